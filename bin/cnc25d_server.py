@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+#
+# cnc25d_server.py
+# it starts the cnc25d design server
+# created by charlyoleg on 2014/04/11
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+# 
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# 
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+cnc25d_server.py keeps the cnc25d designs instantiated in a pool of worker processes
+and answers JSON requests read from stdin or from a Unix socket.
+Usage:
+  cnc25d_server.py --workers 4 < requests.jsonl > responses.jsonl
+  cnc25d_server.py --socket /tmp/cnc25d.sock
+Read cnc25d/design_server.py for the request format.
+"""
+
+from cnc25d import design_server
+
+design_server.design_server_cli()
+
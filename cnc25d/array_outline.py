@@ -0,0 +1,374 @@
+# array_outline.py
+# a compact outline representation for the cnc_outline functions
+# created by charlyoleg on 2014/04/16
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+array_outline.py is part of the Cnc25D API.
+it provides the class Array_Outline that stores a format-A or format-B outline (except circle) in arrays:
+one segment-kind byte per segment, the middle and end point coordinates and the router_bit requests in float64 arrays.
+shift, rotate, reverse and close work on the whole arrays with numpy. Without numpy, the array module is used.
+The cnc_outline functions accept an Array_Outline wherever a list of segments is expected.
+"""
+
+################################################################
+# import
+################################################################
+
+# Python standard library
+import math
+import array
+# numpy is optional
+try:
+  import numpy
+except ImportError:
+  numpy = None
+# cnc25d
+import cnc25d_error
+
+################################################################
+# array helpers
+################################################################
+
+segment_line = 0 # the first point of an outline is stored as a line
+segment_arc = 1
+
+def new_column(ai_values, ai_use_numpy):
+  """ create a float64 array from the list ai_values
+  """
+  if(ai_use_numpy):
+    r_column = numpy.array(ai_values, dtype=numpy.float64)
+  else:
+    r_column = array.array('d', ai_values)
+  return(r_column)
+
+def concat_column(ai_column_1, ai_column_2):
+  """ concatenate two arrays created by new_column() or two segment-kind arrays
+  """
+  if(numpy!=None and isinstance(ai_column_1, numpy.ndarray)):
+    r_column = numpy.concatenate((ai_column_1, ai_column_2))
+  else:
+    r_column = ai_column_1 + ai_column_2
+  return(r_column)
+
+def column_values(ai_column):
+  """ return the values of the array as a list of Python floats or int
+  """
+  if(numpy!=None and isinstance(ai_column, numpy.ndarray)):
+    r_values = ai_column.tolist()
+  else:
+    r_values = list(ai_column)
+  return(r_values)
+
+################################################################
+# Array_Outline class
+################################################################
+
+class Array_Outline:
+  """ outline at the format-A (with router_bit requests) or at the format-B stored in arrays
+      kind[i] is segment_line or segment_arc. mx, my are the middle point of the arcs (zero for the lines)
+      ex, ey are the end points. rbr contains the router_bit requests or is None at the format-B
+  """
+  def __init__(self, ai_outline=None, ai_use_numpy=True):
+    """ create an Array_Outline from a list of segments at the format-A or format-B
+    """
+    self.use_numpy = ai_use_numpy and (numpy!=None)
+    if(ai_outline!=None):
+      self.set_outline(ai_outline)
+
+  def set_outline(self, ai_outline):
+    """ store the list of segments ai_outline
+    """
+    if((not isinstance(ai_outline, (tuple, list)))or(len(ai_outline)<2)or(not isinstance(ai_outline[0], (tuple, list)))):
+      raise cnc25d_error.GeometryError("ERR091: Error, Array_Outline needs a list of at least 2 segments. Circles are not supported")
+    len_first_point = len(ai_outline[0])
+    if(len_first_point==3):
+      self.outline_type = 2 # format-A, same code as cnc_outline.check_outline_format()
+    elif(len_first_point==2):
+      self.outline_type = 1 # format-B
+    else:
+      raise cnc25d_error.GeometryError("ERR097: Error, the first point has an unexpected number of items {:d}".format(len_first_point))
+    line_len = len_first_point
+    arc_len = len_first_point + 2
+    kind = bytearray(len(ai_outline))
+    mx = [0.0]*len(ai_outline)
+    my = [0.0]*len(ai_outline)
+    ex = []
+    ey = []
+    rbr = []
+    for i in range(len(ai_outline)):
+      p = ai_outline[i]
+      len_p = len(p)
+      if(len_p==line_len):
+        ex.append(p[0])
+        ey.append(p[1])
+      elif((len_p==arc_len)and(i>0)):
+        kind[i] = segment_arc
+        mx[i] = p[0]
+        my[i] = p[1]
+        ex.append(p[2])
+        ey.append(p[3])
+      else:
+        raise cnc25d_error.GeometryError("ERR109: Error, the segment {:d} has an unexpected number of items {:d}".format(i, len_p))
+      if(self.outline_type==2):
+        rbr.append(p[-1])
+    if(self.use_numpy):
+      self.kind = numpy.frombuffer(bytes(kind), dtype=numpy.uint8).copy()
+    else:
+      self.kind = kind
+    self.mx = new_column(mx, self.use_numpy)
+    self.my = new_column(my, self.use_numpy)
+    self.ex = new_column(ex, self.use_numpy)
+    self.ey = new_column(ey, self.use_numpy)
+    self.rbr = None
+    if(self.outline_type==2):
+      self.rbr = new_column(rbr, self.use_numpy)
+
+  def new_outline(self, ai_kind, ai_mx, ai_my, ai_ex, ai_ey, ai_rbr):
+    """ internal method that creates an Array_Outline from its arrays
+    """
+    r_outline = Array_Outline(None, self.use_numpy)
+    r_outline.outline_type = self.outline_type
+    r_outline.kind = ai_kind
+    r_outline.mx = ai_mx
+    r_outline.my = ai_my
+    r_outline.ex = ai_ex
+    r_outline.ey = ai_ey
+    r_outline.rbr = ai_rbr
+    return(r_outline)
+
+  def __len__(self):
+    return(len(self.kind))
+
+  def to_list(self):
+    """ return the outline as a list of tuples at its format (A or B)
+    """
+    kind = self.kind
+    mx = column_values(self.mx)
+    my = column_values(self.my)
+    ex = column_values(self.ex)
+    ey = column_values(self.ey)
+    r_outline = []
+    if(self.outline_type==2):
+      rbr = column_values(self.rbr)
+      for i in range(len(kind)):
+        if(kind[i]==segment_arc):
+          r_outline.append((mx[i], my[i], ex[i], ey[i], rbr[i]))
+        else:
+          r_outline.append((ex[i], ey[i], rbr[i]))
+    else:
+      for i in range(len(kind)):
+        if(kind[i]==segment_arc):
+          r_outline.append((mx[i], my[i], ex[i], ey[i]))
+        else:
+          r_outline.append((ex[i], ey[i]))
+    return(r_outline)
+
+  def to_format_B(self):
+    """ return the outline without the router_bit requests (format-B)
+    """
+    r_outline = self.new_outline(self.kind, self.mx, self.my, self.ex, self.ey, None)
+    r_outline.outline_type = 1
+    return(r_outline)
+
+  def is_closed(self):
+    """ return True if the last point is the first point
+    """
+    return((self.ex[0]==self.ex[-1])and(self.ey[0]==self.ey[-1]))
+
+  def shift_xy(self, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient):
+    """ same as cnc_outline.general_outline_shift_xy(): add the offset and multiply by coefficient the coordinates
+        the outline is reversed if the coefficients have opposite signs
+    """
+    if((ai_x_coefficient==0)or(ai_y_coefficient==0)):
+      raise cnc25d_error.GeometryError("ERR439: Error, a multiplication coefficient is set to zero: {:0.2f}  {:0.2f}".format(ai_x_coefficient, ai_y_coefficient))
+    i_outline = self
+    if((ai_x_coefficient*ai_y_coefficient)<0):
+      i_outline = self.reverse()
+    if(self.use_numpy):
+      is_arc = (i_outline.kind==segment_arc)
+      mx = numpy.where(is_arc, ai_x_offset+ai_x_coefficient*i_outline.mx, 0.0)
+      my = numpy.where(is_arc, ai_y_offset+ai_y_coefficient*i_outline.my, 0.0)
+      ex = ai_x_offset+ai_x_coefficient*i_outline.ex
+      ey = ai_y_offset+ai_y_coefficient*i_outline.ey
+    else:
+      kind = i_outline.kind
+      mx = array.array('d', [ (ai_x_offset+ai_x_coefficient*i_outline.mx[i] if kind[i]==segment_arc else 0.0) for i in range(len(kind)) ])
+      my = array.array('d', [ (ai_y_offset+ai_y_coefficient*i_outline.my[i] if kind[i]==segment_arc else 0.0) for i in range(len(kind)) ])
+      ex = array.array('d', [ ai_x_offset+ai_x_coefficient*v for v in i_outline.ex ])
+      ey = array.array('d', [ ai_y_offset+ai_y_coefficient*v for v in i_outline.ey ])
+    r_outline = self.new_outline(i_outline.kind, mx, my, ex, ey, i_outline.rbr)
+    return(r_outline)
+
+  def rotate(self, ai_ox, ai_oy, ai_rotation_angle):
+    """ same as cnc_outline.general_outline_rotate(): rotation of angle ai_rotation_angle and center (ai_ox, ai_oy)
+        the computation is the one of small_geometry.rotate_point()
+    """
+    cos_a = math.cos(ai_rotation_angle)
+    sin_a = math.sin(ai_rotation_angle)
+    if(self.use_numpy):
+      is_arc = (self.kind==segment_arc)
+      ix = self.mx-ai_ox
+      iy = self.my-ai_oy
+      mx = numpy.where(is_arc, ai_ox+ix*cos_a-iy*sin_a, 0.0)
+      my = numpy.where(is_arc, ai_oy+ix*sin_a+iy*cos_a, 0.0)
+      ix = self.ex-ai_ox
+      iy = self.ey-ai_oy
+      ex = ai_ox+ix*cos_a-iy*sin_a
+      ey = ai_oy+ix*sin_a+iy*cos_a
+    else:
+      mx = array.array('d', self.mx)
+      my = array.array('d', self.my)
+      ex = array.array('d', self.ex)
+      ey = array.array('d', self.ey)
+      for i in range(len(self.kind)):
+        ix = self.ex[i]-ai_ox
+        iy = self.ey[i]-ai_oy
+        ex[i] = ai_ox+ix*cos_a-iy*sin_a
+        ey[i] = ai_oy+ix*sin_a+iy*cos_a
+        if(self.kind[i]==segment_arc):
+          ix = self.mx[i]-ai_ox
+          iy = self.my[i]-ai_oy
+          mx[i] = ai_ox+ix*cos_a-iy*sin_a
+          my[i] = ai_oy+ix*sin_a+iy*cos_a
+    r_outline = self.new_outline(self.kind, mx, my, ex, ey, self.rbr)
+    return(r_outline)
+
+  def transform(self, ai_a, ai_b, ai_c, ai_d, ai_e, ai_f):
+    """ apply the affine transform x' = a*x + b*y + c ; y' = d*x + e*y + f to all points
+        the orientation is not changed, see cnc_outline.Transform2D for the reverse of the mirrored outlines
+    """
+    if(self.use_numpy):
+      is_arc = (self.kind==segment_arc)
+      mx = numpy.where(is_arc, ai_a*self.mx+ai_b*self.my+ai_c, 0.0)
+      my = numpy.where(is_arc, ai_d*self.mx+ai_e*self.my+ai_f, 0.0)
+      ex = ai_a*self.ex+ai_b*self.ey+ai_c
+      ey = ai_d*self.ex+ai_e*self.ey+ai_f
+    else:
+      kind = self.kind
+      mx = array.array('d', [ (ai_a*self.mx[i]+ai_b*self.my[i]+ai_c if kind[i]==segment_arc else 0.0) for i in range(len(kind)) ])
+      my = array.array('d', [ (ai_d*self.mx[i]+ai_e*self.my[i]+ai_f if kind[i]==segment_arc else 0.0) for i in range(len(kind)) ])
+      ex = array.array('d', [ ai_a*self.ex[i]+ai_b*self.ey[i]+ai_c for i in range(len(kind)) ])
+      ey = array.array('d', [ ai_d*self.ex[i]+ai_e*self.ey[i]+ai_f for i in range(len(kind)) ])
+    r_outline = self.new_outline(self.kind, mx, my, ex, ey, self.rbr)
+    return(r_outline)
+
+  def reverse(self):
+    """ same as cnc_outline.reverse_outline(): the last point becomes the first point
+        the middle point of an arc stays with its arc. The router_bit request stays with its point
+    """
+    kind = concat_column(self.kind[:1], self.kind[:0:-1])
+    mx = concat_column(self.mx[:1], self.mx[:0:-1])
+    my = concat_column(self.my[:1], self.my[:0:-1])
+    ex = self.ex[::-1]
+    ey = self.ey[::-1]
+    rbr = None
+    if(self.outline_type==2):
+      rbr = self.rbr[::-1]
+      if(self.is_closed()): # move the router_bit request of the closing point
+        if(self.use_numpy):
+          rbr = rbr.copy()
+        if(rbr[0]!=0):
+          print("WARN567: Warning, the last router_bit request of the closed outline is not set to zero: {:0.2f}".format(rbr[0]))
+        rbr[0] = rbr[-1]
+        rbr[-1] = 0
+    r_outline = self.new_outline(kind, mx, my, ex, ey, rbr)
+    return(r_outline)
+
+  def close(self):
+    """ same as cnc_outline.outline_close(): return the outline with a last line to the first point
+    """
+    if(self.is_closed()):
+      print("WARN421: Warning, the outline is already closed!")
+      r_outline = self
+    else:
+      if(self.use_numpy):
+        kind = concat_column(self.kind, numpy.zeros(1, dtype=numpy.uint8))
+      else:
+        kind = self.kind + bytearray(1)
+      mx = concat_column(self.mx, new_column([0.0], self.use_numpy))
+      my = concat_column(self.my, new_column([0.0], self.use_numpy))
+      ex = concat_column(self.ex, self.ex[:1])
+      ey = concat_column(self.ey, self.ey[:1])
+      rbr = None
+      if(self.outline_type==2):
+        rbr = concat_column(self.rbr, new_column([0.0], self.use_numpy))
+      r_outline = self.new_outline(kind, mx, my, ex, ey, rbr)
+    return(r_outline)
+
+################################################################
+# test
+################################################################
+
+def array_outline_test():
+  """ compare the Array_Outline methods with the cnc_outline functions
+  """
+  import cnc_outline
+  ol_A = [(0, 0, 1), (20, 0, 2), (25, 5, 20, 10, 1), (0, 10, 0), (0, 0, 0)]
+  ol_B = [(0, 0), (20, 0), (25, 5, 20, 10), (0, 10)]
+  r_test = True
+  for use_numpy in (True, False):
+    for ol in (ol_A, ol_B):
+      a_ol = Array_Outline(ol, use_numpy)
+      tests = (
+        ('to_list', a_ol.to_list(), ol),
+        ('shift_xy', a_ol.shift_xy(3, 2, -4, 0.5).to_list(), cnc_outline.general_outline_shift_xy(ol, 3, 2, -4, 0.5)),
+        ('shift_xy_flip', a_ol.shift_xy(3, -1, -4, 1).to_list(), cnc_outline.general_outline_shift_xy(ol, 3, -1, -4, 1)),
+        ('rotate', a_ol.rotate(3, 4, 0.7).to_list(), cnc_outline.general_outline_rotate(ol, 3, 4, 0.7)),
+        ('reverse', a_ol.reverse().to_list(), cnc_outline.reverse_outline(ol)))
+      for (t_name, t_result, t_ref) in tests:
+        t_ok = (t_result==[ tuple(s) for s in t_ref ])
+        r_test = r_test and t_ok
+        print("array_outline test {:s} with numpy {:d} format {:d}: {:s}".format(t_name, use_numpy, a_ol.outline_type, 'ok' if t_ok else 'failed'))
+  r_test = array_outline_writer_test() and r_test
+  return(r_test)
+
+def array_outline_writer_test():
+  """ write a figure containing Array_Outline with ideal_figure() and the SVG, DXF and G-code writers
+  """
+  import cStringIO
+  import design_output
+  import outline_backends
+  ol_A = [(0, 0, 1), (20, 0, 2), (25, 5, 20, 10, 1), (0, 10, 0), (0, 0, 0)]
+  ol_B = [(5, 2), (10, 2), (10, 6), (5, 2)]
+  r_test = True
+  for use_numpy in (True, False):
+    fig = [Array_Outline(ol_A, use_numpy), Array_Outline(ol_B, use_numpy), (15, 5, 1)]
+    ideal_fig = design_output.ideal_figure(fig, "array_outline_writer_test")
+    t_ok = (ideal_fig[0]==[ tuple(s[:-1]) for s in ol_A ])
+    for (t_name, f_writer) in (
+      ('svg', outline_backends.write_figure_in_svg_stream),
+      ('dxf', outline_backends.write_figure_in_dxf_stream),
+      ('gcode', lambda fig, fh: outline_backends.write_figure_in_gcode_stream(fig, fh, 1.0))):
+      fh = cStringIO.StringIO()
+      f_writer(ideal_fig, fh)
+      t_ok = t_ok and (len(fh.getvalue())>0)
+    r_test = r_test and t_ok
+    print("array_outline test ideal_figure and writers with numpy {:d}: {:s}".format(use_numpy, 'ok' if t_ok else 'failed'))
+  return(r_test)
+
+################################################################
+# main
+################################################################
+
+if __name__ == "__main__":
+  print("array_outline.py says hello!")
+  array_outline_test()
+
@@ -33,10 +33,77 @@ import sys, argparse
 import re # to detect .dxf or .svg
 from datetime import datetime
 import os
+import time # to measure the duration of the batch jobs
+import glob # to list the files written by a batch job
+import traceback
+import multiprocessing # for run_batch() and the pipelined export
+import threading # for the writer thread of the pipelined export
+import Queue # bounded queue between the export workers and the writer thread
+import cStringIO # the export workers render the files in memory
+import numbers # for the constraint type check
+import collections # the copies of the figure dictionaries keep the figure order
 #
+import cnc_outline
 import outline_backends
 import design_help
 import design_output
+import design_cache
+import design_frontend
+import cnc25d_error
+
+################################################################
+# constraint schema shared by the design instances
+################################################################
+
+constraint_schema_cache = {} # (design_name, f_constraint_constructor) -> parser, reference constraint and schema
+
+def get_constraint_schema(ai_design_name, f_constraint_constructor):
+  """ return a dictionary with the parser, the reference constraint, its key and the schema of f_constraint_constructor
+      They are computed once per design and shared by all the instances, so they must not be modified.
+      schema[k] = (type, nargs, choices) of the constraint k. type None means not checked
+  """
+  cache_key = (ai_design_name, f_constraint_constructor)
+  if(not cache_key in constraint_schema_cache):
+    init_parser = argparse.ArgumentParser(description='Command Line Interface of {:s}'.format(ai_design_name))
+    parser = f_constraint_constructor(init_parser)
+    reference_constraint = vars(parser.parse_args([]))
+    schema = {}
+    for action in parser._actions:
+      if(action.dest in reference_constraint):
+        value_type = action.type
+        if(value_type==None):
+          if(isinstance(action.const, bool)): # store_true or store_false
+            value_type = bool
+          elif(isinstance(action.default, basestring)):
+            value_type = str
+        schema[action.dest] = (value_type, action.nargs, action.choices)
+    r_schema = {}
+    r_schema['parser'] = parser
+    r_schema['reference_constraint'] = reference_constraint
+    r_schema['reference_key'] = design_help.constraint_hash(reference_constraint)
+    r_schema['schema'] = schema
+    constraint_schema_cache[cache_key] = r_schema
+  return(constraint_schema_cache[cache_key])
+
+constraint_type_classes = {float:numbers.Real, int:numbers.Integral, bool:numbers.Integral, str:basestring}
+
+def constraint_value_convert(ai_value, ai_type):
+  """ convert a whole-number float (e.g. 17.0) into an int for the int constraints
+  """
+  r_value = ai_value
+  if((ai_type==int)and isinstance(ai_value, float)and ai_value.is_integer()):
+    r_value = int(ai_value)
+  return(r_value)
+
+def constraint_value_is_valid(ai_value, ai_type, ai_choices):
+  """ check a single constraint value against its type and its choices
+  """
+  r_valid = True
+  if(ai_type in constraint_type_classes):
+    r_valid = isinstance(ai_value, constraint_type_classes[ai_type])
+  if(r_valid and (ai_choices!=None)):
+    r_valid = (ai_value in ai_choices)
+  return(r_valid)
 
 ################################################################
 # bare_design class
@@ -55,8 +122,10 @@ class bare_design:
     self.f_design_constraint_constructor = None
     self.f_2d_constructor = None
     self.f_info = None
+    self.figure_producers = None # alternative to f_2d_constructor
     # optional attributes
     self.f_constraint_check = None # highly recommended
+    self.constraint_rules = None # alternative to f_constraint_check for incremental checks
     self.f_3d_constructor = None
     self.f_3d_freecad_constructor = None
     self.simulation_2d_pts = {}
@@ -79,15 +148,41 @@ class bare_design:
     self.slice3d_configurations = None
     self.freecad_function_pts = None
     self.fc_obj_slice3d_conf = None
+    # cache of the 2D-figures
+    self.constraint_key = None
+    self.figure_cache_key = None
+    self.B_figures = {}
+    self.B_figure_cache_key = None
+    self.S_figures = {}
+    self.S_figure_cache_key = None
+    self.simplify_tolerance = 0.0 # simplification of the written figures (disabled per default)
+    self.export_workers = 1 # number of processes preparing the written figures (1: serial export)
+    self.gcode_parameters = {} # machining parameters of the .ngc files that update the defaults of outline_backends
+    self.lazy_figures = {}
+    self.lazy_heights = {}
+    self.lazy_cache_key = None
+    self.cache_stat = {'2d_hit':0, '2d_miss':0, 'lazy_hit':0, 'lazy_miss':0, 'cnc_cut_hit':0, 'cnc_cut_miss':0, 'disk_hit':0, 'disk_miss':0, 'rule_run':0, 'rule_skip':0}
+    # history of the constraint rules
+    self.constraint_rule_history = None
+    self.constraint_rule_verification = (os.environ.get('CNC25D_VERIFY_CONSTRAINT_RULES', '')!='')
+    # disk cache (disabled per default)
+    self.disk_cache_dir = ''
+    self.disk_cache_size = design_cache.default_disk_cache_size
+    self.disk_cache_key = None
+    self.disk_cache_content = None
 
   def set_constraint_constructor(self, f_constraint_constructor):
     """ create the design constraint list
+        the parser and the reference constraint are created once per design and shared by its instances
     """
-    init_parser = argparse.ArgumentParser(description='Command Line Interface of {:s}'.format(self.design_name))
-    self.parser = f_constraint_constructor(init_parser)
-    self.reference_constraint = vars(self.parser.parse_args([]))
+    constraint_schema = get_constraint_schema(self.design_name, f_constraint_constructor)
+    self.parser = constraint_schema['parser']
+    self.reference_constraint = constraint_schema['reference_constraint']
+    self.reference_constraint_key = constraint_schema['reference_key']
+    self.constraint_schema = constraint_schema['schema']
     self.current_input_constraint = self.reference_constraint.copy()
     self.constraint = self.reference_constraint.copy()
+    self.constraint_key = self.reference_constraint_key
     self.f_design_constraint_constructor = f_constraint_constructor # needed for the function get_constraint_constructor()
 
   def set_constraint_check(self, f_constraint_check):
@@ -95,10 +190,53 @@ class bare_design:
     """
     self.f_constraint_check = f_constraint_check
 
+  def set_constraint_rules(self, constraint_rules=None):
+    """ bind the list of functions constraint_rules that check the constraint and set the dynamic default values
+        A rule is a function f(c) that completes c in place. The rules are executed in the list order.
+        The keys read and written by each rule are recorded, so when only a few constraint values change,
+        only the rules depending on them are executed again. When set, f_constraint_check is not used anymore
+    """
+    self.constraint_rules = constraint_rules
+    self.constraint_rule_history = None
+
+  def set_constraint_rule_verification(self, verify=True):
+    """ compare each incremental constraint check with a full check and raise an error if they differ
+        It can also be enabled with the environment variable CNC25D_VERIFY_CONSTRAINT_RULES
+    """
+    self.constraint_rule_verification = verify
+
   def set_2d_constructor(self, f_2d_constructor):
     """ bind the function f_2d_constructor that generates the 2D figures and returns them in a dictionary
     """
     self.f_2d_constructor = f_2d_constructor
+    self.figure_cache_key = None # the cached 2D-figures are not valid anymore
+    self.lazy_cache_key = None
+
+  def set_2d_figure_producers(self, figure_producers=None):
+    """ bind the dictionary figure_producers that generates the 2D figures one by one
+        figure_producers[figure_id] = (f_producer, dependency_list)
+        Use a collections.OrderedDict to set the order of the figures (the first one is the default figure)
+        f_producer(c, deps) returns (figure, height). deps is the dictionary of the figures of dependency_list. They must not be modified
+        A figure_id starting with '_' is an intermediate result that is not part of the figure list
+        When set, only the requested figure and its dependencies are generated. f_2d_constructor is not used anymore
+    """
+    if(figure_producers!=None):
+      visited = {} # 1: in progress, 2: done
+      def check_dependencies(ai_figure_id, ai_path):
+        if(visited.get(ai_figure_id, 0)==1):
+          raise cnc25d_error.DesignError("ERR126: Error, the figure producers have a dependency cycle: {:s}".format(' -> '.join(ai_path+[ai_figure_id])))
+        if(visited.get(ai_figure_id, 0)==0):
+          visited[ai_figure_id] = 1
+          for d in figure_producers[ai_figure_id][1]:
+            if(not d in figure_producers):
+              raise cnc25d_error.DesignError("ERR128: Error, the figure {:s} depends on the unknown figure {:s}".format(ai_figure_id, d))
+            check_dependencies(d, ai_path+[ai_figure_id])
+          visited[ai_figure_id] = 2
+      for f in sorted(figure_producers.keys()):
+        check_dependencies(f, [])
+    self.figure_producers = figure_producers
+    self.figure_cache_key = None
+    self.lazy_cache_key = None
 
   def set_2d_simulation(self, simulations={}):
     """ set the dictionary that points to Tk-window-2D-simulation functions
@@ -175,8 +313,44 @@ class bare_design:
     """
     self.current_input_constraint = self.reference_constraint.copy()
     self.constraint = self.reference_constraint.copy()
+    self.constraint_key = self.reference_constraint_key
     return(self.constraint)
 
+  def update_constraint_key(self):
+    """ internal method that computes the key identifying the current constraint
+        The cached 2D-figures are reused as long as this key is unchanged
+    """
+    self.constraint_key = design_help.constraint_hash(self.constraint)
+    return(self.constraint_key)
+
+  def check_constraint_type(self, k, value):
+    """ internal method that checks the type and the choices of the input constraint value
+        the values of the dictionaries are checked as the command line interface would do, without parsing
+        It returns the value, with the whole-number floats of the int constraints converted into int
+    """
+    (value_type, nargs, choices) = self.constraint_schema[k]
+    if((value==None)and(self.reference_constraint[k]==None)):
+      return(value)
+    value_list = [value]
+    value_is_list = False
+    if((nargs in ('*', '+'))or(isinstance(nargs, int)and(nargs>0))):
+      if(not isinstance(value, (list, tuple))):
+        raise cnc25d_error.ConstraintError("ERR185: Error in {:s}, the constraint {:s} must be a list".format(self.design_name, k), {k:value})
+      value_list = value
+      value_is_list = True
+    value_list = [ constraint_value_convert(v, value_type) for v in value_list ]
+    for v in value_list:
+      if(not constraint_value_is_valid(v, value_type, choices)):
+        expected = getattr(value_type, '__name__', str(value_type))
+        if(choices!=None):
+          expected += " in {:s}".format(str(choices))
+        raise cnc25d_error.ConstraintError("ERR186: Error in {:s}, the constraint {:s} must be a {:s}".format(self.design_name, k, expected), {k:value})
+    if(value_is_list):
+      r_value = type(value)(value_list)
+    else:
+      r_value = value_list[0]
+    return(r_value)
+
 
   def apply_constraint(self, constraint):
     """ set the dictionary constraint to the design
@@ -187,12 +361,11 @@ class bare_design:
     #c = rc.copy() # starting from default constraint
     new_contraint_value = 0
     for k in constraint.keys():
-      if(not k in rc.keys()):
-        print("ERR177: Error, contraint {:k} is not part of the design".format(k))
-        sys.exit(2)
+      if(not k in rc):
+        raise cnc25d_error.ConstraintError("ERR177: Error, contraint {:s} is not part of the design".format(k))
       if(c[k] != constraint[k]):
         new_contraint_value += 1
-        c[k] = constraint[k] #equivalent to c.update(constraint)
+        c[k] = self.check_constraint_type(k, constraint[k]) #equivalent to c.update(constraint)
     #print("dbg184: {:s} apply_constraint: new {:d},  unchanged: {:d},  total: {:d}".format(self.design_name, new_contraint_value, len(constraint)-new_contraint_value, len(constraint)))
     #c.update(constraint) # apply the new constraint values
     #print("dbg100: constraint:", c)
@@ -204,14 +377,124 @@ class bare_design:
     #  if(c[k] != rc[k]):
     #    print("dbg109: for k {:s}, c[k] {:s} != rc[k] {:s}".format(k, str(c[k]), str(rc[k])))
     self.current_input_constraint = c.copy()
-    if(self.f_constraint_check==None):
+    if(self.load_disk_cache(c)): # the checked constraint and the figures are restored from the disk cache
+      pass
+    elif(self.constraint_rules!=None):
+      self.constraint = self.apply_constraint_rules(c)
+      self.update_constraint_key()
+    elif(self.f_constraint_check==None):
       print("WARN134: Warning, the function f_constraint_check has not been set!")
       self.constraint = c
+      self.update_constraint_key()
     else:
       self.constraint = self.f_constraint_check(c)
+      self.update_constraint_key()
     self.cli_str = "" # delete the cli_str when constraint come from dictionary
     return(self.constraint)
 
+  def apply_constraint_rules(self, input_constraint):
+    """ internal method that checks input_constraint with the constraint rules
+        only the rules depending on the constraint values changed since the previous check are executed
+    """
+    history = self.constraint_rule_history
+    self.constraint_rule_history = None # in case of error, the next check is a full check
+    (r_constraint, history, run_nb) = design_frontend.run_constraint_rules(self.constraint_rules, input_constraint, history)
+    self.cache_stat['rule_run'] += run_nb
+    self.cache_stat['rule_skip'] += len(self.constraint_rules) - run_nb
+    if(self.constraint_rule_verification):
+      (full_constraint, full_history, full_run_nb) = design_frontend.run_constraint_rules(self.constraint_rules, input_constraint)
+      diff_keys = []
+      for k in sorted(set(r_constraint.keys()) | set(full_constraint.keys())):
+        if(design_help.canonical_repr(r_constraint.get(k, None))!=design_help.canonical_repr(full_constraint.get(k, None))):
+          diff_keys.append(k)
+      if(len(diff_keys)>0):
+        context = {}
+        for k in diff_keys:
+          context["incremental c['{:s}']".format(k)] = r_constraint.get(k, None)
+          context["full c['{:s}']".format(k)] = full_constraint.get(k, None)
+        raise cnc25d_error.DesignError("ERR247: Error in {:s}, the incremental constraint check differs from the full check for {:s}".format(self.design_name, ', '.join(diff_keys)), context)
+    self.constraint_rule_history = history
+    return(r_constraint)
+
+  def set_disk_cache(self, cache_dir='', size_budget=design_cache.default_disk_cache_size):
+    """ enable the disk cache in the directory cache_dir with a size budget in MB
+        If cache_dir is the empty string, the disk cache is disabled
+    """
+    self.disk_cache_dir = cache_dir
+    self.disk_cache_size = size_budget
+    self.disk_cache_key = None
+    self.disk_cache_content = None
+
+  def get_disk_cache_content(self):
+    """ internal method that returns a short description of what could be stored in the disk cache
+        (all the A-figures computed, the figures computed by the figure producers, the B-figures)
+    """
+    a_figs = False
+    if((self.A_figures!=None)and(self.figure_cache_key==self.constraint_key)):
+      a_figs = True
+    lazy_figs = ()
+    if(self.lazy_cache_key==self.constraint_key):
+      lazy_figs = tuple(sorted(self.lazy_figures.keys()))
+    b_figs = ()
+    if(self.B_figure_cache_key==self.constraint_key):
+      b_figs = tuple(sorted(self.B_figures.keys()))
+    r_content = (a_figs, lazy_figs, b_figs)
+    return(r_content)
+
+  def load_disk_cache(self, input_constraint):
+    """ internal method that looks for the input_constraint in the disk cache
+        If found, the checked constraint and the figures are restored and True is returned
+    """
+    r_found = False
+    self.disk_cache_key = None
+    if(self.disk_cache_dir!=''):
+      self.disk_cache_key = design_cache.disk_cache_key(self.design_name, input_constraint)
+    if(self.disk_cache_key!=None):
+      entry = design_cache.disk_cache_read(self.disk_cache_dir, self.disk_cache_key)
+      if(entry==None):
+        self.cache_stat['disk_miss'] += 1
+        self.disk_cache_content = None
+      else:
+        self.cache_stat['disk_hit'] += 1
+        self.constraint = entry['constraint']
+        self.update_constraint_key()
+        if(entry['A_figures']!=None):
+          self.A_figures = entry['A_figures']
+          self.figure_heights = entry['figure_heights']
+          self.figure_cache_key = self.constraint_key
+        if(len(entry['lazy_figures'])>0):
+          self.lazy_figures = entry['lazy_figures']
+          self.lazy_heights = entry['lazy_heights']
+          self.lazy_cache_key = self.constraint_key
+        if(len(entry['B_figures'])>0):
+          self.B_figures = entry['B_figures']
+          self.B_figure_cache_key = self.constraint_key
+        self.disk_cache_content = self.get_disk_cache_content()
+        r_found = True
+    return(r_found)
+
+  def save_disk_cache(self):
+    """ write in the disk cache the checked constraint and the figures computed for the current constraint
+        Nothing is written if the disk cache is disabled or if the entry is already up to date
+    """
+    r_status = 0
+    if(self.disk_cache_key!=None):
+      content = self.get_disk_cache_content()
+      if(content!=self.disk_cache_content):
+        entry = {}
+        entry['constraint'] = self.constraint
+        entry['A_figures'] = None
+        entry['figure_heights'] = None
+        if(content[0]):
+          entry['A_figures'] = self.A_figures
+          entry['figure_heights'] = self.figure_heights
+        entry['lazy_figures'] = dict([ (f, self.lazy_figures[f]) for f in content[1] ])
+        entry['lazy_heights'] = dict([ (f, self.lazy_heights[f]) for f in content[1] ])
+        entry['B_figures'] = dict([ (f, self.B_figures[f]) for f in content[2] ])
+        r_status = design_cache.disk_cache_write(self.disk_cache_dir, self.disk_cache_key, entry, self.disk_cache_size)
+        self.disk_cache_content = content
+    return(r_status)
+
   def apply_external_constraint(self, constraint):
     """ set the dictionary constraint to the design without generating error on unknow constraint
     """
@@ -241,13 +524,16 @@ class bare_design:
     return(r_constraint)
 
   def design_setup(self, s_design_name="no_name", f_constraint_constructor=None, f_constraint_check=None, f_2d_constructor=None, d_2d_simulation={}, f_3d_constructor=None, f_3d_freecad_constructor=None, f_info=None,
-    l_display_figure_list=[], s_default_simulation="", l_2d_figure_file_list=None, l_3d_figure_file_list=None, l_3d_conf_file_list=None, l_3d_freecad_file_list=None, f_cli_return_type=None, l_self_test_list=[]):
+    l_display_figure_list=[], s_default_simulation="", l_2d_figure_file_list=None, l_3d_figure_file_list=None, l_3d_conf_file_list=None, l_3d_freecad_file_list=None, f_cli_return_type=None, l_self_test_list=[],
+    d_2d_figure_producers=None, l_constraint_rules=None):
     """ enhance the initial setup of a new design script
     """
     self.set_design_name(s_design_name)
     self.set_constraint_constructor(f_constraint_constructor)
     self.set_constraint_check(f_constraint_check)
+    self.set_constraint_rules(l_constraint_rules)
     self.set_2d_constructor(f_2d_constructor)
+    self.set_2d_figure_producers(d_2d_figure_producers)
     self.set_2d_simulation(d_2d_simulation)
     self.set_3d_constructor(f_3d_constructor)
     self.set_3d_freecad_constructor(f_3d_freecad_constructor)
@@ -280,44 +566,134 @@ class bare_design:
     """ generate the design info
     """
     if(self.f_info==None):
-      print("ERR160: Error, the function f_info has not been set!")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR160: Error, the function f_info has not been set!")
     r_txt = "\nDESIGN INFO for {:s}\n{:s}\n".format(self.design_name, self.cli_str)
     r_txt += "{:s}".format(self.f_info(self.constraint))
     return(r_txt)
 
   def apply_2d_constructor(self):
-    """ internal method that execute the f_2d_constructor function
+    """ internal method that execute the f_2d_constructor function or all the figure producers
+        the function is executed only if the constraint has changed since the previous execution
     """
-    if(self.f_2d_constructor==None):
-      print("ERR169: Error, the function f_2d_constructor has not been set!")
-      sys.exit(2)
-    (figs, fig_heights) = self.f_2d_constructor(self.constraint) # generate all figures
-    self.A_figures = figs
-    self.figure_heights = fig_heights
+    if((self.f_2d_constructor==None)and(self.figure_producers==None)):
+      raise cnc25d_error.DesignError("ERR169: Error, the function f_2d_constructor has not been set!")
+    if((self.A_figures!=None)and(self.figure_cache_key==self.constraint_key)):
+      self.cache_stat['2d_hit'] += 1
+    else:
+      self.cache_stat['2d_miss'] += 1
+      if(self.figure_producers!=None):
+        figs = collections.OrderedDict()
+        fig_heights = collections.OrderedDict()
+        for f in self.get_2d_figure_id_list():
+          (figs[f], fig_heights[f]) = self.produce_2d_figure(f)
+      else:
+        (figs, fig_heights) = self.f_2d_constructor(self.constraint) # generate all figures
+      self.A_figures = figs
+      self.figure_heights = fig_heights
+      self.figure_cache_key = self.constraint_key
     #print("dbg191: self.A_figures.keys():", self.A_figures.keys())
-    return((self.A_figures, self.figure_heights))
+    return((collections.OrderedDict(self.A_figures.items()), collections.OrderedDict(self.figure_heights.items()))) # copies protect the cache against the modifications done by the caller and keep the figure order
+
+  def produce_2d_figure(self, figure_id):
+    """ internal method that returns the figure figure_id and its height without copy
+        with figure producers, only figure_id and its dependencies are generated
+    """
+    if(self.figure_producers==None):
+      self.apply_2d_constructor()
+      if(not figure_id in self.A_figures):
+        raise cnc25d_error.DesignError("ERR156: Error, figure_id {:s} is not in the figure list [{:s}]".format(figure_id, ' '.join(self.A_figures.keys())))
+      return((self.A_figures[figure_id], self.figure_heights[figure_id]))
+    if(not figure_id in self.figure_producers):
+      raise cnc25d_error.DesignError("ERR156: Error, figure_id {:s} is not in the figure list [{:s}]".format(figure_id, ' '.join(self.get_2d_figure_id_list())))
+    if(self.lazy_cache_key!=self.constraint_key): # the constraint has changed
+      self.lazy_figures = {}
+      self.lazy_heights = {}
+      self.lazy_cache_key = self.constraint_key
+      if((self.A_figures!=None)and(self.figure_cache_key==self.constraint_key)): # restored from the disk cache
+        self.lazy_figures.update(self.A_figures)
+        self.lazy_heights.update(self.figure_heights)
+    if(figure_id in self.lazy_figures):
+      self.cache_stat['lazy_hit'] += 1
+    else:
+      self.cache_stat['lazy_miss'] += 1
+      (f_producer, dependencies) = self.figure_producers[figure_id]
+      deps = {}
+      for d in dependencies:
+        deps[d] = self.produce_2d_figure(d)[0]
+      (fig, fig_height) = f_producer(self.constraint, deps)
+      self.lazy_figures[figure_id] = fig
+      self.lazy_heights[figure_id] = fig_height
+    return((self.lazy_figures[figure_id], self.lazy_heights[figure_id]))
+
+  def get_2d_figure_id_list(self):
+    """ return the list of the figure_id that can be generated
+    """
+    if(self.figure_producers!=None):
+      r_list = [ f for f in self.figure_producers.keys() if f[0]!='_' ] # the order of declaration of the figures
+    else:
+      self.apply_2d_constructor()
+      r_list = self.A_figures.keys()
+    return(r_list)
+
+  def apply_cnc_cut(self, figure_id):
+    """ internal method that returns the 2D-figure figure_id at the B-format
+        the cnc_cut of a figure is computed only once for a given constraint
+    """
+    a_figure = self.produce_2d_figure(figure_id)[0]
+    if(self.B_figure_cache_key!=self.constraint_key): # the constraint has changed
+      self.B_figures = {}
+      self.B_figure_cache_key = self.constraint_key
+    if(figure_id in self.B_figures):
+      self.cache_stat['cnc_cut_hit'] += 1
+    else:
+      self.cache_stat['cnc_cut_miss'] += 1
+      self.B_figures[figure_id] = design_output.cnc_cut_figure(a_figure, "cnc_cut_{:s}".format(figure_id))
+    return(self.B_figures[figure_id])
+
+  def set_simplify_tolerance(self, tolerance=0.0):
+    """ set the tolerance of the simplification of the 2D-figures written in files. 0.0 disables the simplification
+    """
+    self.simplify_tolerance = tolerance
+
+  def apply_simplify(self, figure_id):
+    """ internal method that returns the 2D-figure figure_id to be written in files
+        it is the B-format figure simplified with simplify_tolerance. The simplification is computed once per constraint and tolerance
+    """
+    b_figure = self.apply_cnc_cut(figure_id)
+    if(self.simplify_tolerance<=0):
+      return(b_figure)
+    s_figure_cache_key = (self.constraint_key, self.simplify_tolerance)
+    if(self.S_figure_cache_key!=s_figure_cache_key):
+      self.S_figures = {}
+      self.S_figure_cache_key = s_figure_cache_key
+    if(not figure_id in self.S_figures):
+      (s_figure, segment_nb_before, segment_nb_after) = design_output.simplify_figure(b_figure, self.simplify_tolerance, "simplify_{:s}".format(figure_id))
+      print("Simplify the figure {:s} with the tolerance {:0.3f}: {:d} segments -> {:d} segments".format(figure_id, self.simplify_tolerance, segment_nb_before, segment_nb_after))
+      self.S_figures[figure_id] = s_figure
+    return(self.S_figures[figure_id])
+
+  def get_cache_stat(self):
+    """ return a dictionary with the hit and miss counters of the 2D-figure cache and of the cnc_cut cache
+    """
+    return(self.cache_stat.copy())
 
   def get_A_figure(self, figure_id=""):
     """ generate the figure figure_id and return it at the A-format
         if figure_id is empty, the first figure of the figure dictionary is selected
     """
-    self.apply_2d_constructor()
     if(figure_id==''):
-      figure_id = self.A_figures.keys()[0]
+      figure_id = self.get_2d_figure_id_list()[0]
     #print("dbg194: figure_id:", figure_id)
-    if(not figure_id in self.A_figures.keys()):
-      print("ERR156: Error, figure_id {:s} is not in the figure list [{:s}]".format(figure_id, ' '.join(self.A_figures.keys())))
-      sys.exit(2)
-    r_fig = self.A_figures[figure_id]
+    r_fig = design_output.copy_figure(self.produce_2d_figure(figure_id)[0]) # the caller can modify its copy without modifying the cache
     return(r_fig)
       
   def get_B_figure(self, figure_id=""):
     """ generate the figure figure_id and return it at the B-format
         if figure_id is empty, the first figure of the figure dictionary is selected
     """
-    A_fig = self.get_A_figure(figure_id)
-    r_fig = design_output.cnc_cut_figure(A_fig, "get_B_figure_{:s}".format(figure_id))
+    if(figure_id==''):
+      figure_id = self.get_2d_figure_id_list()[0]
+    r_fig = design_output.copy_figure(self.apply_cnc_cut(figure_id)) # the caller can modify its copy without modifying the cache
     return(r_fig)
 
   def get_display_2d_figure_list(self):
@@ -326,15 +702,14 @@ class bare_design:
     figs = self.display_2d_figure_list
     r_list = []
     if(figs != None):
-      self.apply_2d_constructor() # create the A-figures
+      fig_ids = self.get_2d_figure_id_list()
       if(len(figs)==0):
-        r_list = self.A_figures.keys()
+        r_list = fig_ids
       else:
         r_list = figs
       for f in r_list:
-        if(not f in self.A_figures.keys()):
-          print("ERR304: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(self.A_figures.keys())))
-          sys.exit(2)
+        if(not f in fig_ids):
+          raise cnc25d_error.DesignError("ERR304: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(fig_ids)))
     return(r_list)
 
   def outline_display(self):
@@ -343,18 +718,17 @@ class bare_design:
     print("{:s}".format(self.get_info()))
     fig_ids = self.get_display_2d_figure_list()
     for f in fig_ids:
-      fig = self.A_figures[f]
+      fig = self.produce_2d_figure(f)[0]
       d_info = "display_{:s}".format(f)
       #print("dbg218: fig:", fig)
       print("{:s}".format(d_info))
-      outline_backends.figure_simple_display(design_output.cnc_cut_figure(fig, d_info), design_output.ideal_figure(fig, d_info), d_info)
+      outline_backends.figure_simple_display(self.apply_cnc_cut(f), design_output.ideal_figure(fig, d_info), d_info)
 
   def apply_3d_constructor(self):
     """ internal method that execute the f_3d_constructor function
     """
     if(self.f_3d_constructor==None):
-      print("ERR214: Error, the function f_3d_constructor has not been set!")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR214: Error, the function f_3d_constructor has not been set!")
     (assembly_conf, slice3d_conf) = self.f_3d_constructor(self.constraint)
     self.assembly_configurations = assembly_conf
     self.slice3d_configurations = slice3d_conf
@@ -364,8 +738,7 @@ class bare_design:
     """ internal method that execute the f_3d_freecad_constructor function
     """
     if(self.f_3d_freecad_constructor==None):
-      print("ERR315: Error, the function f_3d_freecad_constructor has not been set!")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR315: Error, the function f_3d_freecad_constructor has not been set!")
     (freecad_function_pts, fc_obj_slice3d_conf) = self.f_3d_freecad_constructor(self.constraint)
     self.freecad_function_pts = freecad_function_pts
     self.fc_obj_slice3d_conf = fc_obj_slice3d_conf
@@ -374,14 +747,13 @@ class bare_design:
   def complete_assembly_conf(self, partial_conf):
     """ prepare an assembly_conf and in particular generate the required outline-figures
     """
-    self.apply_2d_constructor()
     #print("dbg243: partial_conf:", partial_conf)
     r_assembly_conf = []
     for i in range(len(partial_conf)):
       one_figure_conf = list(partial_conf[i])
       fig_name = one_figure_conf[0]
       #print("dbg352: fig_name:", fig_name)
-      fig_B = design_output.cnc_cut_figure(self.A_figures[fig_name], "complete_assembly_conf_{:s}".format(fig_name))
+      fig_B = design_output.copy_figure(self.apply_cnc_cut(fig_name)) # the cached outlines are not given to the assembly
       one_figure_conf[0] = fig_B
       r_assembly_conf.append(one_figure_conf)
     return(r_assembly_conf)
@@ -395,8 +767,7 @@ class bare_design:
     if(assembly_name==""):
       assembly_name = self.assembly_configurations.keys()[0] # set the first 3d-assembly-configuration per default
     if(not assembly_name in self.assembly_configurations.keys()):
-      print("ERR187: Error, the assembly_name {:s} is not in the possible 3d-assembly-configuration".format(assembly_name))
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR187: Error, the assembly_name {:s} is not in the possible 3d-assembly-configuration".format(assembly_name))
     #print("dbg245: self.assembly_configurations:", self.assembly_configurations)
     #print("dbg246: assembly_name:", assembly_name)
     r_fc_obj = design_output.figures_to_freecad_assembly(self.complete_assembly_conf(self.assembly_configurations[assembly_name]))
@@ -411,8 +782,7 @@ class bare_design:
     if(function_id==""):
       function_id = self.freecad_function_pts.keys()[0] # set the first 3d-freecad_function_pts per default
     if(not function_id in self.freecad_function_pts.keys()):
-      print("ERR370: Error, the function_id {:s} is not in the possible 3d-freecad_function_pts".format(function_id))
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR370: Error, the function_id {:s} is not in the possible 3d-freecad_function_pts".format(function_id))
     r_fc_obj = self.freecad_function_pts[function_id](self.constraint) # execute the function that generate a freecad object
     return(r_fc_obj)
 
@@ -436,34 +806,168 @@ class bare_design:
     figs = self.write_2d_figure_list
     r_list = []
     if(figs != None):
-      self.apply_2d_constructor() # create the A-figures
+      fig_ids = self.get_2d_figure_id_list()
       if(len(figs)==0):
-        r_list = self.A_figures.keys()
+        r_list = fig_ids
       else:
         r_list = figs
       for f in r_list:
-        if(not f in self.A_figures.keys()):
-          print("ERR291: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(self.A_figures.keys())))
-          sys.exit(2)
+        if(not f in fig_ids):
+          raise cnc25d_error.DesignError("ERR291: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(fig_ids)))
     return(r_list)
 
+  def set_export_workers(self, workers=1):
+    """ set the number of processes that prepare the 2D-figures written in files
+        1 (the default) writes the figures serially, 0 uses one process per CPU
+    """
+    if(workers<0):
+      raise cnc25d_error.DesignError("ERR787: Error, the number of export workers {:d} must be positive".format(workers))
+    self.export_workers = workers
+
+  def set_gcode_parameters(self, parameters={}):
+    """ set the machining parameters of the G-code files (feed_rate, plunge_rate, depth_step, safe_z, spindle_speed, cutter_compensation, tool_number, tool_radius)
+        they update the defaults of outline_backends.set_gcode_parameters()
+    """
+    outline_backends.gcode_merge_parameters(parameters) # check the parameters
+    self.gcode_parameters = dict(parameters)
+
+  def get_gcode_parameters(self):
+    """ return the machining parameters of the G-code files
+        if tool_radius is not set, the constraint cnc_router_bit_radius of the design is used
+    """
+    parameters = {}
+    if(self.constraint.get('cnc_router_bit_radius', 0)>0):
+      parameters['tool_radius'] = self.constraint['cnc_router_bit_radius']
+    parameters.update(self.gcode_parameters)
+    r_parameters = outline_backends.gcode_merge_parameters(parameters)
+    return(r_parameters)
+
+  def get_output_settings(self):
+    """ return the output settings set after the construction of the design, including the ones of the cnc25d modules
+        run_batch() gives them to its worker processes with set_output_settings()
+    """
+    r_settings = {
+      'simplify_tolerance' : self.simplify_tolerance,
+      'export_workers' : self.export_workers,
+      'gcode_parameters' : self.gcode_parameters.copy(),
+      'constraint_rule_verification' : self.constraint_rule_verification,
+      'svg_writer' : outline_backends.svg_writer,
+      'dxf_writer' : outline_backends.dxf_writer,
+      'polyline_tolerance' : outline_backends.polyline_tolerance,
+      'gcode_default_parameters' : outline_backends.gcode_parameters.copy(),
+      'outline_strict_check' : cnc_outline.outline_strict_check}
+    return(r_settings)
+
+  def set_output_settings(self, settings):
+    """ apply the output settings returned by get_output_settings()
+    """
+    self.set_simplify_tolerance(settings['simplify_tolerance'])
+    self.set_export_workers(settings['export_workers'])
+    self.set_gcode_parameters(settings['gcode_parameters'])
+    self.set_constraint_rule_verification(settings['constraint_rule_verification'])
+    outline_backends.set_svg_writer(settings['svg_writer'])
+    outline_backends.set_dxf_writer(settings['dxf_writer'])
+    outline_backends.set_polyline_tolerance(settings['polyline_tolerance'])
+    outline_backends.set_gcode_parameters(settings['gcode_default_parameters'])
+    cnc_outline.set_outline_strict_check(settings['outline_strict_check'])
+
+  def write_figure_files(self, output_file_basename, suffix, figs):
+    """ internal method that writes the 2D-figures figs in the files <output_file_basename>_<figure_id>.<suffix>
+        with more than one export worker, the figures are written by write_figure_files_pipelined()
+    """
+    txt_info = self.get_info()
+    workers = self.export_workers
+    if(workers==0):
+      workers = multiprocessing.cpu_count()
+    workers = min(workers, len(figs))
+    if(workers>1):
+      self.write_figure_files_pipelined(output_file_basename, suffix, figs, workers, txt_info)
+    else:
+      for f in figs:
+        design_output.generate_output_file(self.apply_simplify(f), "{:s}_{:s}.{:s}".format(output_file_basename, f, suffix), self.produce_2d_figure(f)[1], txt_info, self.get_gcode_parameters())
+
+  def write_figure_files_pipelined(self, output_file_basename, suffix, figs, workers, txt_info):
+    """ internal method that writes the 2D-figures figs with a pipeline:
+        a pool of workers processes computes the cnc_cut and the simplification and renders the svg, dxf and ngc files in memory,
+        a writer thread drains a bounded queue of rendered files to the disk, so the computation and the file writing overlap.
+        The brep and stl files are written by the current process because FreeCAD objects can't be sent between processes.
+        The files are identical to the ones of the serial export
+    """
+    # the svg and dxf files are rendered by the workers only with the native writers, the ngc files always
+    file_description = {'svg':'with the native writer the SVG', 'dxf':'with the native writer the DXF', 'ngc':'the G-code'}
+    render = ''
+    if((suffix=='svg')and(outline_backends.svg_writer=='native')):
+      render = 'svg'
+    elif((suffix=='dxf')and(outline_backends.dxf_writer=='native')):
+      render = 'dxf'
+    elif(suffix=='ngc'):
+      render = 'ngc'
+    # the figures already computed are taken from the caches
+    if(self.B_figure_cache_key!=self.constraint_key): # the constraint has changed
+      self.B_figures = {}
+      self.B_figure_cache_key = self.constraint_key
+    s_figure_cache_key = (self.constraint_key, self.simplify_tolerance)
+    if(self.S_figure_cache_key!=s_figure_cache_key):
+      self.S_figures = {}
+      self.S_figure_cache_key = s_figure_cache_key
+    gcode_parameters = self.get_gcode_parameters()
+    export_jobs = []
+    figure_heights = {}
+    for f in figs:
+      (a_figure, figure_heights[f]) = self.produce_2d_figure(f)
+      b_figure = None
+      if(f in self.B_figures):
+        self.cache_stat['cnc_cut_hit'] += 1
+        b_figure = self.B_figures[f]
+      else:
+        self.cache_stat['cnc_cut_miss'] += 1
+      s_figure = self.S_figures.get(f, None)
+      export_jobs.append((f, a_figure, b_figure, s_figure, self.simplify_tolerance, render, figure_heights[f], gcode_parameters))
+    design_help.mkdir_p(os.path.dirname(output_file_basename))
+    print("write_figure_files: {:s} writes {:d} {:s} files with {:d} workers".format(self.design_name, len(figs), suffix, workers))
+    # writer thread
+    file_queue = Queue.Queue(maxsize=2*workers)
+    writer_errors = []
+    file_writer = threading.Thread(target=export_file_writer, args=(file_queue, writer_errors))
+    file_writer.start()
+    worker_pool = multiprocessing.Pool(processes=workers)
+    try:
+      for (f, b_figure, s_figure, file_content) in worker_pool.imap(export_figure_job, export_jobs, chunksize=1):
+        self.B_figures[f] = b_figure
+        if(self.simplify_tolerance>0):
+          self.S_figures[f] = s_figure
+        output_filename = "{:s}_{:s}.{:s}".format(output_file_basename, f, suffix)
+        if(file_content is not None):
+          file_queue.put((output_filename, file_description[render], file_content)) # blocks when the writer thread is late
+        else:
+          design_output.generate_output_file(s_figure, output_filename, figure_heights[f], txt_info, gcode_parameters)
+        if(len(writer_errors)>0):
+          break
+    finally:
+      file_queue.put(None) # end of the writer thread
+      file_writer.join()
+      worker_pool.terminate()
+      worker_pool.join()
+    if(len(writer_errors)>0):
+      raise writer_errors[0]
+
   def write_figure_svg(self, output_file_basename):
     """ write all 2d-figures in svg files
         output_file_basename contains the directory path and the file-basename
     """
-    txt_info = self.get_info()
-    figs = self.get_write_2d_figure_list()
-    for f in figs:
-      design_output.generate_output_file(design_output.cnc_cut_figure(self.A_figures[f], "generate_svg_{:s}".format(f)), "{:s}_{:s}.svg".format(output_file_basename, f), self.figure_heights[f], txt_info)
+    self.write_figure_files(output_file_basename, 'svg', self.get_write_2d_figure_list())
 
   def write_figure_dxf(self, output_file_basename):
     """ write all 2d-figures in dxf files
         output_file_basename contains the directory path and the file-basename
     """
-    txt_info = self.get_info()
-    figs = self.get_write_2d_figure_list()
-    for f in figs:
-      design_output.generate_output_file(design_output.cnc_cut_figure(self.A_figures[f], "generate_dxf_{:s}".format(f)), "{:s}_{:s}.dxf".format(output_file_basename, f), self.figure_heights[f], txt_info)
+    self.write_figure_files(output_file_basename, 'dxf', self.get_write_2d_figure_list())
+
+  def write_figure_ngc(self, output_file_basename):
+    """ write all extrudable 2d-figures in G-code files. The cut depth is the height of the figure
+        output_file_basename contains the directory path and the file-basename
+    """
+    self.write_figure_files(output_file_basename, 'ngc', self.get_write_3d_figure_list())
 
   def get_write_3d_figure_list(self):
     """ generate the list of 2d_figures to be written according to self.write_3d_figure_list
@@ -471,25 +975,21 @@ class bare_design:
     figs = self.write_3d_figure_list
     r_list = []
     if(figs != None):
-      self.apply_2d_constructor() # create the A-figures
+      fig_ids = self.get_2d_figure_id_list()
       if(len(figs)==0):
-        r_list = self.A_figures.keys()
+        r_list = fig_ids
       else:
         r_list = figs
       for f in r_list:
-        if(not f in self.A_figures.keys()):
-          print("ERR380: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(self.A_figures.keys())))
-          sys.exit(2)
+        if(not f in fig_ids):
+          raise cnc25d_error.DesignError("ERR380: Error, f {:s} is not an existing 2d-figures {:s}".format(f, ' '.join(fig_ids)))
     return(r_list)
 
   def write_figure_brep(self, output_file_basename, suffix='brep'):
     """ write all 2d-figures in brep files
         output_file_basename contains the directory path and the file-basename
     """
-    txt_info = self.get_info()
-    figs = self.get_write_3d_figure_list()
-    for f in figs:
-      design_output.generate_output_file(design_output.cnc_cut_figure(self.A_figures[f], "generate_brep_{:s}".format(f)), "{:s}_{:s}.{:s}".format(output_file_basename, f, suffix), self.figure_heights[f], txt_info)
+    self.write_figure_files(output_file_basename, suffix, self.get_write_3d_figure_list())
 
   def get_write_3d_conf_list(self):
     """ generate the list of 3d-assembly-configurations to be written according to self.write_3d_conf_list
@@ -504,8 +1004,7 @@ class bare_design:
         r_list = confs
       for f in r_list:
         if(not f in self.assembly_configurations.keys()):
-          print("ERR406: Error, f {:s} is not an existing 3d-assembly-configurations {:s}".format(f, ' '.join(self.assembly_configurations.keys())))
-          sys.exit(2)
+          raise cnc25d_error.DesignError("ERR406: Error, f {:s} is not an existing 3d-assembly-configurations {:s}".format(f, ' '.join(self.assembly_configurations.keys())))
     return(r_list)
 
   def write_assembly_brep(self, output_file_basename, ai_brep=True, ai_stl=False):
@@ -532,8 +1031,7 @@ class bare_design:
         r_list = l
       for f in r_list:
         if(not f in self.freecad_function_pts.keys()):
-          print("ERR460: Error, f {:s} is not an existing 3d-freecad_function_pts {:s}".format(f, ' '.join(self.freecad_function_pts.keys())))
-          sys.exit(2)
+          raise cnc25d_error.DesignError("ERR460: Error, f {:s} is not an existing 3d-freecad_function_pts {:s}".format(f, ' '.join(self.freecad_function_pts.keys())))
     return(r_list)
 
   def write_freecad_brep(self, output_file_basename, ai_brep=True, ai_stl=False):
@@ -549,13 +1047,11 @@ class bare_design:
     """ run the simulation sim_id
     """
     if(len(self.simulation_2d_pts)==0):
-      print("ERR268: Error, no simulation function is provided. Can't run 2d-simulate {:s}".format(sim_id))
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR268: Error, no simulation function is provided. Can't run 2d-simulate {:s}".format(sim_id))
     if(sim_id==''):
       sim_id = self.simulation_2d_pts.keys()[0]
     if(not sim_id in self.simulation_2d_pts.keys()):
-      print("ERR382: Error, the simulation id {:s} does not exist in the list {:s}".format(sim_id, ' '.join(self.simulation_2d_pts.keys())))
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR382: Error, the simulation id {:s} does not exist in the list {:s}".format(sim_id, ' '.join(self.simulation_2d_pts.keys())))
     print("SIMULATION: {:s} runs simulation: {:s}".format(self.design_name, sim_id))
     #self.simulation_2d_pts[sim_id](self.constraint) # writing correct but too compact for my eyes ;)
     f_simulation = self.simulation_2d_pts[sim_id]
@@ -632,12 +1128,51 @@ class bare_design:
     for i in range(len(self.self_tests)):
       test_ids.append(self.self_tests[i][0])
     print("design_self-test_list: {:s}".format(', '.join(test_ids)))
+    # cache statistics
+    cs = self.cache_stat
+    print("{:s} 2D-figure cache: {:d} hits, {:d} misses".format(self.design_name, cs['2d_hit'], cs['2d_miss']))
+    if(self.figure_producers!=None):
+      print("{:s} per-figure cache: {:d} hits, {:d} misses".format(self.design_name, cs['lazy_hit'], cs['lazy_miss']))
+    print("{:s} cnc_cut cache: {:d} hits, {:d} misses".format(self.design_name, cs['cnc_cut_hit'], cs['cnc_cut_miss']))
+    print("{:s} disk cache: {:d} hits, {:d} misses".format(self.design_name, cs['disk_hit'], cs['disk_miss']))
+    if(self.constraint_rules!=None):
+      print("{:s} constraint rules: {:d} executed, {:d} skipped".format(self.design_name, cs['rule_run'], cs['rule_skip']))
     # return (not yet used)
     return(fig_ids)
 
+  def write_output_files(self, output_file_basename_with_suffix):
+    """ write the info text file and the figures in the format selected by the suffix (.svg, .dxf, .ngc, .brep or .stl)
+    """
+    if(re.search('\.svg$', output_file_basename_with_suffix)):
+      output_file_basename = re.sub('\.svg$', '', output_file_basename_with_suffix)
+      self.write_info_txt(output_file_basename) # write info in test file
+      self.write_figure_svg(output_file_basename)
+    elif(re.search('\.dxf$', output_file_basename_with_suffix)):
+      output_file_basename = re.sub('\.dxf$', '', output_file_basename_with_suffix)
+      self.write_info_txt(output_file_basename) # write info in test file
+      self.write_figure_dxf(output_file_basename)
+    elif(re.search('\.ngc$', output_file_basename_with_suffix)):
+      output_file_basename = re.sub('\.ngc$', '', output_file_basename_with_suffix)
+      self.write_info_txt(output_file_basename) # write info in test file
+      self.write_figure_ngc(output_file_basename)
+    elif(re.search('\.brep$', output_file_basename_with_suffix)):
+      output_file_basename = re.sub('\.brep$', '', output_file_basename_with_suffix)
+      self.write_info_txt(output_file_basename) # write info in test file
+      self.write_figure_brep(output_file_basename)
+      self.write_assembly_brep(output_file_basename)
+      self.write_freecad_brep(output_file_basename)
+    elif(re.search('\.stl$', output_file_basename_with_suffix)):
+      output_file_basename = re.sub('\.stl$', '', output_file_basename_with_suffix)
+      self.write_info_txt(output_file_basename) # write info in test file
+      self.write_figure_brep(output_file_basename, suffix='stl')
+      self.write_assembly_brep(output_file_basename, ai_brep=False, ai_stl=True)
+      self.write_freecad_brep(output_file_basename, ai_brep=False, ai_stl=True)
+    else:
+      raise cnc25d_error.DesignError("ERR698: Error, no output format extension provided! Try suffix: .dxf, .svg, .ngc, .brep or .stl")
+
   def apply_cli_with_output_options(self, cli_str=""):
     """ check the argument-output-options and then call apply_cli()
-        The argument-output-options are: output_file_basename, simulate_2d, display_2d_figures, return_type
+        The argument-output-options are: output_file_basename, simulate_2d, display_2d_figures, return_type, simplify_tolerance, export_workers and the gcode_* machining parameters
     """
     # default simulation ID
     default_sim_id = None
@@ -649,7 +1184,7 @@ class bare_design:
     effective_args_in_txt = "{:s} cli_with_output_file_basename string: ".format(self.design_name) + ' '.join(effective_args)
     cwoo_parser = argparse.ArgumentParser(description='Command Line Interface of {:s} with output_file_basename'.format(self.design_name))
     cwoo_parser.add_argument('--output_file_basename','--ofb', action='store', default='', dest='sw_output_file_basename',
-      help="Outputs files depending on your argument file_extension: .dxf uses mozman dxfwrite, .svg uses mozman svgwrite, .brep or .stl uses FreeCAD")
+      help="Outputs files depending on your argument file_extension: .dxf and .svg use the native writers (or mozman dxfwrite and svgwrite), .brep or .stl uses FreeCAD")
     cwoo_parser.add_argument('--simulate_2d','--s2d', action='store', nargs='?', const=default_sim_id, default='', dest='sw_simulate_2d',
       help="Run a 2D-simualtion in a Tk-window")
     cwoo_parser.add_argument('--display_2d_figures','--d2f', action='store_true', default=False, dest='sw_display_2d_figures',
@@ -658,6 +1193,21 @@ class bare_design:
       help="Select the object to be returned by the method cli. Depreciated! Use rather the appropriate methods")
     cwoo_parser.add_argument('--view_design_configuration','--vdc', action='store_true', default=False, dest='sw_view_design_configuration',
       help="View the design configuration (2D-figures, 2D-simulations, assembly_3dconfs, displayed_figures ...)")
+    cwoo_parser.add_argument('--simplify_tolerance','--st', action='store', type=float, default=0.0, dest='sw_simplify_tolerance',
+      help="Merge the colinear lines and the co-circular arcs and replace the nearly flat arcs by lines in the written 2D-figures. The outlines move less than this tolerance. Default: 0.0 (no simplification)")
+    cwoo_parser.add_argument('--export_workers','--ew', action='store', type=int, default=1, dest='sw_export_workers',
+      help="Number of processes preparing the written 2D-figures while a thread writes the files. 0 uses one process per CPU. Default: 1 (serial export)")
+    for (gcode_parameter, short_switch, value_type, parameter_help) in (
+      ('feed_rate', '--gfr', float, "horizontal cut speed in mm/min"),
+      ('plunge_rate', '--gpr', float, "vertical cut speed in mm/min"),
+      ('depth_step', '--gds', float, "maximal depth of a pass in mm"),
+      ('safe_z', '--gsz', float, "height of the rapid moves above the material in mm"),
+      ('spindle_speed', '--gss', float, "spindle speed in rpm, 0 doesn't start the spindle"),
+      ('cutter_compensation', '--gcc', int, "1 cuts the closed outlines with G41/G42, 0 lets the tool center follow the outlines"),
+      ('tool_number', '--gtn', int, "D word of G41/G42, the tool radius is read in the tool table of the controller"),
+      ('tool_radius', '--gtr', float, "tool radius used for the lead-in and lead-out moves. If not set, the constraint cnc_router_bit_radius when the design has it")):
+      cwoo_parser.add_argument('--gcode_{:s}'.format(gcode_parameter), short_switch, action='store', type=value_type, default=None, dest='sw_gcode_{:s}'.format(gcode_parameter),
+        help="G-code {:s} of the .ngc files. Default: {:s}".format(parameter_help, str(outline_backends.gcode_parameters[gcode_parameter])))
     #print("dbg363: effective_args:", effective_args)
     if(('-h' in effective_args)or('--help' in effective_args)):
       cwoo_parser.print_help()
@@ -669,34 +1219,18 @@ class bare_design:
     self.apply_cli(' '.join(remaining_args))
     self.cli_str = effective_args_in_txt # must be set after apply_constraint()
     # generate output files
+    self.set_simplify_tolerance(oo_args.sw_simplify_tolerance)
+    self.set_export_workers(oo_args.sw_export_workers)
+    gcode_parameters = {}
+    for gcode_parameter in ('feed_rate', 'plunge_rate', 'depth_step', 'safe_z', 'spindle_speed', 'cutter_compensation', 'tool_number', 'tool_radius'):
+      if(getattr(oo_args, 'sw_gcode_{:s}'.format(gcode_parameter))!=None):
+        gcode_parameters[gcode_parameter] = getattr(oo_args, 'sw_gcode_{:s}'.format(gcode_parameter))
+    self.set_gcode_parameters(gcode_parameters)
     if(oo_args.sw_output_file_basename!=''):
-      if(re.search('\.svg$', oo_args.sw_output_file_basename)):
-        output_file_basename = re.sub('\.svg$', '', oo_args.sw_output_file_basename)
-        self.write_info_txt(output_file_basename) # write info in test file
-        self.write_figure_svg(output_file_basename)
-      elif(re.search('\.dxf$', oo_args.sw_output_file_basename)):
-        output_file_basename = re.sub('\.dxf$', '', oo_args.sw_output_file_basename)
-        self.write_info_txt(output_file_basename) # write info in test file
-        self.write_figure_dxf(output_file_basename)
-      elif(re.search('\.brep$', oo_args.sw_output_file_basename)):
-        output_file_basename = re.sub('\.brep$', '', oo_args.sw_output_file_basename)
-        self.write_info_txt(output_file_basename) # write info in test file
-        self.write_figure_brep(output_file_basename)
-        self.write_assembly_brep(output_file_basename)
-        self.write_freecad_brep(output_file_basename)
-      elif(re.search('\.stl$', oo_args.sw_output_file_basename)):
-        output_file_basename = re.sub('\.stl$', '', oo_args.sw_output_file_basename)
-        self.write_info_txt(output_file_basename) # write info in test file
-        self.write_figure_brep(output_file_basename, suffix='stl')
-        self.write_assembly_brep(output_file_basename, ai_brep=False, ai_stl=True)
-        self.write_freecad_brep(output_file_basename, ai_brep=False, ai_stl=True)
-      else:
-        print("ERR698: Error, no output format extension provided! Try suffix: .dxf, .svg, .brep or .stl")
-        sys.exit(2)
+      self.write_output_files(oo_args.sw_output_file_basename)
     # run simulation
     if(oo_args.sw_simulate_2d==None):
-      print("ERR510: no simualtion has been set")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR510: no simualtion has been set")
     elif(oo_args.sw_simulate_2d!=''):
       #print("dbg482: oo_args.sw_simulate_2d:", oo_args.sw_simulate_2d)
       self.run_simulation(oo_args.sw_simulate_2d)
@@ -717,18 +1251,55 @@ class bare_design:
     r_cli = 1
     if(oo_args.sw_return_type!=''):
       if(self.f_return_type==None):
-        print("ERR277: Error, no return_type function is provided. Can't apply return_type {:s}".format(oo_args.sw_return_type))
-        sys.exit(2)
+        raise cnc25d_error.DesignError("ERR277: Error, no return_type function is provided. Can't apply return_type {:s}".format(oo_args.sw_return_type))
       r_cli = self.f_return_type(oo_args.sw_return_type, self.constraint)
+    self.save_disk_cache()
     return(r_cli)
 
+  def run_batch(self, job_list, output_dir, output_format='svg', workers=None):
+    """ generate the output files for each constraint of job_list using a pool of workers processes
+        job_list contains constraint dictionaries or cli strings. A job starts from the default constraint.
+        The files of the job number i are written in output_dir with the basename <design_name>_b<i>
+        If workers is None, one worker per CPU is used. If workers is 1, the jobs run in the current process.
+        A failing job doesn't stop the batch. The returned list contains one summary dictionary per job.
+        The jobs use the output settings of this design (see get_output_settings())
+    """
+    job_nb = len(job_list)
+    if(not output_format in ('svg', 'dxf', 'ngc', 'brep', 'stl')):
+      raise cnc25d_error.DesignError("ERR809: Error, output_format {:s} is not supported! Try: svg, dxf, ngc, brep or stl".format(output_format))
+    if(workers==None):
+      workers = multiprocessing.cpu_count()
+    workers = max(1, min(workers, job_nb))
+    design_help.mkdir_p(output_dir)
+    id_width = max(4, len(str(job_nb)))
+    settings = self.get_output_settings()
+    if(workers>1): # the daemonic processes of a multiprocessing.Pool can't start the export workers
+      settings['export_workers'] = 1
+    batch_jobs = []
+    for i in range(job_nb):
+      output_file_basename = os.path.join(output_dir, "{:s}_b{:0{:d}d}".format(self.design_name, i, id_width))
+      batch_jobs.append((self.__class__, i, job_list[i], output_file_basename, output_format, self.disk_cache_dir, self.disk_cache_size, settings))
+    print("run_batch: {:s} runs {:d} jobs with {:d} workers".format(self.design_name, job_nb, workers))
+    batch_start = time.time()
+    if(workers==1):
+      r_summary = [ run_batch_job(j) for j in batch_jobs ]
+    else:
+      worker_pool = multiprocessing.Pool(processes=workers)
+      try:
+        r_summary = worker_pool.map_async(run_batch_job, batch_jobs, chunksize=1).get(2**31) # a timeout keeps KeyboardInterrupt working
+      finally:
+        worker_pool.terminate()
+        worker_pool.join()
+    failed_jobs = [ j['job'] for j in r_summary if j['status']!='ok' ]
+    print("run_batch: {:s} {:d} jobs succeeded, {:d} jobs failed {:s} in {:0.2f} s".format(self.design_name, job_nb-len(failed_jobs), len(failed_jobs), str(failed_jobs), time.time()-batch_start))
+    return(r_summary)
+
   def run_self_test(self, test_id=''):
     """ run the design-self-test test_id.
         If test_id=='', all design-self-test are executed
     """
     if(self.self_tests==[]):
-      print("ERR322: Error, the self_tests list has not been set!")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR322: Error, the self_tests list has not been set!")
     test_ids = []
     for i in range(len(self.self_tests)):
       test_ids.append(self.self_tests[i][0])
@@ -737,8 +1308,7 @@ class bare_design:
       test_list.extend(test_ids)
     else:
       if(not test_id in test_ids):
-        print("ERR541: Error, test_id {:s} is not in the test-list {:s}".format(test_id, ', '.join(test_ids)))
-        sys.exit(2)
+        raise cnc25d_error.DesignError("ERR541: Error, test_id {:s} is not in the test-list {:s}".format(test_id, ', '.join(test_ids)))
       test_list.append(test_id)
     print("\nInfo: test_list: {:s}\n".format(', '.join(test_list)))
     for i in range(len(test_list)):
@@ -747,8 +1317,7 @@ class bare_design:
         if(test_ids[j]==test_list[i]):
           tn=j
       if(tn==-1):
-        print("ERR562: the test {:s} has not been found".format(test_list[i]))
-        sys.exit(2)
+        raise cnc25d_error.DesignError("ERR562: the test {:s} has not been found".format(test_list[i]))
       else:
         print("{:2d} test case: '{:s}'\nwith switch: {:s}".format(tn+1, self.self_tests[tn][0], self.self_tests[tn][1]))
         self.apply_constraint_default_value()
@@ -759,8 +1328,7 @@ class bare_design:
     """ write a file containing the complete list of parameters and their default values
     """
     if(self.parser==None):
-      print("ERR331: Error, parser has not been set!")
-      sys.exit(2)
+      raise cnc25d_error.DesignError("ERR331: Error, parser has not been set!")
     constraint_dict = vars(self.parser.parse_args([]))
     py_txt = ""
     for (k,v) in constraint_dict.iteritems():
@@ -783,6 +1351,10 @@ class bare_design:
       help="run the design self-test used usually as non-regression-test")
     aio_parser.add_argument('--dump_constraint_file', '--dcf', action='store', default='', dest='sw_dump_constraint_file',
       help="write a python file containing the list of the design constraint. The file can be used as design constraint example")
+    aio_parser.add_argument('--disk_cache_dir', '--dcd', action='store', default=os.environ.get('CNC25D_DISK_CACHE_DIR', ''), dest='sw_disk_cache_dir',
+      help="reuse and store the design results in this directory. Default: the environment variable CNC25D_DISK_CACHE_DIR or no disk cache")
+    aio_parser.add_argument('--disk_cache_size', '--dcs', action='store', type=float, default=float(os.environ.get('CNC25D_DISK_CACHE_SIZE', design_cache.default_disk_cache_size)), dest='sw_disk_cache_size',
+      help="size budget of the disk cache in MB. The least recently used entries are removed. Default: the environment variable CNC25D_DISK_CACHE_SIZE or {:d}".format(design_cache.default_disk_cache_size))
     if(('-h' in effective_args)or('--help' in effective_args)):
       aio_parser.print_help()
       (aio_args, remaining_args) = aio_parser.parse_known_args([])
@@ -790,17 +1362,113 @@ class bare_design:
     else:
       (aio_args, remaining_args) = aio_parser.parse_known_args(effective_args)
     print("dbg111: start a design")
+    if(aio_args.sw_disk_cache_dir!=''):
+      self.set_disk_cache(aio_args.sw_disk_cache_dir, aio_args.sw_disk_cache_size)
     r_cli = 1
-    if(aio_args.sw_run_self_test!=None):
-      #print("dbg596: aio_args.sw_run_self_test:", aio_args.sw_run_self_test)
-      self.run_self_test(aio_args.sw_run_self_test)
-    elif(aio_args.sw_dump_constraint_file!=''):
-      self.dump_constraint_file(aio_args.sw_dump_constraint_file)
-    else:
-      r_cli = self.apply_cli_with_output_options(' '.join(remaining_args))
+    try:
+      if(aio_args.sw_run_self_test!=None):
+        #print("dbg596: aio_args.sw_run_self_test:", aio_args.sw_run_self_test)
+        self.run_self_test(aio_args.sw_run_self_test)
+      elif(aio_args.sw_dump_constraint_file!=''):
+        self.dump_constraint_file(aio_args.sw_dump_constraint_file)
+      else:
+        r_cli = self.apply_cli_with_output_options(' '.join(remaining_args))
+    except cnc25d_error.Cnc25dError as exc: # the command line interface exits with the status 2 as before
+      cnc25d_error.print_error(exc)
+      sys.exit(2)
     print("dbg999: end of design")
     return(r_cli)
   
+################################################################
+# batch worker
+################################################################
+
+batch_design_instances = {} # the design instances are reused by the following jobs of a worker process
+
+def run_batch_job(ai_job):
+  """ execute one job of bare_design.run_batch() and return its summary
+      this function must be at the module level to be used by a multiprocessing.Pool
+  """
+  (design_class, job_id, job_constraint, output_file_basename, output_format, disk_cache_dir, disk_cache_size, settings) = ai_job
+  r_summary = {'job':job_id, 'output_file_basename':output_file_basename, 'status':'ok', 'error':'', 'wall_time':0.0, 'files':[]}
+  job_start = time.time()
+  try:
+    if(not design_class in batch_design_instances):
+      batch_design_instances[design_class] = design_class()
+    my_design = batch_design_instances[design_class]
+    my_design.set_disk_cache(disk_cache_dir, disk_cache_size)
+    my_design.set_output_settings(settings)
+    my_design.apply_constraint_default_value()
+    if(isinstance(job_constraint, dict)):
+      my_design.apply_constraint(job_constraint)
+    else:
+      my_design.apply_cli(job_constraint)
+    my_design.write_output_files("{:s}.{:s}".format(output_file_basename, output_format))
+    my_design.save_disk_cache()
+  except cnc25d_error.Cnc25dError as exc:
+    cnc25d_error.print_error(exc)
+    r_summary['status'] = 'error'
+    r_summary['error'] = exc.error_msg
+  except SystemExit as exc: # the error has already been printed by the failing function
+    r_summary['status'] = 'error'
+    r_summary['error'] = "exit with code {:s}".format(str(exc.code))
+  except Exception as exc:
+    r_summary['status'] = 'error'
+    r_summary['error'] = traceback.format_exc()
+  if(r_summary['status']!='ok'): # a partial output might remain but the next job restarts from a clean design
+    batch_design_instances.pop(design_class, None)
+  r_summary['wall_time'] = time.time()-job_start
+  r_summary['files'] = sorted(glob.glob("{:s}_*".format(output_file_basename)))
+  return(r_summary)
+
+################################################################
+# pipelined export
+################################################################
+
+def export_figure_job(ai_job):
+  """ prepare one 2D-figure for bare_design.write_figure_files_pipelined(): cnc_cut, simplification and, if requested, rendering of the svg, dxf or ngc file
+      this function must be at the module level to be used by a multiprocessing.Pool
+  """
+  (figure_id, a_figure, b_figure, s_figure, simplify_tolerance, render, figure_height, gcode_parameters) = ai_job
+  if(b_figure is None):
+    b_figure = design_output.cnc_cut_figure(a_figure, "cnc_cut_{:s}".format(figure_id))
+  if(s_figure is None):
+    if(simplify_tolerance<=0):
+      s_figure = b_figure
+    else:
+      (s_figure, segment_nb_before, segment_nb_after) = design_output.simplify_figure(b_figure, simplify_tolerance, "simplify_{:s}".format(figure_id))
+      print("Simplify the figure {:s} with the tolerance {:0.3f}: {:d} segments -> {:d} segments".format(figure_id, simplify_tolerance, segment_nb_before, segment_nb_after))
+  file_content = None
+  if(render!=''):
+    file_buffer = cStringIO.StringIO()
+    if(render=='svg'):
+      outline_backends.write_figure_in_svg_stream(s_figure, file_buffer)
+    elif(render=='dxf'):
+      outline_backends.write_figure_in_dxf_stream(s_figure, file_buffer)
+    else:
+      outline_backends.write_figure_in_gcode_stream(s_figure, file_buffer, figure_height, gcode_parameters)
+    file_content = file_buffer.getvalue()
+  r_job = (figure_id, b_figure, s_figure, file_content)
+  return(r_job)
+
+def export_file_writer(ai_file_queue, ai_errors):
+  """ writer thread of bare_design.write_figure_files_pipelined(): write the rendered files until it gets None
+      the first error is appended to ai_errors and the following files are dropped
+  """
+  while True:
+    queue_item = ai_file_queue.get()
+    if(queue_item is None):
+      break
+    if(len(ai_errors)>0):
+      continue
+    (output_filename, file_type, file_content) = queue_item # file_type is a description for the log
+    try:
+      print("Generate {:s} file {:s}".format(file_type, output_filename))
+      with open(output_filename, 'w') as ofh:
+        ofh.write(file_content)
+    except Exception as exc:
+      ai_errors.append(exc)
+
 ################################################################
 # Tests of the bare_design class
 ################################################################
@@ -165,6 +165,13 @@ def bba_constraint_check(c):
 # bell_bagel_assembly 2D-figures construction
 ################################################################
 
+# the figures are listed in the order of the previous releases
+bba_figure_order = (
+  'bell_face', 'internal_bagel', 'bagel_assembly', 'external_buttress_assembly', 'z_rod', 'part_list',
+  'bell_bagel_assembly', 'bell_external_face_buttress', 'y_rod', 'bell_external_side_buttress',
+  'internal_buttress_assembly', 'bell_side', 'external_bagel', 'internal_bagel_2', 'middle_bagel',
+  'bell_internal_buttress', 'bell_part_overview', 'bell_base', 'x_rod')
+
 def bba_2d_construction(c):
   """ construct the 2D-figures with outlines at the A-format for the bell_bagel_assembly design
   """
@@ -206,7 +213,7 @@ def bba_2d_construction(c):
   r_figures['bell_bagel_assembly'] = bell_bagel_assembly_figure
   r_height['bell_bagel_assembly'] = 1.0
   ###
-  return((r_figures, r_height))
+  return(cnc25d_api.order_figures(r_figures, r_height, bba_figure_order))
 
 ################################################################
 # bell_bagel_assembly 3D assembly-configuration construction
@@ -297,6 +304,15 @@ def bba_self_test():
     ["last test"            , "--bagel_axle_internal_diameter 25.0 --bagel_axle_external_diameter 40.0 --axle_hole_position_diameter 35.0 --axle_internal_diameter 28.0 --axle_external_diameter 42.0"]]
   return(r_tests)
 
+def bba_figure_order_test():
+  """ check that get_2d_figure_id_list() returns the figures in the order of the previous releases
+  """
+  figure_ids = bba().get_2d_figure_id_list()
+  r_test = (figure_ids==list(bba_figure_order))
+  if(not r_test):
+    print("ERR140: Error, the bell_bagel_assembly figure order {:s} differs from {:s}".format(str(figure_ids), str(bba_figure_order)))
+  return(r_test)
+
 ################################################################
 # bell_bagel_assembly declaration
 ################################################################
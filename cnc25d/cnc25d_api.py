@@ -31,14 +31,18 @@ to be used by the design examples or external scripts
 
 import importing_freecad
 import cnc_outline
+import array_outline
+import segment_index
 import outline_backends
 import positioning
 import export_2d
 import design_output
 import design_help
+import design_cache
 import bare_design
 import design_frontend
 import draw_2d_frontend
+import cnc25d_error
 
 ################################################################
 # api function alias
@@ -58,14 +62,34 @@ cnc_cut_outline = cnc_outline.cnc_cut_outline
 smooth_outline_c_curve = cnc_outline.smooth_outline_c_curve
 smooth_outline_b_curve = cnc_outline.smooth_outline_b_curve
 ideal_outline = cnc_outline.ideal_outline
+simplify_outline = cnc_outline.simplify_outline
+Transform2D = cnc_outline.Transform2D
+Valid_Outline = cnc_outline.Valid_Outline
+set_outline_strict_check = cnc_outline.set_outline_strict_check
+
+# from array_outline
+Array_Outline = array_outline.Array_Outline
+
+# from segment_index
+Segment_Index = segment_index.Segment_Index
 
 # from outline_backends
 outline_arc_line = outline_backends.outline_arc_line
+outline_to_polyline = outline_backends.outline_to_polyline
+set_polyline_tolerance = outline_backends.set_polyline_tolerance
 #outline_circle = outline_backends.outline_circle # included now in outline_arc_line()
 Two_Canvas =  outline_backends.Two_Canvas
 figure_simple_display = outline_backends.figure_simple_display
 write_figure_in_svg = outline_backends.write_figure_in_svg
+write_figure_in_svg_stream = outline_backends.write_figure_in_svg_stream
+set_svg_writer = outline_backends.set_svg_writer
 write_figure_in_dxf = outline_backends.write_figure_in_dxf
+write_figure_in_dxf_stream = outline_backends.write_figure_in_dxf_stream
+write_figures_in_dxf = outline_backends.write_figures_in_dxf
+set_dxf_writer = outline_backends.set_dxf_writer
+write_figure_in_gcode = outline_backends.write_figure_in_gcode
+write_figure_in_gcode_stream = outline_backends.write_figure_in_gcode_stream
+set_gcode_parameters = outline_backends.set_gcode_parameters
 figure_to_freecad_25d_part =  outline_backends.figure_to_freecad_25d_part
 
 # from positioning
@@ -80,6 +104,15 @@ export_xyz_to_dxf = export_2d.export_xyz_to_dxf
 mkdir_p = design_help.mkdir_p
 interpretor_is_freecad = design_help.interpretor_is_freecad
 get_effective_args = design_help.get_effective_args
+canonical_repr = design_help.canonical_repr
+constraint_hash = design_help.constraint_hash
+order_figures = design_help.order_figures
+
+# from design_cache
+disk_cache_key = design_cache.disk_cache_key
+disk_cache_read = design_cache.disk_cache_read
+disk_cache_write = design_cache.disk_cache_write
+disk_cache_evict = design_cache.disk_cache_evict
 
 # from design_output
 generate_output_file_add_argument = design_output.generate_output_file_add_argument
@@ -91,6 +124,10 @@ rotate_and_translate_figure = design_output.rotate_and_translate_figure
 flip_rotate_and_translate_figure = design_output.flip_rotate_and_translate_figure
 cnc_cut_figure =  design_output.cnc_cut_figure
 ideal_figure = design_output.ideal_figure
+simplify_figure = design_output.simplify_figure
+copy_figure = design_output.copy_figure
+outline_hash = design_output.outline_hash
+figure_hash = design_output.figure_hash
 figures_to_freecad_assembly = design_output.figures_to_freecad_assembly
 
 # from bare_design
@@ -98,12 +135,21 @@ bare_design = bare_design.bare_design
 
 # design_frontend
 check = design_frontend.check
+check_rules = design_frontend.check_rules
+run_constraint_rules = design_frontend.run_constraint_rules
 # draw_2d_frontend
 c_xy = draw_2d_frontend.c_xy
 Arc_Line_Outline = draw_2d_frontend.Arc_Line_Outline
 Circle_Outline = draw_2d_frontend.Circle_Outline
 Figure = draw_2d_frontend.Figure
 Figure_Collection = draw_2d_frontend.Figure_Collection
+# cnc25d_error
+Cnc25dError = cnc25d_error.Cnc25dError
+GeometryError = cnc25d_error.GeometryError
+ConstraintError = cnc25d_error.ConstraintError
+BackendError = cnc25d_error.BackendError
+DesignError = cnc25d_error.DesignError
+exit_on_error = cnc25d_error.exit_on_error
 
 ################################################################
 # function combinations
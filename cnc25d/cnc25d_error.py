@@ -0,0 +1,99 @@
+# cnc25d_error.py
+# the exceptions raised by the cnc25d function library
+# created by charlyoleg on 2014/04/09
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+cnc25d_error.py is part of the Cnc25D API.
+it defines the exceptions raised by the Cnc25D API instead of exiting the Python process.
+A script can catch them to continue with the next job.
+exit_on_error() restores the command line behavior: print the error and exit with the status 2.
+"""
+
+################################################################
+# import
+################################################################
+
+# Python standard library
+import sys
+import re
+
+################################################################
+# exception classes
+################################################################
+
+class Cnc25dError(Exception):
+  """ base class of the Cnc25D exceptions
+      error_id is the ERRxxx code found at the beginning of the message
+      context is a dictionary of values that help understanding the error
+  """
+  def __init__(self, error_msg, context=None):
+    Exception.__init__(self, error_msg)
+    self.error_msg = error_msg
+    self.error_id = 'ERR000'
+    error_id_match = re.match(r'\s*(ERR\d+|WARN\d+)', error_msg)
+    if(error_id_match):
+      self.error_id = error_id_match.group(1)
+    self.context = {}
+    if(context!=None):
+      self.context = context
+
+class GeometryError(Cnc25dError):
+  """ error in the outline computation (cnc_outline, small_geometry)
+  """
+  pass
+
+class ConstraintError(Cnc25dError):
+  """ error in the constraint of a design (design_frontend.check, bare_design.apply_constraint)
+  """
+  pass
+
+class BackendError(Cnc25dError):
+  """ error while converting or writing the figures (outline_backends, design_output)
+  """
+  pass
+
+class DesignError(Cnc25dError):
+  """ error in the setup or usage of a design (bare_design)
+  """
+  pass
+
+################################################################
+# command line interface helpers
+################################################################
+
+def print_error(ai_error):
+  """ print the message and the context of the Cnc25dError ai_error
+  """
+  print("{:s}".format(ai_error.error_msg))
+  for k in sorted(ai_error.context.keys()):
+    print("{:s} = {:s}".format(k, str(ai_error.context[k])))
+
+def exit_on_error(ai_function, *args, **kwargs):
+  """ call ai_function with the arguments args and kwargs
+      If a Cnc25dError is raised, print it and exit with the status 2 like the command line interfaces used to do
+  """
+  try:
+    r_value = ai_function(*args, **kwargs)
+  except Cnc25dError as exc:
+    print_error(exc)
+    sys.exit(2)
+  return(r_value)
+
@@ -0,0 +1,29 @@
+# cnc25d_version.py
+# the version of the Cnc25D package
+# created by charlyoleg on 2014/05/02
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+cnc25d_version.py contains the only definition of the version of Cnc25D.
+It is read by setup.py and by the modules that depend on the release (e.g. the disk cache).
+"""
+
+cnc25d_version = '0.1.11'
+
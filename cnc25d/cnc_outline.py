@@ -53,9 +53,189 @@ from __future__ import division # to get float division
 #
 import math
 import sys, argparse
+import os
+import itertools
 #
 import design_help # just for get_effective_args()
+import cnc25d_error
 from small_geometry import *
+from array_outline import Array_Outline
+# numpy is optional
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+################################################################
+# ******** validated outline ***********
+################################################################
+
+outline_strict_check = (os.environ.get('CNC25D_STRICT_OUTLINE_CHECK', '')!='')
+
+def set_outline_strict_check(ai_strict):
+  """ in strict mode, the cached properties of the Valid_Outline are verified each time they are used
+      It can also be enabled with the environment variable CNC25D_STRICT_OUTLINE_CHECK
+  """
+  global outline_strict_check
+  outline_strict_check = ai_strict
+
+def outline_properties(ai_outline):
+  """ walk the outline and return its properties: outline_type, closed, segment_nb and bbox
+      bbox is (x_min, x_max, y_min, y_max) of the end-points and of the middle-points of the arcs
+  """
+  outline_type = check_list_outline_format(ai_outline)
+  if(outline_type==0): # circle
+    (x, y, radius) = ai_outline
+    r_properties = {'outline_type':0, 'closed':True, 'segment_nb':0, 'bbox':(x-radius, x+radius, y-radius, y+radius)}
+    return(r_properties)
+  (x_min, x_max, y_min, y_max) = (ai_outline[0][0], ai_outline[0][0], ai_outline[0][1], ai_outline[0][1])
+  line_len = outline_type+1
+  arc_len = outline_type+3
+  for i in range(len(ai_outline)):
+    len_p = len(ai_outline[i])
+    if((i==0)and(len_p!=line_len)):
+      raise cnc25d_error.GeometryError("ERR161: Error, the first point has an unexpected number of items {:d}".format(len_p))
+    if((len_p!=line_len)and(len_p!=arc_len)):
+      raise cnc25d_error.GeometryError("ERR162: Error, the segment {:d} has an unexpected number of items {:d}".format(i, len_p))
+    for j in range(0, len_p-outline_type+1, 2):
+      x = ai_outline[i][j]
+      y = ai_outline[i][j+1]
+      if(x<x_min):
+        x_min = x
+      elif(x>x_max):
+        x_max = x
+      if(y<y_min):
+        y_min = y
+      elif(y>y_max):
+        y_max = y
+  outline_closed = (ai_outline[0][0]==ai_outline[-1][-outline_type-1])and(ai_outline[0][1]==ai_outline[-1][-outline_type])
+  r_properties = {'outline_type':outline_type, 'closed':outline_closed, 'segment_nb':len(ai_outline)-1, 'bbox':(x_min, x_max, y_min, y_max)}
+  return(r_properties)
+
+def outline_resolved_arcs(ai_outline):
+  """ return the list of the resolved-arc records of the outline, computed with arc_3_points_to_radius_center_angles()
+      the record of the segment i is at the index i. It is None for the line-segments and for the start point
+  """
+  outline_type = check_list_outline_format(ai_outline)
+  r_arcs = []
+  if(outline_type==0): # circle
+    return(r_arcs)
+  arc_len = outline_type+3
+  r_arcs.append(None)
+  for i in range(1, len(ai_outline)):
+    resolved_arc = None
+    if(len(ai_outline[i])==arc_len):
+      resolved_arc = arc_3_points_to_radius_center_angles((ai_outline[i-1][-outline_type-1], ai_outline[i-1][-outline_type]), (ai_outline[i][0], ai_outline[i][1]), (ai_outline[i][2], ai_outline[i][3]))
+    r_arcs.append(resolved_arc)
+  return(r_arcs)
+
+class Valid_Outline(list):
+  """ outline (format-A, format-B or circle) validated at its construction
+      its properties outline_type, closed, segment_nb and bbox are cached.
+      The list methods that modify the outline clear the cache, so the properties are recomputed when they are used
+      The transform functions of cnc_outline return a Valid_Outline with the properties of the input outline
+      The resolved-arc records are computed the first time a backend uses them and are shared by all the backends
+  """
+
+  def __init__(self, ai_outline, ai_properties=None):
+    """ validate ai_outline
+        ai_properties lets the transform functions set the known properties without walking the outline.
+        A missing bbox is computed when it is used
+    """
+    list.__init__(self, ai_outline)
+    self.resolved_arcs = None
+    if(ai_properties is None):
+      self.properties = outline_properties(self)
+    else:
+      self.properties = dict(ai_properties)
+      if(outline_strict_check):
+        self.verify_properties()
+
+  def verify_properties(self):
+    """ walk the outline and check that the cached properties are correct
+    """
+    properties = outline_properties(self)
+    for k in self.properties.keys():
+      if((self.properties[k]!=None)and(self.properties[k]!=properties[k])):
+        raise cnc25d_error.GeometryError("ERR163: Error, the cached property {:s} of the outline is {:s} instead of {:s}".format(k, str(self.properties[k]), str(properties[k])))
+    self.properties = properties
+
+  def get_property(self, ai_key):
+    """ return one cached property. It is recomputed if the outline has been modified
+    """
+    if(self.properties is None):
+      self.properties = outline_properties(self)
+    elif(outline_strict_check or (self.properties.get(ai_key, None) is None)):
+      self.verify_properties()
+    return(self.properties[ai_key])
+
+  def get_outline_type(self):
+    """ same code as check_outline_format()
+    """
+    return(self.get_property('outline_type'))
+
+  def is_closed(self):
+    """ return True if the last point is equal to the first point
+    """
+    return(self.get_property('closed'))
+
+  def get_segment_nb(self):
+    """ return the number of segments. 0 for a circle
+    """
+    return(self.get_property('segment_nb'))
+
+  def get_bbox(self):
+    """ return (x_min, x_max, y_min, y_max)
+    """
+    return(self.get_property('bbox'))
+
+  def get_cached_bbox(self):
+    """ return the bbox if it is already computed, None otherwise
+    """
+    r_bbox = None
+    if(self.properties!=None):
+      r_bbox = self.properties['bbox']
+    return(r_bbox)
+
+  def get_resolved_arcs(self):
+    """ return the list of the resolved-arc records (see outline_resolved_arcs()). It is computed once
+    """
+    if(getattr(self, 'resolved_arcs', None) is None):
+      self.resolved_arcs = outline_resolved_arcs(self)
+    return(self.resolved_arcs)
+
+  def copy(self):
+    """ return a copy of the outline that keeps the cached properties and resolved arcs. The list segments are copied
+    """
+    r_outline = Valid_Outline([ list(p) if isinstance(p, list) else p for p in self ], self.properties)
+    if(self.resolved_arcs is not None):
+      r_outline.resolved_arcs = list(self.resolved_arcs)
+    return(r_outline)
+
+  def derive(self, ai_outline, ai_bbox=None):
+    """ return a Valid_Outline of ai_outline, computed from self by a transform that keeps the format, the closure and the segment number
+    """
+    properties = {'outline_type':self.get_outline_type(), 'closed':self.is_closed(), 'segment_nb':self.get_segment_nb(), 'bbox':ai_bbox}
+    r_outline = Valid_Outline(ai_outline, properties)
+    return(r_outline)
+
+def valid_outline_modifier(ai_method_name):
+  """ wrap a list method to clear the cached properties and resolved arcs of Valid_Outline
+  """
+  list_method = getattr(list, ai_method_name)
+  def modifier(self, *args, **kwargs):
+    r_value = list_method(self, *args, **kwargs)
+    self.properties = None
+    self.resolved_arcs = None
+    return(r_value)
+  modifier.__name__ = ai_method_name
+  modifier.__doc__ = list_method.__doc__
+  return(modifier)
+
+for method_name in ('__setitem__', '__delitem__', '__setslice__', '__delslice__', '__iadd__', '__imul__',
+    'append', 'extend', 'insert', 'pop', 'remove', 'reverse', 'sort'):
+  if(hasattr(list, method_name)):
+    setattr(Valid_Outline, method_name, valid_outline_modifier(method_name))
 
 ################################################################
 # ******** Sub-functions for the API ***********
@@ -65,23 +245,30 @@ def check_outline_format(ai_outline):
   """ check the input format and return the outline_type with the code:
       0: format-B circle,  1: format-B general outline (all outline except circle), 2: format-A
   """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.outline_type)
+  if(isinstance(ai_outline, Valid_Outline)):
+    return(ai_outline.get_outline_type())
+  r_outline_type = check_list_outline_format(ai_outline)
+  return(r_outline_type)
+
+def check_list_outline_format(ai_outline):
+  """ sub-function of check_outline_format() for the outlines defined with lists or tuples
+  """
   r_outline_type = -1
   # check if it is a format-B circle
   if(not isinstance(ai_outline, (tuple, list))):
-    print("ERR937: Error, ai_outline must be a list or a tuple")
     print("dbg072: ai_outline:", ai_outline)
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR937: Error, ai_outline must be a list or a tuple")
   # check if the outline contains at least on element
   if(len(ai_outline)==0):
-    print("ERR075: Error, ai_outline should not be empty!")
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR075: Error, ai_outline should not be empty!")
   # check if the outline is a circle or a general outline
   if(isinstance(ai_outline[0], (tuple, list))): # general outline
     # checks on ai_outline for general outline
     if(len(ai_outline)<2):
-      print("ERR402: Error, the segment list must contain at least 2 elements. Currently, len(ai_outline) = {:d}".format(len(ai_outline)))
       print("dbg082: ai_outline:", ai_outline)
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR402: Error, the segment list must contain at least 2 elements. Currently, len(ai_outline) = {:d}".format(len(ai_outline)))
     # check the first point
     len_first_point = len(ai_outline[0])
     if(len_first_point==2):
@@ -89,28 +276,40 @@ def check_outline_format(ai_outline):
     elif(len_first_point==3):
       r_outline_type = 2
     else:
-      print("ERR457: Error, the first point has an unexpected number of items {:d}".format(len_first_point))
       #print("dbg093: ai_outline:", ai_outline)
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR457: Error, the first point has an unexpected number of items {:d}".format(len_first_point))
   else: # circle outline
     if(len(ai_outline)!=3):
-      print("ERR758: Error, circle outline must be a list of 3 floats (or int)! Current len: {:d}".format(len(ai_outline)))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR758: Error, circle outline must be a list of 3 floats (or int)! Current len: {:d}".format(len(ai_outline)))
     r_outline_type = 0
   return(r_outline_type)
 
+def is_outline_closed(ai_outline):
+  """ return True if the last point of the outline is equal to its first point
+      a circle is closed
+  """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.is_closed())
+  if(isinstance(ai_outline, Valid_Outline)):
+    return(ai_outline.is_closed())
+  outline_type = check_outline_format(ai_outline)
+  r_closed = True
+  if(outline_type!=0):
+    r_closed = (ai_outline[0][0]==ai_outline[-1][-outline_type-1])and(ai_outline[0][1]==ai_outline[-1][-outline_type])
+  return(r_closed)
+
 def reverse_outline(ai_outline):
   """ reverse an outline
       ai_outline can be list of segments with the input format of cnc_cut_outline.cnc_cut_outline() or with the input format of outline_backends.outline_arc_line()
       the output format is the input format
   """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.reverse())
   # check the ai_outline format
   outline_type = check_outline_format(ai_outline)
   #print("dbg553: outline_type:", outline_type)
   # check if the outline is closed
-  outline_closed = False
-  if((ai_outline[0][0]==ai_outline[-1][-outline_type-1])and(ai_outline[0][1]==ai_outline[-1][-outline_type])):
-    outline_closed = True
+  outline_closed = is_outline_closed(ai_outline)
   # outline data extraction
   l_end_point = []
   l_mid_point = []
@@ -125,16 +324,14 @@ def reverse_outline(ai_outline):
       elif(len_p==4):
         is_arc = True
       else:
-        print("ERR257: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR257: Error, the segment has an unxepected number of items {:d}".format(len_p))
     elif(outline_type==2):
       if(len_p==3):
         is_arc = False
       elif(len_p==5):
         is_arc = True
       else:
-        print("ERR258: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR258: Error, the segment has an unxepected number of items {:d}".format(len_p))
     #else:
     #  print("ERR557: Error, the outline_type is unexpected {:d}".format(outline_type))
     #  sys.exit(2)
@@ -184,6 +381,8 @@ def reverse_outline(ai_outline):
       last_segment =  list(r_outline[-1])
       last_segment[-1] = 0
       r_outline[-1] = tuple(last_segment)
+  if(isinstance(ai_outline, Valid_Outline)): # the reversed outline has the same points
+    r_outline = ai_outline.derive(r_outline, ai_outline.get_cached_bbox())
   return(r_outline)
 
 def smooth_corner_line_line(ai_pre_point, ai_current_point, ai_post_point, ai_router_bit_request, ai_error_msg_id):
@@ -203,23 +402,19 @@ def smooth_corner_line_line(ai_pre_point, ai_current_point, ai_post_point, ai_ro
   # corner angle
   #if(AG==0):
   if(AG<radian_epsilon):
-    print("ERR406: the length AG is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR406: the length AG is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   #if(AH==0):
   if(AH<radian_epsilon):
-    print("ERR407: the length AH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR407: the length AH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   #if(GH==0):
   if(GH<radian_epsilon):
-    print("ERR408: the length GH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR408: the length GH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   # law of cosines
   #corner_angle = math.acos((AG**2+AH**2-GH**2)/(2*AH*AG))
   corner_cos = (AG**2+AH**2-GH**2)/(2*AH*AG)
   if(abs(corner_cos)>(1+radian_epsilon)):
-    print("ERR210: Error with math.acos {:0.5f}".format((AG**2+AH**2-GH**2)/(2*AH*AG)))
     print("dbg211: AG {:0.3f}  AH {:0.3f}  GH {:0.3f}".format(AG, AH, GH))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR210: Error with math.acos {:0.5f}".format((AG**2+AH**2-GH**2)/(2*AH*AG)))
   elif(corner_cos>=1):
     corner_angle = 0
   elif(corner_cos<=-1):
@@ -311,16 +506,13 @@ def enlarge_corner_line_line(ai_pre_point, ai_current_point, ai_post_point, ai_r
   # corner angle
   #if(AG==0):
   if(AG<radian_epsilon):
-    print("ERR506: the length AG is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR506: the length AG is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   #if(AH==0):
   if(AH<radian_epsilon):
-    print("ERR507: the length AH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR507: the length AH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   #if(GH==0):
   if(GH<radian_epsilon):
-    print("ERR508: the length GH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
-    sys.exit(1)
+    raise cnc25d_error.GeometryError("ERR508: the length GH is null at point {:s} ({:0.2f}, {:0.2f}, {:0.2f})".format(ai_error_msg_id, AX, AY, ai_router_bit_request))
   corner_angle = math.acos((AG**2+AH**2-GH**2)/(2*AH*AG))
   #print("dbg296: corner_angle:", corner_angle)
   if(corner_angle>math.pi-radian_epsilon):
@@ -490,8 +682,9 @@ def cnc_cut_corner(ai_pre_point, ai_pre_middle, ai_current_point, ai_post_middle
   #print("dbg578: r_outline:", r_outline)
   return(r_outline)
 
-def arc_middle(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_new_end1, ai_new_end2, ai_error_msg_id, ai_error_msg_idx):
+def arc_middle(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_new_end1, ai_new_end2, ai_error_msg_id, ai_error_msg_idx, ai_arc_circle=None):
   """ Compute the middle point of an arc with new end points
+      ai_arc_circle is the result of arc_center_radius_angles() for the three arc points, if it is already computed
   """
   #print("dbg107: ai_error_msg_id: {:s}  ai_error_msg_idx: {:d}".format(ai_error_msg_id, ai_error_msg_idx))
   error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, ai_error_msg_idx)
@@ -509,7 +702,9 @@ def arc_middle(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_new_end1, ai_new_end2, ai_
   EX = ai_new_end2[0]
   EY = ai_new_end2[1]
   # calculation of I
-  (IX,IY, arc_radius, uw, u, w) = arc_center_radius_angles(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, error_msg_id)
+  if(ai_arc_circle==None):
+    ai_arc_circle = arc_center_radius_angles(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, error_msg_id)
+  (IX,IY, arc_radius, uw, u, w) = ai_arc_circle
   # check I is equidistant of A,B,C,D,E
   IA = math.sqrt((AX-IX)**2+(AY-IY)**2)
   IB = math.sqrt((BX-IX)**2+(BY-IY)**2)
@@ -517,17 +712,15 @@ def arc_middle(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_new_end1, ai_new_end2, ai_
   ID = math.sqrt((DX-IX)**2+(DY-IY)**2)
   IE = math.sqrt((EX-IX)**2+(EY-IY)**2)
   if((abs(IA-arc_radius)>radian_epsilon)or(abs(IB-arc_radius)>radian_epsilon)or(abs(IC-arc_radius)>radian_epsilon)):
-    print("ERR831: Error, in {:s}, I is not equidistant from A,B,C,D,E. IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, IA, IB, IC))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR831: Error, in {:s}, I is not equidistant from A,B,C,D,E. IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, IA, IB, IC))
   if((abs(ID-IA)>radian_epsilon)or(abs(IE-IA)>radian_epsilon)):
-    print("ERR832: Error, in {:s}, I is not equidistant from A,B,C,D,E. IA={:0.2f} IB={:0.2f} IC={:0.2f} ID={:0.2f} IE={:0.2f}".format(error_msg_id, IA, IB, IC, ID, IE))
     print("dbg414: AX {:0.2f}  AY {:0.2f}".format(AX,AY))
     print("dbg424: BX {:0.2f}  BY {:0.2f}".format(BX,BY))
     print("dbg434: CX {:0.2f}  CY {:0.2f}".format(CX,CY))
     print("dbg444: DX {:0.2f}  DY {:0.2f}".format(DX,DY))
     print("dbg454: EX {:0.2f}  EY {:0.2f}".format(EX,EY))
     print("dbg464: IX {:0.2f}  IY {:0.2f}".format(IX,IY))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR832: Error, in {:s}, I is not equidistant from A,B,C,D,E. IA={:0.2f} IB={:0.2f} IC={:0.2f} ID={:0.2f} IE={:0.2f}".format(error_msg_id, IA, IB, IC, ID, IE))
   # calculation of the angles d=(Ix, ID) and e=(Ix, IE)
   d = math.atan2(DY-IY, DX-IX)
   e = math.atan2(EY-IY, EX-IX)
@@ -571,8 +764,7 @@ def arc_middle(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_new_end1, ai_new_end2, ai_
   FY = IY+arc_radius*math.sin(f)
   # dummy F in case of error
   if(arc_middle_status==2):
-    print("ERR221: Error in {:s} during the recalculation of the arc middle point!".format(error_msg_id))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR221: Error in {:s} during the recalculation of the arc middle point!".format(error_msg_id))
     #print("WARN221: Warning in {:s}, creating a dummy arc because of internal error!".format(error_msg_id))
     #lDE = math.sqrt((EX-DX)**2+(EY-DY)**2)
     #xDE = math.atan2(EY-DY, EX-DX)
@@ -590,10 +782,11 @@ def general_outline_shift_xy(ai_outline, ai_x_offset, ai_x_coefficient, ai_y_off
   """ For each point of the list, add the offset and multiply by coefficient the coordinates
       ai_outline can be list of segments with the format-A or format-B except circle
   """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.shift_xy(ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient))
   # check the parameters
   if((ai_x_coefficient==0)or(ai_y_coefficient==0)):
-    print("ERR439: Error, a multiplication coefficient is set to zero: {:0.2f}  {:0.2f}".format(ai_x_coefficient, ai_y_coefficient))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR439: Error, a multiplication coefficient is set to zero: {:0.2f}  {:0.2f}".format(ai_x_coefficient, ai_y_coefficient))
   # check if the outline must be reversed
   if((ai_x_coefficient*ai_y_coefficient)<0):
     i_outline=reverse_outline(ai_outline)
@@ -615,19 +808,16 @@ def general_outline_shift_xy(ai_outline, ai_x_offset, ai_x_coefficient, ai_y_off
       elif(len_p==4):
         is_arc = True
       else:
-        print("ERR237: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR237: Error, the segment has an unxepected number of items {:d}".format(len_p))
     elif(outline_type==2):
       if(len_p==3):
         is_arc = False
       elif(len_p==5):
         is_arc = True
       else:
-        print("ERR247: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR247: Error, the segment has an unxepected number of items {:d}".format(len_p))
     else:
-      print("ERR257: Error, the outline_type is unexpected {:d}".format(outline_type))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR257: Error, the outline_type is unexpected {:d}".format(outline_type))
     # extract segments
     end_point = []
     end_point_router_bit = []
@@ -651,12 +841,21 @@ def general_outline_shift_xy(ai_outline, ai_x_offset, ai_x_coefficient, ai_y_off
     new_segment.extend(end_point)
     new_segment.extend(end_point_router_bit)
     r_outline.append(tuple(new_segment))
+  if(isinstance(i_outline, Valid_Outline)):
+    bbox = i_outline.get_cached_bbox()
+    if(bbox!=None):
+      (x1, x2) = sorted((ai_x_offset+ai_x_coefficient*bbox[0], ai_x_offset+ai_x_coefficient*bbox[1]))
+      (y1, y2) = sorted((ai_y_offset+ai_y_coefficient*bbox[2], ai_y_offset+ai_y_coefficient*bbox[3]))
+      bbox = (x1, x2, y1, y2)
+    r_outline = i_outline.derive(r_outline, bbox)
   return(r_outline)
 
 def general_outline_rotate(ai_outline, ai_ox, ai_oy, ai_rotation_angle):
   """ For each point of the list, apply a rotation of angle ai_rotation_angle and rotation center (ai_ox, ai_oy)
       ai_outline can be list of segments with the format-A or with the format-B except circle
   """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.rotate(ai_ox, ai_oy, ai_rotation_angle))
   # check the ai_outline format
   outline_type = check_outline_format(ai_outline)
   #print("dbg453: outline_type:", outline_type)
@@ -673,19 +872,16 @@ def general_outline_rotate(ai_outline, ai_ox, ai_oy, ai_rotation_angle):
       elif(len_p==4):
         is_arc = True
       else:
-        print("ERR237: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR237: Error, the segment has an unxepected number of items {:d}".format(len_p))
     elif(outline_type==2):
       if(len_p==3):
         is_arc = False
       elif(len_p==5):
         is_arc = True
       else:
-        print("ERR247: Error, the segment has an unxepected number of items {:d}".format(len_p))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR247: Error, the segment has an unxepected number of items {:d}".format(len_p))
     else:
-      print("ERR257: Error, the outline_type is unexpected {:d}".format(outline_type))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR257: Error, the outline_type is unexpected {:d}".format(outline_type))
     # extract segments
     end_point = []
     end_point_router_bit = []
@@ -709,8 +905,274 @@ def general_outline_rotate(ai_outline, ai_ox, ai_oy, ai_rotation_angle):
     new_segment.extend(end_point)
     new_segment.extend(end_point_router_bit)
     r_outline.append(tuple(new_segment))
+  if(isinstance(ai_outline, Valid_Outline)):
+    r_outline = ai_outline.derive(r_outline)
   return(r_outline)
 
+################################################################
+# ******** batched corner kernels for cnc_cut_outline() ***********
+################################################################
+
+# corner classes
+corner_zero = 0 # angular corner, the router_bit request is zero
+corner_line_line = 1
+corner_other = 2 # line-arc, arc-line or arc-arc corner, computed by cnc_cut_corner()
+
+line_line_batch_min = 16 # below this number of line-line corners, the Python loop is faster than numpy
+
+def classify_corners(ai_pt_mid, ai_pt_request):
+  """ return the list of the corner classes of the points of an outline
+      the router_bit request of the last point is already set to zero by cnc_cut_outline_data()
+  """
+  pre_middle = [ai_pt_mid[-1]] + ai_pt_mid[1:] # the first corner of a closed outline follows the last segment
+  post_middle = ai_pt_mid[1:] + [None]
+  r_class = [ (corner_zero if (request==0) else (corner_line_line if ((pre is None)and(post is None)) else corner_other))
+    for (request, pre, post) in zip(ai_pt_request, pre_middle, post_middle) ]
+  return(r_class)
+
+def get_arc_circle(ai_arc_circles, ai_pt_end, ai_pt_mid, ai_arc_idx, ai_error_msg_id, ai_error_msg_idx):
+  """ return the result of arc_center_radius_angles() for the arc ending at the point ai_arc_idx
+      ai_arc_circles is the dictionary of the arcs already computed
+  """
+  if(not ai_arc_idx in ai_arc_circles):
+    error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, ai_error_msg_idx)
+    ai_arc_circles[ai_arc_idx] = arc_center_radius_angles(ai_pt_end[ai_arc_idx-1], ai_pt_mid[ai_arc_idx], ai_pt_end[ai_arc_idx], error_msg_id)
+  return(ai_arc_circles[ai_arc_idx])
+
+def line_line_corner_batch(ai_pt_end, ai_pt_request, ai_corner_class, ai_outline_closed):
+  """ compute with numpy the line-line corners that follow an angular corner
+      Those corners don't depend on the previous corner, so they can be computed in one batch.
+      return the dictionary {point_index: corner_outline}.
+      The corners that would print a warning or raise an error are not included and are left to cnc_cut_corner()
+      The operations are the ones of smooth_corner_line_line() and enlarge_corner_line_line(), so the results are identical
+  """
+  r_corners = {}
+  if(numpy==None):
+    return(r_corners)
+  last_corner = len(ai_pt_end)-2
+  if(ai_outline_closed): # the last corner depends on the first corner
+    last_corner -= 1
+  smooth_idx = []
+  enlarge_idx = []
+  for i in range(1, last_corner+1):
+    if((ai_corner_class[i]==corner_line_line)and(ai_corner_class[i-1]==corner_zero)):
+      if(ai_pt_request[i]>0):
+        smooth_idx.append(i)
+      else:
+        enlarge_idx.append(i)
+  if(len(smooth_idx)+len(enlarge_idx)<line_line_batch_min):
+    return(r_corners)
+  radian_epsilon = math.pi/1000
+  pt_end = numpy.fromiter(itertools.chain.from_iterable(ai_pt_end), numpy.float64, 2*len(ai_pt_end)).reshape(-1, 2)
+  with numpy.errstate(all='ignore'): # the invalid corners are filtered out
+    # smoothed corners
+    if(len(smooth_idx)>0):
+      (AX, AY, GX, GY, HX, HY, AG, AH, corner_cos) = line_line_corner_lengths(pt_end, smooth_idx)
+      rbr = numpy.array([ ai_pt_request[i] for i in smooth_idx ], dtype=numpy.float64)
+      corner_angle = numpy.arccos(corner_cos)
+      AE = rbr/numpy.tan(corner_angle/2)
+      valid = (corner_cos<1)&(corner_cos>-1)&(corner_angle<=math.pi-radian_epsilon)&(corner_angle>=radian_epsilon)&(AG>=AE)&(AH>=AE)
+      EX = AX+(GX-AX)*AE/AG
+      EY = AY+(GY-AY)*AE/AG
+      FX = AX+(HX-AX)*AE/AH
+      FY = AY+(HY-AY)*AE/AH
+      AK = rbr*(1-numpy.sin(corner_angle/2))*2/numpy.sin(corner_angle)
+      KX = AX+(GX-AX)*AK/AG
+      KY = AY+(GY-AY)*AK/AG
+      LX = AX+(HX-AX)*AK/AH
+      LY = AY+(HY-AY)*AK/AH
+      IX = (KX+LX)/2
+      IY = (KY+LY)/2
+      corners = zip(zip(EX.tolist(), EY.tolist()), zip(IX.tolist(), IY.tolist(), FX.tolist(), FY.tolist()))
+      for (i, corner_valid, corner) in zip(smooth_idx, valid.tolist(), corners):
+        if(corner_valid):
+          r_corners[i] = list(corner)
+    # enlarged corners
+    if(len(enlarge_idx)>0):
+      (AX, AY, GX, GY, HX, HY, AG, AH, corner_cos) = line_line_corner_lengths(pt_end, enlarge_idx)
+      rbr = numpy.array([ abs(ai_pt_request[i]) for i in enlarge_idx ], dtype=numpy.float64)
+      corner_angle = numpy.arccos(corner_cos)
+      obtuse = (corner_angle>math.pi/2-radian_epsilon)
+      # obtuse corners
+      AE = 2*rbr*numpy.cos(corner_angle/2)
+      valid_obtuse = (AG>=AE)&(AH>=AE)
+      EX = AX+(GX-AX)*AE/AG
+      EY = AY+(GY-AY)*AE/AG
+      FX = AX+(HX-AX)*AE/AH
+      FY = AY+(HY-AY)*AE/AH
+      # acute corners
+      AM = rbr/numpy.sin(corner_angle/2)
+      valid_acute = (AG>=AM)&(AH>=AM)
+      MX = AX+(GX-AX)*AM/AG
+      MY = AY+(GY-AY)*AM/AG
+      NX = AX+(HX-AX)*AM/AH
+      NY = AY+(HY-AY)*AM/AH
+      AR = AM/2
+      ARX = (GX-AX)*AR/AG
+      ARY = (GY-AY)*AR/AG
+      ASX = (HX-AX)*AR/AH
+      ASY = (HY-AY)*AR/AH
+      AV = rbr/numpy.cos(corner_angle/2)
+      AVX = (GX-AX)*AV/AG
+      AVY = (GY-AY)*AV/AG
+      AWX = (HX-AX)*AV/AH
+      AWY = (HY-AY)*AV/AH
+      KX = AX+ARX-ASX+(AVX+AWX)/2
+      KY = AY+ARY-ASY+(AVY+AWY)/2
+      LX = AX-ARX+ASX+(AVX+AWX)/2
+      LY = AY-ARY+ASY+(AVY+AWY)/2
+      valid = (corner_cos<=1)&(corner_cos>=-1)&(corner_angle<=math.pi-radian_epsilon)&(corner_angle>=radian_epsilon)&numpy.where(obtuse, valid_obtuse, valid_acute)
+      l_valid = valid.tolist()
+      l_obtuse = obtuse.tolist()
+      (EX, EY, FX, FY) = (EX.tolist(), EY.tolist(), FX.tolist(), FY.tolist())
+      (MX, MY, NX, NY, KX, KY, LX, LY) = (MX.tolist(), MY.tolist(), NX.tolist(), NY.tolist(), KX.tolist(), KY.tolist(), LX.tolist(), LY.tolist())
+      for j in range(len(enlarge_idx)):
+        if(l_valid[j]):
+          (PX, PY) = ai_pt_end[enlarge_idx[j]] # the corner point is kept as it is
+          if(l_obtuse[j]):
+            r_corners[enlarge_idx[j]] = [(EX[j],EY[j]), (PX,PY,FX[j],FY[j])]
+          else:
+            r_corners[enlarge_idx[j]] = [(MX[j],MY[j]), (KX[j],KY[j]), (PX,PY,LX[j],LY[j]), (NX[j],NY[j])]
+  return(r_corners)
+
+def line_line_corner_lengths(ai_pt_end, ai_corner_idx):
+  """ sub-function of line_line_corner_batch(): return the coordinates, the lengths and the cosinus of the corners
+      ai_pt_end is the numpy array of the points. The corners with a null segment get a cosinus out of [-1, 1]
+  """
+  radian_epsilon = math.pi/1000
+  idx = numpy.array(ai_corner_idx)
+  (AX, AY) = (ai_pt_end[idx,0], ai_pt_end[idx,1])
+  (GX, GY) = (ai_pt_end[idx-1,0], ai_pt_end[idx-1,1])
+  (HX, HY) = (ai_pt_end[idx+1,0], ai_pt_end[idx+1,1])
+  AG = numpy.sqrt(numpy.power(GX-AX, 2.0)+numpy.power(GY-AY, 2.0))
+  AH = numpy.sqrt(numpy.power(HX-AX, 2.0)+numpy.power(HY-AY, 2.0))
+  GH = numpy.sqrt(numpy.power(HX-GX, 2.0)+numpy.power(HY-GY, 2.0))
+  corner_cos = (numpy.power(AG, 2.0)+numpy.power(AH, 2.0)-numpy.power(GH, 2.0))/(2*AH*AG)
+  corner_cos[(AG<radian_epsilon)|(AH<radian_epsilon)|(GH<radian_epsilon)] = 2.0
+  r_lengths = (AX, AY, GX, GY, HX, HY, AG, AH, corner_cos)
+  return(r_lengths)
+
+################################################################
+# ******** affine transform ***********
+################################################################
+
+class Transform2D:
+  """ 2D affine transform x' = a*x + b*y + c ; y' = d*x + e*y + f
+      The shift, rotate and flip steps are composed in one matrix, so an outline is transformed in a single pass
+      The outline is reversed when the transform is a mirror (negative determinant) to keep its orientation
+  """
+
+  def __init__(self, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0):
+    """ create the transform. By default, the identity
+    """
+    self.coef = (a, b, c, d, e, f)
+
+  def compose(self, ai_next):
+    """ return the transform that applies first self and then ai_next
+    """
+    (a1, b1, c1, d1, e1, f1) = self.coef
+    (a2, b2, c2, d2, e2, f2) = ai_next.coef
+    r_transform = Transform2D(a2*a1+b2*d1, a2*b1+b2*e1, a2*c1+b2*f1+c2, d2*a1+e2*d1, d2*b1+e2*e1, d2*c1+e2*f1+f2)
+    return(r_transform)
+
+  def translate(self, ai_x, ai_y):
+    """ return the transform self followed by a translation
+    """
+    r_transform = self.compose(Transform2D(1.0, 0.0, ai_x, 0.0, 1.0, ai_y))
+    return(r_transform)
+
+  def shift_xy(self, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient):
+    """ return the transform self followed by the outline_shift_xy() step
+    """
+    r_transform = self.compose(Transform2D(ai_x_coefficient, 0.0, ai_x_offset, 0.0, ai_y_coefficient, ai_y_offset))
+    return(r_transform)
+
+  def rotate(self, ai_ox, ai_oy, ai_rotation_angle):
+    """ return the transform self followed by a rotation of center (ai_ox, ai_oy) and angle ai_rotation_angle
+    """
+    cos_a = math.cos(ai_rotation_angle)
+    sin_a = math.sin(ai_rotation_angle)
+    r_transform = self.compose(Transform2D(cos_a, -1*sin_a, ai_ox-ai_ox*cos_a+ai_oy*sin_a, sin_a, cos_a, ai_oy-ai_ox*sin_a-ai_oy*cos_a))
+    return(r_transform)
+
+  def flip_xy(self, ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip):
+    """ return the transform self followed by a flip of the box (ai_zero_x, ai_zero_y, ai_size_x, ai_size_y)
+        the flipped box is placed at (0, 0)
+    """
+    r_transform = self.translate(-1*(ai_zero_x+ai_size_x/2.0), -1*(ai_zero_y+ai_size_y/2.0))
+    r_transform = r_transform.shift_xy(0.0, ai_x_flip, 0.0, ai_y_flip)
+    r_transform = r_transform.translate(ai_size_x/2.0, ai_size_y/2.0)
+    return(r_transform)
+
+  def determinant(self):
+    """ return the determinant of the linear part. Negative for a mirror
+    """
+    (a, b, c, d, e, f) = self.coef
+    r_det = a*e-b*d
+    return(r_det)
+
+  def is_similarity(self):
+    """ return True if the transform keeps the shape of the circles
+    """
+    (a, b, c, d, e, f) = self.coef
+    epsilon = 1e-9*max(1.0, abs(a), abs(b), abs(d), abs(e))
+    r_similarity = (abs(a*a+d*d-b*b-e*e)<epsilon)and(abs(a*b+d*e)<epsilon)
+    return(r_similarity)
+
+  def apply_point(self, ai_point):
+    """ return the transformed point (x, y)
+    """
+    (a, b, c, d, e, f) = self.coef
+    r_point = [a*ai_point[0]+b*ai_point[1]+c, d*ai_point[0]+e*ai_point[1]+f]
+    return(r_point)
+
+  def apply_outline(self, ai_outline):
+    """ return the transformed outline
+        ai_outline can be a circle, a list of segments with the format-A or format-B, or an Array_Outline
+        the output format is the input format
+        the radius of a circle is not scaled, as with outline_shift_xy()
+    """
+    (a, b, c, d, e, f) = self.coef
+    det = self.determinant()
+    if(det==0):
+      raise cnc25d_error.GeometryError("ERR642: Error, the transform is not invertible: {:s}".format(str(self.coef)))
+    if(isinstance(ai_outline, Array_Outline)):
+      r_outline = ai_outline.transform(a, b, c, d, e, f)
+      if(det<0):
+        r_outline = r_outline.reverse()
+      return(r_outline)
+    outline_type = check_outline_format(ai_outline)
+    if(outline_type==0): # it's a format-B circle
+      # like outline_shift_xy(), only the center is transformed, the radius is kept
+      if((not self.is_similarity())or(abs(abs(det)-1.0)>1e-9)):
+        print("WARN359: Warning, circle is transformed with a scale! The radius is kept. {:s}".format(str(self.coef)))
+      (x, y, radius) = ai_outline
+      r_outline = (a*x+b*y+c, d*x+e*y+f, radius)
+      if(isinstance(ai_outline, Valid_Outline)):
+        r_outline = ai_outline.derive(r_outline)
+      return(r_outline)
+    # new outline construction
+    r_outline = []
+    for p in ai_outline:
+      len_p = len(p)
+      if(len_p==outline_type+1): # line
+        r_outline.append((a*p[0]+b*p[1]+c, d*p[0]+e*p[1]+f) + tuple(p[2:]))
+      elif(len_p==outline_type+3): # arc
+        r_outline.append((a*p[0]+b*p[1]+c, d*p[0]+e*p[1]+f, a*p[2]+b*p[3]+c, d*p[2]+e*p[3]+f) + tuple(p[4:]))
+      else:
+        raise cnc25d_error.GeometryError("ERR643: Error, the segment has an unxepected number of items {:d}".format(len_p))
+    if(isinstance(ai_outline, Valid_Outline)):
+      r_outline = ai_outline.derive(r_outline)
+    if(det<0):
+      r_outline = reverse_outline(r_outline)
+    return(r_outline)
+
+  def apply_figure(self, ai_figure):
+    """ return the transformed figure (list of outlines)
+    """
+    r_figure = [ self.apply_outline(ol) for ol in ai_figure ]
+    return(r_figure)
+
 ################################################################
 # ******** API function for outline creation ***********
 ################################################################
@@ -727,6 +1189,8 @@ def outline_shift_xy(ai_outline, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_
     circle_center_y = ai_outline[1]
     circle_radius = ai_outline[2]
     r_outline = (ai_x_offset+ai_x_coefficient*circle_center_x, ai_y_offset+ai_y_coefficient*circle_center_y, circle_radius)
+    if(isinstance(ai_outline, Valid_Outline)):
+      r_outline = ai_outline.derive(r_outline)
   else: # format-A or format-A general outline
     r_outline = general_outline_shift_xy(ai_outline, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient)
   return(r_outline)
@@ -757,6 +1221,8 @@ def outline_rotate(ai_outline, ai_ox, ai_oy, ai_rotation_angle):
     circle_radius = ai_outline[2]
     rotated_circle_center = rotate_point((circle_center_x, circle_center_y), ai_ox, ai_oy, ai_rotation_angle)
     r_outline = (rotated_circle_center[0], rotated_circle_center[1], circle_radius)
+    if(isinstance(ai_outline, Valid_Outline)):
+      r_outline = ai_outline.derive(r_outline)
   else: # format-A or format-A general outline
     r_outline = general_outline_rotate(ai_outline, ai_ox, ai_oy, ai_rotation_angle)
   return(r_outline)
@@ -765,17 +1231,19 @@ def outline_close(ai_outline):
   """ close the input outline and return it
       The output outline format is the input outline format.
       It works with the format-A or the format-B
+      An Array_Outline is not modified, the closed outline is returned
   """
+  if(isinstance(ai_outline, Array_Outline)):
+    return(ai_outline.close())
   # check the ai_outline format
   outline_type = check_outline_format(ai_outline)
   r_outline = ai_outline
   if(outline_type!=0): # general outline (not a circle)
     # check if the outline is already closed
-    outline_closed = False
+    outline_closed = is_outline_closed(ai_outline)
     #print("dbg536: ai_outline[-1]:", ai_outline[-1])
     #print("dbg537: ai_outline:", ai_outline)
-    if((ai_outline[0][0]==ai_outline[-1][-outline_type-1])and(ai_outline[0][1]==ai_outline[-1][-outline_type])):
-      outline_closed = True
+    if(outline_closed):
       print("WARN421: Warning, the outline is already closed!")
     # construct the output outline
     if(not outline_closed):
@@ -799,31 +1267,19 @@ def outline_reverse(ai_outline):
     r_outline = reverse_outline(ai_outline)
   return(r_outline)
 
-def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
-  """
-  This function converts a list of segments (lines and arcs) into a list of segments (lines and arcs) compatible with a CNC cut.
-  For each input segment, you must provide:
-  - the end point (X,Y) for a line 
-      or a middle point (X,Y) and the end point (X,Y) for an arc 
-  - and the router_bit radius R.
-  The start point of a line or an arc is the last point of the previous segment
-  If R=0, the point is an angular corner.
-  If R>0, the point is smoothed to fit the constraints of a router_bit radius R.
-  If R<0, the point is enlarged to fit the constraints of a router_bit radius R.
-  eg: ai_segment_list = [ [x1,y1,r1], .. [x2,y2,r2], .. [x3,y3,x4,y4,r4], .. ]
-  You can use equally lists or tuples for segment description or segment_list description.
-  The first element is the start point of the outline. It must be a tuple of three floats.
-  If the last point of the last segment is equal to the start point, the outline is closed. Otherwise the outline is open.
-  If the outline is closed, the router_bit request of the start point is used and the router_bit request of the end point of the last segment is ignore.
-  From a programming point of view, ai_segment_list is a tuple of 3-tulpes and/or 5-tuples.
-  The returned list of segments has the same format as the input list of segment of outline_backends.outline_arc_line()
+def cnc_cut_outline_data(ai_segment_list, ai_error_msg_id):
+  """ sub-function of cnc_cut_outline(): check the outline and extract its points
+      return (outline_closed, point_nb, pt_end, pt_mid, pt_request)
   """
+  if(isinstance(ai_segment_list, Array_Outline)):
+    ai_segment_list = ai_segment_list.to_list()
   # is the outline closed or open?
   #precision_epsilon = 1/1000.0
-  outline_closed = False
-  if((ai_segment_list[0][0]==ai_segment_list[-1][-3])and(ai_segment_list[0][1]==ai_segment_list[-1][-2])):
+  if(isinstance(ai_segment_list, Valid_Outline)):
+    outline_closed = ai_segment_list.is_closed()
+  else:
+    outline_closed = (ai_segment_list[0][0]==ai_segment_list[-1][-3])and(ai_segment_list[0][1]==ai_segment_list[-1][-2])
   #if((abs(ai_segment_list[0][0]-ai_segment_list[-1][-3])<precision_epsilon)and(abs(ai_segment_list[0][1]==ai_segment_list[-1][-2])<precision_epsilon)):
-    outline_closed = True
   #print("dbg536: in {:s} outline_closed: {:d}".format(ai_error_msg_id, outline_closed))
   #print("dbg957: {:0.2f} = {:0.2f}".format(ai_segment_list[0][0], ai_segment_list[-1][-2]))
   #print("dbg958: {:0.2f} = {:0.2f}".format(ai_segment_list[0][1], ai_segment_list[-1][-1]))
@@ -834,15 +1290,12 @@ def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
   segment_nb = point_nb-1
   # check of the outline size
   if(segment_nb<1):
-    print("ERR202: Error in {:s}, the number of segments must be bigger than 1. Currently: {:d}".format(ai_error_msg_id, segment_nb))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR202: Error in {:s}, the number of segments must be bigger than 1. Currently: {:d}".format(ai_error_msg_id, segment_nb))
   if((segment_nb<2)and(outline_closed)):
-    print("ERR203: Error in {:s}, the number of segments must be bigger than 2 with a closed outline. Currently: {:d}".format(ai_error_msg_id, point_nb))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR203: Error in {:s}, the number of segments must be bigger than 2 with a closed outline. Currently: {:d}".format(ai_error_msg_id, point_nb))
   # check the start point
   if(len(ai_segment_list[0])!=3):
-    print("ERR564: the start point is not defined with three floats. {:d}".format(len(ai_segment_list[0])))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR564: the start point is not defined with three floats. {:d}".format(len(ai_segment_list[0])))
   # extract segment data
   pt_end = []
   pt_mid = []
@@ -857,8 +1310,7 @@ def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
       (mid_pt_x, mid_pt_y, end_pt_x, end_pt_y, end_pt_r) = ai_segment_list[pt_idx]
       mid_elem = (mid_pt_x, mid_pt_y)
     else:
-      print("ERR563: Error, the segment is defined with an unexpected number of float {:d}".format(len_segment))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR563: Error, the segment is defined with an unexpected number of float {:d}".format(len_segment))
     pt_end.append((end_pt_x,end_pt_y))
     pt_request.append(end_pt_r)
     pt_mid.append(mid_elem)
@@ -871,6 +1323,118 @@ def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
   if(pt_request[-1]!=0):
     print("WARN947: Warning, in {:s}, the router_bit request of the last point of the outline is not zero: {:0.2f}".format(ai_error_msg_id, pt_request[-1]))
     pt_request[-1]=0
+  return((outline_closed, point_nb, pt_end, pt_mid, pt_request))
+
+def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
+  """
+  This function converts a list of segments (lines and arcs) into a list of segments (lines and arcs) compatible with a CNC cut.
+  For each input segment, you must provide:
+  - the end point (X,Y) for a line 
+      or a middle point (X,Y) and the end point (X,Y) for an arc 
+  - and the router_bit radius R.
+  The start point of a line or an arc is the last point of the previous segment
+  If R=0, the point is an angular corner.
+  If R>0, the point is smoothed to fit the constraints of a router_bit radius R.
+  If R<0, the point is enlarged to fit the constraints of a router_bit radius R.
+  eg: ai_segment_list = [ [x1,y1,r1], .. [x2,y2,r2], .. [x3,y3,x4,y4,r4], .. ]
+  ai_segment_list can also be an Array_Outline at the format-A
+  You can use equally lists or tuples for segment description or segment_list description.
+  The first element is the start point of the outline. It must be a tuple of three floats.
+  If the last point of the last segment is equal to the start point, the outline is closed. Otherwise the outline is open.
+  If the outline is closed, the router_bit request of the start point is used and the router_bit request of the end point of the last segment is ignore.
+  From a programming point of view, ai_segment_list is a tuple of 3-tulpes and/or 5-tuples.
+  The returned list of segments has the same format as the input list of segment of outline_backends.outline_arc_line()
+  The corners are classified first: the angular corners and the independent line-line corners are processed by batches,
+  the other corners one by one with cnc_cut_corner(). The returned outline is the one of cnc_cut_outline_reference().
+  """
+  (outline_closed, point_nb, pt_end, pt_mid, pt_request) = cnc_cut_outline_data(ai_segment_list, ai_error_msg_id)
+  # classification of the corners and batch computation of the line-line corners
+  line_line_corners = {}
+  if(point_nb>2*line_line_batch_min): # a batched corner follows an angular corner
+    corner_class = classify_corners(pt_mid, pt_request)
+    line_line_corners = line_line_corner_batch(pt_end, pt_request, corner_class, outline_closed)
+  arc_circles = {} # the circle of each arc is computed once for all the arc_middle() calls
+  # build outline
+  r_outline = []
+  # start point
+  if(outline_closed):
+    r_outline.extend(cnc_cut_corner(pt_end[-2],pt_mid[-1], pt_end[0], pt_mid[1], pt_end[1], pt_request[0], ai_error_msg_id, 0))
+  else:
+    r_outline.append(pt_end[0])
+  # middle of the outline
+  corn_idx = 0
+  while(corn_idx<point_nb-2):
+    # run of angular corners between lines
+    run_end = corn_idx+1
+    while((run_end<point_nb-1)and(pt_request[run_end]==0)and(pt_mid[run_end] is None)and(pt_mid[run_end+1] is None)):
+      run_end += 1
+    if(run_end>corn_idx+1):
+      r_outline.extend(pt_end[corn_idx+1:run_end])
+      corn_idx = run_end-1
+      continue
+    # get the last point of the outline under construction
+    previous_point = (r_outline[-1][-2], r_outline[-1][-1])
+    # compute a temporary middle point because it might be out of the arc
+    tmp_middle_point = pt_mid[corn_idx+1]
+    if(tmp_middle_point!=None):
+      last_point = previous_point
+      next_point = pt_end[corn_idx+1]
+      error_msg_id = "{:s}.am1".format(ai_error_msg_id)
+      arc_circle = get_arc_circle(arc_circles, pt_end, pt_mid, corn_idx+1, error_msg_id, corn_idx+1)
+      tmp_middle_point = arc_middle(pt_end[corn_idx], pt_mid[corn_idx+1], pt_end[corn_idx+1], last_point, next_point, error_msg_id, corn_idx+1, arc_circle)
+    # following point
+    following_point = pt_end[corn_idx+2]
+    following_middle_point =  pt_mid[corn_idx+2]
+    if(outline_closed and (corn_idx==point_nb-3)):
+      following_point = r_outline[0]
+      if(following_middle_point!=None):
+        error_msg_id = "{:s}.am2".format(ai_error_msg_id)
+        arc_circle = get_arc_circle(arc_circles, pt_end, pt_mid, point_nb-1, error_msg_id, -2)
+        following_middle_point = arc_middle(pt_end[-2], pt_mid[-1], pt_end[-1], pt_end[-2], following_point, error_msg_id, -2, arc_circle)
+    # compute the corner outline
+    router_bit_request = pt_request[corn_idx+1]
+    if((corn_idx+1 in line_line_corners)and(previous_point==pt_end[corn_idx])and(following_point==pt_end[corn_idx+2])):
+      new_corner = line_line_corners[corn_idx+1]
+    elif((router_bit_request>0)and(tmp_middle_point is None)and(following_middle_point is None)):
+      new_corner = smooth_corner_line_line(previous_point, pt_end[corn_idx+1], following_point, router_bit_request, "{:s}.{:d}".format(ai_error_msg_id, corn_idx+1))
+    elif((router_bit_request<0)and(tmp_middle_point is None)and(following_middle_point is None)):
+      new_corner = enlarge_corner_line_line(previous_point, pt_end[corn_idx+1], following_point, abs(router_bit_request), "{:s}.{:d}".format(ai_error_msg_id, corn_idx+1))
+    else:
+      new_corner = cnc_cut_corner(previous_point, tmp_middle_point, pt_end[corn_idx+1], following_middle_point, following_point, pt_request[corn_idx+1], ai_error_msg_id, corn_idx+1)
+    # recompute the final middle point because it might be out of the arc
+    if(pt_mid[corn_idx+1] is not None):
+      last_point = (r_outline[-1][-2], r_outline[-1][-1])
+      next_point = new_corner[0]
+      error_msg_id = "{:s}.am3".format(ai_error_msg_id)
+      arc_circle = get_arc_circle(arc_circles, pt_end, pt_mid, corn_idx+1, error_msg_id, corn_idx+1)
+      new_middle_point = arc_middle(pt_end[corn_idx], pt_mid[corn_idx+1], pt_end[corn_idx+1], last_point, next_point, error_msg_id, corn_idx+1, arc_circle)
+      new_corner[0] = (new_middle_point[0], new_middle_point[1], next_point[0], next_point[1])
+    r_outline.extend(new_corner)
+    corn_idx += 1
+  # last segment
+  if(outline_closed):
+    next_point=r_outline[0]
+  else:
+    next_point=pt_end[-1]
+  if(pt_mid[-1]!=None):
+    last_point = (r_outline[-1][-2], r_outline[-1][-1])
+    error_msg_id = "{:s}.am4".format(ai_error_msg_id)
+    arc_circle = get_arc_circle(arc_circles, pt_end, pt_mid, point_nb-1, error_msg_id, -1)
+    new_middle_point = arc_middle(pt_end[-2], pt_mid[-1], pt_end[-1], last_point, next_point, error_msg_id, -1, arc_circle)
+    last_segment = (new_middle_point[0], new_middle_point[1], next_point[0], next_point[1])
+  else:
+    last_segment = (next_point[0], next_point[1])
+  r_outline.append(last_segment)
+  # the format-B outline is valid by construction and has the closure of the input outline
+  r_outline = Valid_Outline(r_outline, {'outline_type':1, 'closed':outline_closed, 'segment_nb':len(r_outline)-1, 'bbox':None})
+  # function return
+  return(r_outline)
+
+def cnc_cut_outline_reference(ai_segment_list, ai_error_msg_id):
+  """ reference implementation of cnc_cut_outline(): the corners are computed one by one with cnc_cut_corner()
+      cnc_cut_outline() must return the same outline
+  """
+  (outline_closed, point_nb, pt_end, pt_mid, pt_request) = cnc_cut_outline_data(ai_segment_list, ai_error_msg_id)
   # build outline
   r_outline = []
   # start point
@@ -926,15 +1490,18 @@ def cnc_cut_outline(ai_segment_list, ai_error_msg_id):
   else:
     last_segment = (next_point[0], next_point[1])
   r_outline.append(last_segment)
+  # the format-B outline is valid by construction and has the closure of the input outline
+  r_outline = Valid_Outline(r_outline, {'outline_type':1, 'closed':outline_closed, 'segment_nb':len(r_outline)-1, 'bbox':None})
   # function return
   return(r_outline)
 
-def approximate_curve_tangent(ai_polyline, ai_error_msg_id):
+def approximate_curve_tangent(ai_polyline, ai_error_msg_id, ai_vectorized=True):
   """
   This function gets a list of points (outline format b with only lines).
   It returns an outline format c (containing points and their tangent).
   The tangents are computed using the previous and following points.
   You can also consider this function as a convertor from outline_format_b to outline_format_c
+  If numpy is available and ai_vectorized is True, the tangents of the intermediate points are computed at once
   """
   #radian_epsilon = 1/1000.0
   # check if the input outline is closed
@@ -945,14 +1512,12 @@ def approximate_curve_tangent(ai_polyline, ai_error_msg_id):
   point_nb = len(ai_polyline)
   # check the outline point number
   if(point_nb<2):
-    print("ERR309: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR309: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
   # check if ai_polyline is valid
   for i in range(len(ai_polyline)):
     point_len = len(ai_polyline[i])
     if(point_len!=2):
-      print("ERR319: Error in {:s}, the point {:d} of ai_polyline must have exactly 2 elements. Currently: {:d}".format(ai_error_msg_id, i, point_len))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR319: Error in {:s}, the point {:d} of ai_polyline must have exactly 2 elements. Currently: {:d}".format(ai_error_msg_id, i, point_len))
   # processing initialization
   r_outline = []
   pre_point = ai_polyline[0]
@@ -967,19 +1532,24 @@ def approximate_curve_tangent(ai_polyline, ai_error_msg_id):
     tangent_inclination2 = math.atan2((post2_point[1]-pre_point[1])/segment_length, (post2_point[0]-pre_point[0])/segment_length)
     tangent_inclination2_diff = math.fmod(tangent_inclination2-tangent_inclination+5*math.pi, 2*math.pi) - math.pi
     if(abs(tangent_inclination2_diff)>math.pi/3):
-      print("ERR315: Error in {:s}, the tangent_inclination is changing too fast for a curve approximation. tangent_inclination: {:0.2f}  tangent_inclination2: {:0.2f}".format(ai_error_msg_id, tangent_inclination, tangent_inclination2))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR315: Error in {:s}, the tangent_inclination is changing too fast for a curve approximation. tangent_inclination: {:0.2f}  tangent_inclination2: {:0.2f}".format(ai_error_msg_id, tangent_inclination, tangent_inclination2))
     tangent_inclination = math.fmod(tangent_inclination-1*tangent_inclination2_diff/2 + 5*math.pi, 2*math.pi) - math.pi
   r_outline.append((ai_polyline[0][0], ai_polyline[0][1], tangent_inclination)) # first-point
   # processing incrementation
-  for i in range(point_nb-2):
-    # error message
-    i_error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, i)
-    pre_point = ai_polyline[i]
-    post_point = ai_polyline[i+2]
-    segment_length = math.sqrt((post_point[0]-pre_point[0])**2+(post_point[1]-pre_point[1])**2)
-    tangent_inclination = math.atan2((post_point[1]-pre_point[1])/segment_length, (post_point[0]-pre_point[0])/segment_length)
-    r_outline.append((ai_polyline[i+1][0], ai_polyline[i+1][1], tangent_inclination)) # point
+  intermediate_points = None
+  if(ai_vectorized and (numpy is not None) and (point_nb-2>=curve_vectorized_min)):
+    intermediate_points = approximate_curve_tangent_vectorized(ai_polyline)
+  if(intermediate_points is not None):
+    r_outline.extend(intermediate_points)
+  else:
+    for i in range(point_nb-2):
+      # error message
+      i_error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, i)
+      pre_point = ai_polyline[i]
+      post_point = ai_polyline[i+2]
+      segment_length = math.sqrt((post_point[0]-pre_point[0])**2+(post_point[1]-pre_point[1])**2)
+      tangent_inclination = math.atan2((post_point[1]-pre_point[1])/segment_length, (post_point[0]-pre_point[0])/segment_length)
+      r_outline.append((ai_polyline[i+1][0], ai_polyline[i+1][1], tangent_inclination)) # point
   # processing ending
   pre_point = ai_polyline[-2]
   post_point = ai_polyline[-1]
@@ -993,14 +1563,27 @@ def approximate_curve_tangent(ai_polyline, ai_error_msg_id):
     tangent_inclination2 = math.atan2((post_point[1]-pre2_point[1])/segment_length, (post_point[0]-pre2_point[0])/segment_length)
     tangent_inclination2_diff = math.fmod(tangent_inclination2-tangent_inclination+5*math.pi, 2*math.pi) - math.pi
     if(abs(tangent_inclination2_diff)>math.pi/3):
-      print("ERR315: Error in {:s}, the tangent_inclination is changing too fast for a curve approximation. tangent_inclination: {:0.2f}  tangent_inclination2: {:0.2f}".format(ai_error_msg_id, tangent_inclination, tangent_inclination2))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR315: Error in {:s}, the tangent_inclination is changing too fast for a curve approximation. tangent_inclination: {:0.2f}  tangent_inclination2: {:0.2f}".format(ai_error_msg_id, tangent_inclination, tangent_inclination2))
     tangent_inclination = math.fmod(tangent_inclination-1*tangent_inclination2_diff/2 + 5*math.pi, 2*math.pi) - math.pi
   r_outline.append((ai_polyline[-1][0], ai_polyline[-1][1], tangent_inclination)) # end-point
   # return
   return(r_outline)
 
-def smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id):
+def approximate_curve_tangent_vectorized(ai_polyline):
+  """ sub-function of approximate_curve_tangent(): compute with numpy the tangents of the intermediate points of ai_polyline
+      It returns None if a segment is null, so approximate_curve_tangent() raises the error of the scalar computation
+  """
+  points = numpy.array(ai_polyline, dtype=float)
+  dx = points[2:,0]-points[:-2,0]
+  dy = points[2:,1]-points[:-2,1]
+  segment_length = numpy.sqrt(numpy.power(dx, 2)+numpy.power(dy, 2))
+  if(not numpy.all(segment_length>0)):
+    return(None)
+  tangent_inclination = numpy.arctan2(dy/segment_length, dx/segment_length).tolist()
+  r_points = [ (ai_polyline[i+1][0], ai_polyline[i+1][1], tangent_inclination[i]) for i in range(len(tangent_inclination)) ]
+  return(r_points)
+
+def smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id, ai_vectorized=True):
   """
   This function computes a serie of 2N arcs that pass through the (N+1) points defined by the N line-segments of ai_polyline.
   ai_polyline is an outline of format C, (list of list of 3 floats).
@@ -1008,8 +1591,12 @@ def smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_
   ai_router_bit_request is just used to warn if the radius_of_curvature is smaller than the router_bit. Because this function can not know on which side of the outline is the material, those warnings might be irrelevant. If you don't want this feature, just set it to 0, this disables these warnings.
   ai_error_msg_id is a string, that can help you to track bugs and erros.
   The function returns an outline of format B containing only arcs
+  If numpy is available and ai_vectorized is True, the arcs of all the segments are computed at once with the same results, warnings and errors
   """
-  r_outline = sub_smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id)
+  if(ai_vectorized):
+    r_outline = sub_smooth_outline_c_curve_vectorized(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id)
+  else:
+    r_outline = sub_smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id)
   #for i in range(len(r_outline)):
   #  print("dbg339: i r_outline[i]:", i, r_outline[i])
   # return
@@ -1037,6 +1624,8 @@ def ideal_outline(ai_outline, ai_error_msg_id):
       The returned ideal outline is probably not makable by a 3-axis CNC
       but you can use it to display it and understand the cnc_cut_outline() and smooth_outline_c_curve()
   """
+  if(isinstance(ai_outline, Array_Outline)): # the list of segments is accepted by all the backends
+    return(ai_outline.to_format_B().to_list())
   outline_type = check_outline_format(ai_outline)
   if(outline_type==2): # format-A or format-C outline
     r_outline = []
@@ -1045,16 +1634,120 @@ def ideal_outline(ai_outline, ai_error_msg_id):
       # check the segment length
       segment_len = len(i_segment)
       if((segment_len!=3)and(segment_len!=5)):
-        print("ERR868: Error in {:s}.{:d}, len(segment_len) is not 3 or 5!".format(ai_error_msg_id, i))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR868: Error in {:s}.{:d}, len(segment_len) is not 3 or 5!".format(ai_error_msg_id, i))
       i += 1
       # construct the ideal outline
       r_outline.append(i_segment[:-1]) # remove the third or the fifth element
+    # same points, same closure
+    r_outline = Valid_Outline(r_outline, {'outline_type':1, 'closed':is_outline_closed(ai_outline), 'segment_nb':len(r_outline)-1, 'bbox':None})
   else: # format-B circle or format-B general outline
     print("WARN441: Warning in {:s}, nothing to do, the outline is already in format-B".format(ai_error_msg_id))
     r_outline = ai_outline
   return(r_outline)
 
+def point_segment_distance(ai_point, ai_A, ai_B):
+  """ return the distance between the point ai_point and the segment [ai_A, ai_B]
+  """
+  ABX = ai_B[0]-ai_A[0]
+  ABY = ai_B[1]-ai_A[1]
+  APX = ai_point[0]-ai_A[0]
+  APY = ai_point[1]-ai_A[1]
+  AB2 = ABX**2+ABY**2
+  t = 0
+  if(AB2>0):
+    t = min(1, max(0, (APX*ABX+APY*ABY)/AB2))
+  r_distance = math.sqrt((APX-t*ABX)**2+(APY-t*ABY)**2)
+  return(r_distance)
+
+def simplify_outline(ai_outline, ai_tolerance, ai_error_msg_id):
+  """ reduce the number of segments of a format-B outline before writing it:
+      the consecutive colinear lines are merged, the consecutive co-circular arcs are merged
+      and the nearly flat arcs are replaced by lines.
+      The points of the input outline stay closer than ai_tolerance to the simplified outline
+      A circle is returned unchanged. ai_tolerance<=0 disables the simplification
+  """
+  if(isinstance(ai_outline, Array_Outline)):
+    ai_outline = ai_outline.to_list()
+  outline_type = check_outline_format(ai_outline)
+  if((outline_type==0)or(ai_tolerance<=0)):
+    return(ai_outline)
+  if(outline_type!=1):
+    raise cnc25d_error.GeometryError("ERR651: Error in {:s}, simplify_outline() expects a format-B outline. Use cnc_cut_outline() first".format(ai_error_msg_id))
+  if(isinstance(ai_outline, Valid_Outline)):
+    resolved_arcs = ai_outline.get_resolved_arcs()
+  else:
+    resolved_arcs = outline_resolved_arcs(ai_outline)
+  # the backends reject shorter segments
+  length_epsilon = math.pi/1000
+  angle_epsilon = math.pi/10000
+  # the current run of mergeable segments: its type (0: none, 1: line, 2: arc), its start point and its points to be checked
+  run_type = 0
+  run_start = None
+  run_points = []
+  run_segment = None
+  run_sweep = 0
+  run_center = None
+  run_radius = 0
+  r_outline = [ai_outline[0]]
+  for i in range(1, len(ai_outline)):
+    segment = ai_outline[i]
+    start = (ai_outline[i-1][-2], ai_outline[i-1][-1])
+    end = (segment[-2], segment[-1])
+    segment_type = 1
+    inner_points = []
+    if(resolved_arcs[i] is not None):
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arcs[i]
+      # the arc is checked at its middle point and at the middle of its two halves
+      inner_points = [(ptix+lia*math.cos(u+uv/2), ptiy+lia*math.sin(u+uv/2), uv/2), (segment[0], segment[1], uv), (ptix+lia*math.cos(v+vw/2), ptiy+lia*math.sin(v+vw/2), uv+vw/2)]
+      if(lia==0): # colinear arc
+        inner_points = [(segment[0], segment[1], 0)]
+      elif((abs(uw)>=math.pi)or(lia*(1-math.cos(uw/2))>ai_tolerance)): # not a nearly flat arc
+        segment_type = 2
+    merged = False
+    if((segment_type==1)and(run_type==1)):
+      points = run_points + [start] + inner_points
+      if(math.sqrt((end[0]-run_start[0])**2+(end[1]-run_start[1])**2)>length_epsilon):
+        merged = all([ point_segment_distance(p, run_start, end)<=ai_tolerance for p in points ])
+      if(merged):
+        run_points = points
+        run_segment = (end[0], end[1])
+    elif((segment_type==2)and(run_type==2)and((uw>0)==(run_sweep>0))and(abs(run_sweep+uw)<2*math.pi-angle_epsilon)):
+      if((math.sqrt((ptix-run_center[0])**2+(ptiy-run_center[1])**2)<=ai_tolerance)and(abs(lia-run_radius)<=ai_tolerance)):
+        sweep = run_sweep+uw
+        points = run_points + [(start[0], start[1], run_sweep)] + [ (p[0], p[1], run_sweep+p[2]) for p in inner_points ]
+        # the middle point of the merged arc is the point of the run the closest to its half sweep
+        middle = min(points, key=lambda p: abs(p[2]-sweep/2))
+        try:
+          merged_arc = arc_3_points_to_radius_center_angles(run_start, middle, end)
+        except cnc25d_error.BackendError:
+          merged_arc = (0, 0, 0, 0, 0, 0, 0, 0, 0)
+        (lia2, ptix2, ptiy2) = merged_arc[:3]
+        if((lia2>0)and((merged_arc[8]>0)==(sweep>0))):
+          merged = all([ abs(math.sqrt((p[0]-ptix2)**2+(p[1]-ptiy2)**2)-lia2)<=ai_tolerance for p in points ])
+        if(merged):
+          run_points = points
+          run_segment = (middle[0], middle[1], end[0], end[1])
+          run_sweep = sweep
+          run_center = (ptix2, ptiy2)
+          run_radius = lia2
+    if(not merged):
+      if(run_type!=0):
+        r_outline.append(run_segment)
+      run_type = segment_type
+      run_start = start
+      if(segment_type==1):
+        run_points = inner_points
+        run_segment = (end[0], end[1])
+      else:
+        run_points = inner_points
+        run_segment = tuple(segment)
+        run_sweep = uw
+        run_center = (ptix, ptiy)
+        run_radius = lia
+  r_outline.append(run_segment)
+  r_outline = Valid_Outline(r_outline)
+  return(r_outline)
+
 
 ################################################################
 # cnc_cut_outline API testing
@@ -1498,6 +2191,84 @@ def cnc_cut_outline_test5(ai_sw_router_bit_radius):
 # cnc_cut_outline command line interface
 ################################################################
 
+def cnc_cut_outline_benchmark(ai_design_names=('gearwheel', 'gearring', 'box_wood_frame'), ai_repeat_nb=10):
+  """ compare the execution time and the results of cnc_cut_outline() and cnc_cut_outline_reference()
+      with the outlines of the figures of the designs ai_design_names. The format-B outlines get angular corners
+  """
+  import time
+  import cnc25d_design # imported here because the designs import cnc_outline
+  print("Run the cnc_cut_outline benchmark with the designs {:s} ...".format(', '.join(ai_design_names)))
+  r_status = 0
+  for design_name in ai_design_names:
+    my_design = getattr(cnc25d_design, design_name)()
+    outlines = []
+    for fig_id in my_design.get_2d_figure_id_list():
+      for ol in my_design.get_A_figure(fig_id):
+        outline_type = check_outline_format(ol)
+        if(outline_type==2):
+          outlines.append(ol)
+        elif(outline_type==1): # like the gear profiles, with angular corners
+          outlines.append([ tuple(segment)+(0,) for segment in ol ])
+    # compare the results
+    for i in range(len(outlines)):
+      if(repr(list(cnc_cut_outline(outlines[i], "bench"))) != repr(list(cnc_cut_outline_reference(outlines[i], "bench")))):
+        print("ERR187: Error, cnc_cut_outline() and cnc_cut_outline_reference() return different outlines for the outline {:d} of {:s}".format(i, design_name))
+        r_status = 1
+    # measure the execution times
+    l_time = []
+    for f_cut in (cnc_cut_outline_reference, cnc_cut_outline):
+      best_time = 0
+      for j in range(ai_repeat_nb):
+        start_time = time.time()
+        for ol in outlines:
+          f_cut(ol, "bench")
+        duration = time.time()-start_time
+        if((j==0)or(duration<best_time)):
+          best_time = duration
+      l_time.append(best_time)
+    corner_nb = sum([ len(ol) for ol in outlines ])
+    print("{:s}: {:d} outlines, {:d} corners, cnc_cut_outline_reference: {:0.2f} ms, cnc_cut_outline: {:0.2f} ms".format(design_name, len(outlines), corner_nb, 1000*l_time[0], 1000*l_time[1]))
+  return(r_status)
+
+def smooth_outline_c_curve_benchmark(ai_sample_nbs=(10, 20, 50, 100, 200), ai_repeat_nb=20):
+  """ compare the execution time and the results of the scalar and numpy versions of approximate_curve_tangent() and smooth_outline_c_curve()
+      with involute gear flanks of ai_sample_nbs points
+  """
+  import time
+  print("Run the smooth_outline_c_curve benchmark with involute flanks of {:s} points (numpy: {:s}) ...".format(', '.join([ str(n) for n in ai_sample_nbs ]), str(numpy is not None)))
+  r_status = 0
+  base_radius = 20.0
+  for sample_nb in ai_sample_nbs:
+    # involute of the base circle, the tangent inclination at the parameter u is u
+    flank_B = []
+    flank_C = []
+    for i in range(sample_nb):
+      u = 0.1+3.0*i/(sample_nb-1)
+      (px, py) = (base_radius*(math.cos(u)+u*math.sin(u)), base_radius*(math.sin(u)-u*math.cos(u)))
+      flank_B.append((px, py))
+      flank_C.append((px, py, u))
+    l_step = (
+      ('approximate_curve_tangent', lambda vectorized: approximate_curve_tangent(flank_B, "bench", vectorized)),
+      ('smooth_outline_c_curve', lambda vectorized: smooth_outline_c_curve(flank_C, math.pi/1000, 0, "bench", vectorized)))
+    for (step_name, step_function) in l_step:
+      # compare the results
+      if(repr(step_function(False))!=repr(step_function(True))):
+        print("ERR188: Error, the scalar and the numpy {:s}() return different outlines for {:d} points".format(step_name, sample_nb))
+        r_status = 1
+      # measure the execution times
+      l_time = []
+      for vectorized in (False, True):
+        best_time = 0
+        for j in range(ai_repeat_nb):
+          start_time = time.time()
+          step_function(vectorized)
+          duration = time.time()-start_time
+          if((j==0)or(duration<best_time)):
+            best_time = duration
+        l_time.append(best_time)
+      print("{:s} with {:d} points: scalar: {:0.3f} ms, numpy: {:0.3f} ms".format(step_name, sample_nb, 1000*l_time[0], 1000*l_time[1]))
+  return(r_status)
+
 def cnc_cut_outline_cli(ai_args=""):
   """ command line interface of cnc_cut_outline.py when it is used in standalone
   """
@@ -1518,6 +2289,10 @@ def cnc_cut_outline_cli(ai_args=""):
     help='Small shapes for development, that are displayed with Tkinter.')
   cco_parser.add_argument('--test5','--t5', action='store_true', default=False, dest='sw_test5',
     help='Small shapes to development smooth_curve, that are displayed with Tkinter.')
+  cco_parser.add_argument('--benchmark','--bm', action='store_true', default=False, dest='sw_benchmark',
+    help='Compare cnc_cut_outline() with cnc_cut_outline_reference() on the outlines of the gear and box_wood_frame designs.')
+  cco_parser.add_argument('--curve_benchmark','--cbm', action='store_true', default=False, dest='sw_curve_benchmark',
+    help='Compare the scalar and numpy versions of smooth_outline_c_curve() on involute flanks of 10 to 200 points.')
   effective_args = design_help.get_effective_args(ai_args)
   cco_args = cco_parser.parse_args(effective_args)
   print("dbg111: start testing cnc_cut_outline.py")
@@ -1531,6 +2306,10 @@ def cnc_cut_outline_cli(ai_args=""):
     cnc_cut_outline_test4(cco_args.sw_router_bit_radius)
   if(cco_args.sw_test5):
     cnc_cut_outline_test5(cco_args.sw_router_bit_radius)
+  if(cco_args.sw_benchmark):
+    cnc_cut_outline_benchmark()
+  if(cco_args.sw_curve_benchmark):
+    smooth_outline_c_curve_benchmark()
   print("dbg999: end of script")
   
     
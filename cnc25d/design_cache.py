@@ -0,0 +1,182 @@
+# design_cache.py
+# a persistent cache on disk to reuse the results of the cnc25d designs between two processes
+# created by charlyoleg on 2014/04/07
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+design_cache.py is part of the Cnc25D API.
+it stores on disk the checked constraint and the figures of a design
+so a new process calling the design with the same constraint can skip their computation.
+An entry is a compressed pickle file. The least recently used entries are removed
+when the cache directory exceeds its size budget.
+"""
+
+################################################################
+# import
+################################################################
+
+# Python standard library
+import sys, os
+import hashlib
+import cPickle as pickle
+import zlib
+import tempfile
+# cnc25d
+import design_help
+from cnc25d_version import cnc25d_version # a new release must not reuse the entries of an old one
+
+################################################################
+# disk cache parameters
+################################################################
+
+disk_cache_format = 2 # the entries contain the figures of the figure producers
+disk_cache_suffix = '.cnc25d_cache'
+default_disk_cache_size = 512 # Mega-Bytes
+
+################################################################
+# disk cache functions
+################################################################
+
+def disk_cache_key(ai_design_name, ai_constraint):
+  """ return the key of the entry associated to the design ai_design_name and the input constraint ai_constraint
+      return None if the constraint contains objects that can not be identified between two processes
+  """
+  c_txt = design_help.canonical_repr(ai_constraint)
+  r_key = None
+  if(not ' at 0x' in c_txt): # the representation of functions or instances contains memory addresses
+    k_txt = "{:s} {:d} {:s} {:s}".format(cnc25d_version, disk_cache_format, ai_design_name, c_txt)
+    r_key = hashlib.sha1(k_txt).hexdigest()
+  return(r_key)
+
+def disk_cache_filename(ai_cache_dir, ai_key):
+  """ return the path of the file containing the entry ai_key
+  """
+  r_filename = os.path.join(ai_cache_dir, "{:s}{:s}".format(ai_key, disk_cache_suffix))
+  return(r_filename)
+
+def disk_cache_read(ai_cache_dir, ai_key):
+  """ return the value of the entry ai_key or None if the entry is missing or corrupted
+  """
+  r_value = None
+  entry_filename = disk_cache_filename(ai_cache_dir, ai_key)
+  if(os.path.isfile(entry_filename)):
+    try:
+      ifh = open(entry_filename, 'rb')
+      entry_data = ifh.read()
+      ifh.close()
+      r_value = pickle.loads(zlib.decompress(entry_data))
+      os.utime(entry_filename, None) # the modification time tracks the last use for the eviction
+    except Exception as exc:
+      print("WARN079: Warning, the disk cache entry {:s} is ignored because of {:s}".format(entry_filename, str(exc)))
+      r_value = None
+  return(r_value)
+
+def disk_cache_write(ai_cache_dir, ai_key, ai_value, ai_size_budget=default_disk_cache_size):
+  """ write the entry ai_key with the value ai_value and evict the old entries to respect ai_size_budget (in MB)
+      return 0 if the entry has been written, 2 if the value can not be stored
+  """
+  r_status = 2
+  try:
+    entry_data = zlib.compress(pickle.dumps(ai_value, pickle.HIGHEST_PROTOCOL), 6)
+  except (pickle.PicklingError, TypeError) as exc:
+    print("WARN094: Warning, the disk cache entry {:s} can not be written because of {:s}".format(ai_key, str(exc)))
+    entry_data = None
+  if(entry_data!=None):
+    if(not os.path.isdir(ai_cache_dir)):
+      design_help.mkdir_p(ai_cache_dir)
+    # write in a temporary file and then rename it, so concurrent processes never read a partial entry
+    (tmp_fd, tmp_filename) = tempfile.mkstemp(suffix='.tmp', dir=ai_cache_dir)
+    ofh = os.fdopen(tmp_fd, 'wb')
+    ofh.write(entry_data)
+    ofh.close()
+    os.rename(tmp_filename, disk_cache_filename(ai_cache_dir, ai_key))
+    disk_cache_evict(ai_cache_dir, ai_size_budget)
+    r_status = 0
+  return(r_status)
+
+def disk_cache_evict(ai_cache_dir, ai_size_budget=default_disk_cache_size):
+  """ remove the least recently used entries until the cache directory is smaller than ai_size_budget (in MB)
+      return the number of removed entries
+  """
+  size_budget = int(ai_size_budget*1024*1024)
+  entry_list = []
+  total_size = 0
+  for f in os.listdir(ai_cache_dir):
+    if(f.endswith(disk_cache_suffix)):
+      entry_filename = os.path.join(ai_cache_dir, f)
+      try:
+        f_stat = os.stat(entry_filename)
+      except OSError: # removed by a concurrent process
+        continue
+      entry_list.append((f_stat.st_mtime, f_stat.st_size, entry_filename))
+      total_size += f_stat.st_size
+  entry_list.sort()
+  r_removed = 0
+  for (f_mtime, f_size, entry_filename) in entry_list:
+    if(total_size<=size_budget):
+      break
+    try:
+      os.remove(entry_filename)
+      r_removed += 1
+    except OSError: # removed by a concurrent process
+      pass
+    total_size -= f_size
+  return(r_removed)
+
+################################################################
+# test-functions
+################################################################
+
+def design_cache_test():
+  """ write, read and evict some entries in a temporary directory
+  """
+  test_dir = tempfile.mkdtemp(prefix='cnc25d_cache_test_')
+  c1 = {'length':10.0, 'sub_c':{'b':1, 'a':(2.0, 3.0)}}
+  c2 = {'sub_c':{'a':[2.0, 3.0], 'b':1}, 'length':10.0}
+  k1 = disk_cache_key('test_design', c1)
+  if(k1!=disk_cache_key('test_design', c2)):
+    print("ERR151: Error, the disk cache key depends on the dictionary order")
+    sys.exit(2)
+  if(disk_cache_key('test_design', {'f':design_cache_test})!=None):
+    print("ERR154: Error, a constraint containing a function must not get a disk cache key")
+    sys.exit(2)
+  v1 = {'constraint':c1, 'A_figures':{'fig':[[(0.0, 0.0, 1.0), (10.0, 0.0, 1.0), (0.0, 0.0, 0)]]}}
+  disk_cache_write(test_dir, k1, v1)
+  if(disk_cache_read(test_dir, k1)!=v1):
+    print("ERR160: Error, the disk cache entry has been modified")
+    sys.exit(2)
+  for i in range(5):
+    disk_cache_write(test_dir, disk_cache_key('test_design', {'i':i}), v1, 0.0)
+  remaining_entries = [ f for f in os.listdir(test_dir) if f.endswith(disk_cache_suffix) ]
+  if(len(remaining_entries)!=0):
+    print("ERR166: Error, {:d} entries remain in the disk cache with a size budget of zero".format(len(remaining_entries)))
+    sys.exit(2)
+  os.rmdir(test_dir)
+  print("design_cache_test: OK")
+  return(1)
+
+################################################################
+# main
+################################################################
+
+if __name__ == "__main__":
+  print("design_cache.py says hello!\n")
+  design_cache_test()
+
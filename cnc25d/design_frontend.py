@@ -43,12 +43,14 @@ it provides functions that complete the bare_design class to create design scrip
 import math
 import sys
 import re
+import copy
 #import argparse
 #from datetime import datetime
 #import os, errno
 ## cnc25d
 #import outline_backends
 #import export_2d
+import cnc25d_error
 
 
 ################################################################
@@ -59,6 +61,42 @@ import re
 # function to check the constraint dictionary
 ################################################################
 
+compiled_check_cache = {} # (error_msg, constraint_dict_name) -> (code object, constraint keys, readable message)
+
+def compile_check(error_msg, constraint_dict_name='c'):
+  """ compile the check expression error_msg once
+      return the code object, the list of the constraint keys used by the expression and the expression without the dictionary name
+  """
+  cache_key = (error_msg, constraint_dict_name)
+  if(not cache_key in compiled_check_cache):
+    check_code = compile(error_msg, '<check>', 'eval')
+    error_msg_without_dict = re.sub("'\]", " ", re.sub("{:s}\['".format(constraint_dict_name), " ", error_msg))
+    var_list = re.findall("{:s}\['\w+'\]".format(constraint_dict_name), error_msg)
+    #print("dbg075: var_list:", var_list)
+    var_keys = []
+    for d_item in var_list:
+      d_key = re.sub("'\].*$", "", re.sub("^.*\['", "", d_item))
+      #d_key = re.sub("^.*\['(\w+)'\]$", "\1", d_item)
+      #print("dbg078: d_key:", d_key)
+      if(not d_key in var_keys):
+        var_keys.append(d_key)
+    compiled_check_cache[cache_key] = (check_code, var_keys, error_msg_without_dict)
+  return(compiled_check_cache[cache_key])
+
+def check_failure(constraint_dict, error_id, error_msg, constraint_dict_name='c', warning_nerror=False):
+  """ return the message and the dictionary of the constraint values of a failed check
+  """
+  (check_code, var_keys, error_msg_without_dict) = compile_check(error_msg, constraint_dict_name)
+  msg_introduction = "Error on"
+  if(warning_nerror):
+    msg_introduction = "Warning on"
+  #print("ERR073: Error on {:s} with:".format(error_msg))
+  r_check_msg = "{:s}: {:s} {:s} with:".format(error_id, msg_introduction, error_msg_without_dict)
+  r_var_values = {}
+  for d_key in var_keys:
+    r_var_values["{:s}['{:s}']".format(constraint_dict_name, d_key)] = constraint_dict[d_key]
+  return((r_check_msg, r_var_values))
+
 def check(constraint_dict={}, error_id="ERR000", error_msg='', constraint_dict_name='c', condition=None, warning_nerror=False):
   """ If the condition is False, print the error-message with the associated constraints and exit
       If the condition is set to None, the error_msg is evaluated
@@ -66,31 +104,200 @@ def check(constraint_dict={}, error_id="ERR000", error_msg='', constraint_dict_n
   test_result = condition
   if(condition==None):
     #print("dbg068: eval(' {:s} ')".format(error_msg))
-    eval_context = {constraint_dict_name:constraint_dict}
-    test_result = eval(error_msg, eval_context)
+    test_result = eval(compile_check(error_msg, constraint_dict_name)[0], {constraint_dict_name:constraint_dict})
     #print("dbg070: test_result {:d}".format(test_result))
   if(not test_result):
-    msg_introduction = "Error on"
-    if(warning_nerror):
-      msg_introduction = "Warning on"
-    #print("ERR073: Error on {:s} with:".format(error_msg))
-    error_msg_without_dict = re.sub("'\]", " ", re.sub("{:s}\['".format(constraint_dict_name), " ", error_msg))
-    print("{:s}: {:s} {:s} with:".format(error_id, msg_introduction, error_msg_without_dict))
-    var_list = re.findall("{:s}\['\w+'\]".format(constraint_dict_name), error_msg)
-    #print("dbg075: var_list:", var_list)
-    for d_item in var_list:
-      d_key = re.sub("'\].*$", "", re.sub("^.*\['", "", d_item))
-      #d_key = re.sub("^.*\['(\w+)'\]$", "\1", d_item)
-      #print("dbg078: d_key:", d_key)
-      d_val = constraint_dict[d_key]
-      print("{:s}['{:s}'] = {:s}".format(constraint_dict_name, d_key, str(d_val)))
+    (check_msg, var_values) = check_failure(constraint_dict, error_id, error_msg, constraint_dict_name, warning_nerror)
     if(not warning_nerror):
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError(check_msg, var_values)
     else:
-      pass
-      #print("Should exit with error status 2")
+      print("{:s}".format(check_msg))
+      for k in sorted(var_values.keys()):
+        print("{:s} = {:s}".format(k, str(var_values[k])))
   return(0)
 
+def check_rules(constraint_dict, rule_table, constraint_dict_name='c'):
+  """ evaluate all the rules of rule_table with the constraint dictionary
+      a rule is a tuple (error_id, error_msg) or (error_id, error_msg, warning_nerror)
+      The warnings are printed. The failed errors are reported together in one ConstraintError
+      return the list of the error_id of the failed warnings
+  """
+  eval_context = {constraint_dict_name:constraint_dict}
+  error_msgs = []
+  error_values = {}
+  r_warnings = []
+  for rule in rule_table:
+    warning_nerror = False
+    if(len(rule)>2):
+      warning_nerror = rule[2]
+    if(not eval(compile_check(rule[1], constraint_dict_name)[0], eval_context)):
+      (check_msg, var_values) = check_failure(constraint_dict, rule[0], rule[1], constraint_dict_name, warning_nerror)
+      if(warning_nerror):
+        r_warnings.append(rule[0])
+        print("{:s}".format(check_msg))
+        for k in sorted(var_values.keys()):
+          print("{:s} = {:s}".format(k, str(var_values[k])))
+      else:
+        error_msgs.append(check_msg)
+        error_values.update(var_values)
+  if(len(error_msgs)>0):
+    raise cnc25d_error.ConstraintError('\n'.join(error_msgs), error_values)
+  return(r_warnings)
+
+################################################################
+# incremental constraint check
+################################################################
+
+deleted_constraint = object() # marks a constraint removed by a rule
+
+def constraint_snapshot(ai_value):
+  """ copy the containers of a constraint value, so later in-place modifications don't alter it
+  """
+  r_value = ai_value
+  if(isinstance(ai_value, (list, dict, tuple, set))):
+    r_value = copy.deepcopy(ai_value)
+  return(r_value)
+
+class Constraint_Tracker(dict):
+  """ constraint dictionary that records the keys read and written by a constraint rule
+      c.copy() returns a tracker whose reads are also recorded by its parent
+      Only c[k], c.get(), k in c, the value iterators and the modifying methods are tracked
+  """
+  def __init__(self, ai_constraint={}, ai_parent=None):
+    dict.__init__(self, ai_constraint)
+    self.parent = ai_parent
+    self.start_rule()
+
+  def start_rule(self):
+    """ forget the keys recorded for the previous rule
+    """
+    self.read_keys = set()
+    self.written_keys = set()
+
+  def record_read(self, ai_key):
+    if(not ai_key in self.written_keys): # a value set by the rule itself is not a dependency
+      self.read_keys.add(ai_key)
+      if(self.parent!=None):
+        self.parent.record_read(ai_key)
+
+  def __getitem__(self, ai_key):
+    self.record_read(ai_key)
+    return(dict.__getitem__(self, ai_key))
+
+  def get(self, ai_key, ai_default=None):
+    self.record_read(ai_key)
+    return(dict.get(self, ai_key, ai_default))
+
+  def __contains__(self, ai_key):
+    self.record_read(ai_key)
+    return(dict.__contains__(self, ai_key))
+
+  def has_key(self, ai_key):
+    return(self.__contains__(ai_key))
+
+  def __setitem__(self, ai_key, ai_value):
+    self.written_keys.add(ai_key)
+    dict.__setitem__(self, ai_key, ai_value)
+
+  def __delitem__(self, ai_key):
+    self.written_keys.add(ai_key)
+    dict.__delitem__(self, ai_key)
+
+  def setdefault(self, ai_key, ai_default=None):
+    self.record_read(ai_key)
+    self.written_keys.add(ai_key)
+    return(dict.setdefault(self, ai_key, ai_default))
+
+  def pop(self, ai_key, *args):
+    self.record_read(ai_key)
+    self.written_keys.add(ai_key)
+    return(dict.pop(self, ai_key, *args))
+
+  def update(self, *args, **kwargs):
+    new_values = dict(*args, **kwargs)
+    for k in new_values.keys():
+      self[k] = new_values[k]
+
+  def record_all_reads(self):
+    for k in dict.keys(self):
+      self.record_read(k)
+
+  def items(self):
+    self.record_all_reads()
+    return(dict.items(self))
+
+  def iteritems(self):
+    self.record_all_reads()
+    return(dict.iteritems(self))
+
+  def values(self):
+    self.record_all_reads()
+    return(dict.values(self))
+
+  def itervalues(self):
+    self.record_all_reads()
+    return(dict.itervalues(self))
+
+  def copy(self):
+    return(Constraint_Tracker(self, self))
+
+  def get_rule_record(self):
+    """ return the keys read by the rule and a snapshot of the values it has written
+        the containers read by the rule are considered as written because they might have been modified in place
+    """
+    r_reads = frozenset(self.read_keys)
+    r_writes = {}
+    for k in self.written_keys | self.read_keys:
+      if(dict.__contains__(self, k)):
+        v = dict.__getitem__(self, k)
+        if((k in self.written_keys)or(isinstance(v, (list, dict, set)))):
+          r_writes[k] = constraint_snapshot(v)
+      elif(k in self.written_keys):
+        r_writes[k] = deleted_constraint
+    return((r_reads, r_writes))
+
+def run_constraint_rules(ai_rules, ai_constraint, ai_history=None):
+  """ apply the list of constraint rules ai_rules to a copy of the input constraint ai_constraint
+      A rule is a function f(c) that checks c and completes it in place.
+      ai_history is the history returned by the previous call. With it, only the rules that read or write
+      a value that has changed are executed again. The other ones replay the values they had set.
+      return the checked constraint, the new history and the number of executed rules
+  """
+  c = Constraint_Tracker(dict([ (k, constraint_snapshot(v)) for (k, v) in ai_constraint.iteritems() ]))
+  dirty_keys = None # None means all rules must be executed
+  if((ai_history!=None)and(len(ai_history['records'])==len(ai_rules))):
+    previous_input = ai_history['input']
+    dirty_keys = set()
+    for k in set(ai_constraint.keys()) | set(previous_input.keys()):
+      if(ai_constraint.get(k, deleted_constraint) != previous_input.get(k, deleted_constraint)):
+        dirty_keys.add(k)
+  r_history = {'input':dict([ (k, constraint_snapshot(v)) for (k, v) in ai_constraint.iteritems() ]), 'records':[]}
+  r_run_nb = 0
+  for i in range(len(ai_rules)):
+    if(dirty_keys==None):
+      old_record = None
+    else:
+      old_record = ai_history['records'][i]
+    if((old_record==None)or(len(old_record[0] & dirty_keys)>0)or(len(dirty_keys.intersection(old_record[1].keys()))>0)):
+      c.start_rule()
+      ai_rules[i](c)
+      new_record = c.get_rule_record()
+      r_run_nb += 1
+      if(old_record!=None): # propagate only the values that have really changed
+        for k in set(new_record[1].keys()) | set(old_record[1].keys()):
+          if(new_record[1].get(k, deleted_constraint) != old_record[1].get(k, deleted_constraint)):
+            dirty_keys.add(k)
+    else:
+      new_record = old_record
+      for (k, v) in old_record[1].iteritems():
+        if(v is deleted_constraint):
+          dict.pop(c, k, None)
+        else:
+          dict.__setitem__(c, k, constraint_snapshot(v))
+    r_history['records'].append(new_record)
+  r_constraint = dict(c)
+  return((r_constraint, r_history, r_run_nb))
+
 ################################################################
 # function and class to construct figures and outlines : move to draw_2d_frontend
 ################################################################
@@ -112,11 +319,45 @@ def test_check():
   check(c, "ERR107", "c['a']>c['c1']", warning_nerror=True)
 
 
+def test_check_rules():
+  """ test the API function check_rules()
+  """
+  print("\nTest check_rules()")
+  c={'a':3, 'b':7.008, 'c1':15}
+  rules = [("ERR204", "c['a']<c['b']"), ("ERR205", "c['a']>c['b']", True), ("ERR206", "c['a']>c['b']"), ("ERR207", "c['a']>c['c1']")]
+  try:
+    check_rules(c, rules)
+  except cnc25d_error.ConstraintError as exc:
+    print("ConstraintError {:s} with {:d} lines".format(exc.error_id, len(exc.error_msg.split('\n'))))
+    cnc25d_error.print_error(exc)
+
+def test_run_constraint_rules():
+  """ test the API function run_constraint_rules()
+  """
+  print("\nTest run_constraint_rules()")
+  def rule_a(c):
+    c['a2'] = 2*c['a']
+  def rule_b(c):
+    c['b2'] = c['b'] + c['a2']
+  def rule_l(c):
+    c['l'].append(c['b2'])
+  rules = [rule_a, rule_b, rule_l]
+  c = {'a':1, 'b':10, 'l':[]}
+  (r_c, history, run_nb) = run_constraint_rules(rules, c)
+  print("full run: {:d} rules, {:s}".format(run_nb, str(sorted(r_c.items()))))
+  c['b'] = 20
+  (r_c, history, run_nb) = run_constraint_rules(rules, c, history)
+  print("b changed: {:d} rules, {:s}".format(run_nb, str(sorted(r_c.items()))))
+  (r_c, history, run_nb) = run_constraint_rules(rules, c, history)
+  print("nothing changed: {:d} rules, {:s}".format(run_nb, str(sorted(r_c.items()))))
+
 def design_frontend_self_test():
   """ check the design front-end fonctions
   """
   print("Non-regression tests of the design_frontend module")
   test_check()
+  test_check_rules()
+  test_run_constraint_rules()
 
 ################################################################
 # main
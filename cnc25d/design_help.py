@@ -44,6 +44,8 @@ it provides macros that are commonly used in design scripts
 import sys, argparse
 #from datetime import datetime
 import os, errno
+import hashlib
+import collections
 #import re
 #import Tkinter # to display the outline in a small GUI
 # FreeCAD
@@ -112,6 +114,33 @@ def get_effective_args(ai_default_args):
   #FreeCAD.Console.PrintMessage("dbg116: r_effective_args: %s\n"%(str(r_effective_args)))
   return(r_effective_args)
 
+def canonical_repr(ai_value):
+  """ return a string representing ai_value that doesn't depend on the order of the dictionary keys
+      tuples and lists are represented the same way
+  """
+  if(isinstance(ai_value, dict)):
+    r_txt = "{" + ", ".join([ "{:s}: {:s}".format(repr(k), canonical_repr(ai_value[k])) for k in sorted(ai_value.keys()) ]) + "}"
+  elif(isinstance(ai_value, (list, tuple))):
+    r_txt = "[" + ", ".join([ canonical_repr(v) for v in ai_value ]) + "]"
+  else:
+    r_txt = repr(ai_value)
+  return(r_txt)
+
+def order_figures(ai_figures, ai_heights, ai_figure_order):
+  """ return the figure and height dictionaries as OrderedDict listing first the figures of ai_figure_order
+      the other figures follow in the order of ai_figures
+  """
+  l_figure_ids = [ f for f in ai_figure_order if f in ai_figures ] + [ f for f in ai_figures.keys() if not f in ai_figure_order ]
+  r_figures = collections.OrderedDict([ (f, ai_figures[f]) for f in l_figure_ids ])
+  r_heights = collections.OrderedDict([ (f, ai_heights[f]) for f in l_figure_ids ])
+  return((r_figures, r_heights))
+
+def constraint_hash(ai_constraint):
+  """ return a stable key (hexadecimal string) identifying the constraint dictionary ai_constraint
+  """
+  r_key = hashlib.sha1(canonical_repr(ai_constraint)).hexdigest()
+  return(r_key)
+
 ################################################################
 # test-functions
 ################################################################
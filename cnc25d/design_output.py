@@ -46,6 +46,8 @@ from datetime import datetime
 #import os, errno
 import os
 import re
+import hashlib
+import copy
 #import Tkinter # to display the outline in a small GUI
 # FreeCAD
 import Part
@@ -59,6 +61,7 @@ import export_2d
 import design_help
 import cnc_outline
 import positioning
+import cnc25d_error
 
 
 ################################################################
@@ -74,7 +77,7 @@ def generate_output_file_add_argument(ai_parser, ai_variant=0):
   """
   r_parser = ai_parser
   r_parser.add_argument('--output_file_basename','--ofb', action='store', default='', dest='sw_output_file_basename',
-    help="If not  the empty_string (the default value), it outputs the (first) gear in file(s) depending on your argument file_extension: .dxf uses mozman dxfwrite, .svg uses mozman svgwrite, no-extension uses FreeCAD and you get .brep and .dxf")
+    help="If not  the empty_string (the default value), it outputs the (first) gear in file(s) depending on your argument file_extension: .dxf uses the native DXF writer (or mozman dxfwrite, see set_dxf_writer()), .svg uses the native SVG writer (or mozman svgwrite, see set_svg_writer()), .ngc writes a G-code program, no-extension uses FreeCAD and you get .brep and .dxf")
   if(ai_variant==1):
     r_parser.add_argument('--return_type','--rt', action='store', default='int_status', dest='sw_return_type',
       help="Define the what the main function should returns. Possible values: int_status, cnc25d_figure, freecad_object. Set it to freecad_object to use it with FreeCAD. Default: int_status")
@@ -82,7 +85,7 @@ def generate_output_file_add_argument(ai_parser, ai_variant=0):
   return(r_parser)
   
 def get_output_file_suffix(ai_output_file_basename):
-  """ detect the output-file-suffix .dxf and .svg and return the basename and suffix
+  """ detect the output-file-suffix .dxf, .svg and .ngc and return the basename and suffix
   """
   output_file_suffix = '' # .brep
   output_file_basename = ai_output_file_basename
@@ -92,11 +95,15 @@ def get_output_file_suffix(ai_output_file_basename):
   elif(re.search('\.svg$', ai_output_file_basename)):
     output_file_suffix = '.svg'
     output_file_basename = re.sub('\.svg$', '', ai_output_file_basename)
+  elif(re.search('\.ngc$', ai_output_file_basename)):
+    output_file_suffix = '.ngc'
+    output_file_basename = re.sub('\.ngc$', '', ai_output_file_basename)
   r_bs = (output_file_basename, output_file_suffix)
   return(r_bs)
 
-def generate_output_file(ai_figure, ai_output_filename, ai_height, ai_info_txt=''):
+def generate_output_file(ai_figure, ai_output_filename, ai_height, ai_info_txt='', ai_gcode_parameters={}):
   """ implement the swith --output_file_basename for 2D figure
+      ai_gcode_parameters updates the machining parameters of the .ngc files (see outline_backends.set_gcode_parameters())
   """
   if(ai_output_filename!=''):
     # create the output directory if needed
@@ -104,14 +111,15 @@ def generate_output_file(ai_figure, ai_output_filename, ai_height, ai_info_txt='
     design_help.mkdir_p(l_output_dir)
     #l_output_basename = os.path.basename(ai_output_filename)
     #print("dbg449: l_output_basename:", l_output_basename)
-    # mozman dxfwrite
+    # native DXF writer or mozman dxfwrite
     if(re.search('\.dxf$', ai_output_filename)):
-      #print("Generate {:s} with mozman dxfwrite".format(ai_output_filename))
       outline_backends.write_figure_in_dxf(ai_figure, ai_output_filename)
-    # mozman svgwrite
+    # native SVG writer or mozman svgwrite
     elif(re.search('\.svg$', ai_output_filename)):
-      #print("Generate {:s} with mozman svgwrite".format(ai_output_filename))
       outline_backends.write_figure_in_svg(ai_figure, ai_output_filename)
+    # G-code
+    elif(re.search('\.ngc$', ai_output_filename)):
+      outline_backends.write_figure_in_gcode(ai_figure, ai_output_filename, ai_height, ai_gcode_parameters)
     # FreeCAD
     elif(re.search('\.brep$', ai_output_filename)):
       print("Generate with FreeCAD the BRep file {:s}".format(ai_output_filename))
@@ -128,8 +136,7 @@ def generate_output_file(ai_figure, ai_output_filename, ai_height, ai_info_txt='
       # slice freecad_part  in the XY plan at a height of ai_height/2
       export_2d.export_to_dxf(freecad_part, Base.Vector(0,0,1), ai_height/2, "{:s}.dxf".format(ai_output_filename))
     else:
-      print("ERR124: Error: the suffix of the filename {:s} is unknown. Try with suffix: .dxf, .svg, .brep or .stl".format(ai_output_filename))
-      sys.exit(2)
+      raise cnc25d_error.BackendError("ERR124: Error: the suffix of the filename {:s} is unknown. Try with suffix: .dxf, .svg, .ngc, .brep or .stl".format(ai_output_filename))
     # info_txt
     #if(ai_info_txt!=''):
     #  output_basename = re.sub('(\.dxf$)|(\.svg$)', '', ai_output_filename)
@@ -155,8 +162,7 @@ def freecad_object_output_file(ai_freecad_object, ai_output_filename, ai_brep=Tr
     ai_freecad_object.exportStl(stl_output_filename)
   if(len(ai_slice_xyz)>0):
     if(len(ai_slice_xyz)!=9):
-      print("ERR150: Error, len(ai_slice_xyz) {:d} must be 9".format(len(ai_slice_xyz)))
-      sys.exit(2)
+      raise cnc25d_error.BackendError("ERR150: Error, len(ai_slice_xyz) {:d} must be 9".format(len(ai_slice_xyz)))
     size_x = ai_slice_xyz[0]
     size_y = ai_slice_xyz[1]
     size_z = ai_slice_xyz[2]
@@ -184,14 +190,12 @@ def generate_3d_assembly_output_file(ai_3d_conf, ai_output_filename, ai_brep=Tru
 def flip_rotate_and_translate_figure(ai_figure, ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip, ai_rotation_angle, ai_translate_x, ai_translate_y):
   """ flip, rotate and translate a figure (list of outlines). Usually used to agglomerate figures to create a cut-set.
   """
-  r_figure = []
-  for i in range(len(ai_figure)):
-    centered_ol = cnc_outline.outline_shift_xy(ai_figure[i], -1*(ai_zero_x+ai_size_x/2.0), 1, -1*(ai_zero_y+ai_size_y/2.0), 1)
-    flipped_ol = cnc_outline.outline_shift_xy(centered_ol, 0.0, ai_x_flip, 0.0, ai_y_flip)
-    #flipped_ol = cnc_outline.outline_shift_xy(centered_ol, 0, ai_x_flip, 0, ai_y_flip) # what makes the most sense? re-shift or not?
-    rotated_ol = cnc_outline.outline_rotate(flipped_ol, 0.0, 0.0, ai_rotation_angle)
-    translated_ol = cnc_outline.outline_shift_xy(rotated_ol, ai_size_x/2.0+ai_translate_x, 1, ai_size_y/2.0+ai_translate_y, 1)
-    r_figure.append(translated_ol[:])
+  transform = cnc_outline.Transform2D().translate(-1*(ai_zero_x+ai_size_x/2.0), -1*(ai_zero_y+ai_size_y/2.0))
+  transform = transform.shift_xy(0.0, ai_x_flip, 0.0, ai_y_flip)
+  #transform = transform.shift_xy(0, ai_x_flip, 0, ai_y_flip) # what makes the most sense? re-shift or not?
+  transform = transform.rotate(0.0, 0.0, ai_rotation_angle)
+  transform = transform.translate(ai_size_x/2.0+ai_translate_x, ai_size_y/2.0+ai_translate_y)
+  r_figure = transform.apply_figure(ai_figure) # one pass per outline
   return(r_figure)
 
 def rotate_and_translate_figure(ai_figure, ai_rotation_center_x, ai_rotation_center_y, ai_rotation_angle, ai_translate_x, ai_translate_y):
@@ -215,6 +219,38 @@ def cnc_cut_figure(ai_figure, ai_error_msg_id):
       r_figure.append(ai_figure[i])
   return(r_figure)
 
+def copy_figure(ai_figure):
+  """ return a copy of the figure whose outlines can be modified without modifying the outlines of ai_figure
+  """
+  r_figure = []
+  for outline in ai_figure:
+    if(isinstance(outline, cnc_outline.Valid_Outline)):
+      r_figure.append(outline.copy())
+    elif(isinstance(outline, cnc_outline.Array_Outline)):
+      r_figure.append(copy.deepcopy(outline))
+    else: # list or tuple of segments, or circle
+      r_figure.append(type(outline)([ list(p) if isinstance(p, list) else p for p in outline ]))
+  return(r_figure)
+
+def simplify_figure(ai_figure, ai_tolerance, ai_error_msg_id):
+  """ apply the simplify_outline function to all outlines of the input figure (format-B)
+      return the simplified figure and the numbers of segments before and after the simplification. A circle counts as one segment
+  """
+  r_figure = []
+  segment_nb_before = 0
+  segment_nb_after = 0
+  for i in range(len(ai_figure)):
+    outline = cnc_outline.simplify_outline(ai_figure[i], ai_tolerance, "{:s}.ol{:d}".format(ai_error_msg_id, i))
+    if(cnc_outline.check_outline_format(outline)==0): # circle
+      segment_nb_before += 1
+      segment_nb_after += 1
+    else:
+      segment_nb_before += len(ai_figure[i])-1
+      segment_nb_after += len(outline)-1
+    r_figure.append(outline)
+  r_simplify = (r_figure, segment_nb_before, segment_nb_after)
+  return(r_simplify)
+
 def ideal_figure(ai_figure, ai_error_msg_id):
   """ apply the ideal_outline function to all outlines of the input figure
   """
@@ -232,13 +268,11 @@ def figures_to_freecad_assembly(ai_figure_assembly):
   """
   obj_nb = len(ai_figure_assembly)
   if(obj_nb<1):
-    print("ERR235: the freecad assembly must contain at least one figure")
-    sys.exit(2)
+    raise cnc25d_error.BackendError("ERR235: the freecad assembly must contain at least one figure")
   fc_obj = []
   for i in range(obj_nb):
     if(len(ai_figure_assembly[i])!=11):
-      print("ERR219: Error len of ai_figure_assembly {:d} must be 11".format(len(ai_figure_assembly[i])))
-      sys.exit(2)
+      raise cnc25d_error.BackendError("ERR219: Error len of ai_figure_assembly {:d} must be 11".format(len(ai_figure_assembly[i])))
     (part_figure, zero_x, zero_y, size_x, size_y, size_z, flip, orientation, translate_x, translate_y, translate_z) = ai_figure_assembly[i]
     part_figure_zero = rotate_and_translate_figure(part_figure, 0, 0, 0, -1*zero_x, -1*zero_y)
     part_extruded = outline_backends.figure_to_freecad_25d_part(part_figure_zero, size_z)
@@ -250,8 +284,292 @@ def figures_to_freecad_assembly(ai_figure_assembly):
     r_assembly = r_assembly.fuse(fc_obj[i+1])
   return(r_assembly)
 
+################################################################
+# geometric hash
+################################################################
+
+default_hash_tolerance = 1e-4
+
+def hash_parse_outline(ai_outline, ai_error_msg_id):
+  """ sub-function of outline_hash(): convert a format-A or format-B outline into (closed, start-point, start-rbr, segments)
+      with segments the list of (middle-point or None, end-point, rbr). A circle returns None
+  """
+  if(isinstance(ai_outline, cnc_outline.Array_Outline)):
+    ai_outline = ai_outline.to_list()
+  outline_format = cnc_outline.check_outline_format(ai_outline)
+  if(outline_format==0):
+    return(None)
+  if(outline_format==2):
+    rbr_idx = -1
+  else:
+    rbr_idx = None
+  start_point = (float(ai_outline[0][0]), float(ai_outline[0][1]))
+  start_rbr = float(ai_outline[0][-1]) if(rbr_idx) else 0.0
+  segments = []
+  for i in range(1, len(ai_outline)):
+    segment = ai_outline[i]
+    coordinates = segment[:-1] if(rbr_idx) else segment
+    if(len(coordinates)==2):
+      middle_point = None
+      end_point = (float(coordinates[0]), float(coordinates[1]))
+    elif(len(coordinates)==4):
+      middle_point = (float(coordinates[0]), float(coordinates[1]))
+      end_point = (float(coordinates[2]), float(coordinates[3]))
+    else:
+      raise cnc25d_error.BackendError("ERR311: Error in {:s}, segment {:d} has an unexpected length {:d}".format(ai_error_msg_id, i, len(segment)))
+    segment_rbr = float(segment[-1]) if(rbr_idx) else 0.0
+    segments.append((middle_point, end_point, segment_rbr))
+  closed = (segments[-1][1]==start_point)
+  if(closed): # the router_bit_request of the start-point is used at the end of the last segment
+    segments[-1] = (segments[-1][0], segments[-1][1], start_rbr)
+  r_parsed = (closed, start_point, start_rbr, segments)
+  return(r_parsed)
+
+def least_rotation(ai_sequence):
+  """ return the index k such that ai_sequence[k:]+ai_sequence[:k] is the smallest rotation of ai_sequence (Booth's algorithm)
+  """
+  S = ai_sequence + ai_sequence
+  f = [-1] * len(S)
+  k = 0
+  for j in range(1, len(S)):
+    sj = S[j]
+    i = f[j-k-1]
+    while((i!=-1)and(sj!=S[k+i+1])):
+      if(sj<S[k+i+1]):
+        k = j-i-1
+      i = f[i]
+    if(sj!=S[k+i+1]):
+      if(sj<S[k]):
+        k = j
+      f[j-k] = -1
+    else:
+      f[j-k] = i+1
+  r_k = k%max(1, len(ai_sequence))
+  return(r_k)
+
+def rotation_starts(ai_sequence, ai_k):
+  """ return the list of the indexes giving the same rotation of ai_sequence as ai_k (more than one for a periodic outline like a gear)
+  """
+  n = len(ai_sequence)
+  rotated = ai_sequence[ai_k:]+ai_sequence[:ai_k]
+  period = n
+  for p in range(1, n):
+    if((n%p==0)and(rotated[p:]+rotated[:p]==rotated)):
+      period = p
+      break
+  r_starts = [ (ai_k+i*period)%n for i in range(n//period) ]
+  return(r_starts)
+
+def placed_outline_key(ai_parsed, ai_tolerance):
+  """ sub-function of outline_hash(): the canonical key of a parsed outline with its coordinates
+      the start-point of a closed outline is the one giving the smallest key
+  """
+  q = lambda v: int(round(v/ai_tolerance))
+  qp = lambda p: () if(p is None) else (q(p[0]), q(p[1]))
+  (closed, start_point, start_rbr, segments) = ai_parsed
+  items = [ (qp(middle_point), qp(end_point), q(segment_rbr)) for (middle_point, end_point, segment_rbr) in segments ]
+  if(closed):
+    k = least_rotation(items)
+    r_key = ('closed', tuple(items[k:]+items[:k]))
+  else:
+    r_key = ('open', qp(start_point), q(start_rbr), tuple(items))
+  return(r_key)
+
+def shape_outline_key(ai_parsed, ai_tolerance):
+  """ sub-function of outline_hash(): the canonical key of a parsed outline that doesn't depend on its placement
+      each segment is described in the frame of its chord, so the key is invariant by rotation and translation
+      It returns the key and the list of the start indexes that give this key
+  """
+  q = lambda v: int(round(v/ai_tolerance))
+  (closed, start_point, start_rbr, segments) = ai_parsed
+  vertices = [start_point] + [ s[1] for s in segments ]
+  segment_nb = len(segments)
+  frames = []
+  for i in range(segment_nb):
+    (AX, AY) = vertices[i]
+    (BX, BY) = vertices[i+1]
+    length = math.sqrt((BX-AX)**2+(BY-AY)**2)
+    if(length>0):
+      frames.append((AX, AY, (BX-AX)/length, (BY-AY)/length, length))
+    else:
+      frames.append((AX, AY, 1.0, 0.0, 0.0))
+  def local(ai_frame, ai_point):
+    (OX, OY, ux, uy, length) = ai_frame
+    return((q((ai_point[0]-OX)*ux+(ai_point[1]-OY)*uy), q(-(ai_point[0]-OX)*uy+(ai_point[1]-OY)*ux)))
+  items = []
+  for i in range(segment_nb):
+    (middle_point, end_point, segment_rbr) = segments[i]
+    middle = () if(middle_point is None) else local(frames[i], middle_point)
+    if(closed or (i<segment_nb-1)):
+      next_end = local(frames[i], segments[(i+1)%segment_nb][1])
+    else:
+      next_end = ()
+    items.append((q(frames[i][4]), middle, q(segment_rbr), next_end))
+  if(closed):
+    k = least_rotation(items)
+    r_key = ('closed', tuple(items[k:]+items[:k]))
+    r_starts = rotation_starts(items, k)
+  else:
+    r_key = ('open', q(start_rbr), tuple(items))
+    r_starts = [0]
+  r_shape = (r_key, r_starts, frames)
+  return(r_shape)
+
+def transform_parsed_outline(ai_parsed, ai_frame):
+  """ sub-function of figure_hash(): express the coordinates of a parsed outline in the frame (OX, OY, ux, uy)
+  """
+  (OX, OY, ux, uy) = ai_frame[:4]
+  def local(ai_point):
+    if(ai_point is None):
+      return(None)
+    return(((ai_point[0]-OX)*ux+(ai_point[1]-OY)*uy, -(ai_point[0]-OX)*uy+(ai_point[1]-OY)*ux))
+  (closed, start_point, start_rbr, segments) = ai_parsed
+  r_parsed = (closed, local(start_point), start_rbr, [ (local(m), local(e), r) for (m, e, r) in segments ])
+  return(r_parsed)
+
+def figure_key(ai_figure, ai_tolerance, ai_rigid, ai_error_msg_id):
+  """ sub-function of figure_hash(): the canonical key of a figure (list of format-A or format-B outlines)
+      the outlines are sorted, so the key doesn't depend on their order
+  """
+  q = lambda v: int(round(v/ai_tolerance))
+  l_parsed = [ hash_parse_outline(ai_figure[i], "{:s}.ol{:d}".format(ai_error_msg_id, i)) for i in range(len(ai_figure)) ]
+  if(not ai_rigid):
+    l_key = []
+    for i in range(len(ai_figure)):
+      if(l_parsed[i] is None):
+        l_key.append(('circle', q(ai_figure[i][0]), q(ai_figure[i][1]), q(ai_figure[i][2])))
+      else:
+        l_key.append(placed_outline_key(l_parsed[i], ai_tolerance))
+    r_key = tuple(sorted(l_key))
+    return(r_key)
+  # rigid placement: the other outlines are placed in a frame attached to a reference outline
+  # the centroid of the vertices doesn't depend on the placement, so its coordinates in a frame select the reference frame
+  l_point = []
+  for i in range(len(ai_figure)):
+    if(l_parsed[i] is None):
+      l_point.append((float(ai_figure[i][0]), float(ai_figure[i][1])))
+    else:
+      (closed, start_point, start_rbr, segments) = l_parsed[i]
+      if(not closed):
+        l_point.append(start_point)
+      l_point.extend([ s[1] for s in segments ])
+  GX = sum([ p[0] for p in l_point ])/len(l_point)
+  GY = sum([ p[1] for p in l_point ])/len(l_point)
+  def centroid_key(ai_frame):
+    (OX, OY, ux, uy) = ai_frame[:4]
+    return((q((GX-OX)*ux+(GY-OY)*uy), q(-(GX-OX)*uy+(GY-OY)*ux)))
+  l_shape = [ None if(p is None) else shape_outline_key(p, ai_tolerance) for p in l_parsed ]
+  l_frame = [] # (selection key, reference index, frame)
+  reference = None
+  if(any([ s is not None for s in l_shape ])):
+    reference = max([ (len(l_parsed[i][3]), l_shape[i][0]) for i in range(len(l_shape)) if(l_shape[i] is not None) ])[1]
+    for i in range(len(l_shape)):
+      if((l_shape[i] is not None)and(l_shape[i][0]==reference)):
+        for k in l_shape[i][1]:
+          l_frame.append((centroid_key(l_shape[i][2][k]), i, l_shape[i][2][k]))
+  else: # only circles: the frame goes from the center of a largest circle to the centroid or, if they are at the same place, to an other center
+    radius_max = max([ q(c[2]) for c in ai_figure ])
+    for i in range(len(ai_figure)):
+      if(q(ai_figure[i][2])==radius_max):
+        (CX, CY) = (ai_figure[i][0], ai_figure[i][1])
+        length = math.sqrt((GX-CX)**2+(GY-CY)**2)
+        if(q(length)>0):
+          l_frame.append(((0, q(length)), None, (CX, CY, (GX-CX)/length, (GY-CY)/length)))
+        else:
+          for j in range(len(ai_figure)):
+            length = math.sqrt((ai_figure[j][0]-CX)**2+(ai_figure[j][1]-CY)**2)
+            if(q(length)>0):
+              l_frame.append(((1, -q(length), -q(ai_figure[j][2])), None, (CX, CY, (ai_figure[j][0]-CX)/length, (ai_figure[j][1]-CY)/length)))
+    if(len(l_frame)==0): # concentric circles
+      r_key = ('concentric',) + tuple(sorted([ q(c[2]) for c in ai_figure ]))
+      return(r_key)
+  # only the frames with the smallest selection key are tried. There are several only for a symmetric figure
+  selection_min = min([ f[0] for f in l_frame ])
+  r_key = None
+  for (selection, reference_idx, frame) in l_frame:
+    if(selection!=selection_min):
+      continue
+    (OX, OY, ux, uy) = frame[:4]
+    l_key = [('reference', reference)]
+    for i in range(len(ai_figure)):
+      if(i==reference_idx):
+        continue
+      if(l_parsed[i] is None):
+        (cx, cy) = (ai_figure[i][0]-OX, ai_figure[i][1]-OY)
+        l_key.append(('circle', q(cx*ux+cy*uy), q(-cx*uy+cy*ux), q(ai_figure[i][2])))
+      else:
+        l_key.append(placed_outline_key(transform_parsed_outline(l_parsed[i], frame), ai_tolerance))
+    frame_key = tuple(sorted(l_key))
+    if((r_key is None)or(frame_key<r_key)):
+      r_key = frame_key
+  return(r_key)
+
+def outline_hash(ai_outline, ai_tolerance=default_hash_tolerance, ai_rigid=False, ai_error_msg_id="outline_hash"):
+  """ return a stable key (hexadecimal string) identifying the geometry of a format-A or format-B outline or of a circle
+      The coordinates are quantized to ai_tolerance. Tuples and lists give the same key.
+      The key of a closed outline doesn't depend on its start-point. If ai_rigid is True, it doesn't depend on its placement either
+  """
+  r_hash = figure_hash([ai_outline], ai_tolerance, ai_rigid, ai_error_msg_id)
+  return(r_hash)
+
+def figure_hash(ai_figure, ai_tolerance=default_hash_tolerance, ai_rigid=False, ai_error_msg_id="figure_hash"):
+  """ return a stable key (hexadecimal string) identifying the geometry of a figure (list of format-A or format-B outlines)
+      The key doesn't depend on the order of the outlines. See outline_hash() for the other invariances
+  """
+  if(not (ai_tolerance>0)):
+    raise cnc25d_error.BackendError("ERR314: Error in {:s}, the hash tolerance {:s} must be positive".format(ai_error_msg_id, str(ai_tolerance)))
+  if(len(ai_figure)==0):
+    raise cnc25d_error.BackendError("ERR317: Error in {:s}, the figure is empty".format(ai_error_msg_id))
+  r_hash = hashlib.sha1(repr(figure_key(ai_figure, ai_tolerance, ai_rigid, ai_error_msg_id))).hexdigest()
+  return(r_hash)
+
 ################################################################
 # test-functions
 ################################################################
 
+def figure_hash_test():
+  """ check the invariances of outline_hash() and figure_hash()
+  """
+  print("Non-regression tests of outline_hash() and figure_hash()")
+  plate = [[0.0, 0.0, 0.0], [60.0, 0.0, 5.0], [60.0, 40.0, 0.0], [30.0, 48.0, 0.0, 40.0, 2.0], [0.0, 0.0, 0.0]]
+  plate_tuple = tuple([ tuple(p) for p in plate ])
+  plate_shifted_start = [[60.0, 0.0, 5.0], [60.0, 40.0, 0.0], [30.0, 48.0, 0.0, 40.0, 2.0], [0.0, 0.0, 0.0], [60.0, 0.0, 5.0]]
+  plate_open = plate[:-1] + [[0.0, 1.0, 0.0]]
+  square = lambda x, y: [[x, y, 0.0], [x+4.0, y, 0.0], [x+4.0, y+4.0, 0.0], [x, y+4.0, 0.0], [x, y, 0.0]]
+  figure = [plate, square(5.0, 5.0), square(20.0, 7.0), square(40.0, 30.0), [45.0, 10.0, 3.0], [10.0, 30.0, 2.0]]
+  figure_reordered = [figure[4], figure[2], figure[0], figure[5], figure[3], figure[1]]
+  figure_placed = rotate_and_translate_figure(figure, 30.0, 20.0, 0.7, 100.0, -40.0)
+  figure_mirrored = flip_rotate_and_translate_figure(figure, 0.0, 0.0, 0.0, 0.0, -1, 1, 0.0, 0.0, 0.0)
+  figure_moved_hole = figure[:3] + [square(40.0, 31.0)] + figure[4:]
+  circles = [[0.0, 0.0, 10.0], [20.0, 0.0, 3.0], [0.0, 15.0, 2.0]]
+  circles_placed = rotate_and_translate_figure(circles, 0.0, 0.0, 2.1, 7.0, 3.0)
+  holes = [ square(10.0*i, 7.0*((i*i)%5)) for i in range(40) ]
+  holes_placed = rotate_and_translate_figure(holes, 0.0, 0.0, -1.2, 50.0, 8.0)
+  l_check = []
+  l_check.append(("tuple and list", outline_hash(plate_tuple)==outline_hash(plate), True))
+  l_check.append(("start-point of a closed outline", outline_hash(plate_shifted_start)==outline_hash(plate), True))
+  l_check.append(("open outline", outline_hash(plate_open)==outline_hash(plate), False))
+  l_check.append(("outline order", figure_hash(figure_reordered)==figure_hash(figure), True))
+  l_check.append(("placement without rigid", figure_hash(figure_placed)==figure_hash(figure), False))
+  l_check.append(("rigid placement", figure_hash(figure_placed, ai_rigid=True)==figure_hash(figure, ai_rigid=True), True))
+  l_check.append(("rigid placement and outline order", figure_hash(figure_placed[::-1], ai_rigid=True)==figure_hash(figure_reordered, ai_rigid=True), True))
+  l_check.append(("rigid mirror", figure_hash(figure_mirrored, ai_rigid=True)==figure_hash(figure, ai_rigid=True), False))
+  l_check.append(("rigid moved hole", figure_hash(figure_moved_hole, ai_rigid=True)==figure_hash(figure, ai_rigid=True), False))
+  l_check.append(("rigid placement of circles", figure_hash(circles_placed, ai_rigid=True)==figure_hash(circles, ai_rigid=True), True))
+  l_check.append(("rigid placement of identical outlines", figure_hash(holes_placed, ai_rigid=True)==figure_hash(holes, ai_rigid=True), True))
+  r_test = 1
+  for (check_name, check_value, expected_value) in l_check:
+    check_ok = (check_value==expected_value)
+    if(not check_ok):
+      r_test = 0
+    print("{:s}: {:s} (expected {:s}) {:s}".format(check_name, str(check_value), str(expected_value), "ok" if(check_ok) else "ERR184: Error"))
+  return(r_test)
+
+################################################################
+# main
+################################################################
+
+if __name__ == "__main__":
+  print("design_output.py says hello!\n")
+  figure_hash_test()
 
@@ -0,0 +1,305 @@
+# design_server.py
+# a long-running process that keeps the cnc25d designs ready to answer requests
+# created by charlyoleg on 2014/04/11
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+design_server.py serves the cnc25d designs to other processes.
+FreeCAD, the backends and the designs are imported and instantiated once per worker process,
+so a request doesn't pay the start-up time of a new Python process.
+The requests and the responses are JSON objects, one per line, read from stdin and written to stdout
+or exchanged over a Unix socket.
+
+request: {"id": 1, "design": "gearwheel", "constraint": {"gear_tooth_nb": 23}, "outputs": ["svg", "info"]}
+  constraint is a dictionary or a cli string. The default constraint is applied first.
+  outputs is a list of: svg, dxf, brep, stl, info
+  if output_file_basename is set, the files are written with it and their paths are returned,
+  otherwise the text of the svg, dxf and ngc files is returned. The content of the brep and stl files is returned base64 encoded
+response: {"id": 1, "status": "ok", "svg": {"gearwheel_fig": "<?xml ..."}, "info": "..."}
+  or {"id": 1, "status": "error", "error_id": "ERR123", "error": "...", "context": {...}}
+request {"command": "list"} returns the list of the served designs.
+"""
+
+################################################################
+# import
+################################################################
+
+# Python standard library
+import sys, os
+import argparse
+import json
+import base64
+import glob
+import shutil
+import tempfile
+import threading
+import traceback
+import multiprocessing
+import SocketServer
+# cnc25d
+import design_help
+import cnc25d_error
+
+################################################################
+# design registry
+################################################################
+
+served_design_names = ('box_wood_frame', 'gear_profile', 'gearwheel', 'gearring', 'gearbar', 'split_gearwheel', 'epicyclic_gearing',
+  'axle_lid', 'motor_lid', 'ltt', 'bell', 'bagel', 'bba', 'crest', 'cross_cube', 'gimbal')
+served_output_formats = ('svg', 'dxf', 'ngc', 'brep', 'stl', 'info')
+binary_output_formats = ('brep', 'stl') # returned base64 encoded because they can not be written in a JSON string
+
+server_designs = {} # the design instances of the current worker process
+
+def str_from_json(ai_value):
+  """ convert the unicode strings returned by the json module into str, as expected by the designs
+  """
+  if(isinstance(ai_value, dict)):
+    r_value = dict([ (str_from_json(k), str_from_json(v)) for (k, v) in ai_value.iteritems() ])
+  elif(isinstance(ai_value, list)):
+    r_value = [ str_from_json(v) for v in ai_value ]
+  elif(isinstance(ai_value, unicode)):
+    r_value = ai_value.encode('utf-8')
+  else:
+    r_value = ai_value
+  return(r_value)
+
+def design_server_worker_init(ai_design_names, ai_quiet_stdout=False):
+  """ initialize a worker process: instantiate once all the served designs
+      the argparse parsers and the imported modules are reused by all the requests
+  """
+  if(ai_quiet_stdout): # stdout is reserved for the responses
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+  import cnc25d_design
+  for d in ai_design_names:
+    server_designs[d] = getattr(cnc25d_design, d)()
+
+################################################################
+# request processing
+################################################################
+
+def design_server_encode(ai_response):
+  """ return the JSON line of the response dictionary ai_response
+      if ai_response can not be encoded, the JSON line of an error response is returned
+  """
+  try:
+    r_line = json.dumps(ai_response)
+  except (TypeError, ValueError) as exc: # e.g. a string that is not utf-8
+    r_line = json.dumps({'id':ai_response.get('id', None), 'status':'error', 'error_id':'ERR181',
+      'error':"ERR181: Error, the response can not be encoded in JSON: {:s}".format(str(exc))})
+  return(r_line)
+
+def design_server_job(ai_request):
+  """ process one request in a worker process and return the JSON line of the response
+  """
+  r_response = {'id':ai_request.get('id', None), 'status':'ok'}
+  tmp_dir = ''
+  try:
+    if(ai_request.get('command', '')=='list'):
+      r_response['designs'] = sorted(server_designs.keys())
+      return(design_server_encode(r_response))
+    design_name = ai_request.get('design', '')
+    if(not design_name in server_designs):
+      raise cnc25d_error.DesignError("ERR105: Error, the design {:s} is not served. Try: {:s}".format(str(design_name), ', '.join(sorted(server_designs.keys()))))
+    outputs = ai_request.get('outputs', ['info'])
+    for o in outputs:
+      if(not o in served_output_formats):
+        raise cnc25d_error.DesignError("ERR109: Error, the output {:s} is not supported. Try: {:s}".format(str(o), ', '.join(served_output_formats)))
+    my_design = server_designs[design_name]
+    my_design.apply_constraint_default_value()
+    request_constraint = ai_request.get('constraint', {})
+    if(isinstance(request_constraint, dict)):
+      my_design.apply_constraint(request_constraint)
+    else:
+      my_design.apply_cli(request_constraint)
+    if('info' in outputs):
+      r_response['info'] = my_design.get_info()
+    file_outputs = [ o for o in outputs if o!='info' ]
+    if(len(file_outputs)>0):
+      output_file_basename = ai_request.get('output_file_basename', '')
+      return_text = (output_file_basename=='')
+      if(return_text):
+        tmp_dir = tempfile.mkdtemp(prefix='cnc25d_server_')
+        output_file_basename = os.path.join(tmp_dir, design_name)
+      for o in file_outputs:
+        my_design.write_output_files("{:s}.{:s}".format(output_file_basename, o))
+      written_files = sorted(glob.glob("{:s}_*".format(output_file_basename)))
+      if(return_text):
+        for o in file_outputs:
+          r_response[o] = {}
+          for f in written_files:
+            if(f.endswith('.{:s}'.format(o))):
+              fig_id = f[len(output_file_basename)+1:-len(o)-1]
+              ifh = open(f, 'rb')
+              file_content = ifh.read()
+              ifh.close()
+              if(o in binary_output_formats):
+                file_content = base64.b64encode(file_content)
+              r_response[o][fig_id] = file_content
+      else:
+        r_response['files'] = written_files
+  except cnc25d_error.Cnc25dError as exc:
+    r_response['status'] = 'error'
+    r_response['error_id'] = exc.error_id
+    r_response['error'] = exc.error_msg
+    r_response['context'] = dict([ (k, str(v)) for (k, v) in exc.context.iteritems() ])
+  except SystemExit as exc: # the error message has been printed by the design
+    r_response['status'] = 'error'
+    r_response['error_id'] = 'ERR000'
+    r_response['error'] = "exit with code {:s}".format(str(exc.code))
+  except Exception as exc:
+    r_response['status'] = 'error'
+    r_response['error_id'] = 'ERR000'
+    r_response['error'] = traceback.format_exc()
+  finally:
+    if(tmp_dir!=''):
+      shutil.rmtree(tmp_dir, ignore_errors=True)
+  return(design_server_encode(r_response))
+
+def design_server_submit(ai_pool, ai_line, ai_write_response):
+  """ decode the JSON request ai_line and submit it to the worker pool
+      ai_write_response is called with the JSON line of the response. It returns the AsyncResult or None
+  """
+  r_async = None
+  try:
+    request = str_from_json(json.loads(ai_line))
+    if(not isinstance(request, dict)):
+      raise ValueError("the request must be a JSON object")
+  except ValueError as exc:
+    ai_write_response(design_server_encode({'id':None, 'status':'error', 'error_id':'ERR173', 'error':"ERR173: Error, invalid request: {:s}".format(str(exc))}))
+    return(r_async)
+  r_async = ai_pool.apply_async(design_server_job, (request,), callback=ai_write_response)
+  return(r_async)
+
+################################################################
+# transports
+################################################################
+
+class Response_Writer:
+  """ write the responses, one JSON object per line, from several threads
+  """
+  def __init__(self, ai_fh):
+    self.fh = ai_fh
+    self.lock = threading.Lock()
+
+  def write(self, ai_response_line):
+    """ write the JSON line ai_response_line
+        it is the callback of the worker pool, so it must never raise: an exception would stop the result handler thread of the pool
+    """
+    try:
+      with self.lock:
+        self.fh.write(ai_response_line + '\n')
+        self.fh.flush()
+    except (IOError, OSError, ValueError): # the client has gone
+      pass
+    except Exception:
+      traceback.print_exc(file=sys.stderr)
+
+def serve_stdio(ai_pool, ai_input_fh, ai_output_fh):
+  """ process the requests of ai_input_fh until its end
+      the requests are processed concurrently, so the responses might come in a different order
+  """
+  response_writer = Response_Writer(ai_output_fh)
+  pending_jobs = []
+  for line in iter(ai_input_fh.readline, ''):
+    if(line.strip()!=''):
+      pending_jobs.append(design_server_submit(ai_pool, line, response_writer.write))
+      pending_jobs = [ j for j in pending_jobs if (j!=None)and(not j.ready()) ]
+  for j in pending_jobs:
+    j.wait()
+  return(0)
+
+class Design_Request_Handler(SocketServer.StreamRequestHandler):
+  """ process the requests of one Unix socket connection
+  """
+  def handle(self):
+    serve_stdio(self.server.worker_pool, self.rfile, self.wfile)
+
+class Design_Unix_Server(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+  """ Unix socket server with one thread per connection. The design work is done by the worker pool
+  """
+  daemon_threads = True
+
+def serve_unix_socket(ai_pool, ai_socket_path):
+  """ process the requests received on the Unix socket ai_socket_path until KeyboardInterrupt
+  """
+  if(os.path.exists(ai_socket_path)):
+    os.remove(ai_socket_path)
+  server = Design_Unix_Server(ai_socket_path, Design_Request_Handler)
+  server.worker_pool = ai_pool
+  print("design_server listens on {:s}".format(ai_socket_path))
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    os.remove(ai_socket_path)
+  return(0)
+
+################################################################
+# command line interface
+################################################################
+
+def design_server_cli(ai_args=""):
+  """ command line interface to start the design server
+  """
+  ds_parser = argparse.ArgumentParser(description='Serve the cnc25d designs with JSON requests over stdin/stdout or a Unix socket')
+  ds_parser.add_argument('--socket', '--so', action='store', default='', dest='sw_socket',
+    help="path of the Unix socket to listen on. If empty, the requests are read from stdin and the responses written on stdout")
+  ds_parser.add_argument('--workers', '--wo', action='store', type=int, default=0, dest='sw_workers',
+    help="number of worker processes. Default: 0, one per CPU")
+  ds_parser.add_argument('--designs', '--de', action='store', default=','.join(served_design_names), dest='sw_designs',
+    help="comma separated list of the served designs. Default: all the designs of cnc25d_design")
+  effective_args = design_help.get_effective_args(ai_args)
+  ds_args = ds_parser.parse_args(effective_args)
+  design_names = [ d for d in ds_args.sw_designs.split(',') if d!='' ]
+  for d in design_names:
+    if(not d in served_design_names):
+      print("ERR257: Error, the design {:s} can not be served. Try: {:s}".format(d, ', '.join(served_design_names)))
+      sys.exit(2)
+  worker_nb = ds_args.sw_workers
+  if(worker_nb<1):
+    worker_nb = multiprocessing.cpu_count()
+  use_stdio = (ds_args.sw_socket=='')
+  if(use_stdio): # keep the stdout file descriptor for the responses and send the prints of the designs to stderr
+    response_fh = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+  import cnc25d_design # imported before forking, so the workers inherit the imported modules
+  worker_pool = multiprocessing.Pool(processes=worker_nb, initializer=design_server_worker_init, initargs=(design_names, use_stdio))
+  try:
+    if(use_stdio):
+      serve_stdio(worker_pool, sys.stdin, response_fh)
+    else:
+      serve_unix_socket(worker_pool, ds_args.sw_socket)
+  finally:
+    worker_pool.close()
+    worker_pool.join()
+  return(0)
+
+################################################################
+# main
+################################################################
+
+if __name__ == "__main__":
+  design_server_cli()
+
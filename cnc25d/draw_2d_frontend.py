@@ -51,6 +51,8 @@ import copy
 ## cnc25d
 import small_geometry
 import cnc_outline
+import segment_index
+import design_output
 #import outline_backends
 #import export_2d
 
@@ -126,6 +128,7 @@ class Arc_Line_Outline:
     """
     self.outline_id = outline_id
     self.ol = []
+    self.check_cache = None # (outline snapshot, statistics) of the last check()
 
   def add_StartPoint(self, CX=0.0, CY=0.0, C=(), rbr=0.0):
     """
@@ -218,36 +221,41 @@ class Arc_Line_Outline:
     last_segment[-1] = 0
     self.ol[-1] = tuple(last_segment)
 
+  def transform(self, ai_transform, ai_suffix="transform"):
+    """ create a new outline from the parent one with the cnc_outline.Transform2D ai_transform
+    """
+    r_ol = Arc_Line_Outline("{:s}_{:s}".format(self.outline_id, ai_suffix))
+    r_ol.add_piece(ai_transform.apply_outline(self.ol))
+    return(r_ol)
+
   def rotate(self, ai_x, ai_y, ai_angle):
     """ create a new outline from the parent one with a rotation of center (ai_x, ai_y) and angle ai_angle
     """
-    r_ol = Arc_Line_Outline("{:s}_rotated".format(self.outline_id))
-    r_ol.add_piece(cnc_outline.outline_rotate(self.ol, ai_x, ai_y, ai_angle))
+    r_ol = self.transform(cnc_outline.Transform2D().rotate(ai_x, ai_y, ai_angle), "rotated")
     return(r_ol)
 
   def shift_xy(self, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient):
     """ Create a new outline with add an offset and multiply by coefficient the coordinates
     """
-    r_ol = Arc_Line_Outline("{:s}_shift".format(self.outline_id))
-    r_ol.add_piece(cnc_outline.outline_shift_xy(self.ol, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient))
+    r_ol = self.transform(cnc_outline.Transform2D().shift_xy(ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient), "shift")
     return(r_ol)
 
   def flip_xy(self, ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip):
     """ Create a new outline with a flip_xy
     """
-    r_ol = Arc_Line_Outline("{:s}_flip".format(self.outline_id))
-    centered_ol = cnc_outline.outline_shift_xy(self.ol, -1*(ai_zero_x+ai_size_x/2.0), 1, -1*(ai_zero_y+ai_size_y/2.0), 1)
-    flipped_ol = cnc_outline.outline_shift_xy(centered_ol, 0.0, ai_x_flip, 0.0, ai_y_flip)
-    #flipped_ol = cnc_outline.outline_shift_xy(centered_ol, 0, ai_x_flip, 0, ai_y_flip) # what makes the most sense? re-shift or not?
-    recentered_ol = cnc_outline.outline_shift_xy(flipped_ol, ai_size_x/2.0, 1, ai_size_y/2.0, 1)
-    r_ol.add_piece(recentered_ol)
+    r_ol = self.transform(cnc_outline.Transform2D().flip_xy(ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip), "flip")
     return(r_ol)
 
   def check(self, figure_id=""):
     """ Check the consistence of the outline for being integrated in a figure
+        The statistics are memorized and reused as long as the outline is not modified
     """
     # length precision
     radian_epsilon = math.pi/1000
+    # the same outline is often checked several times (figure integration, merge_figure, stat_info)
+    ol_snapshot = tuple(tuple(segment) for segment in self.ol)
+    if((self.check_cache is not None)and(self.check_cache[0]==ol_snapshot)):
+      return(dict(self.check_cache[1]))
     #
     if(len(self.ol)<2):
       print("ERR179: Error, figure {:s}, outline {:s} with {:d} segments is too short. Add at leat two segment first.".format(figure_id, self.outline_id, len(self.ol)))
@@ -370,6 +378,7 @@ class Arc_Line_Outline:
         # arc_radius
         stat['arc_radius_min'] = min_w_init(stat['arc_radius_min'], arc_radius)
         stat['arc_radius_max'] = max_w_init(stat['arc_radius_max'], arc_radius)
+    self.check_cache = (ol_snapshot, dict(stat))
     # return
     return(stat)
 
@@ -534,6 +543,31 @@ y_max:  {:0.3f}
 """.format(self.radius, 2*self.radius, self.x, self.y, ol_stat['circle_circumference'], ol_stat['x_min'], ol_stat['x_max'], ol_stat['y_min'], ol_stat['y_max'])
     return(r_txt)
 
+  def transform(self, ai_transform, ai_suffix="transform"):
+    """ create a new circle from the parent one with the cnc_outline.Transform2D ai_transform
+    """
+    (X, Y, R) = ai_transform.apply_outline((self.x, self.y, self.radius))
+    r_ol = Circle_Outline("{:s}_{:s}".format(self.outline_id, ai_suffix), R, X, Y)
+    return(r_ol)
+
+  def rotate(self, ai_x, ai_y, ai_angle):
+    """ create a new circle from the parent one with a rotation of center (ai_x, ai_y) and angle ai_angle
+    """
+    r_ol = self.transform(cnc_outline.Transform2D().rotate(ai_x, ai_y, ai_angle), "rotated")
+    return(r_ol)
+
+  def shift_xy(self, ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient):
+    """ Create a new circle with add an offset and multiply by coefficient the center coordinates
+    """
+    r_ol = self.transform(cnc_outline.Transform2D().shift_xy(ai_x_offset, ai_x_coefficient, ai_y_offset, ai_y_coefficient), "shift")
+    return(r_ol)
+
+  def flip_xy(self, ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip):
+    """ Create a new circle with a flip_xy
+    """
+    r_ol = self.transform(cnc_outline.Transform2D().flip_xy(ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip), "flip")
+    return(r_ol)
+
   def convert_to_old_format(self):
     """ convert the Circle_Outline object to the old-list-format
         this function should be only used during the transistion to the new format (Circle_Outline object)
@@ -678,31 +712,32 @@ class Figure:
     """
     self.height = ai_height
 
-  def rotate(self, ai_x, ai_y, ai_angle):
-    """ create a new figure from the parent one with a rotation of center (ai_x, ai_y) and angle ai_angle
+  def transform(self, ai_transform, ai_suffix="transform"):
+    """ create a new figure from the parent one with the cnc_outline.Transform2D ai_transform
+        compose the steps in ai_transform, so each outline is transformed only once
     """
-    r_fig = Figure("{:s}_rotate")
+    r_fig = Figure("{:s}_{:s}".format(self.figure_id, ai_suffix))
     for i in range(len(self.outlines)):
-      r_fig.add_undefine_outline(self.outlines[i].rotate(ai_x, ai_y, ai_angle))
+      r_fig.add_undefine_outline(self.outlines[i].transform(ai_transform, ai_suffix))
     r_fig.extrudable = self.extrudable
     return(r_fig)
 
+  def rotate(self, ai_x, ai_y, ai_angle):
+    """ create a new figure from the parent one with a rotation of center (ai_x, ai_y) and angle ai_angle
+    """
+    r_fig = self.transform(cnc_outline.Transform2D().rotate(ai_x, ai_y, ai_angle), "rotate")
+    return(r_fig)
+
   def translate(self, ai_translate_x, ai_translate_y):
     """ create a new figure from the parent one with a translation
     """
-    r_fig = Figure("{:s}_translate")
-    for i in range(len(self.outlines)):
-      r_fig.add_undefine_outline(self.outlines[i].shift_xy(ai_translate_x, 1, ai_translate_y, 1))
-    r_fig.extrudable = self.extrudable
+    r_fig = self.transform(cnc_outline.Transform2D().translate(ai_translate_x, ai_translate_y), "translate")
     return(r_fig)
 
   def flip_xy(self, ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip):
     """ create a new figure from the parent one with a flip
     """
-    r_fig = Figure("{:s}_flip")
-    for i in range(len(self.outlines)):
-      r_fig.add_undefine_outline(self.outlines[i].flip_xy(ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip))
-    r_fig.extrudable = self.extrudable
+    r_fig = self.transform(cnc_outline.Transform2D().flip_xy(ai_zero_x, ai_zero_y, ai_size_x, ai_size_y, ai_x_flip, ai_y_flip), "flip")
     return(r_fig)
 
   def stat_info(self, context_msg=""):
@@ -827,6 +862,70 @@ y_length: {:0.3f}
         r_B_format.append(self.outlines[i].convert_to_old_format())
     return(r_B_format)
 
+  def geometric_hash(self, tolerance=design_output.default_hash_tolerance, rigid=False):
+    """ return a stable key (hexadecimal string) identifying the geometry of the figure
+        the coordinates are quantized to tolerance. See design_output.figure_hash()
+    """
+    r_hash = design_output.figure_hash(self.convert_to_old_format(), tolerance, rigid, self.figure_id)
+    return(r_hash)
+
+  def check_clearance(self, min_distance, cnc_cut=True):
+    """ check that the outlines of the figure don't intersect each other and are separated by at least min_distance
+        if the figure is extrudable, check also that the hole-outlines are inside the external outline and not inside an other hole
+        The segments are stored in a segment_index.Segment_Index, so only the close segments are compared
+        cnc_cut selects the outlines cnc_cut() or ideal(). It returns the list of the error messages (empty if the figure is valid)
+    """
+    # length precision
+    radian_epsilon = math.pi/1000
+    if(cnc_cut):
+      B_figure = self.cnc_cut()
+    else:
+      B_figure = self.ideal()
+    # the cell size follows the size and the segment number of the figure, so a cell contains a few segments
+    # it can not be smaller than the clearance, the largest distance queried in the index
+    l_properties = [ cnc_outline.outline_properties(ol) for ol in B_figure ]
+    (x_min, x_max) = (min([ p['bbox'][0] for p in l_properties ]), max([ p['bbox'][1] for p in l_properties ]))
+    (y_min, y_max) = (min([ p['bbox'][2] for p in l_properties ]), max([ p['bbox'][3] for p in l_properties ]))
+    segment_nb = sum([ max(1, p['segment_nb']) for p in l_properties ])
+    cell_size = max(math.sqrt((x_max-x_min)*(y_max-y_min)/segment_nb), max(x_max-x_min, y_max-y_min)/segment_nb)
+    si = segment_index.Segment_Index(max(cell_size, min_distance, radian_epsilon))
+    for i in range(len(B_figure)):
+      si.add_outline(B_figure[i], self.outlines[i].outline_id)
+    # keep the closest segments of each pair of outlines
+    closest = {}
+    for (distance, s1, s2) in si.close_pairs(max(min_distance, radian_epsilon)):
+      (o1, o2) = (si.segments[s1][1], si.segments[s2][1])
+      if((o1==o2)and(distance>=radian_epsilon)): # the segments of an outline are only checked for intersection
+        continue
+      if((o1, o2) not in closest):
+        closest[(o1, o2)] = (distance, si.segments[s1][2], si.segments[s2][2])
+    r_msg = []
+    intersecting = set()
+    for (o1, o2) in sorted(closest.keys()):
+      (distance, i1, i2) = closest[(o1, o2)]
+      if(o1==o2):
+        r_msg.append("ERR611: Error, figure {:s}, outline {:s} intersects itself between the segments {:d} and {:d}".format(self.figure_id, self.outlines[o1].outline_id, i1, i2))
+      elif(distance<radian_epsilon):
+        intersecting.add((o1, o2))
+        r_msg.append("ERR612: Error, figure {:s}, outline {:s} segment {:d} and outline {:s} segment {:d} intersect".format(self.figure_id, self.outlines[o1].outline_id, i1, self.outlines[o2].outline_id, i2))
+      else:
+        r_msg.append("ERR613: Error, figure {:s}, outline {:s} segment {:d} and outline {:s} segment {:d} are {:0.3f} apart, less than the clearance {:0.3f}".format(self.figure_id, self.outlines[o1].outline_id, i1, self.outlines[o2].outline_id, i2, distance, min_distance))
+    # without intersection, one point tells if a hole is inside an other outline
+    if(self.extrudable):
+      for i in range(1, len(B_figure)):
+        if(isinstance(B_figure[i][0], (tuple, list))):
+          (px, py) = (B_figure[i][0][0], B_figure[i][0][1])
+        else:
+          (px, py) = (B_figure[i][0]+B_figure[i][2], B_figure[i][1])
+        if(((0, i) not in intersecting)and(not si.point_in_outline(px, py, 0))):
+          r_msg.append("ERR614: Error, figure {:s}, hole-outline {:s} is outside the external outline {:s}".format(self.figure_id, self.outlines[i].outline_id, self.outlines[0].outline_id))
+        for j in range(1, len(B_figure)):
+          if((j!=i)and((min(i, j), max(i, j)) not in intersecting)and si.point_in_outline(px, py, j)):
+            r_msg.append("ERR615: Error, figure {:s}, hole-outline {:s} is inside the hole-outline {:s}".format(self.figure_id, self.outlines[i].outline_id, self.outlines[j].outline_id))
+    for msg in r_msg:
+      print(msg)
+    return(r_msg)
+
 
 class Figure_Collection:
   """
@@ -1030,6 +1129,7 @@ def test_draw_2d_1():
   print(tfc2.get_figure_id('first_figure').stat_info("test_figure_collection_reload"))
   b_figure = design_output.cnc_cut_figure(tfc.get_figure_id('first_figure').convert_to_old_format(), "first_figure")
   #outline_backends.figure_simple_display(b_figure, (), "test")
+  print("check_clearance of the first_figure: {:d} error(s)".format(len(fig1.check_clearance(2.0))))
   outline_backends.figure_simple_display(fig1.cnc_cut(), fig1.ideal(), "test")
   b_figure2 = design_output.cnc_cut_figure(tfc.get_figure_id('second_figure').convert_to_old_format(), "second_figure")
   #outline_backends.figure_simple_display(b_figure2, (), "test")
@@ -1052,6 +1152,25 @@ def test_draw_2d_2():
   fig2.merge_figure(fig1.flip_xy(0.0, -10.0, 20.0, 30.0, -1, 1).translate(30.0, 0.0))
   outline_backends.figure_simple_display(fig2.cnc_cut(), fig2.ideal(), "test")
 
+def test_draw_2d_3():
+  """ check that the circle transforms keep the radius like cnc_outline.outline_shift_xy()
+  """
+  print("\nTest the circle transforms with non-unit coefficients")
+  r_test = True
+  circle = Circle_Outline("c1", 3.0, 5.0, -2.0)
+  for (xo, xc, yo, yc) in ((1.0, 2.0, -4.0, 2.0), (10.0, -0.5, 3.0, 1.5), (0.0, -1.0, 0.0, -1.0)):
+    ref = cnc_outline.outline_shift_xy((5.0, -2.0, 3.0), xo, xc, yo, yc)
+    tr = cnc_outline.Transform2D().shift_xy(xo, xc, yo, yc).apply_outline((5.0, -2.0, 3.0))
+    ol = circle.shift_xy(xo, xc, yo, yc).convert_to_old_format()
+    for c in (tr, ol):
+      if(max([abs(c[i]-ref[i]) for i in range(3)])>1e-9):
+        print("ERR175: Error, circle shift_xy {:s} differs from outline_shift_xy {:s}".format(str(c), str(ref)))
+        r_test = False
+  if(circle.rotate(1.0, 1.0, 0.7).radius!=3.0):
+    print("ERR178: Error, the rotated circle has not kept its radius")
+    r_test = False
+  print("circle transforms: {:s}".format("OK" if r_test else "KO"))
+  return(r_test)
 
 def draw_2d_frontend_self_test():
   """ check the design front-end fonctions
@@ -1060,6 +1179,7 @@ def draw_2d_frontend_self_test():
   test_c_xy()
   test_draw_2d_1()
   test_draw_2d_2()
+  test_draw_2d_3()
 
 ################################################################
 # main
@@ -31,6 +31,7 @@ You can also simulate or view of the gearring and get a DXF, SVG or BRep file.
 ################################################################
 
 import cnc25d_api
+import cnc25d_error
 #cnc25d_api.importing_freecad()
 
 #print("FreeCAD.Version:", FreeCAD.Version())
@@ -41,6 +42,7 @@ import cnc25d_api
 ################################################################
 
 import math
+import collections
 import sys, argparse
 #from datetime import datetime
 #import os, errno
@@ -147,11 +149,9 @@ def gearring_constraint_constructor(ai_parser, ai_variant = 0):
 # gearring constraint_check
 ################################################################
 
-def gearring_constraint_check(c):
-  """ check the gearring constraint c and set the dynamic default values
+def gearring_check_router_bit(c):
+  """ set the router_bit_radius of the gearring constraint c
   """
-  ### precision
-  radian_epsilon = math.pi/1000
   ### check parameter coherence (part 1)
   # get the router_bit_radius
   c['gear_rbr'] = c['gear_router_bit_radius']
@@ -163,6 +163,12 @@ def gearring_constraint_check(c):
   c['holder_sr'] = c['holder_smoothing_radius']
   if(c['cnc_router_bit_radius']>c['holder_sr']):
     c['holder_sr'] = c['cnc_router_bit_radius']
+
+def gearring_check_gear_profile(c):
+  """ check the gear_profile of the gearring constraint c
+  """
+  ### precision
+  radian_epsilon = math.pi/1000
   # c['gear_tooth_nb']
   if(c['gear_tooth_nb']>0): # create a gear_profile
     ### inherit gear_profile
@@ -173,16 +179,20 @@ def gearring_constraint_check(c):
     c['maximal_gear_profile_radius'] = gear_profile_parameters['g1_param']['hollow_radius']
     c['g1_ix'] = gear_profile_parameters['g1_param']['center_ox']
     c['g1_iy'] = gear_profile_parameters['g1_param']['center_oy']
-    gear_module = gear_profile_parameters['g1_param']['module']
+    c['gear_profile_module'] = gear_profile_parameters['g1_param']['module']
   else: # no gear_profile, just a circle
     if(c['gear_primitive_diameter']<radian_epsilon):
-      print("ERR176: Error, the no-gear-profile circle outline diameter gear_primitive_diameter {:0.2f} is too small!".format(c['gear_primitive_diameter']))
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR176: Error, the no-gear-profile circle outline diameter gear_primitive_diameter {:0.2f} is too small!".format(c['gear_primitive_diameter']))
     c['g1_ix'] = c['center_position_x']
     c['g1_iy'] = c['center_position_y']
     c['maximal_gear_profile_radius'] = float(c['gear_primitive_diameter'])/2
-    gear_module = 0
+    c['gear_profile_module'] = 0
+
+def gearring_check_holder(c):
+  """ check the holder of the gearring constraint c
+  """
   ### check parameter coherence (part 2)
+  gear_module = c.pop('gear_profile_module') # set by gearring_check_gear_profile() and not part of the returned constraint
   c['holder_radius'] = float(c['holder_diameter'])/2
   if(c['holder_radius']==0): # dynamic default value
     c['holder_radius'] = c['maximal_gear_profile_radius'] + 2.0*gear_module + c['holder_hole_diameter']/2.0
@@ -195,8 +205,7 @@ def gearring_constraint_check(c):
   c['holder_crenel_half_width'] = float(c['holder_crenel_width'])/2
   holder_crenel_with_wall_half_width = c['holder_crenel_half_width'] + c['holder_crenel_skin_width']
   if(c['holder_radius']<holder_crenel_with_wall_half_width):
-    print("ERR213: Error, holder_radius {:0.3f} must be bigger than holder_crenel_with_wall_half_width {:0.3f}".format(c['holder_radius'], holder_crenel_with_wall_half_width))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR213: Error, holder_radius {:0.3f} must be bigger than holder_crenel_with_wall_half_width {:0.3f}".format(c['holder_radius'], holder_crenel_with_wall_half_width))
   c['holder_crenel_half_angle'] = math.asin(float(holder_crenel_with_wall_half_width)/c['holder_radius'])
   c['holder_crenel_x_position'] = math.sqrt((c['holder_radius'])**2 - (holder_crenel_with_wall_half_width)**2)
   additional_holder_maximal_height = c['holder_radius'] - c['holder_crenel_x_position']
@@ -211,63 +220,60 @@ def gearring_constraint_check(c):
   # c['holder_crenel_height
   if(c['holder_crenel_number']>0):
     if((0.9*holder_side_straigth_length)<c['holder_sr']):
-      print("ERR218: Error, the holder-crenel-wall-side height is too small: holder_side_straigth_length {:0.3f}  holder_smoothing_radius {:0.3f}".format(holder_side_straigth_length, c['holder_sr']))
       #print("dbg214: holder_radius, holder_crenel_x_position:", c['holder_radius'], c['holder_crenel_x_position'])
       #print("dbg215: holder_maximal_height, additional_holder_maximal_height:", holder_maximal_height, additional_holder_maximal_height)
       #print("dbg216: holder_crenel_skin_width, holder_maximal_height_plus:", c['holder_crenel_skin_width'], c['holder_maximal_height_plus'])
       #print("dbg217: holder_maximal_height_plus, holder_side_outer_smoothing_radius:", c['holder_maximal_height_plus'], c['holder_side_outer_smoothing_radius'])
       #print("dbg218: holder_hole_position_radius, holder_crenel_position, holder_crenel_height:", c['holder_hole_position_radius'], c['holder_crenel_position'], c['holder_crenel_height'])
       #print("dbg219: holder_maximal_radius, holder_radius:", c['holder_maximal_radius'], c['holder_radius'])
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR218: Error, the holder-crenel-wall-side height is too small: holder_side_straigth_length {:0.3f}  holder_smoothing_radius {:0.3f}".format(holder_side_straigth_length, c['holder_sr']))
   # c['holder_crenel_position']
   if(c['holder_crenel_position']<c['holder_hole_radius']):
-    print("ERR211: Error, holder_crenel_position {:0.3f} is too small compare to holder_hole_radius {:0.3f}".format(c['holder_crenel_position'], c['holder_hole_radius']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR211: Error, holder_crenel_position {:0.3f} is too small compare to holder_hole_radius {:0.3f}".format(c['holder_crenel_position'], c['holder_hole_radius']))
   # c['holder_crenel_width']
   if(c['holder_crenel_width']<2.1*c['holder_crenel_rbr']):
-    print("ERR215: Error, holder_crenel_width {:0.3} is too small compare to holder_crenel_router_bit_radius {:0.3f}".format(c['holder_crenel_width'], c['holder_crenel_rbr']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR215: Error, holder_crenel_width {:0.3} is too small compare to holder_crenel_router_bit_radius {:0.3f}".format(c['holder_crenel_width'], c['holder_crenel_rbr']))
   # hollow_circle and holder-hole
   if(c['maximal_gear_profile_radius']>(c['holder_hole_position_radius']-c['holder_hole_radius'])):
-    print("ERR303: Error, holder-hole are too closed from the gear_hollow_circle: maximal_gear_profile_radius {:0.3f}  holder_hole_position_radius {:0.3f}  holder_hole_radius {:0.3f}".format(c['maximal_gear_profile_radius'], c['holder_hole_position_radius'], c['holder_hole_radius']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR303: Error, holder-hole are too closed from the gear_hollow_circle: maximal_gear_profile_radius {:0.3f}  holder_hole_position_radius {:0.3f}  holder_hole_radius {:0.3f}".format(c['maximal_gear_profile_radius'], c['holder_hole_position_radius'], c['holder_hole_radius']))
   # holder_hole_mark_nb
   if((c['holder_hole_mark_nb']<0)or(c['holder_hole_mark_nb']>c['holder_crenel_number'])):
-    print("ERR294: Error, holder_hole_mark_nb {:d} is out of its range 0..{:d}".format(c['holder_hole_mark_nb'], c['holder_crenel_number']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR294: Error, holder_hole_mark_nb {:d} is out of its range 0..{:d}".format(c['holder_hole_mark_nb'], c['holder_crenel_number']))
+
+def gearring_check_double_hole(c):
+  """ check the holder_double_hole of the gearring constraint c
+  """
   # holder_double_hole
   c['holder_double_hole_radius'] = c['holder_double_hole_diameter']/2.0
   c['holder_double_hole_position_radius'] = c['holder_hole_position_radius'] + c['holder_double_hole_position']
   if(c['holder_double_hole_length']<0):
-    print("ERR304: Error, holder_double_hole_length {:0.3f} should be positive".format(c['holder_double_hole_length']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR304: Error, holder_double_hole_length {:0.3f} should be positive".format(c['holder_double_hole_length']))
   elif(c['holder_double_hole_length']>0):
     if(c['holder_double_hole_radius']==0):
-      print("ERR308: Error, holder_double_hole_length {:0.3f} is positive whereas holder_double_hole_radius is set to zero".format(c['holder_double_hole_length']))
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR308: Error, holder_double_hole_length {:0.3f} is positive whereas holder_double_hole_radius is set to zero".format(c['holder_double_hole_length']))
   if(c['holder_double_hole_position']!=0):
     if(c['holder_double_hole_radius']==0):
-      print("ERR319: Error, holder_double_hole_position {:0.3f} is set whereas holder_double_hole_radius is still set to zero".format(c['holder_double_hole_position']))
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR319: Error, holder_double_hole_position {:0.3f} is set whereas holder_double_hole_radius is still set to zero".format(c['holder_double_hole_position']))
   if(c['holder_double_hole_radius']<0):
-    print("ERR322: Error, holder_double_hole_radius {:0.3f} must be positive or null".format(c['holder_double_hole_radius']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR322: Error, holder_double_hole_radius {:0.3f} must be positive or null".format(c['holder_double_hole_radius']))
   elif(c['holder_double_hole_radius']>0):
     if(c['holder_double_hole_length']==0):
-      print("ERR326: Error, holder_double_hole_length must be positive when holder_double_hole_radius {:0.3f} is positive".format(c['holder_double_hole_radius']))
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR326: Error, holder_double_hole_length must be positive when holder_double_hole_radius {:0.3f} is positive".format(c['holder_double_hole_radius']))
   # holder_double_hole_mark_nb
   if((c['holder_double_hole_mark_nb']<0)or(c['holder_double_hole_mark_nb']>c['holder_crenel_number'])):
-    print("ERR333: Error, holder_double_hole_mark_nb {:d} is out of its range 0..{:d}".format(c['holder_double_hole_mark_nb'], c['holder_crenel_number']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR333: Error, holder_double_hole_mark_nb {:d} is out of its range 0..{:d}".format(c['holder_double_hole_mark_nb'], c['holder_crenel_number']))
+
+def gearring_check_hole_B(c):
+  """ check the holder_hole_B of the gearring constraint c
+  """
   ## holder_hole_B
+  additional_holder_maximal_height = c['holder_radius'] - c['holder_crenel_x_position']
   holder_hole_B_radius = float(c['holder_hole_B_diameter'])/2
   # holder_hole_B_crenel_list_bis
   c['holder_hole_B_crenel_list_bis'] = [ 0 for i in range(c['holder_crenel_number']) ]
   for i in range(len(c['holder_hole_B_crenel_list'])):
     if((int(c['holder_hole_B_crenel_list'][i])<0)or(int(c['holder_hole_B_crenel_list'][i])>=c['holder_crenel_number'])):
-      print("ERR286: Error, the holder_hole_B_crenel_list index {:s} is out of the range 0..{:d}".format(c['holder_hole_B_crenel_list'][i], c['holder_crenel_number']))
-      sys.exit(2)
+      raise cnc25d_error.ConstraintError("ERR286: Error, the holder_hole_B_crenel_list index {:s} is out of the range 0..{:d}".format(c['holder_hole_B_crenel_list'][i], c['holder_crenel_number']))
     c['holder_hole_B_crenel_list_bis'][int(c['holder_hole_B_crenel_list'][i])] = 1
   #print("dbg358: holder_hole_B_crenel_list_bis:", c['holder_hole_B_crenel_list_bis'])
   c['holder_maximal_height_plus_B'] = c['holder_hole_position_radius'] + c['holder_crenel_B_position'] + c['holder_crenel_height'] - c['holder_radius'] + additional_holder_maximal_height
@@ -293,8 +299,19 @@ def gearring_constraint_check(c):
   #print("dbg378: holder_smoothing_radius_list:", c['holder_smoothing_radius_list'])
   #
   if(c['holder_crenel_number_cut']>c['holder_crenel_number']):
-    print("ERR288: Error, holder_crenel_number_cut {:d} must be smaller than holder_crenel_number {:d}".format(c['holder_crenel_number_cut'], c['holder_crenel_number']))
-    sys.exit(2)
+    raise cnc25d_error.ConstraintError("ERR288: Error, holder_crenel_number_cut {:d} must be smaller than holder_crenel_number {:d}".format(c['holder_crenel_number_cut'], c['holder_crenel_number']))
+
+def gearring_constraint_rules():
+  """ the rules checking the gearring constraint. When a constraint changes, only the rules depending on it are executed again
+  """
+  r_rules = [gearring_check_router_bit, gearring_check_gear_profile, gearring_check_holder, gearring_check_double_hole, gearring_check_hole_B]
+  return(r_rules)
+
+def gearring_constraint_check(c):
+  """ check the gearring constraint c and set the dynamic default values
+  """
+  for f_rule in gearring_constraint_rules():
+    f_rule(c)
   ###
   return(c)
 
@@ -341,11 +358,10 @@ def make_holder_crenel(ai_holder_maximal_height_plus, ai_holder_crenel_height, a
 # gearring 2D-figures construction
 ################################################################
 
-def gearring_2d_construction(c):
+def gearring_holder_outline(c, deps):
   """
-  construct the 2D-figures with outlines at the A-format for the gearring design
+  construct the holder outline at the A-format (intermediate figure of the gearring design)
   """
-  ### holder outline
   if(c['holder_crenel_number']==0):
     holder_outline = (c['g1_ix'], c['g1_iy'], c['holder_radius'])
   elif(c['holder_crenel_number']>0):
@@ -369,7 +385,14 @@ def gearring_2d_construction(c):
                         c['g1_ix']+c['holder_radius']*math.cos(end_angle), c['g1_iy']+c['holder_radius']*math.sin(end_angle), c['holder_smoothing_radius_list'][i+1]))
     holder_A[-1] = (holder_A[-1][0], holder_A[-1][1], holder_A[0][0], holder_A[0][1], 0)
     holder_outline = holder_A
-  ### holder-hole outline
+  return((holder_outline, None))
+
+def gearring_holder_hole_figure(c, deps):
+  """
+  construct the holder-hole outlines at the A-format (intermediate figure of the gearring design)
+  """
+  if(c['holder_crenel_number']>0):
+    angle_incr = 2*math.pi/c['holder_crenel_number']
   holder_hole_figure = []
   for i in range(c['holder_crenel_number']):
     hole_angle = c['holder_position_angle']+i*angle_incr
@@ -389,7 +412,14 @@ def gearring_2d_construction(c):
         #holder_hole_figure.append(gearwheel.marked_circle_crenel(c['g1_ix']+tmp_l2*math.cos(hole_angle+tmp_a2), c['g1_iy']+tmp_l2*math.sin(hole_angle+tmp_a2), c['holder_double_hole_radius'], hole_angle+tmp_a2+math.pi/2, c['holder_crenel_rbr']))
       else:
         holder_hole_figure.append([c['g1_ix']+tmp_l2*math.cos(hole_angle+tmp_a2), c['g1_iy']+tmp_l2*math.sin(hole_angle+tmp_a2), c['holder_double_hole_radius']])
-  ### design output
+  return((holder_hole_figure, None))
+
+def gearring_fig(c, deps):
+  """
+  construct the gearring_fig figure at the A-format
+  """
+  holder_outline = deps['_holder_outline']
+  holder_hole_figure = deps['_holder_hole_figure']
   gr_figure = []
   gr_figure.append(holder_outline) # largest outline first for freecad
   if(c['gear_tooth_nb']>0):
@@ -398,11 +428,21 @@ def gearring_2d_construction(c):
   else:
     gr_figure.append((c['g1_ix'], c['g1_iy'], float(c['gear_primitive_diameter'])/2))
   gr_figure.extend(holder_hole_figure)
-  #
+  return((gr_figure, c['gear_profile_height']))
+
+def gearring_without_hole_fig(c, deps):
+  """
+  construct the gearring_without_hole_fig figure at the A-format
+  """
   gr_wo_hole_fig = []
-  gr_wo_hole_fig.append(holder_outline)
-  gr_wo_hole_fig.extend(holder_hole_figure)
-  # gearring_cut : added for low_torque_transmission
+  gr_wo_hole_fig.append(deps['_holder_outline'])
+  gr_wo_hole_fig.extend(deps['_holder_hole_figure'])
+  return((gr_wo_hole_fig, c['gear_profile_height']))
+
+def gearring_cut(c, deps):
+  """
+  construct the gearring_cut figure at the A-format (added for low_torque_transmission)
+  """
   gearring_cut_fig = []
   if(c['holder_crenel_number_cut']>0):
     #print("dbg400: holder_crenel_number_cut:", c['holder_crenel_number_cut'])
@@ -448,20 +488,32 @@ def gearring_2d_construction(c):
           #gearring_cut_fig.append(gearwheel.marked_circle_crenel(c['g1_ix']+tmp_l2*math.cos(hole_angle+tmp_a2), c['g1_iy']+tmp_l2*math.sin(hole_angle+tmp_a2), c['holder_double_hole_radius'], hole_angle+tmp_a2+math.pi/2, c['holder_crenel_rbr']))
         else:
           gearring_cut_fig.append([c['g1_ix']+tmp_l2*math.cos(hole_angle+tmp_a2), c['g1_iy']+tmp_l2*math.sin(hole_angle+tmp_a2), c['holder_double_hole_radius']])
-    
-  ###
+  return((gearring_cut_fig, c['gear_profile_height']))
+
+def gearring_2d_figure_producers():
+  """
+  the figures of the gearring design with their dependencies. Only the requested figures are constructed
+  """
+  r_producers = collections.OrderedDict() # the figures are listed in the order of declaration
+  r_producers['_holder_outline'] = (gearring_holder_outline, [])
+  r_producers['_holder_hole_figure'] = (gearring_holder_hole_figure, [])
+  r_producers['gearring_fig'] = (gearring_fig, ['_holder_outline', '_holder_hole_figure'])
+  r_producers['gearring_without_hole_fig'] = (gearring_without_hole_fig, ['_holder_outline', '_holder_hole_figure'])
+  r_producers['gearring_cut'] = (gearring_cut, [])
+  return(r_producers)
+
+def gearring_2d_construction(c):
+  """
+  construct the 2D-figures with outlines at the A-format for the gearring design
+  """
   r_figures = {}
   r_height = {}
-  #
-  r_figures['gearring_fig'] = gr_figure
-  r_height['gearring_fig'] = c['gear_profile_height']
-  #
-  r_figures['gearring_without_hole_fig'] = gr_wo_hole_fig
-  r_height['gearring_without_hole_fig'] = c['gear_profile_height']
-  #
-  r_figures['gearring_cut'] = gearring_cut_fig
-  r_height['gearring_cut'] = c['gear_profile_height']
-  ###
+  deps = {}
+  (deps['_holder_outline'], h) = gearring_holder_outline(c, {})
+  (deps['_holder_hole_figure'], h) = gearring_holder_hole_figure(c, {})
+  (r_figures['gearring_fig'], r_height['gearring_fig']) = gearring_fig(c, deps)
+  (r_figures['gearring_without_hole_fig'], r_height['gearring_without_hole_fig']) = gearring_without_hole_fig(c, deps)
+  (r_figures['gearring_cut'], r_height['gearring_cut']) = gearring_cut(c, {})
   return((r_figures, r_height))
 
 ################################################################
@@ -604,7 +656,9 @@ class gearring(cnc25d_api.bare_design):
       l_3d_figure_file_list     = ['gearring_fig'],
       l_3d_conf_file_list       = ['gearring_3dconf1'],
       f_cli_return_type         = None,
-      l_self_test_list          = gearring_self_test())
+      l_self_test_list          = gearring_self_test(),
+      d_2d_figure_producers     = gearring_2d_figure_producers(),
+      l_constraint_rules        = gearring_constraint_rules())
     self.apply_constraint(constraint)
 
 
@@ -144,6 +144,15 @@ def gimbal_constraint_check(c):
 # gimbal 2D-figures construction
 ################################################################
 
+# the figures are listed in the order of the previous releases
+gimbal_figure_order = (
+  'internal_bagel', 'bagel_assembly', 'external_buttress_assembly', 'z_rod', 'bell_bagel_assembly',
+  'bell_external_face_buttress', 'face_A_fig', 'y_rod', 'bell_external_side_buttress',
+  'internal_buttress_assembly', 'spacer', 'external_bagel', 'cc_part_list', 'crest_A_fig', 'axle',
+  'middle_bagel', 'top_fig', 'crest_B_fig', 'x_rod', 'bell_face', 'part_list', 'gimbal_sketch', 'face_B_fig',
+  'face_threaded_rod', 'bell_side', 'internal_bagel_2', 'top_threaded_rod', 'bell_internal_buttress',
+  'cc_overview', 'bell_base', 'bell_part_overview')
+
 def gimbal_2d_construction(c):
   """ construct the 2D-figures with outlines at the A-format for the gimbal design
   """
@@ -192,7 +201,7 @@ def gimbal_2d_construction(c):
   r_figures['gimbal_sketch'] = gimbal_sketch_figure
   r_height['gimbal_sketch'] = 1.0
   ###
-  return((r_figures, r_height))
+  return(cnc25d_api.order_figures(r_figures, r_height, gimbal_figure_order))
 
 ################################################################
 # gimbal simulation
@@ -343,6 +352,15 @@ def gimbal_self_test():
     ["last test"            , "--bottom_angle 0.1 --top_angle 0.2"]]
   return(r_tests)
 
+def gimbal_figure_order_test():
+  """ check that get_2d_figure_id_list() returns the figures in the order of the previous releases
+  """
+  figure_ids = gimbal().get_2d_figure_id_list()
+  r_test = (figure_ids==list(gimbal_figure_order))
+  if(not r_test):
+    print("ERR142: Error, the gimbal figure order {:s} differs from {:s}".format(str(figure_ids), str(gimbal_figure_order)))
+  return(r_test)
+
 ################################################################
 # gimbal design declaration
 ################################################################
@@ -50,208 +50,163 @@ import Part
 from FreeCAD import Base
 import math
 import sys, argparse
-import svgwrite
-from dxfwrite import DXFEngine
+import os # for os.path.getsize() in outline_writer_benchmark()
+# svgwrite is optional: SVG files are written with the native writer by default
+try:
+  import svgwrite
+except ImportError:
+  svgwrite = None
+# dxfwrite is optional: DXF files are written with the native writer by default
+try:
+  from dxfwrite import DXFEngine
+except ImportError:
+  DXFEngine = None
 import Tkinter
 import time # for time.sleep to help Tkinter to finish properly
 import display_backend
+import small_geometry
+import segment_index # for the containment of the outlines in write_figure_in_gcode_stream()
 import cnc_outline # just used in figure_simple_display() for cnc_outline.outline_rotate, closed(), check_outline_format() and ideal_outline()
 import export_2d # just for test enhancement
 import design_help # just for get_effective_args() and mkdir_p
+import cnc25d_error
 
 
 ################################################################
 # global variable
 ################################################################
 
-unit_circle_resolution = 12 #6
+unit_circle_resolution = 12 #6 # used only when a resolution is given to complete_circle() or arc_of_circle()
+# the arcs and circles are converted into polylines with a chord deviation smaller than polyline_tolerance (see set_polyline_tolerance())
+polyline_tolerance = 0.01
+polyline_max_step_angle = math.pi/4 # at least 8 points per circle, even for the tiny fillets
 #default_dxf_layer_name = 'CNC25D'
 global_epsilon_length = math.pi/1000
 global_epsilon_angle = math.pi/10000
+# native SVG writer: number of decimals of the coordinates and shared style of the outlines
+svg_decimal_nb = 4
+svg_writer = 'native' # 'native' or 'svgwrite'
+svg_style_classes = (
+  ('outline', 'fill:green; fill-opacity:0.25; stroke:black; stroke-width:1'),
+  ('circle', 'fill:green; fill-opacity:0.25; stroke:black; stroke-width:1'))
+# native DXF writer: number of decimals of the coordinates
+dxf_decimal_nb = 6
+dxf_writer = 'native' # 'native' or 'dxfwrite'
+dxf_handle_seed = 0x10000000 # $HANDSEED written before the outlines are streamed: it must be greater than all the handles of the document
+# G-code writer: number of decimals of the coordinates and machining parameters (mm and mm/min, see set_gcode_parameters())
+gcode_decimal_nb = 4
+gcode_parameters = {
+  'feed_rate' : 600.0, # horizontal cut speed
+  'plunge_rate' : 150.0, # vertical cut speed
+  'depth_step' : 1.0, # maximal depth of a pass
+  'safe_z' : 5.0, # height of the rapid moves above the material (the top of the material is at Z=0)
+  'spindle_speed' : 10000, # 0 doesn't start the spindle
+  'cutter_compensation' : 1, # 1: the closed outlines are cut with G41/G42, 0: the tool center follows the outlines
+  'tool_number' : 1, # D word of G41/G42: the tool radius is read in the tool table of the controller
+  'tool_radius' : 1.0} # used for the lead-in and lead-out moves of the cutter compensation
 
 ################################################################
 # ******** sub-functions for the API ***********
 ################################################################
 
-def complete_circle(ai_center, ai_radius, ai_resolution):
-  """ Generate a list of points that creates a circle with the resolution ai_resolution.
-      ai_resolution sets the mamximum number of intermediate points to create
+def set_polyline_tolerance(ai_tolerance):
+  """ set the maximal chord deviation used to convert the arcs and circles into polylines (tkinter and polyline backends)
+  """
+  global polyline_tolerance
+  if(ai_tolerance<=0):
+    raise cnc25d_error.BackendError("ERR822: Error, the polyline tolerance {:0.5f} must be strictly positive".format(ai_tolerance))
+  polyline_tolerance = ai_tolerance
+
+def arc_step_number(ai_radius, ai_angle, ai_tolerance=None):
+  """ number of chords needed to follow the arc of radius ai_radius and angle ai_angle with a chord deviation smaller than ai_tolerance
+      If ai_tolerance is None, the global polyline_tolerance is used
+  """
+  l_tolerance = ai_tolerance
+  if(l_tolerance is None):
+    l_tolerance = polyline_tolerance
+  if(l_tolerance<=0):
+    raise cnc25d_error.BackendError("ERR823: Error, the polyline tolerance {:0.5f} must be strictly positive".format(l_tolerance))
+  max_step_angle = polyline_max_step_angle
+  if(l_tolerance<ai_radius):
+    max_step_angle = min(2*math.acos(1-l_tolerance/ai_radius), polyline_max_step_angle)
+  r_nb = max(1, int(math.ceil(abs(ai_angle)/max_step_angle)))
+  return(r_nb)
+
+def rotated_points(ai_cx, ai_cy, ai_radius, ai_start_angle, ai_step_angle, ai_point_nb):
+  """ list of the ai_point_nb points of the circle (ai_cx, ai_cy, ai_radius) at the angles ai_start_angle+(i+1)*ai_step_angle
+      The points are computed by incremental rotation, so only one cos/sin pair is computed per call
   """
   r_points = []
-  # calculation of the angle resolution:
-  if(ai_resolution<3):
-    print("ERR821: The ai_resolution is smaller than 3. Current ai_resolution = {:d}".format(ai_resolution))
-    sys.exit(2)
-  #print("dbg424: ai_radius:", ai_radius)
-  circle_resolution = int(ai_resolution * ai_radius) # circle resolution increase with the radius
+  if(ai_point_nb<1):
+    return(r_points)
+  cos_step = math.cos(ai_step_angle)
+  sin_step = math.sin(ai_step_angle)
+  dx = ai_radius*math.cos(ai_start_angle)
+  dy = ai_radius*math.sin(ai_start_angle)
+  for i in range(ai_point_nb):
+    (dx, dy) = (dx*cos_step-dy*sin_step, dx*sin_step+dy*cos_step)
+    r_points.append([ai_cx+dx, ai_cy+dy])
+  return(r_points)
+
+def complete_circle(ai_center, ai_radius, ai_resolution=None, ai_tolerance=None):
+  """ Generate a list of points that creates a circle.
+      If ai_resolution is set, the number of points is ai_resolution*ai_radius (legacy behavior)
+      Otherwise the number of points is set by the maximal chord deviation ai_tolerance (by default, the global polyline_tolerance)
+  """
+  if(ai_resolution is not None):
+    # calculation of the angle resolution:
+    if(ai_resolution<3):
+      raise cnc25d_error.BackendError("ERR821: The ai_resolution is smaller than 3. Current ai_resolution = {:d}".format(ai_resolution))
+    #print("dbg424: ai_radius:", ai_radius)
+    circle_resolution = int(ai_resolution * ai_radius) # circle resolution increase with the radius
+  else:
+    circle_resolution = max(3, arc_step_number(ai_radius, 2*math.pi, ai_tolerance))
   angle_resolution = 2*math.pi/circle_resolution
   # create the list of points
-  for i in range(circle_resolution):
-    r_points.append([ai_center[0]+ai_radius*math.cos(i*angle_resolution), ai_center[1]+ai_radius*math.sin(i*angle_resolution)])
+  r_points = [[ai_center[0]+ai_radius, ai_center[1]]]
+  r_points.extend(rotated_points(ai_center[0], ai_center[1], ai_radius, 0, angle_resolution, circle_resolution-1))
   return(r_points)
 
-def arc_3_points_to_radius_center_angles(ai_start, ai_middle, ai_end):
-  """ From three points (A,B,C: equivalent to 6 floats) computes the radius, the center (I) and the angles ((Ix,IA), (Ix,IB), (Ix,IC)) of the arc passing through A, B and C
-  """
-  # interpretation of the three points
-  ptax = ai_start[0]
-  ptay = ai_start[1]
-  ptbx = ai_middle[0]
-  ptby = ai_middle[1]
-  ptcx = ai_end[0]
-  ptcy = ai_end[1]
-  #print("dbg501: pta: {:6.01f}  {:6.01f}".format(ptax, ptay))
-  #print("dbg502: ptb: {:6.01f}  {:6.01f}".format(ptbx, ptby))
-  #print("dbg503: ptc: {:6.01f}  {:6.01f}".format(ptcx, ptcy))
-  # epsilon definiton to be tolerant to calculation imprecision
-  #epsilon = math.pi/1000 # can be used to compare radian and sine
-  length_epsilon = global_epsilon_length # to speed up run time
-  angle_epsilon = global_epsilon_angle # to speed up run time
-  #print("dbg747: length_epsilon:", length_epsilon)
-  # check
-  if((ptax==ptbx)and(ptay==ptby)):
-    print("ERR807: Error, point_A and point_B are identical!")
-    sys.exit(2)
-  if((ptbx==ptcx)and(ptby==ptcy)):
-    print("ERR808: Error, point_B and point_C are identical!")
-    sys.exit(2)
-  if((ptax==ptcx)and(ptay==ptcy)):
-    print("ERR809: Error, point_A and point_C are identical!")
-    sys.exit(2)
-  ## check the documentation for the explanation of the following calculation
-  # length of [AB] and [BC]
-  lab = math.sqrt((ptbx-ptax)**2+(ptby-ptay)**2)
-  lbc = math.sqrt((ptcx-ptbx)**2+(ptcy-ptby)**2)
-  if(lab<length_epsilon):
-    print("ERR811: Error, A and B are almost identical")
-    print("dbg559: pta={:0.2f} {:0.2f}  ptb={:0.2f} {:0.2f}  ptc={:0.2f} {:0.2f}".format(ptax, ptay, ptbx, ptby, ptcx, ptcy))
-    sys.exit(2)
-  if(lbc<length_epsilon):
-    print("ERR812: Error, B and C are almost identical")
-    sys.exit(2)
-  # calculation of cos(e), cos(f), sin(e) and sin(f)
-  cos_e = (ptbx-ptax)/lab
-  cos_f = (ptcx-ptbx)/lbc
-  sin_e = (ptby-ptay)/lab
-  sin_f = (ptcy-ptby)/lbc
-  #print("dbg304: cos_e: ", cos_e)
-  #print("dbg305: sin_e: ", sin_e)
-  #print("dbg306: cos_f: ", cos_f)
-  #print("dbg307: sin_f: ", sin_f)
-  is_colinear = (math.copysign(1, sin_e)*cos_e)-(math.copysign(1,sin_f)*cos_f)
-  #print("dbg556: is_colinear:", is_colinear)
-  if(abs(is_colinear)<angle_epsilon):
-    #print("ERR810: Error, A, B, C are colinear. Arc can not be created!")
-    #sys.exit(2)
-    if(lab>100*length_epsilon):
-      pass # to let comment the following warning
-      #print("WARN810: Arc ABC is replaced by the line AC, because A,B,C are colinear!")
-      #print("dbg559: A= {:0.2f} {:0.2f}  B= {:0.2f} {:0.2f}  C= {:0.2f} {:0.2f}".format(ptax, ptay, ptbx, ptby, ptcx, ptcy))
-      #print("dbg558: is_colinear:", is_colinear)
-      #print("dbg557: lab:", lab)
-    r_a3ptrca = (0, 0, 0, 0, 0, 0, 0, 0, 0)
-    return(r_a3ptrca)
-  # Calculation of M and N
-  ptmx = (ptax+ptbx)/2
-  ptmy = (ptay+ptby)/2
-  ptnx = (ptbx+ptcx)/2
-  ptny = (ptby+ptcy)/2
-  #print("dbg134: ptmx:", ptmx)
-  #print("dbg135: ptmy:", ptmy)
-  #print("dbg136: ptnx:", ptnx)
-  #print("dbg137: ptny:", ptny)
-  # calculation of I
-  lix = cos_e*sin_f-cos_f*sin_e
-  kix = sin_f*(cos_e*ptmx+sin_e*ptmy)-sin_e*(cos_f*ptnx+sin_f*ptny)
-  liy = sin_e*cos_f-sin_f*cos_e
-  kiy = cos_f*(cos_e*ptmx+sin_e*ptmy)-cos_e*(cos_f*ptnx+sin_f*ptny)
-  if(abs(lix)<angle_epsilon):
-    print("ERR813: Error, A, B and C are almost colinear. Arc can not be created!")
-    sys.exit(2)
-  if(abs(liy)<angle_epsilon):
-    print("ERR814: Error, A, B and C are almost colinear. Arc can not be created!")
-    sys.exit(2)
-  #print("dbg124: lix:", lix)
-  #print("dbg125: kix:", kix)
-  #print("dbg126: liy:", liy)
-  #print("dbg127: kiy:", kiy)
-  ptix = kix / lix
-  ptiy = kiy / liy
-  #print("dbg505: pti: {:6.02f}  {:6.02f}".format(ptix, ptiy))
-  # length of [IA], [IB] and [IC]
-  lia = math.sqrt((ptax-ptix)**2+(ptay-ptiy)**2)
-  lib = math.sqrt((ptbx-ptix)**2+(ptby-ptiy)**2)
-  lic = math.sqrt((ptcx-ptix)**2+(ptcy-ptiy)**2)
-  if(abs(lib-lia)>length_epsilon):
-    #print("dbg404: lia:", lia)
-    #print("dbg405: lib:", lib)
-    print("ERR815: I is not equidistant from A and B!")
-    sys.exit(2)
-  if(abs(lic-lib)>length_epsilon):
-    #print("dbg402: lib:", lib)
-    #print("dbg403: lic:", lic)
-    print("ERR816: I is not equidistant from B and C!")
-    sys.exit(2)
-  # calculation of the angle u=(Ix, IA) , v=(Ix, IB) and w=(Ix, IC)
-  u = math.atan2(ptay-ptiy, ptax-ptix)
-  v = math.atan2(ptby-ptiy, ptbx-ptix)
-  w = math.atan2(ptcy-ptiy, ptcx-ptix)
-  # calculation of the angle uv=(IA, IB), uw=(IA, IC) vw=(IB, IC)
-  uv = math.fmod(v-u+4*math.pi, 2*math.pi)
-  uw = math.fmod(w-u+4*math.pi, 2*math.pi)
-  vw = math.fmod(w-v+4*math.pi, 2*math.pi)
-  # check arc direction
-  ccw_ncw = 1
-  if(uw>uv):
-    #print("dbg874: arc of circle direction: counter clock wise (CCW)")
-    ccw_ncw = 1
-  else:
-    #print("dbg875: arc of circle direction: clock wise (CW)")
-    ccw_ncw = 0
-    uv = uv - 2*math.pi
-    vw = vw - 2*math.pi
-    uw = uw - 2*math.pi
-  r_a3ptrca = (lia, ptix, ptiy, u, v, w, uv, vw, uw)
-  return(r_a3ptrca)
-
-def arc_of_circle(ai_start, ai_middle, ai_end, ai_resolution):
+# moved in small_geometry to be shared with cnc_outline.Valid_Outline.get_resolved_arcs()
+arc_3_points_to_radius_center_angles = small_geometry.arc_3_points_to_radius_center_angles
+
+def arc_of_circle(ai_start, ai_middle, ai_end, ai_resolution=None, ai_resolved_arc=None, ai_tolerance=None):
   """ From three points (list of 6 floats) creates a polyline (list of 2*n floats) representing the arc of circle defined by the three points
-      ai_resolution sets the maximum number of intermediate points to create
+      If ai_resolution is set, it sets the number of intermediate points (ai_resolution*radius points per turn, legacy behavior)
+      Otherwise the number of intermediate points is set by the maximal chord deviation ai_tolerance (by default, the global polyline_tolerance)
+      ai_resolved_arc is the result of arc_3_points_to_radius_center_angles() for the three points, if it is already computed
   """
-  ### precision
-  #epsilon = math.pi/1000 # can be used to compare radian and sine
-  #length_epsilon = global_epsilon_length # to speed up run time
-  #angle_epsilon = global_epsilon_angle # to speed up run time
   ### get radius, center and angles
-  (lia, ptix, ptiy, u, v, w, uv, vw, uw) = arc_3_points_to_radius_center_angles(ai_start, ai_middle, ai_end)
+  if(ai_resolved_arc is None):
+    ai_resolved_arc = arc_3_points_to_radius_center_angles(ai_start, ai_middle, ai_end)
+  (lia, ptix, ptiy, u, v, w, uv, vw, uw) = ai_resolved_arc
   ### colinear case
   if(lia==0):
     r_polyline = (ai_start, ai_end)
     return(r_polyline)
   ### real arc case
-  # calculation of the angle resolution:
-  if(ai_resolution<3):
-    print("ERR821: The ai_resolution is smaller than 3. Current ai_resolution = {:d}".format(ai_resolution))
-    sys.exit(2)
-  #print("dbg414: arc radius: lia:", lia)
-  circle_resolution = ai_resolution * lia # angle resolution increase with the radius
-  ar = 2*math.pi/circle_resolution
-  # number of intermediate point between A and B and step angle
-  abip = int(abs(uv)/ar)
+  if(ai_resolution is not None):
+    # calculation of the angle resolution:
+    if(ai_resolution<3):
+      raise cnc25d_error.BackendError("ERR821: The ai_resolution is smaller than 3. Current ai_resolution = {:d}".format(ai_resolution))
+    #print("dbg414: arc radius: lia:", lia)
+    circle_resolution = ai_resolution * lia # angle resolution increase with the radius
+    ar = 2*math.pi/circle_resolution
+    # number of intermediate point between A and B, and between B and C
+    abip = int(abs(uv)/ar)
+    bcip = int(abs(vw)/ar)
+  else:
+    abip = arc_step_number(lia, uv, ai_tolerance)-1
+    bcip = arc_step_number(lia, vw, ai_tolerance)-1
+  # step angles
   absa = uv/(abip+1)
-  #print("dbg741: uv angle resolution: absa:", absa)
-  # number of intermediate point between B and C and step angle
-  bcip = int(abs(vw)/ar)
   bcsa = vw/(bcip+1)
-  #print("dbg742: vw angle resolution: bcsa:", bcsa)
   # polyline construction
   r_polyline = []
   r_polyline.append(ai_start)
-  for i in range(abip):
-    r_polyline.append([ptix+lia*math.cos(u+(i+1)*absa), ptiy+lia*math.sin(u+(i+1)*absa)])
+  r_polyline.extend(rotated_points(ptix, ptiy, lia, u, absa, abip))
   r_polyline.append(ai_middle)
-  for i in range(bcip):
-    r_polyline.append([ptix+lia*math.cos(v+(i+1)*bcsa), ptiy+lia*math.sin(v+(i+1)*bcsa)])
+  r_polyline.extend(rotated_points(ptix, ptiy, lia, v, bcsa, bcip))
   r_polyline.append(ai_end)
   return(r_polyline)
 
@@ -268,10 +223,9 @@ def outline_arc_line_with_freecad(ai_segments, ai_outline_closed):
   fc_outline = []
   for i in range(segment_nb-1):
     if((abs(ai_segments[i][-2]-ai_segments[i+1][-2])<length_epsilon)and(abs(ai_segments[i][-1]-ai_segments[i+1][-1])<length_epsilon)):
-      print("ERR264: Error, point of index {:d} and {:d} are identical. x {:0.5f}  y {:0.5f}".format(i,i+1, ai_segments[i][-2], ai_segments[i][-1]))
       #for j in range(segment_nb):
       #  print("dbg269: pt {:d}  x {:0.3f}  y {:0.3f}".format(j, ai_segments[j][-2], ai_segments[j][-1]))
-      sys.exit(2)
+      raise cnc25d_error.BackendError("ERR264: Error, point of index {:d} and {:d} are identical. x {:0.5f}  y {:0.5f}".format(i,i+1, ai_segments[i][-2], ai_segments[i][-1]))
   for i in range(segment_nb):
     segment_type = 'line'
     fc_vectors.append(Base.Vector(ai_segments[i+1][0], ai_segments[i+1][1], constant_z))
@@ -296,8 +250,9 @@ def outline_arc_line_with_freecad(ai_segments, ai_outline_closed):
   r_outline = Part.Shape(fc_outline)
   return(r_outline)
 
-def outline_arc_line_with_svgwrite(ai_segments, ai_outline_closed):
+def outline_arc_line_with_svgwrite(ai_segments, ai_outline_closed, ai_resolved_arcs=None):
   """ Generates the arcs and lines outline with the mozman svgwrite
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
   """
   svg_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
   segment_nb = len(ai_segments)-1
@@ -326,7 +281,11 @@ def outline_arc_line_with_svgwrite(ai_segments, ai_outline_closed):
       #svg_line.stroke('black', width=1)
       svg_outline.append(svg_line)
     elif(segment_type=='arc'):
-      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      if(ai_resolved_arcs is None):
+        resolved_arc = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      else:
+        resolved_arc = ai_resolved_arcs[i+1]
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arc
       large_arc_flag = 0
       if(abs(uw)>math.pi):
         large_arc_flag = 1
@@ -353,8 +312,75 @@ def outline_arc_line_with_svgwrite(ai_segments, ai_outline_closed):
   r_outline = svg_outline
   return(r_outline)
 
-def outline_arc_line_with_dxfwrite(ai_segments, ai_outline_closed):
+def short_number(ai_value, ai_decimal_nb):
+  """ format a coordinate with ai_decimal_nb decimals and without the trailing zeros
+  """
+  r_str = "{:0.{:d}f}".format(ai_value, ai_decimal_nb)
+  if('.' in r_str):
+    r_str = r_str.rstrip('0').rstrip('.')
+  if(r_str=='-0'):
+    r_str = '0'
+  return(r_str)
+
+def svg_number(ai_value):
+  """ format a coordinate for the native SVG writer
+  """
+  return(short_number(ai_value, svg_decimal_nb))
+
+def dxf_number(ai_value):
+  """ format a coordinate for the native DXF writer
+  """
+  return(short_number(ai_value, dxf_decimal_nb))
+
+def outline_arc_line_with_svgpath(ai_segments, ai_outline_closed, ai_resolved_arcs=None):
+  """ Generates the arcs and lines outline as one native SVG path element (a string)
+      The geometry is the one of outline_arc_line_with_svgwrite() but the arcs are written with absolute coordinates
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
+  """
+  svg_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
+  segment_nb = len(ai_segments)-1
+  path_data = ["M{:s},{:s}".format(svg_number(ai_segments[0][0]), svg_number(ai_segments[0][1]))]
+  for i in range(segment_nb):
+    segment_type = 'line'
+    svg_points.append(tuple((ai_segments[i+1][0], ai_segments[i+1][1])))
+    point_start = svg_points[-2]
+    point_end = svg_points[-1]
+    if(len(ai_segments[i+1])==4):
+      segment_type = 'arc'
+      svg_points.append(tuple((ai_segments[i+1][2], ai_segments[i+1][3])))
+      point_start = svg_points[-3]
+      point_mid = svg_points[-2]
+      point_end = svg_points[-1]
+    last_segment = (i==segment_nb-1)
+    if(last_segment and ai_outline_closed):
+      point_end = svg_points[0]
+    if(segment_type=='line'):
+      if(not (last_segment and ai_outline_closed)): # the closing line is drawn by Z
+        path_data.append("L{:s},{:s}".format(svg_number(point_end[0]), svg_number(point_end[1])))
+    elif(segment_type=='arc'):
+      if(ai_resolved_arcs is None):
+        resolved_arc = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      else:
+        resolved_arc = ai_resolved_arcs[i+1]
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arc
+      large_arc_flag = 0
+      if(abs(uw)>math.pi):
+        large_arc_flag = 1
+      sweep_flag = 1
+      if(uw<0):
+        sweep_flag = 0
+      if(lia==0):
+        path_data.append("L{:s},{:s}".format(svg_number(point_end[0]), svg_number(point_end[1])))
+      else:
+        path_data.append("A{:s},{:s} 0 {:d},{:d} {:s},{:s}".format(svg_number(lia), svg_number(lia), large_arc_flag, sweep_flag, svg_number(point_end[0]), svg_number(point_end[1])))
+  if(ai_outline_closed):
+    path_data.append("Z")
+  r_outline = '<path class="outline" d="{:s}"/>\n'.format(" ".join(path_data))
+  return(r_outline)
+
+def outline_arc_line_with_dxfwrite(ai_segments, ai_outline_closed, ai_resolved_arcs=None):
   """ Generates the arcs and lines outline with the mozman dxfwrite
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
   """
   dxf_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
   segment_nb = len(ai_segments)-1
@@ -381,7 +407,11 @@ def outline_arc_line_with_dxfwrite(ai_segments, ai_outline_closed):
       dxf_line = DXFEngine.line(start=point_start, end=point_end)
       dxf_outline.append(dxf_line)
     elif(segment_type=='arc'):
-      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      if(ai_resolved_arcs is None):
+        resolved_arc = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      else:
+        resolved_arc = ai_resolved_arcs[i+1]
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arc
       u2 = u
       w2 = u + uw
       if(uw<0):
@@ -405,61 +435,164 @@ def outline_arc_line_with_dxfwrite(ai_segments, ai_outline_closed):
   r_outline = dxf_outline
   return(r_outline)
 
-def outline_arc_line_with_tkinter(ai_segments, ai_outline_closed):
-  """ Transform the arcs and lines outlines into tkinter lines
+def outline_arc_line_with_lwpolyline(ai_segments, ai_outline_closed, ai_resolved_arcs=None):
+  """ Generates the arcs and lines outline as one DXF LWPOLYLINE record for the native DXF writer
+      The record is ('LWPOLYLINE', closed_flag, vertices) where vertices is a list of [x, y, bulge]
+      The bulge of a vertex is tan(sweep/4) of the arc starting at this vertex (0 for a line)
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
+  """
+  lw_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
+  segment_nb = len(ai_segments)-1
+  vertices = [[ai_segments[0][0], ai_segments[0][1], 0]]
+  for i in range(segment_nb):
+    segment_type = 'line'
+    lw_points.append(tuple((ai_segments[i+1][0], ai_segments[i+1][1])))
+    point_start = lw_points[-2]
+    point_end = lw_points[-1]
+    if(len(ai_segments[i+1])==4):
+      segment_type = 'arc'
+      lw_points.append(tuple((ai_segments[i+1][2], ai_segments[i+1][3])))
+      point_start = lw_points[-3]
+      point_mid = lw_points[-2]
+      point_end = lw_points[-1]
+    last_segment = (i==segment_nb-1)
+    if(last_segment and ai_outline_closed):
+      point_end = lw_points[0]
+    if(segment_type=='arc'):
+      if(ai_resolved_arcs is None):
+        resolved_arc = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      else:
+        resolved_arc = ai_resolved_arcs[i+1]
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arc
+      if(lia!=0): # when arc_3_points_to_radius_center_angles found that the 3 points are too colinear, it is a line
+        vertices[-1][2] = math.tan(uw/4)
+    if(not (last_segment and ai_outline_closed)): # the closing segment ends on the first vertex
+      vertices.append([point_end[0], point_end[1], 0])
+  closed_flag = 0
+  if(ai_outline_closed):
+    closed_flag = 1
+  r_outline = [('LWPOLYLINE', closed_flag, vertices)]
+  return(r_outline)
+
+def outline_arc_line_with_polyline(ai_segments, ai_outline_closed, ai_resolved_arcs=None, ai_tolerance=None):
+  """ Transform the arcs and lines outline into a polyline (list of [x, y]). The arcs are approximated with the chord deviation ai_tolerance
+      If the outline is closed, the last point of the polyline is the first point
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
   """
-  tkline_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
+  pl_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
   segment_nb = len(ai_segments)-1
-  tkline_outline = []
+  r_polyline = [[ai_segments[0][0], ai_segments[0][1]]]
   for i in range(segment_nb):
     segment_type = 'line'
-    tkline_points.append(tuple((ai_segments[i+1][0], ai_segments[i+1][1])))
-    point_start = tkline_points[-2]
-    point_end = tkline_points[-1]
+    pl_points.append(tuple((ai_segments[i+1][0], ai_segments[i+1][1])))
+    point_start = pl_points[-2]
+    point_end = pl_points[-1]
     if(len(ai_segments[i+1])==4):
       segment_type = 'arc'
-      tkline_points.append(tuple((ai_segments[i+1][2], ai_segments[i+1][3])))
-      point_start = tkline_points[-3]
-      point_mid = tkline_points[-2]
-      point_end = tkline_points[-1]
+      pl_points.append(tuple((ai_segments[i+1][2], ai_segments[i+1][3])))
+      point_start = pl_points[-3]
+      point_mid = pl_points[-2]
+      point_end = pl_points[-1]
     if(i==segment_nb-1):
-      #print("dbg306: last segment")
       if(ai_outline_closed):
-        #print("dbg307: close")
-        point_end = tkline_points[0]
-    #print("dbg563: i: {:d}  segment: {:s}".format(i, segment_type))
+        point_end = pl_points[0]
     if(segment_type=='line'):
-      tkinter_line = (point_start[0], point_start[1], point_end[0], point_end[1])
-      tkline_outline.append(tkinter_line)
+      r_polyline.append([point_end[0], point_end[1]])
     elif(segment_type=='arc'):
-      arc_polyline = arc_of_circle(point_start, point_mid, point_end, unit_circle_resolution)
-      arc_polyline_tk = []
-      for i in range(len(arc_polyline)-1):
-        arc_polyline_tk.append((arc_polyline[i][0], arc_polyline[i][1], arc_polyline[i+1][0], arc_polyline[i+1][1]))
-      tkline_outline.extend(arc_polyline_tk)
-  r_outline = tuple(tkline_outline)
+      resolved_arc = None
+      if(ai_resolved_arcs is not None):
+        resolved_arc = ai_resolved_arcs[i+1]
+      arc_polyline = arc_of_circle(point_start, point_mid, point_end, None, resolved_arc, ai_tolerance)
+      r_polyline.extend(arc_polyline[1:])
+  return(r_polyline)
+
+def outline_circle_with_polyline(ai_center, ai_radius, ai_tolerance=None):
+  """ Transform the circle outline into a closed polyline (the last point is the first point)
+  """
+  r_polyline = complete_circle(ai_center, ai_radius, None, ai_tolerance)
+  r_polyline.append(list(r_polyline[0]))
+  return(r_polyline)
+
+def polyline_to_tkinter(ai_polyline):
+  """ Transform a polyline into tkinter lines
+  """
+  r_outline = tuple((ai_polyline[i][0], ai_polyline[i][1], ai_polyline[i+1][0], ai_polyline[i+1][1]) for i in range(len(ai_polyline)-1))
   return(r_outline)
 
-def outline_circle_with_tkinter(ai_center, ai_radius):
+def gcode_number(ai_value):
+  """ format a coordinate for the G-code writer
+  """
+  return(short_number(ai_value, gcode_decimal_nb))
+
+def outline_arc_line_with_gcode(ai_segments, ai_outline_closed, ai_resolved_arcs=None):
+  """ Generates the arcs and lines outline as G-code moves (G1 for the lines, G2/G3 for the arcs)
+      It returns a list of (x_end, y_end, gcode_block) where gcode_block moves the tool from the previous point to (x_end, y_end)
+      I and J are the position of the arc center relative to the start of the arc
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
+  """
+  gc_points = [tuple((ai_segments[0][0], ai_segments[0][1]))]
+  segment_nb = len(ai_segments)-1
+  r_moves = []
+  for i in range(segment_nb):
+    segment_type = 'line'
+    gc_points.append(tuple((ai_segments[i+1][0], ai_segments[i+1][1])))
+    point_start = gc_points[-2]
+    point_end = gc_points[-1]
+    if(len(ai_segments[i+1])==4):
+      segment_type = 'arc'
+      gc_points.append(tuple((ai_segments[i+1][2], ai_segments[i+1][3])))
+      point_start = gc_points[-3]
+      point_mid = gc_points[-2]
+      point_end = gc_points[-1]
+    if(i==segment_nb-1):
+      if(ai_outline_closed):
+        point_end = gc_points[0]
+    gc_block = "G1 X{:s} Y{:s}".format(gcode_number(point_end[0]), gcode_number(point_end[1]))
+    if(segment_type=='arc'):
+      if(ai_resolved_arcs is None):
+        resolved_arc = arc_3_points_to_radius_center_angles(point_start, point_mid, point_end)
+      else:
+        resolved_arc = ai_resolved_arcs[i+1]
+      (lia, ptix, ptiy, u, v, w, uv, vw, uw) = resolved_arc
+      if(lia!=0): # when arc_3_points_to_radius_center_angles found that the 3 points are too colinear, it is a line
+        gc_direction = 'G3' # counter clock wise
+        if(uw<0):
+          gc_direction = 'G2' # clock wise
+        gc_block = "{:s} X{:s} Y{:s} I{:s} J{:s}".format(gc_direction, gcode_number(point_end[0]), gcode_number(point_end[1]), gcode_number(ptix-point_start[0]), gcode_number(ptiy-point_start[1]))
+    r_moves.append((point_end[0], point_end[1], gc_block))
+  return(r_moves)
+
+def outline_circle_with_gcode(ai_center, ai_radius, ai_start_angle=0):
+  """ Generates the circle as one G3 move (complete counter clock wise turn) starting and ending at the angle ai_start_angle
+  """
+  start_x = ai_center[0]+ai_radius*math.cos(ai_start_angle)
+  start_y = ai_center[1]+ai_radius*math.sin(ai_start_angle)
+  gc_block = "G3 X{:s} Y{:s} I{:s} J{:s}".format(gcode_number(start_x), gcode_number(start_y), gcode_number(ai_center[0]-start_x), gcode_number(ai_center[1]-start_y))
+  r_moves = [(start_x, start_y, gc_block)]
+  return(r_moves)
+
+def outline_arc_line_with_tkinter(ai_segments, ai_outline_closed, ai_resolved_arcs=None, ai_tolerance=None):
+  """ Transform the arcs and lines outlines into tkinter lines
+      ai_resolved_arcs is the list of the resolved-arc records of the outline (see cnc_outline.Valid_Outline.get_resolved_arcs())
+  """
+  r_outline = polyline_to_tkinter(outline_arc_line_with_polyline(ai_segments, ai_outline_closed, ai_resolved_arcs, ai_tolerance))
+  return(r_outline)
+
+def outline_circle_with_tkinter(ai_center, ai_radius, ai_tolerance=None):
   """ Transform the circle outline into tkinter lines
   """
-  circle_points = complete_circle(ai_center, ai_radius, unit_circle_resolution)
-  circle_polyline_tk = []
-  for i in range(len(circle_points)-1):
-    circle_polyline_tk.append((circle_points[i][0], circle_points[i][1], circle_points[i+1][0], circle_points[i+1][1]))
-  circle_polyline_tk.append((circle_points[-1][0], circle_points[-1][1], circle_points[0][0], circle_points[0][1]))
-  r_outline = tuple(circle_polyline_tk)
+  r_outline = polyline_to_tkinter(outline_circle_with_polyline(ai_center, ai_radius, ai_tolerance))
   return(r_outline)
 
-def outline_circle(ai_center, ai_radius, ai_backend):
+def outline_circle(ai_center, ai_radius, ai_backend, ai_tolerance=None):
   """ Generates a circle according to the selected backend.
-      Possible backend: freecad, mozman dxfwrite, mozman svgwrite, Tkinter.
+      Possible backend: freecad, mozman dxfwrite, mozman svgwrite, svgpath, lwpolyline, Tkinter, polyline, gcode.
+      ai_tolerance is the chord deviation of the tkinter and polyline backends (by default, the global polyline_tolerance)
   """
   #r_outline = ''
   # check the radius
   if(ai_radius<=0):
-    print("ERR409: Error, the radius {:0.3f} is negative or null!".format(ai_radius))
-    sys.exit(2)
+    raise cnc25d_error.BackendError("ERR409: Error, the radius {:0.3f} is negative or null!".format(ai_radius))
   # select backend
   if(ai_backend=='freecad'):
     r_outline = Part.Circle(Base.Vector(ai_center[0], ai_center[1], 0), Base.Vector(0,0,1), ai_radius).toShape()
@@ -467,11 +600,19 @@ def outline_circle(ai_center, ai_radius, ai_backend):
     svg_circle = svgwrite.shapes.Circle(center=(ai_center[0], ai_center[1]), r=ai_radius)
     svg_circle.fill('green', opacity=0.25).stroke('black', width=1)
     r_outline = [svg_circle] # circle wrapped in list to help the integration in the function write_figure_in_svg()
+  elif(ai_backend=='svgpath'):
+    r_outline = '<circle class="circle" cx="{:s}" cy="{:s}" r="{:s}"/>\n'.format(svg_number(ai_center[0]), svg_number(ai_center[1]), svg_number(ai_radius))
   elif(ai_backend=='dxfwrite'):
     dxf_circle = DXFEngine.circle(radius=ai_radius, center=(ai_center[0], ai_center[1]))
     r_outline = [dxf_circle] # circle wrapped in list to help the integration in the function write_figure_in_dxf()
+  elif(ai_backend=='lwpolyline'):
+    r_outline = [('CIRCLE', ai_center[0], ai_center[1], ai_radius)]
   elif(ai_backend=='tkinter'):
-    r_outline = outline_circle_with_tkinter(ai_center, ai_radius)
+    r_outline = outline_circle_with_tkinter(ai_center, ai_radius, ai_tolerance)
+  elif(ai_backend=='polyline'):
+    r_outline = outline_circle_with_polyline(ai_center, ai_radius, ai_tolerance)
+  elif(ai_backend=='gcode'):
+    r_outline = outline_circle_with_gcode(ai_center, ai_radius)
   return(r_outline)
 
 ################################################################
@@ -480,9 +621,10 @@ def outline_circle(ai_center, ai_radius, ai_backend):
 
 ### outline level function
 
-def outline_arc_line(ai_segments, ai_backend):
+def outline_arc_line(ai_segments, ai_backend, ai_tolerance=None):
   """ Generates the arcs and lines outline according to the selected backend
-      Possible backend: freecad, mozman dxfwrite, mozman svgwrite, Tkinter.
+      Possible backend: freecad, mozman dxfwrite, mozman svgwrite, svgpath (native SVG element string), lwpolyline (native DXF record), Tkinter, polyline (list of points), gcode (list of G-code moves).
+      ai_tolerance is the chord deviation of the arcs with the tkinter and polyline backends (by default, the global polyline_tolerance)
       ai_segments is a list of segments (ie line or arc)
       If ai_segments is a list/tuple of list/tuple, it's a list of segments (ie line or arc)
       a segment starts from the last point of the previous segment.
@@ -498,16 +640,20 @@ def outline_arc_line(ai_segments, ai_backend):
   r_outline = ''
   #print("dbg204: len(ai_segments):", len(ai_segments))
   #print("dbg205: ai_backend:", ai_backend)
+  if(isinstance(ai_segments, cnc_outline.Array_Outline)): # the backends work on the list of segments
+    ai_segments = ai_segments.to_list()
   # check is ai_segments is a list or a tuple
   if(not isinstance(ai_segments, (tuple, list))):
-    print("ERR337: Error, ai_segments must be a list or a tuple")
-    sys.exit(2)
+    raise cnc25d_error.BackendError("ERR337: Error, ai_segments must be a list or a tuple")
+  if((ai_backend=='svgwrite')and(svgwrite is None)):
+    raise cnc25d_error.BackendError("ERR338: Error, the backend svgwrite requires the Python package svgwrite that is not installed")
+  if((ai_backend=='dxfwrite')and(DXFEngine is None)):
+    raise cnc25d_error.BackendError("ERR339: Error, the backend dxfwrite requires the Python package dxfwrite that is not installed")
   # check if the outline is a circle or a general outline
   if(isinstance(ai_segments[0], (tuple, list))): # general outline
     # checks on ai_segments for general outline
     if(len(ai_segments)<2):
-      print("ERR509: Error, the segment list must contain at least 2 elements. Currently, len(ai_segments) = {:d}".format(len(ai_segments)))
-      sys.exit(2)
+      raise cnc25d_error.BackendError("ERR509: Error, the segment list must contain at least 2 elements. Currently, len(ai_segments) = {:d}".format(len(ai_segments)))
     # convert any format into format-B
     if(len(ai_segments[0])==3): # format-A or format-C
       print("WARN231: warning, format-A or format-C used in outline_arc_line() and must be converted in format-B with ideal_outline()")
@@ -515,34 +661,49 @@ def outline_arc_line(ai_segments, ai_backend):
     else:
       outline_B = ai_segments
     if(len(outline_B[0])!=2):
-      print("ERR403: Error, the first element of the segment list must have 2 elements. Currently, len(outline_B[0]) = {:d}".format(len(outline_B[0])))
-      sys.exit(2)
-    for i in range(len(outline_B)):
-      if((len(outline_B[i])!=2)and(len(outline_B[i])!=4)):
-        print("ERR405: Error, the length of the segment {:d} must be 2 or 4. Currently len(outline_B[i]) = {:d}".format(i, len(outline_B[i])))
-        sys.exit(2)
+      raise cnc25d_error.BackendError("ERR403: Error, the first element of the segment list must have 2 elements. Currently, len(outline_B[0]) = {:d}".format(len(outline_B[0])))
+    # a Valid_Outline has been checked at its construction, unless it has been modified since (properties reset to None)
+    if(not (isinstance(outline_B, cnc_outline.Valid_Outline) and (outline_B.properties is not None))):
+      for i in range(len(outline_B)):
+        if((len(outline_B[i])!=2)and(len(outline_B[i])!=4)):
+          raise cnc25d_error.BackendError("ERR405: Error, the length of the segment {:d} must be 2 or 4. Currently len(outline_B[i]) = {:d}".format(i, len(outline_B[i])))
     # check if the outline is closed
-    outline_closed = False
-    if((outline_B[0][0]==outline_B[-1][-2])and(outline_B[0][1]==outline_B[-1][-1])):
-      #print("dbg207: the outline is closed.")
-      outline_closed = True
+    outline_closed = cnc_outline.is_outline_closed(outline_B)
+    # the arcs of a Valid_Outline are resolved once for all the backends (FreeCAD resolves its arcs itself)
+    resolved_arcs = None
+    if(isinstance(outline_B, cnc_outline.Valid_Outline) and (ai_backend!='freecad')):
+      resolved_arcs = outline_B.get_resolved_arcs()
     # select backend
     if(ai_backend=='freecad'):
       r_outline = outline_arc_line_with_freecad(outline_B, outline_closed)
     elif(ai_backend=='svgwrite'):
-      r_outline = outline_arc_line_with_svgwrite(outline_B, outline_closed)
+      r_outline = outline_arc_line_with_svgwrite(outline_B, outline_closed, resolved_arcs)
+    elif(ai_backend=='svgpath'):
+      r_outline = outline_arc_line_with_svgpath(outline_B, outline_closed, resolved_arcs)
     elif(ai_backend=='dxfwrite'):
-      r_outline = outline_arc_line_with_dxfwrite(outline_B, outline_closed)
+      r_outline = outline_arc_line_with_dxfwrite(outline_B, outline_closed, resolved_arcs)
+    elif(ai_backend=='lwpolyline'):
+      r_outline = outline_arc_line_with_lwpolyline(outline_B, outline_closed, resolved_arcs)
     elif(ai_backend=='tkinter'):
-      r_outline = outline_arc_line_with_tkinter(outline_B, outline_closed)
+      r_outline = outline_arc_line_with_tkinter(outline_B, outline_closed, resolved_arcs, ai_tolerance)
+    elif(ai_backend=='polyline'):
+      r_outline = outline_arc_line_with_polyline(outline_B, outline_closed, resolved_arcs, ai_tolerance)
+    elif(ai_backend=='gcode'):
+      r_outline = outline_arc_line_with_gcode(outline_B, outline_closed, resolved_arcs)
   else: # circle outline
     if(len(ai_segments)!=3):
-      print("ERR658: Error, circle outline must be a list of 3 floats (or int)! Current len: {:d}".format(len(ai_segments)))
       print("dbg368: ai_segments:", ai_segments)
-      sys.exit(2)
-    r_outline = outline_circle((ai_segments[0], ai_segments[1]), ai_segments[2], ai_backend)
+      raise cnc25d_error.BackendError("ERR658: Error, circle outline must be a list of 3 floats (or int)! Current len: {:d}".format(len(ai_segments)))
+    r_outline = outline_circle((ai_segments[0], ai_segments[1]), ai_segments[2], ai_backend, ai_tolerance)
   return(r_outline)
 
+def outline_to_polyline(ai_outline, ai_tolerance=None):
+  """ Convert an outline (format-B or circle) into a polyline (list of [x, y]) for the exports that don't support the arcs
+      The arcs are approximated with a chord deviation smaller than ai_tolerance (by default, the global polyline_tolerance)
+  """
+  r_polyline = outline_arc_line(ai_outline, 'polyline', ai_tolerance)
+  return(r_polyline)
+
 # inherited from display_backend
 Two_Canvas = display_backend.Two_Canvas
 
@@ -598,9 +759,35 @@ def figure_simple_display(ai_figure, ai_overlay_figure=[], ai_parameter_info="")
   time.sleep(1.0)
   return(0)
 
-def write_figure_in_svg(ai_figure, ai_filename):
-  """ Generate the SVG file ai_filename from the figure ai_figure (list of format B outline)
+def set_svg_writer(ai_writer):
+  """ select the writer used by write_figure_in_svg(): 'native' (default) or 'svgwrite'
+  """
+  global svg_writer
+  if(ai_writer not in ('native', 'svgwrite')):
+    raise cnc25d_error.BackendError("ERR496: Error, the SVG writer {:s} is unknown. Possible values: native, svgwrite".format(ai_writer))
+  svg_writer = ai_writer
+
+def write_figure_in_svg_stream(ai_figure, ai_file_handle):
+  """ Write the SVG document of the figure ai_figure in the open file ai_file_handle
+      Each outline is converted into one path element and written immediately, so the memory doesn't grow with the figure
+      ai_figure can be any iterable of outlines (e.g. a generator)
   """
+  ai_file_handle.write('<?xml version="1.0" encoding="utf-8" ?>\n')
+  ai_file_handle.write('<svg baseProfile="full" height="100%" version="1.1" width="100%" xmlns="http://www.w3.org/2000/svg">\n')
+  ai_file_handle.write('<defs><style type="text/css"><![CDATA[\n')
+  for (class_name, class_style) in svg_style_classes:
+    ai_file_handle.write(".{:s} {{ {:s} }}\n".format(class_name, class_style))
+  ai_file_handle.write(']]></style></defs>\n')
+  for i_ol in ai_figure:
+    ai_file_handle.write(outline_arc_line(i_ol, 'svgpath'))
+  ai_file_handle.write('</svg>\n')
+  return(0)
+
+def write_figure_in_svg_with_svgwrite(ai_figure, ai_filename):
+  """ Generate the SVG file ai_filename with mozman svgwrite (one svgwrite object per segment)
+  """
+  if(svgwrite is None):
+    raise cnc25d_error.BackendError("ERR497: Error, the SVG writer svgwrite requires the Python package svgwrite that is not installed")
   print("Generate with mozman svgwrite the SVG file {:s}".format(ai_filename))
   object_svg = svgwrite.Drawing(filename = ai_filename)
   for i_ol in ai_figure:
@@ -610,9 +797,150 @@ def write_figure_in_svg(ai_figure, ai_filename):
   object_svg.save()
   return(0)
 
-def write_figure_in_dxf(ai_figure, ai_filename):
-  """ Generate the DXF file ai_filename from the figure ai_figure (list of format B outline)
+def write_figure_in_svg(ai_figure, ai_filename, ai_writer=''):
+  """ Generate the SVG file ai_filename from the figure ai_figure (list of format B outline)
+      ai_writer selects 'native' (one path per outline, streamed) or 'svgwrite'. If empty, the writer set by set_svg_writer() is used
+  """
+  l_writer = ai_writer
+  if(l_writer==''):
+    l_writer = svg_writer
+  if(l_writer=='svgwrite'):
+    write_figure_in_svg_with_svgwrite(ai_figure, ai_filename)
+  elif(l_writer=='native'):
+    print("Generate with the native writer the SVG file {:s}".format(ai_filename))
+    with open(ai_filename, 'w') as ofh:
+      write_figure_in_svg_stream(ai_figure, ofh)
+  else:
+    raise cnc25d_error.BackendError("ERR498: Error, the SVG writer {:s} is unknown. Possible values: native, svgwrite".format(l_writer))
+  return(0)
+
+def set_dxf_writer(ai_writer):
+  """ select the writer used by write_figure_in_dxf(): 'native' (default) or 'dxfwrite'
+  """
+  global dxf_writer
+  if(ai_writer not in ('native', 'dxfwrite')):
+    raise cnc25d_error.BackendError("ERR506: Error, the DXF writer {:s} is unknown. Possible values: native, dxfwrite".format(ai_writer))
+  dxf_writer = ai_writer
+
+def dxf_layout_object(ai_handle, ai_owner_handle, ai_name, ai_flag, ai_tab_order, ai_block_record_handle):
+  """ return the DXF LAYOUT object ai_name (A3 paper) for the OBJECTS section of the native DXF writer
+  """
+  r_layout = "0\nLAYOUT\n5\n{:s}\n330\n{:s}\n100\nAcDbPlotSettings\n1\n\n4\nA3\n6\n\n40\n7.5\n41\n20.0\n42\n7.5\n43\n20.0\n44\n420.0\n45\n297.0\n46\n0.0\n47\n0.0\n48\n0.0\n49\n0.0\n140\n0.0\n141\n0.0\n142\n1.0\n143\n1.0\n70\n{:d}\n72\n1\n73\n0\n74\n5\n7\n\n75\n16\n76\n0\n77\n2\n78\n300\n147\n1.0\n148\n0.0\n149\n0.0\n".format(ai_handle, ai_owner_handle, ai_flag)
+  r_layout += "100\nAcDbLayout\n1\n{:s}\n70\n1\n71\n{:d}\n10\n0.0\n20\n0.0\n11\n420.0\n21\n297.0\n12\n0.0\n22\n0.0\n32\n0.0\n14\n1e+20\n24\n1e+20\n34\n1e+20\n15\n-1e+20\n25\n-1e+20\n35\n-1e+20\n146\n0.0\n13\n0.0\n23\n0.0\n33\n0.0\n16\n1.0\n26\n0.0\n36\n0.0\n17\n0.0\n27\n1.0\n37\n0.0\n76\n1\n330\n{:s}\n".format(ai_name, ai_tab_order, ai_block_record_handle)
+  return(r_layout)
+
+def write_layer_outlines_in_dxf_stream(ai_layer_names, ai_layer_outlines, ai_file_handle):
+  """ Write a DXF R2000 document in the open file ai_file_handle
+      ai_layer_names is the list of the layers declared in the LAYER table. The layer 0 is always declared
+      ai_layer_outlines is an iterable of (layer_name, outline). Each outline is written as one LWPOLYLINE (or CIRCLE) immediately
+      The tables, the blocks *Model_Space and *Paper_Space and the objects (root dictionary and layouts) required by R2000 are written
+      around the entities. Their handles are allocated before the entities, so $HANDSEED is set to dxf_handle_seed
+  """
+  dxf_handle = [0] # the handles must be unique
+  def sub_next_handle():
+    dxf_handle[0] += 1
+    return("{:X}".format(dxf_handle[0]))
+  layer_names = list(ai_layer_names)
+  if(not '0' in layer_names):
+    layer_names.insert(0, '0')
+  # handles of the objects that are referenced before being written
+  h_model_record = sub_next_handle()
+  h_paper_record = sub_next_handle()
+  h_root_dict = sub_next_handle()
+  h_group_dict = sub_next_handle()
+  h_layout_dict = sub_next_handle()
+  h_model_layout = sub_next_handle()
+  h_paper_layout = sub_next_handle()
+  # header
+  ai_file_handle.write("0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1015\n9\n$DWGCODEPAGE\n3\nANSI_1252\n9\n$HANDSEED\n5\n{:X}\n9\n$INSUNITS\n70\n4\n0\nENDSEC\n".format(dxf_handle_seed))
+  ai_file_handle.write("0\nSECTION\n2\nCLASSES\n0\nENDSEC\n")
+  # tables
+  def sub_table(ai_table_name, ai_records, ai_record_handles=()):
+    """ write the symbol table ai_table_name with the records ai_records: list of (subclass, group codes)
+    """
+    h_table = sub_next_handle()
+    r_table = ["0\nTABLE\n2\n{:s}\n5\n{:s}\n330\n0\n100\nAcDbSymbolTable\n70\n{:d}\n".format(ai_table_name, h_table, len(ai_records))]
+    handle_code = 5
+    if(ai_table_name=='DIMSTYLE'):
+      r_table.append("100\nAcDbDimStyleTable\n")
+      handle_code = 105
+    for i in range(len(ai_records)):
+      (subclass, group_codes) = ai_records[i]
+      if(i<len(ai_record_handles)):
+        h_record = ai_record_handles[i]
+      else:
+        h_record = sub_next_handle()
+      r_table.append("0\n{:s}\n{:d}\n{:s}\n330\n{:s}\n100\nAcDbSymbolTableRecord\n100\n{:s}\n{:s}".format(ai_table_name, handle_code, h_record, h_table, subclass, group_codes))
+    r_table.append("0\nENDTAB\n")
+    ai_file_handle.write("".join(r_table))
+  ai_file_handle.write("0\nSECTION\n2\nTABLES\n")
+  sub_table('VPORT', [('AcDbViewportTableRecord', "2\n*Active\n70\n0\n10\n0.0\n20\n0.0\n11\n1.0\n21\n1.0\n12\n0.0\n22\n0.0\n13\n0.0\n23\n0.0\n14\n0.5\n24\n0.5\n15\n0.5\n25\n0.5\n16\n0.0\n26\n0.0\n36\n1.0\n17\n0.0\n27\n0.0\n37\n0.0\n40\n1000.0\n41\n1.34\n42\n50.0\n43\n0.0\n44\n0.0\n50\n0.0\n51\n0.0\n71\n0\n72\n1000\n73\n1\n74\n3\n75\n0\n76\n0\n77\n0\n78\n0\n")])
+  sub_table('LTYPE', [ ('AcDbLinetypeTableRecord', "2\n{:s}\n70\n0\n3\n{:s}\n72\n65\n73\n0\n40\n0.0\n".format(lt, ld)) for (lt, ld) in (('ByBlock', ''), ('ByLayer', ''), ('CONTINUOUS', 'Solid line')) ])
+  sub_table('LAYER', [ ('AcDbLayerTableRecord', "2\n{:s}\n70\n0\n62\n7\n6\nCONTINUOUS\n".format(layer_name)) for layer_name in layer_names ])
+  sub_table('STYLE', [('AcDbTextStyleTableRecord', "2\nStandard\n70\n0\n40\n0.0\n41\n1.0\n50\n0.0\n71\n0\n42\n2.5\n3\ntxt\n4\n\n")])
+  sub_table('VIEW', [])
+  sub_table('UCS', [])
+  sub_table('APPID', [('AcDbRegAppTableRecord', "2\nACAD\n70\n0\n")])
+  sub_table('DIMSTYLE', [('AcDbDimStyleTableRecord', "2\nStandard\n70\n0\n")])
+  sub_table('BLOCK_RECORD', [('AcDbBlockTableRecord', "2\n*Model_Space\n340\n{:s}\n".format(h_model_layout)), ('AcDbBlockTableRecord', "2\n*Paper_Space\n340\n{:s}\n".format(h_paper_layout))], (h_model_record, h_paper_record))
+  ai_file_handle.write("0\nENDSEC\n")
+  # blocks
+  ai_file_handle.write("0\nSECTION\n2\nBLOCKS\n")
+  for (block_name, h_block_record, paper_flag) in (('*Model_Space', h_model_record, ''), ('*Paper_Space', h_paper_record, "67\n1\n")):
+    ai_file_handle.write("0\nBLOCK\n5\n{:s}\n330\n{:s}\n100\nAcDbEntity\n{:s}8\n0\n100\nAcDbBlockBegin\n2\n{:s}\n70\n0\n10\n0.0\n20\n0.0\n30\n0.0\n3\n{:s}\n1\n\n".format(sub_next_handle(), h_block_record, paper_flag, block_name, block_name))
+    ai_file_handle.write("0\nENDBLK\n5\n{:s}\n330\n{:s}\n100\nAcDbEntity\n{:s}8\n0\n100\nAcDbBlockEnd\n".format(sub_next_handle(), h_block_record, paper_flag))
+  ai_file_handle.write("0\nENDSEC\n")
+  # entities in the model space
+  ai_file_handle.write("0\nSECTION\n2\nENTITIES\n")
+  for (layer_name, i_ol) in ai_layer_outlines:
+    for dxf_record in outline_arc_line(i_ol, 'lwpolyline'):
+      if(dxf_record[0]=='LWPOLYLINE'):
+        (record_type, closed_flag, vertices) = dxf_record
+        dxf_entity = ["0\nLWPOLYLINE\n5\n{:s}\n330\n{:s}\n100\nAcDbEntity\n8\n{:s}\n100\nAcDbPolyline\n90\n{:d}\n70\n{:d}\n".format(sub_next_handle(), h_model_record, layer_name, len(vertices), closed_flag)]
+        for (vx, vy, bulge) in vertices:
+          if(bulge==0):
+            dxf_entity.append("10\n{:s}\n20\n{:s}\n".format(dxf_number(vx), dxf_number(vy)))
+          else:
+            dxf_entity.append("10\n{:s}\n20\n{:s}\n42\n{:s}\n".format(dxf_number(vx), dxf_number(vy), dxf_number(bulge)))
+        ai_file_handle.write("".join(dxf_entity))
+      else: # CIRCLE
+        (record_type, cx, cy, cr) = dxf_record
+        ai_file_handle.write("0\nCIRCLE\n5\n{:s}\n330\n{:s}\n100\nAcDbEntity\n8\n{:s}\n100\nAcDbCircle\n10\n{:s}\n20\n{:s}\n30\n0\n40\n{:s}\n".format(sub_next_handle(), h_model_record, layer_name, dxf_number(cx), dxf_number(cy), dxf_number(cr)))
+  ai_file_handle.write("0\nENDSEC\n")
+  if(dxf_handle[0]>=dxf_handle_seed):
+    raise cnc25d_error.BackendError("ERR511: Error, the DXF document has more handles {:d} than the handle seed {:d}".format(dxf_handle[0], dxf_handle_seed))
+  # objects: root dictionary, group dictionary and layouts
+  ai_file_handle.write("0\nSECTION\n2\nOBJECTS\n")
+  ai_file_handle.write("0\nDICTIONARY\n5\n{:s}\n330\n0\n100\nAcDbDictionary\n281\n1\n3\nACAD_GROUP\n350\n{:s}\n3\nACAD_LAYOUT\n350\n{:s}\n".format(h_root_dict, h_group_dict, h_layout_dict))
+  ai_file_handle.write("0\nDICTIONARY\n5\n{:s}\n330\n{:s}\n100\nAcDbDictionary\n281\n1\n".format(h_group_dict, h_root_dict))
+  ai_file_handle.write("0\nDICTIONARY\n5\n{:s}\n330\n{:s}\n100\nAcDbDictionary\n281\n1\n3\nModel\n350\n{:s}\n3\nLayout1\n350\n{:s}\n".format(h_layout_dict, h_root_dict, h_model_layout, h_paper_layout))
+  ai_file_handle.write(dxf_layout_object(h_model_layout, h_layout_dict, 'Model', 1024, 0, h_model_record))
+  ai_file_handle.write(dxf_layout_object(h_paper_layout, h_layout_dict, 'Layout1', 0, 1, h_paper_record))
+  ai_file_handle.write("0\nENDSEC\n0\nEOF\n")
+  return(0)
+
+def write_figure_in_dxf_stream(ai_figure, ai_file_handle, ai_layer=''):
+  """ Write the DXF document of the figure ai_figure in the open file ai_file_handle
+      ai_layer: '' puts all outlines in the layer 0, 'outline' creates one layer per outline (outline_000, outline_001 ..), any other string is the name of the layer of all outlines
+      With ai_layer='outline', ai_figure must be a list (the layers are declared before the outlines). Otherwise it can be any iterable of outlines (e.g. a generator)
   """
+  if(ai_layer=='outline'):
+    layer_names = ["outline_{:03d}".format(i) for i in range(len(ai_figure))]
+    layer_outlines = ((layer_names[i], ai_figure[i]) for i in range(len(ai_figure)))
+  else:
+    l_layer = ai_layer
+    if(l_layer==''):
+      l_layer = '0'
+    layer_names = [l_layer]
+    layer_outlines = ((l_layer, i_ol) for i_ol in ai_figure)
+  r_wfds = write_layer_outlines_in_dxf_stream(layer_names, layer_outlines, ai_file_handle)
+  return(r_wfds)
+
+def write_figure_in_dxf_with_dxfwrite(ai_figure, ai_filename):
+  """ Generate the DXF file ai_filename with mozman dxfwrite (one LINE or ARC entity per segment)
+  """
+  if(DXFEngine is None):
+    raise cnc25d_error.BackendError("ERR507: Error, the DXF writer dxfwrite requires the Python package dxfwrite that is not installed")
   print("Generate with mozman dxfwrite the DXF file {:s}".format(ai_filename))
   object_dxf = DXFEngine.drawing(ai_filename)
   #object_dxf.add_layer("my_dxf_layer")
@@ -623,6 +951,333 @@ def write_figure_in_dxf(ai_figure, ai_filename):
   object_dxf.save()
   return(0)
 
+def write_figure_in_dxf(ai_figure, ai_filename, ai_writer='', ai_layer=''):
+  """ Generate the DXF file ai_filename from the figure ai_figure (list of format B outline)
+      ai_writer selects 'native' (one LWPOLYLINE per outline, streamed) or 'dxfwrite'. If empty, the writer set by set_dxf_writer() is used
+      ai_layer is used by the native writer (see write_figure_in_dxf_stream())
+  """
+  l_writer = ai_writer
+  if(l_writer==''):
+    l_writer = dxf_writer
+  if(l_writer=='dxfwrite'):
+    write_figure_in_dxf_with_dxfwrite(ai_figure, ai_filename)
+  elif(l_writer=='native'):
+    print("Generate with the native writer the DXF file {:s}".format(ai_filename))
+    with open(ai_filename, 'w') as ofh:
+      write_figure_in_dxf_stream(ai_figure, ofh, ai_layer)
+  else:
+    raise cnc25d_error.BackendError("ERR508: Error, the DXF writer {:s} is unknown. Possible values: native, dxfwrite".format(l_writer))
+  return(0)
+
+def write_figures_in_dxf(ai_figures, ai_filename, ai_layer_names=()):
+  """ Generate the DXF file ai_filename with the native writer, with one layer per figure of the list ai_figures
+      ai_layer_names is the list of the layer names. If empty, the layers are named figure_000, figure_001 ..
+  """
+  layer_names = list(ai_layer_names)
+  if(len(layer_names)==0):
+    layer_names = ["figure_{:03d}".format(i) for i in range(len(ai_figures))]
+  if(len(layer_names)!=len(ai_figures)):
+    raise cnc25d_error.BackendError("ERR510: Error, the number of layer names {:d} and of figures {:d} are different".format(len(layer_names), len(ai_figures)))
+  layer_outlines = ((layer_names[i], i_ol) for i in range(len(ai_figures)) for i_ol in ai_figures[i])
+  print("Generate with the native writer the DXF file {:s}".format(ai_filename))
+  with open(ai_filename, 'w') as ofh:
+    write_layer_outlines_in_dxf_stream(layer_names, layer_outlines, ofh)
+  return(0)
+
+def set_gcode_parameters(ai_parameters):
+  """ update the default machining parameters of the G-code writer with the dictionary ai_parameters
+      possible keys: feed_rate, plunge_rate, depth_step, safe_z, spindle_speed, cutter_compensation, tool_number, tool_radius
+  """
+  global gcode_parameters
+  gcode_parameters = gcode_merge_parameters(ai_parameters)
+
+def gcode_merge_parameters(ai_parameters):
+  """ return the default machining parameters updated with the dictionary ai_parameters after checking them
+  """
+  r_parameters = gcode_parameters.copy()
+  for k in ai_parameters.keys():
+    if(not k in r_parameters):
+      raise cnc25d_error.BackendError("ERR721: Error, the G-code parameter {:s} is unknown. Possible parameters: {:s}".format(k, ', '.join(sorted(r_parameters.keys()))))
+    r_parameters[k] = float(ai_parameters[k])
+  for k in ('feed_rate', 'plunge_rate', 'depth_step', 'safe_z', 'tool_number', 'tool_radius'):
+    if(r_parameters[k]<=0):
+      raise cnc25d_error.BackendError("ERR722: Error, the G-code parameter {:s} = {:0.3f} must be strictly positive".format(k, r_parameters[k]))
+  if(r_parameters['spindle_speed']<0):
+    raise cnc25d_error.BackendError("ERR723: Error, the G-code parameter spindle_speed = {:0.3f} must be positive".format(r_parameters['spindle_speed']))
+  if(not r_parameters['cutter_compensation'] in (0, 1)):
+    raise cnc25d_error.BackendError("ERR727: Error, the G-code parameter cutter_compensation = {:0.3f} must be 0 or 1".format(r_parameters['cutter_compensation']))
+  if(r_parameters['tool_number']!=int(r_parameters['tool_number'])):
+    raise cnc25d_error.BackendError("ERR728: Error, the G-code parameter tool_number = {:0.3f} must be an integer".format(r_parameters['tool_number']))
+  return(r_parameters)
+
+def gcode_outline_order(ai_figure, ai_start_x=0.0, ai_start_y=0.0):
+  """ choose the cut order and the start point of the outlines of the format-B figure ai_figure
+      an outline is cut after all the outlines it contains (the holes before the external outline),
+      and among the outlines ready to be cut, the next one is the one with the start point the closest to the tool (nearest neighbour)
+      a closed outline can start at any of its points, a circle at any angle, an open outline only at its first point
+      It returns the list of (outline_index, start, nesting) with start the index of the first move for the arc-line outlines or the start angle for the circles
+      and nesting the number of closed outlines containing the outline (odd for a hole), and the length of the rapid moves between the start points
+  """
+  outline_nb = len(ai_figure)
+  if(outline_nb==0):
+    return([], 0.0)
+  # containment of the outlines
+  x_list = []
+  for ol in ai_figure:
+    if(isinstance(ol[0], (tuple, list))):
+      x_list.extend([ ol[0][0] ]+[ seg[-2] for seg in ol[1:] ])
+    else:
+      x_list.extend([ ol[0]-ol[2], ol[0]+ol[2] ])
+  cell_size = max(0.001, (max(x_list)-min(x_list))/32)
+  si = segment_index.Segment_Index(cell_size)
+  outline_closed = []
+  for i in range(outline_nb):
+    si.add_outline(ai_figure[i], "gcode_outline_{:d}".format(i))
+    if(isinstance(ai_figure[i][0], (tuple, list))):
+      outline_closed.append(cnc_outline.is_outline_closed(ai_figure[i]))
+    else:
+      outline_closed.append(True)
+  # bounding boxes of the outlines (the complete circle of each arc) to skip the far outlines
+  bboxes = [ [float('inf'), float('inf'), -float('inf'), -float('inf')] for i in range(outline_nb) ]
+  for (segment, i, k) in si.segments:
+    if(segment[0]==segment_index.segment_line):
+      seg_box = (min(segment[1], segment[3]), min(segment[2], segment[4]), max(segment[1], segment[3]), max(segment[2], segment[4]))
+    else:
+      seg_box = (segment[5]-segment[7], segment[6]-segment[7], segment[5]+segment[7], segment[6]+segment[7])
+    bboxes[i] = [min(bboxes[i][0], seg_box[0]), min(bboxes[i][1], seg_box[1]), max(bboxes[i][2], seg_box[2]), max(bboxes[i][3], seg_box[3])]
+  containers = [ [] for i in range(outline_nb) ] # the outlines that contain the outline i
+  inside_nb = [0]*outline_nb # number of outlines inside the outline i that are not cut yet
+  for i in range(outline_nb):
+    if(isinstance(ai_figure[i][0], (tuple, list))):
+      (px, py) = (ai_figure[i][0][0], ai_figure[i][0][1])
+    else:
+      (px, py) = (ai_figure[i][0]+ai_figure[i][2], ai_figure[i][1])
+    for j in range(outline_nb):
+      (xmin, ymin, xmax, ymax) = bboxes[j]
+      if((j!=i)and outline_closed[j]and(xmin<=px<=xmax)and(ymin<=py<=ymax)and si.point_in_outline(px, py, j)):
+        containers[i].append(j)
+        inside_nb[j] += 1
+  # nearest neighbour
+  r_order = []
+  rapid_length = 0.0
+  (tool_x, tool_y) = (ai_start_x, ai_start_y)
+  remaining = set(range(outline_nb))
+  while(len(remaining)>0):
+    best = None
+    for i in remaining:
+      if(inside_nb[i]>0):
+        continue
+      if(best is not None): # the outline can't be closer than its bounding box
+        (xmin, ymin, xmax, ymax) = bboxes[i]
+        if(math.hypot(max(xmin-tool_x, 0, tool_x-xmax), max(ymin-tool_y, 0, tool_y-ymax))>=best[0][0]):
+          continue
+      ol = ai_figure[i]
+      if(not isinstance(ol[0], (tuple, list))): # circle
+        (cx, cy, radius) = ol
+        start = 0.0
+        if(math.hypot(tool_x-cx, tool_y-cy)>0):
+          start = math.atan2(tool_y-cy, tool_x-cx)
+        candidates = [(abs(math.hypot(tool_x-cx, tool_y-cy)-radius), start, cx+radius*math.cos(start), cy+radius*math.sin(start))]
+      elif(outline_closed[i]): # any point of a closed outline, move k starts at the end of the move k-1
+        candidates = [(math.hypot(tool_x-ol[0][0], tool_y-ol[0][1]), 0, ol[0][0], ol[0][1])]
+        candidates.extend([ (math.hypot(tool_x-ol[k][-2], tool_y-ol[k][-1]), k, ol[k][-2], ol[k][-1]) for k in range(1, len(ol)-1) ])
+      else:
+        candidates = [(math.hypot(tool_x-ol[0][0], tool_y-ol[0][1]), 0, ol[0][0], ol[0][1])]
+      candidate = min(candidates)
+      if((best is None)or(candidate[0]<best[0][0])):
+        best = (candidate, i)
+    if(best is None):
+      raise cnc25d_error.BackendError("ERR724: Error, the outlines {:s} contain each other".format(str(sorted(remaining))))
+    ((distance, start, start_x, start_y), i) = best
+    r_order.append((i, start, len(containers[i])))
+    rapid_length += distance
+    remaining.remove(i)
+    for j in containers[i]:
+      inside_nb[j] -= 1
+    if(outline_closed[i]):
+      (tool_x, tool_y) = (start_x, start_y)
+    else:
+      (tool_x, tool_y) = (ai_figure[i][-1][-2], ai_figure[i][-1][-1])
+  return(r_order, rapid_length)
+
+def gcode_move_path(ai_start, ai_segment):
+  """ return the path of the move from the point ai_start along the format-B segment ai_segment:
+      ('line', start_x, start_y, end_x, end_y) or ('arc', center_x, center_y, radius, start_angle, sweep_angle) with sweep_angle>0 for a CCW arc
+  """
+  if(len(ai_segment)==4):
+    (lia, ptix, ptiy, u, v, w, uv, vw, uw) = arc_3_points_to_radius_center_angles(ai_start, (ai_segment[0], ai_segment[1]), (ai_segment[2], ai_segment[3]))
+    if(lia!=0):
+      return(('arc', ptix, ptiy, lia, u, uw))
+  return(('line', ai_start[0], ai_start[1], ai_segment[-2], ai_segment[-1]))
+
+def gcode_path_length(ai_path):
+  """ return the length of the path made by gcode_move_path()
+  """
+  if(ai_path[0]=='arc'):
+    r_length = ai_path[3]*abs(ai_path[5])
+  else:
+    r_length = math.hypot(ai_path[3]-ai_path[1], ai_path[4]-ai_path[2])
+  return(r_length)
+
+def gcode_path_point(ai_path, ai_length):
+  """ return the point (x, y) at the distance ai_length from the start of the path and the unit tangent (tx, ty) at this point
+  """
+  if(ai_path[0]=='arc'):
+    (path_type, cx, cy, radius, start_angle, sweep_angle) = ai_path
+    direction = math.copysign(1, sweep_angle)
+    a = start_angle+direction*ai_length/radius
+    r_point = (cx+radius*math.cos(a), cy+radius*math.sin(a), -direction*math.sin(a), direction*math.cos(a))
+  else:
+    (path_type, x1, y1, x2, y2) = ai_path
+    path_length = math.hypot(x2-x1, y2-y1)
+    (tx, ty) = ((x2-x1)/path_length, (y2-y1)/path_length)
+    r_point = (x1+ai_length*tx, y1+ai_length*ty, tx, ty)
+  return(r_point)
+
+def gcode_path_block(ai_path, ai_length):
+  """ return the G-code block moving the tool from the start of the path to the point at the distance ai_length
+  """
+  (x, y, tx, ty) = gcode_path_point(ai_path, ai_length)
+  if(ai_path[0]=='arc'):
+    (path_type, cx, cy, radius, start_angle, sweep_angle) = ai_path
+    gc_direction = 'G3' # counter clock wise
+    if(sweep_angle<0):
+      gc_direction = 'G2' # clock wise
+    r_block = "{:s} X{:s} Y{:s} I{:s} J{:s}".format(gc_direction, gcode_number(x), gcode_number(y), gcode_number(-radius*math.cos(start_angle)), gcode_number(-radius*math.sin(start_angle)))
+  else:
+    r_block = "G1 X{:s} Y{:s}".format(gcode_number(x), gcode_number(y))
+  return(r_block)
+
+def outline_signed_area(ai_outline):
+  """ return the signed area of the closed format-B outline ai_outline: positive for a counter clock wise outline
+  """
+  polyline = outline_to_polyline(ai_outline)
+  r_area = 0.0
+  for i in range(len(polyline)-1):
+    r_area += polyline[i][0]*polyline[i+1][1]-polyline[i+1][0]*polyline[i][1]
+  r_area = r_area/2
+  return(r_area)
+
+def write_figure_in_gcode_stream(ai_figure, ai_file_handle, ai_height, ai_parameters={}):
+  """ Write the G-code program (mm, absolute coordinates) cutting the outlines of the figure ai_figure through the thickness ai_height
+      The top of the material is at Z=0. Each outline is cut in passes not deeper than depth_step before moving to the next outline
+      The cut order and the start points minimize the rapid moves (see gcode_outline_order())
+      With cutter_compensation, the closed outlines are cut with G41 or G42 so the tool stays outside the material:
+      the side depends on the orientation of the outline and on its nesting (outer outline or hole). Each pass starts with a lead-in
+      perpendicular to the outline from the waste side, ends with an overlap of the first move and a lead-out, and the tool radius
+      is taken from the tool table of the controller (tool_number). The open outlines are cut without compensation
+      ai_parameters updates the default machining parameters (see set_gcode_parameters())
+      It returns the length of the rapid moves
+  """
+  gp = gcode_merge_parameters(ai_parameters)
+  if(ai_height<=0):
+    raise cnc25d_error.BackendError("ERR725: Error, the cut depth (figure height) {:0.3f} must be strictly positive".format(ai_height))
+  # convert all outlines in format-B
+  figure_B = []
+  for i in range(len(ai_figure)):
+    if(cnc_outline.check_outline_format(ai_figure[i])==2):
+      print("WARN726: Warning, the outline {:d} must be converted in format-B with ideal_outline()!".format(i))
+      figure_B.append(cnc_outline.ideal_outline(ai_figure[i], "write_figure_in_gcode"))
+    elif(isinstance(ai_figure[i], cnc_outline.Array_Outline)):
+      figure_B.append(ai_figure[i].to_list())
+    else:
+      figure_B.append(ai_figure[i])
+  (outline_order, order_length) = gcode_outline_order(figure_B)
+  pass_nb = max(1, int(math.ceil(ai_height/gp['depth_step']-global_epsilon_length)))
+  pass_depths = [ -ai_height*(p+1)/pass_nb for p in range(pass_nb) ]
+  safe_z = gcode_number(gp['safe_z'])
+  feed_rate = gcode_number(gp['feed_rate'])
+  plunge_rate = gcode_number(gp['plunge_rate'])
+  tool_radius = gp['tool_radius']
+  lead_length = 2*tool_radius # the entry move of G41/G42 must be longer than the tool radius
+  # header
+  ai_file_handle.write("%\n(generated by Cnc25D: {:d} outlines, {:d} passes of {:s} mm)\n".format(len(figure_B), pass_nb, gcode_number(ai_height/pass_nb)))
+  if(gp['cutter_compensation']>0):
+    ai_file_handle.write("(cutter compensation with the tool D{:d} of radius {:s} mm)\n".format(int(gp['tool_number']), gcode_number(tool_radius)))
+  ai_file_handle.write("G21 G90 G17 G94 G40\n") # mm, absolute coordinates, XY plane, feed per minute, no cutter compensation
+  ai_file_handle.write("G0 Z{:s}\n".format(safe_z))
+  if(gp['spindle_speed']>0):
+    ai_file_handle.write("M3 S{:s}\n".format(gcode_number(gp['spindle_speed'])))
+  # outlines
+  r_rapid_length = 0.0
+  (tool_x, tool_y) = (0.0, 0.0)
+  for (i, start, nesting) in outline_order:
+    ol = figure_B[i]
+    if(not isinstance(ol[0], (tuple, list))): # circle
+      moves = outline_circle_with_gcode((ol[0], ol[1]), ol[2], start)
+      (start_x, start_y) = (moves[0][0], moves[0][1])
+      outline_closed = True
+      first_path = ('arc', ol[0], ol[1], ol[2], start, 2*math.pi)
+      outline_ccw = True # G3
+    else:
+      moves = outline_arc_line(ol, 'gcode')
+      outline_closed = cnc_outline.is_outline_closed(ol)
+      if(start==0):
+        (start_x, start_y) = (ol[0][0], ol[0][1])
+      else:
+        (start_x, start_y) = (moves[start-1][0], moves[start-1][1])
+        moves = moves[start:]+moves[:start]
+      if(outline_closed):
+        first_path = gcode_move_path((start_x, start_y), ol[start+1])
+        outline_ccw = (outline_signed_area(ol)>0)
+    compensation = (gp['cutter_compensation']>0)and outline_closed
+    if(compensation):
+      # the tool must stay outside the material: on the right of an outer CCW outline, on the left of a CCW hole
+      outline_hole = (nesting%2==1)
+      comp_code = 'G41' # tool on the left of the outline
+      side = 1
+      if(outline_ccw!=outline_hole):
+        comp_code = 'G42' # tool on the right of the outline
+        side = -1
+      (px, py, tx, ty) = gcode_path_point(first_path, 0)
+      (lead_in_x, lead_in_y) = (px-side*ty*lead_length, py+side*tx*lead_length)
+      overlap_length = min(2*tool_radius, gcode_path_length(first_path)) # cut the material left by the lead-in
+      (ox, oy, otx, oty) = gcode_path_point(first_path, overlap_length)
+      (lead_out_x, lead_out_y) = (ox-side*oty*lead_length, oy+side*otx*lead_length)
+      overlap_block = gcode_path_block(first_path, overlap_length)
+      gc_outline = ["(outline {:d}: {:s} {:s})\n".format(i, 'hole' if outline_hole else 'outer outline', comp_code)]
+      for p in range(pass_nb):
+        if(p>0):
+          gc_outline.append("G0 Z{:s}\n".format(safe_z))
+        gc_outline.append("G0 X{:s} Y{:s}\n".format(gcode_number(lead_in_x), gcode_number(lead_in_y)))
+        r_rapid_length += math.hypot(lead_in_x-tool_x, lead_in_y-tool_y)
+        gc_outline.append("G1 Z{:s} F{:s}\n".format(gcode_number(pass_depths[p]), plunge_rate))
+        gc_outline.append("{:s} D{:d}\n".format(comp_code, int(gp['tool_number'])))
+        gc_outline.append("G1 X{:s} Y{:s} F{:s}\n".format(gcode_number(px), gcode_number(py), feed_rate))
+        gc_outline.extend([ "{:s}\n".format(move[2]) for move in moves ])
+        gc_outline.append("{:s}\nG40\n".format(overlap_block))
+        gc_outline.append("G1 X{:s} Y{:s}\n".format(gcode_number(lead_out_x), gcode_number(lead_out_y)))
+        (tool_x, tool_y) = (lead_out_x, lead_out_y)
+    else:
+      gc_outline = ["(outline {:d})\n".format(i)]
+      for p in range(pass_nb):
+        if((p==0)or(not outline_closed)): # go back to the start point of the open outline
+          if(p>0):
+            gc_outline.append("G0 Z{:s}\n".format(safe_z))
+          gc_outline.append("G0 X{:s} Y{:s}\n".format(gcode_number(start_x), gcode_number(start_y)))
+          r_rapid_length += math.hypot(start_x-tool_x, start_y-tool_y)
+        gc_outline.append("G1 Z{:s} F{:s}\n".format(gcode_number(pass_depths[p]), plunge_rate))
+        gc_outline.append("{:s} F{:s}\n".format(moves[0][2], feed_rate))
+        gc_outline.extend([ "{:s}\n".format(move[2]) for move in moves[1:] ])
+        (tool_x, tool_y) = (moves[-1][0], moves[-1][1])
+    gc_outline.append("G0 Z{:s}\n".format(safe_z))
+    ai_file_handle.write("".join(gc_outline))
+  # footer
+  if(gp['spindle_speed']>0):
+    ai_file_handle.write("M5\n")
+  ai_file_handle.write("M2\n%\n")
+  return(r_rapid_length)
+
+def write_figure_in_gcode(ai_figure, ai_filename, ai_height, ai_parameters={}):
+  """ Generate the G-code file ai_filename (usually with the suffix .ngc) from the figure ai_figure (list of format B outline)
+      ai_height is the thickness of the material. ai_parameters updates the default machining parameters (see set_gcode_parameters())
+  """
+  print("Generate the G-code file {:s}".format(ai_filename))
+  with open(ai_filename, 'w') as ofh:
+    rapid_length = write_figure_in_gcode_stream(ai_figure, ofh, ai_height, ai_parameters)
+  print("G-code: {:d} outlines, rapid moves {:0.1f} mm".format(len(ai_figure), rapid_length))
+  return(0)
+
 def figure_to_freecad_25d_part(ai_figure, ai_extrude_height):
   """ the first outline of the figure ai_figure is the outer line of the part
       the other outlines are holes in the part
@@ -636,8 +1291,7 @@ def figure_to_freecad_25d_part(ai_figure, ai_extrude_height):
   # check the number of outlines
   outline_nb = len(ai_figure)
   if(outline_nb<1):
-    print("ERR876: Error, the figure doesn't contain any outlines!")
-    sys.exit(2)
+    raise cnc25d_error.BackendError("ERR876: Error, the figure doesn't contain any outlines!")
   # check if one outline is not closed
   face_nwire = True
   for oli in range(len(ai_figure)):
@@ -769,6 +1423,9 @@ def outline_arc_line_test1():
   one_circle = outline_circle(l_circle_center, l_circle_radius, 'svgwrite')
   object_svg.add(one_circle[0])
   object_svg.save()
+  # native svg writer
+  print("dbg705: test1 native svg writer")
+  write_figure_in_svg(l_ols+[l_circle_center+[l_circle_radius]], "{:s}/outline_arc_line_test1_01.svg".format(l_output_dir), 'native')
   # backend dxfwrite
   print("dbg703: test1 backend dxfwrite")
   output_dxf_file_name =  "{:s}/outline_arc_line_test1_00.dxf".format(l_output_dir)
@@ -781,6 +1438,9 @@ def outline_arc_line_test1():
   one_circle = outline_circle(l_circle_center, l_circle_radius, 'dxfwrite')
   object_dxf.add(one_circle[0])
   object_dxf.save()
+  # native dxf writer
+  print("dbg706: test1 native dxf writer")
+  write_figure_in_dxf(l_ols+[l_circle_center+[l_circle_radius]], "{:s}/outline_arc_line_test1_01.dxf".format(l_output_dir), 'native', 'outline')
   # backend tkinter
   print("dbg704: test1 backend tkinter")
   tk_root = Tkinter.Tk()
@@ -844,6 +1504,214 @@ def outline_arc_line_test1():
   r_test = 1
   return(r_test)
 
+def valid_outline_check_test():
+  """ check that outline_arc_line() verifies the segments of a Valid_Outline modified after its construction
+  """
+  vo = cnc_outline.Valid_Outline([(0, 0), (20, 0), (20, 20), (0, 0)])
+  r_test = True
+  outline_arc_line(vo, 'svgpath') # checked at its construction
+  vo[2] = (20, 20, 5) # the list modification resets the cached properties
+  try:
+    outline_arc_line(vo, 'svgpath')
+    r_test = False
+  except cnc25d_error.BackendError:
+    pass
+  print("valid_outline check test: {:s}".format('ok' if r_test else 'failed'))
+  return(r_test)
+
+def dxf_writer_test(ai_output_dir="test_output"):
+  """ check the structure of the DXF documents of the native writer
+      If the Python package ezdxf is installed, the files are also read and audited by ezdxf
+  """
+  import cStringIO
+  fig = [[(0, 0), (40, 0), (50, 10, 40, 20), (0, 20), (0, 0)], [(5, 5), (15, 5), (15, 15)], (25, 10, 4)]
+  r_test = True
+  for (t_name, t_layer) in (('layer_0', ''), ('layer_outline', 'outline'), ('layer_cut', 'cut')):
+    fh = cStringIO.StringIO()
+    write_figure_in_dxf_stream(fig, fh, t_layer)
+    lines = fh.getvalue().split("\n")
+    pairs = [ (lines[2*i].strip(), lines[2*i+1]) for i in range(len(lines)//2) ]
+    sections = [ pairs[i+1][1] for i in range(len(pairs)-1) if(pairs[i]==('0', 'SECTION')) ]
+    body = pairs[pairs.index(('2', 'CLASSES')):] # $HANDSEED of the header also uses the group code 5
+    handles = [ v for (c, v) in body if(c in ('5', '105')) ]
+    owners = [ v for (c, v) in body if((c=='330')and(v!='0')) ]
+    seed = int(pairs[pairs.index(('9', '$HANDSEED'))+1][1], 16)
+    t_ok = ((sections==['HEADER', 'CLASSES', 'TABLES', 'BLOCKS', 'ENTITIES', 'OBJECTS'])
+      and (len(handles)==len(set(handles)))
+      and (set(owners)<=set(handles))
+      and (max([ int(h, 16) for h in handles ])<seed)
+      and (pairs[-1]==('0', 'EOF')))
+    r_test = r_test and t_ok
+    print("dxf_writer test structure {:s}: {:s}".format(t_name, 'ok' if t_ok else 'failed'))
+  try:
+    import ezdxf
+  except ImportError:
+    ezdxf = None
+    print("dxf_writer test with ezdxf: skipped, ezdxf is not installed")
+  if(ezdxf is not None):
+    design_help.mkdir_p(ai_output_dir)
+    dxf_filename = "{:s}/dxf_writer_test.dxf".format(ai_output_dir)
+    write_figure_in_dxf(fig, dxf_filename, 'native', 'outline')
+    doc = ezdxf.readfile(dxf_filename)
+    t_ok = ((doc.dxfversion=='AC1015') and ([ e.dxftype() for e in doc.modelspace() ]==['LWPOLYLINE', 'LWPOLYLINE', 'CIRCLE']))
+    if(hasattr(doc, 'audit')): # the auditor of ezdxf<0.10 reports the objects it adds itself
+      auditor = doc.audit()
+      t_ok = t_ok and (len(auditor.errors)==0) and (len(auditor.fixes)==0)
+    r_test = r_test and t_ok
+    print("dxf_writer test with ezdxf: {:s}".format('ok' if t_ok else 'failed'))
+  return(r_test)
+
+def arc_tessellation_test():
+  """ check the polylines of arc_step_number(), arc_of_circle() and complete_circle()
+      with a tolerance, the chord deviation must be smaller than the tolerance for small and large radii
+      with a resolution, the points must be the ones of the legacy fixed-resolution implementation
+  """
+  r_test = True
+  def chord_deviation(ai_points, ai_cx, ai_cy, ai_radius):
+    deviations = [0.0]
+    for i in range(len(ai_points)-1):
+      mx = (ai_points[i][0]+ai_points[i+1][0])/2.0
+      my = (ai_points[i][1]+ai_points[i+1][1])/2.0
+      deviations.append(ai_radius-math.sqrt((mx-ai_cx)**2+(my-ai_cy)**2))
+    return(max(deviations))
+  # tolerance
+  for l_tolerance in (0.01, 0.0001):
+    for l_radius in (0.05, 0.5, 20.0, 5000.0):
+      (cx, cy) = (3.0, -2.0)
+      arc_pts = lambda a: [cx+l_radius*math.cos(a), cy+l_radius*math.sin(a)]
+      l_deviation = []
+      for (a_start, a_middle, a_end) in ((0.2, 1.0, 2.0), (1.0, -1.5, -3.5)): # counter clock wise and clock wise
+        polyline = arc_of_circle(arc_pts(a_start), arc_pts(a_middle), arc_pts(a_end), ai_tolerance=l_tolerance)
+        l_deviation.append(chord_deviation(polyline, cx, cy, l_radius))
+      circle = complete_circle((cx, cy), l_radius, ai_tolerance=l_tolerance)
+      l_deviation.append(chord_deviation(circle+circle[:1], cx, cy, l_radius))
+      step_nb = arc_step_number(l_radius, 2*math.pi, l_tolerance)
+      # the arc center computed from three points has a rounding error proportional to the radius
+      t_ok = (max(l_deviation)<=l_tolerance+1e-12*l_radius) and (len(circle)==max(3, step_nb)) and (step_nb>=8)
+      if(step_nb>8): # the step number is the smallest one respecting the tolerance
+        t_ok = t_ok and (l_radius*(1-math.cos(math.pi/(step_nb-1)))>l_tolerance)
+      r_test = r_test and t_ok
+      print("tessellation test tolerance {:0.4f} radius {:0.3f}: {:d} points per circle, chord deviation {:0.6f} {:s}".format(l_tolerance, l_radius, len(circle), max(l_deviation), 'ok' if t_ok else 'failed'))
+  # legacy resolution
+  t_ok = True
+  for l_resolution in (3, 12):
+    for l_radius in (0.5, 7.0, 60.0):
+      legacy_nb = int(l_resolution * l_radius)
+      if(legacy_nb<1):
+        continue
+      legacy_circle = [ [1.0+l_radius*math.cos(i*2*math.pi/legacy_nb), 2.0+l_radius*math.sin(i*2*math.pi/legacy_nb)] for i in range(legacy_nb) ]
+      circle = complete_circle((1.0, 2.0), l_radius, l_resolution)
+      t_ok = t_ok and (len(circle)==len(legacy_circle)) and all([ (abs(p[0]-q[0])<1e-9)and(abs(p[1]-q[1])<1e-9) for (p, q) in zip(circle, legacy_circle) ])
+      (A, B, C) = ([1.0+l_radius, 2.0], [1.0+l_radius*math.cos(2.5), 2.0+l_radius*math.sin(2.5)], [1.0+l_radius*math.cos(4.0), 2.0+l_radius*math.sin(4.0)])
+      ar = 2*math.pi/(l_resolution * l_radius)
+      legacy_arc_nb = 3 + int(2.5/ar) + int(1.5/ar)
+      t_ok = t_ok and (len(arc_of_circle(A, B, C, l_resolution))==legacy_arc_nb)
+  r_test = r_test and t_ok
+  print("tessellation test legacy resolution: {:s}".format('ok' if t_ok else 'failed'))
+  return(r_test)
+
+def svg_writer_test():
+  """ check the path elements of the native SVG writer: the arc flags (large-arc, sweep) and the closing of the closed outlines
+      the center of each arc is computed back from its flags and the middle point of the input arc must be on the drawn arc
+  """
+  import cStringIO
+  import re
+  import xml.dom.minidom
+  c30 = math.cos(math.pi/6)*10
+  fig = [
+    [(0, 0), (40, 0), (50, 10, 46, 18), (0, 20), (0, 0)], # small counter clock wise arc, closed by a line
+    [(100, 10), (110, 0, 92, -6), (100, 10)], # large clock wise arc, closed by a line
+    [(205, c30), (220, 0), (210, -10, 205, c30)], # large clock wise arc closing the outline
+    [(310, 0), (300, 10, 294, -8), (284, -8), (284+c30, -13, 290, -26)], # open outline with a large counter clock wise arc and a small clock wise arc
+    (25, 10, 4)]
+  fig_flags = [[(0, 1)], [(1, 0)], [(1, 0)], [(1, 1), (0, 0)], None]
+  tolerance = 10**(1-svg_decimal_nb)
+  r_test = True
+  fh = cStringIO.StringIO()
+  write_figure_in_svg_stream(fig, fh)
+  dom = xml.dom.minidom.parseString(fh.getvalue())
+  elements = [ e for e in dom.documentElement.childNodes if((e.nodeType==e.ELEMENT_NODE)and(e.tagName in ('path', 'circle'))) ]
+  t_ok = ([ e.tagName for e in elements ]==['path', 'path', 'path', 'path', 'circle'])
+  print("svg_writer test document: {:s}".format('ok' if t_ok else 'failed'))
+  r_test = r_test and t_ok
+  for (ol_idx, (outline, flags, element)) in enumerate(zip(fig, fig_flags, elements)):
+    if(flags is None):
+      continue
+    for (l_name, l_outline) in (('list', outline), ('valid_outline', cnc_outline.Valid_Outline(outline))):
+      commands = [ (c, [ float(v) for v in re.findall(r'-?[0-9.]+', a) ]) for (c, a) in re.findall(r'([MLAZ])([^MLAZ]*)', outline_arc_line(l_outline, 'svgpath')) ]
+      t_ok = True
+      if(l_name=='list'): # the path element written in the document
+        t_ok = (commands==[ (c, [ float(v) for v in re.findall(r'-?[0-9.]+', a) ]) for (c, a) in re.findall(r'([MLAZ])([^MLAZ]*)', element.getAttribute('d')) ])
+      current = tuple(commands[0][1])
+      vertices = [current]
+      arc_flags = []
+      arc_idx = 0
+      for (c, values) in commands[1:]:
+        if(c=='A'):
+          (radius, fa, fs, x2, y2) = (values[0], int(values[3]), int(values[4]), values[5], values[6])
+          arc_flags.append((fa, fs))
+          # center of the arc according to the SVG specification (endpoint to center parameterization)
+          (hx, hy) = ((current[0]-x2)/2, (current[1]-y2)/2)
+          coef = math.sqrt(max(0, radius**2/(hx**2+hy**2)-1))
+          if(fa==fs):
+            coef = -coef
+          (cx, cy) = (coef*hy+(current[0]+x2)/2, -coef*hx+(current[1]+y2)/2)
+          arc_segments = [ s for s in outline[1:] if(len(s)==4) ]
+          (mx, my) = arc_segments[arc_idx][:2]
+          arc_idx += 1
+          a_start = math.atan2(current[1]-cy, current[0]-cx)
+          a_middle = (math.atan2(my-cy, mx-cx)-a_start)%(2*math.pi)
+          a_end = (math.atan2(y2-cy, x2-cx)-a_start)%(2*math.pi)
+          if(fs==0): # clock wise
+            (a_middle, a_end) = ((-a_middle)%(2*math.pi), (-a_end)%(2*math.pi))
+          t_ok = t_ok and (abs(math.sqrt((mx-cx)**2+(my-cy)**2)-radius)<tolerance) and (a_middle<a_end) and ((a_end>math.pi)==(fa==1))
+          current = (x2, y2)
+        elif(c=='Z'):
+          if(max(abs(current[0]-vertices[0][0]), abs(current[1]-vertices[0][1]))>tolerance): # Z draws the closing line
+            current = vertices[0]
+          else:
+            continue
+        else:
+          current = tuple(values)
+        vertices.append(current)
+      expected_vertices = [ (s[-2], s[-1]) for s in outline ]
+      closed = (outline[0]==outline[-1][-2:])
+      t_ok = (t_ok and (arc_flags==flags) and (commands[-1][0]=='Z')==closed
+        and (len(vertices)==len(expected_vertices))
+        and all([ max(abs(v[0]-e[0]), abs(v[1]-e[1]))<tolerance for (v, e) in zip(vertices, expected_vertices) ]))
+      r_test = r_test and t_ok
+      print("svg_writer test outline {:d} {:s}: {:s}".format(ol_idx, l_name, 'ok' if t_ok else 'failed'))
+  return(r_test)
+
+def outline_writer_benchmark(ai_nx=20, ai_ny=20, ai_output_dir="test_output"):
+  """ write a figure of ai_nx*ai_ny rounded plates with a hole in SVG and DXF with the native writers and with mozman svgwrite and dxfwrite
+      print the run time and the file size of each writer
+  """
+  bench_figure = []
+  for ix in range(ai_nx):
+    for iy in range(ai_ny):
+      ox = 60*ix
+      oy = 40*iy
+      bench_figure.append(cnc_outline.ideal_outline([
+        (ox, oy, 5),
+        (ox+50, oy, 5),
+        (ox+50, oy+30, 10),
+        (ox+25, oy+35, ox, oy+30, 5),
+        (ox, oy, 0)], "outline_writer_benchmark"))
+      bench_figure.append((ox+25, oy+15, 6))
+  design_help.mkdir_p(ai_output_dir)
+  print("Writer benchmark with {:d} outlines".format(len(bench_figure)))
+  for (file_suffix, write_function, writers) in (
+    ('svg', write_figure_in_svg, ('native', 'svgwrite')),
+    ('dxf', write_figure_in_dxf, ('native', 'dxfwrite'))):
+    for l_writer in writers:
+      l_filename = "{:s}/outline_writer_benchmark_{:s}.{:s}".format(ai_output_dir, l_writer, file_suffix)
+      start_time = time.time()
+      write_function(bench_figure, l_filename, l_writer)
+      run_time = time.time()-start_time
+      print("{:s} {:s} writer: {:0.3f} s  {:d} bytes".format(file_suffix, l_writer, run_time, os.path.getsize(l_filename)))
+  return(0)
+
 ################################################################
 # ******** command line interface ***********
 ################################################################
@@ -854,12 +1722,32 @@ def outline_backends_cli(ai_args=""):
   ob_parser = argparse.ArgumentParser(description='Test the outline_backends API.')
   ob_parser.add_argument('--test1','--t1', action='store_true', default=False, dest='sw_test1',
     help='Run outline_arc_line_test1()')
+  ob_parser.add_argument('--dxf_test','--dt', action='store_true', default=False, dest='sw_dxf_test',
+    help='Run dxf_writer_test() to check the DXF documents of the native writer (with ezdxf if installed)')
+  ob_parser.add_argument('--tessellation_test','--tt', action='store_true', default=False, dest='sw_tessellation_test',
+    help='Run arc_tessellation_test() to check the chord deviation of the arcs and circles converted into polylines')
+  ob_parser.add_argument('--svg_test','--st', action='store_true', default=False, dest='sw_svg_test',
+    help='Run svg_writer_test() to check the arc flags and the closing of the path elements of the native SVG writer')
+  ob_parser.add_argument('--valid_outline_test','--vot', action='store_true', default=False, dest='sw_valid_outline_test',
+    help='Run valid_outline_check_test() to check the segments of a modified Valid_Outline')
+  ob_parser.add_argument('--writer_benchmark','--wb', action='store_true', default=False, dest='sw_writer_benchmark',
+    help='Run outline_writer_benchmark() to compare the native SVG and DXF writers with svgwrite and dxfwrite')
   effective_args = design_help.get_effective_args(ai_args)
   ob_args = ob_parser.parse_args(effective_args)
   r_obc = 0
   print("dbg111: start testing outline_backends.py")
   if(ob_args.sw_test1):
     r_obc = outline_arc_line_test1()
+  if(ob_args.sw_dxf_test):
+    r_obc = dxf_writer_test()
+  if(ob_args.sw_tessellation_test):
+    r_obc = arc_tessellation_test()
+  if(ob_args.sw_svg_test):
+    r_obc = svg_writer_test()
+  if(ob_args.sw_valid_outline_test):
+    r_obc = valid_outline_check_test()
+  if(ob_args.sw_writer_benchmark):
+    r_obc = outline_writer_benchmark()
   print("dbg999: end of script")
   return(r_obc)
 
@@ -0,0 +1,425 @@
+# segment_index.py
+# a grid index of the segments of a figure for the intersection, clearance and containment checks
+# created by charlyoleg on 2014/04/22
+#
+# (C) Copyright 2014 charlyoleg
+#
+# This file is part of the Cnc25D Python package.
+#
+# Cnc25D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Cnc25D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cnc25D.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+segment_index.py is part of the Cnc25D API.
+it provides the class Segment_Index that stores the lines and arcs of several format-B outlines in a uniform grid.
+Only the segments sharing a grid cell are compared, so the intersection and clearance checks of a figure
+don't compare every segment with every other segment.
+The distances between lines and arcs are computed exactly (no polyline approximation of the arcs).
+"""
+
+################################################################
+# import
+################################################################
+
+# Python standard library
+import math
+# cnc25d
+import small_geometry
+import cnc25d_error
+
+################################################################
+# distance between lines and arcs
+################################################################
+
+# a segment is a tuple:
+# line: (segment_line, x1, y1, x2, y2)
+# arc:  (segment_arc, x1, y1, x2, y2, cx, cy, radius, a0, sweep) with the arc going counter clock wise from the angle a0 to a0+sweep
+
+segment_line = 0
+segment_arc = 1
+
+def angle_in_arc(ai_angle, ai_a0, ai_sweep):
+  """ check if the angle ai_angle is in the counter clock wise angle range [ai_a0, ai_a0+ai_sweep]
+  """
+  r_in = (math.fmod(ai_angle-ai_a0+8*math.pi, 2*math.pi)<=ai_sweep)
+  return(r_in)
+
+def point_line_distance(ai_px, ai_py, ai_x1, ai_y1, ai_x2, ai_y2):
+  """ return the distance between the point P and the line-segment [(x1,y1), (x2,y2)]
+  """
+  ABX = ai_x2-ai_x1
+  ABY = ai_y2-ai_y1
+  APX = ai_px-ai_x1
+  APY = ai_py-ai_y1
+  AB2 = ABX*ABX+ABY*ABY
+  t = 0
+  if(AB2>0):
+    t = min(1, max(0, (APX*ABX+APY*ABY)/AB2))
+  r_distance = math.hypot(APX-t*ABX, APY-t*ABY)
+  return(r_distance)
+
+def point_arc_distance(ai_px, ai_py, ai_arc):
+  """ return the distance between the point P and the arc-segment ai_arc
+  """
+  (kind, x1, y1, x2, y2, cx, cy, radius, a0, sweep) = ai_arc
+  center_distance = math.hypot(ai_px-cx, ai_py-cy)
+  if(center_distance==0):
+    r_distance = radius
+  elif(angle_in_arc(math.atan2(ai_py-cy, ai_px-cx), a0, sweep)):
+    r_distance = abs(center_distance-radius)
+  else:
+    r_distance = min(math.hypot(ai_px-x1, ai_py-y1), math.hypot(ai_px-x2, ai_py-y2))
+  return(r_distance)
+
+def point_segment_distance(ai_px, ai_py, ai_segment):
+  """ return the distance between the point P and a line-segment or an arc-segment
+  """
+  if(ai_segment[0]==segment_line):
+    r_distance = point_line_distance(ai_px, ai_py, ai_segment[1], ai_segment[2], ai_segment[3], ai_segment[4])
+  else:
+    r_distance = point_arc_distance(ai_px, ai_py, ai_segment)
+  return(r_distance)
+
+def line_line_distance(ai_line1, ai_line2):
+  """ return the distance between two line-segments. 0 if they intersect
+  """
+  (k1, AX, AY, BX, BY) = ai_line1
+  (k2, CX, CY, DX, DY) = ai_line2
+  o1 = (BX-AX)*(CY-AY)-(BY-AY)*(CX-AX)
+  o2 = (BX-AX)*(DY-AY)-(BY-AY)*(DX-AX)
+  o3 = (DX-CX)*(AY-CY)-(DY-CY)*(AX-CX)
+  o4 = (DX-CX)*(BY-CY)-(DY-CY)*(BX-CX)
+  if((o1*o2<0)and(o3*o4<0)):
+    r_distance = 0.0
+  else:
+    r_distance = min(point_line_distance(AX, AY, CX, CY, DX, DY), point_line_distance(BX, BY, CX, CY, DX, DY),
+                     point_line_distance(CX, CY, AX, AY, BX, BY), point_line_distance(DX, DY, AX, AY, BX, BY))
+  return(r_distance)
+
+def line_arc_distance(ai_line, ai_arc):
+  """ return the distance between a line-segment and an arc-segment. 0 if they intersect
+  """
+  (k1, AX, AY, BX, BY) = ai_line
+  (k2, x1, y1, x2, y2, cx, cy, radius, a0, sweep) = ai_arc
+  ABX = BX-AX
+  ABY = BY-AY
+  ACX = cx-AX
+  ACY = cy-AY
+  AB2 = ABX*ABX+ABY*ABY
+  # intersections of the line with the circle: |A+t*AB-C|=radius
+  if(AB2>0):
+    tf = (ACX*ABX+ACY*ABY)/AB2 # F, the projection of the center C on the line
+    FX = AX+tf*ABX
+    FY = AY+tf*ABY
+    CF = math.hypot(FX-cx, FY-cy)
+    if(CF<=radius):
+      dt = math.sqrt((radius*radius-CF*CF)/AB2)
+      for t in (tf-dt, tf+dt):
+        if((t>=0)and(t<=1)):
+          if(angle_in_arc(math.atan2(AY+t*ABY-cy, AX+t*ABX-cx), a0, sweep)):
+            return(0.0)
+  # the ends of each segment
+  r_distance = min(point_arc_distance(AX, AY, ai_arc), point_arc_distance(BX, BY, ai_arc),
+                   point_line_distance(x1, y1, AX, AY, BX, BY), point_line_distance(x2, y2, AX, AY, BX, BY))
+  # the arc points on the perpendicular of the line passing by the center
+  if((AB2>0)and(tf>0)and(tf<1)and(CF>0)):
+    fa = math.atan2(FY-cy, FX-cx)
+    if(angle_in_arc(fa, a0, sweep)):
+      r_distance = min(r_distance, abs(CF-radius))
+    if(angle_in_arc(fa+math.pi, a0, sweep)):
+      r_distance = min(r_distance, CF+radius)
+  return(r_distance)
+
+def arc_arc_distance(ai_arc1, ai_arc2):
+  """ return the distance between two arc-segments. 0 if they intersect
+  """
+  (k1, ax1, ay1, ax2, ay2, c1x, c1y, r1, a1, s1) = ai_arc1
+  (k2, bx1, by1, bx2, by2, c2x, c2y, r2, a2, s2) = ai_arc2
+  d = math.hypot(c2x-c1x, c2y-c1y)
+  # intersections of the two circles
+  if((d>0)and(d<=r1+r2)and(d>=abs(r1-r2))):
+    a = (r1*r1-r2*r2+d*d)/(2*d)
+    h = math.sqrt(max(0, r1*r1-a*a))
+    MX = c1x+a*(c2x-c1x)/d
+    MY = c1y+a*(c2y-c1y)/d
+    for sign in (-1, 1):
+      PX = MX-sign*h*(c2y-c1y)/d
+      PY = MY+sign*h*(c2x-c1x)/d
+      if(angle_in_arc(math.atan2(PY-c1y, PX-c1x), a1, s1) and angle_in_arc(math.atan2(PY-c2y, PX-c2x), a2, s2)):
+        return(0.0)
+  # the ends of each segment
+  r_distance = min(point_arc_distance(ax1, ay1, ai_arc2), point_arc_distance(ax2, ay2, ai_arc2),
+                   point_arc_distance(bx1, by1, ai_arc1), point_arc_distance(bx2, by2, ai_arc1))
+  # the arc points on the line of the two centers
+  if(d>0):
+    ca = math.atan2(c2y-c1y, c2x-c1x)
+    for angle in (ca, ca+math.pi):
+      if(angle_in_arc(angle, a1, s1)):
+        r_distance = min(r_distance, point_arc_distance(c1x+r1*math.cos(angle), c1y+r1*math.sin(angle), ai_arc2))
+      if(angle_in_arc(angle, a2, s2)):
+        r_distance = min(r_distance, point_arc_distance(c2x+r2*math.cos(angle), c2y+r2*math.sin(angle), ai_arc1))
+  return(r_distance)
+
+def segment_distance(ai_segment1, ai_segment2):
+  """ return the distance between two segments (line or arc). 0 if they intersect
+  """
+  if(ai_segment1[0]==segment_line):
+    if(ai_segment2[0]==segment_line):
+      r_distance = line_line_distance(ai_segment1, ai_segment2)
+    else:
+      r_distance = line_arc_distance(ai_segment1, ai_segment2)
+  else:
+    if(ai_segment2[0]==segment_line):
+      r_distance = line_arc_distance(ai_segment2, ai_segment1)
+    else:
+      r_distance = arc_arc_distance(ai_segment1, ai_segment2)
+  return(r_distance)
+
+def segment_ray_crossing(ai_px, ai_py, ai_segment):
+  """ return the number of crossings between the segment and the horizontal ray starting at P and going to +x
+      the ends of the segments are counted with the half-open rule, so a closed outline is crossed an odd number of times if P is inside
+  """
+  r_crossing = 0
+  if(ai_segment[0]==segment_line):
+    l_pieces = [(ai_segment[1], ai_segment[2], ai_segment[3], ai_segment[4], 0)]
+  else:
+    # split the arc into y-monotonic pieces
+    (kind, x1, y1, x2, y2, cx, cy, radius, a0, sweep) = ai_segment
+    l_split = []
+    for extremum in (math.pi/2, 3*math.pi/2):
+      split_angle = math.fmod(extremum-a0+8*math.pi, 2*math.pi)
+      if((split_angle>0)and(split_angle<sweep)):
+        l_split.append(split_angle)
+    l_split.sort()
+    l_angle = [0]+l_split+[sweep]
+    # a clock wise arc is stored from its end point, so the exact end points are ordered along the angle
+    (ex, ey) = (cx+radius*math.cos(a0), cy+radius*math.sin(a0))
+    if(math.hypot(x2-ex, y2-ey)<math.hypot(x1-ex, y1-ey)):
+      (x1, y1, x2, y2) = (x2, y2, x1, y1)
+    l_point = [(x1, y1)]+[ (cx+radius*math.cos(a0+sa), cy+radius*math.sin(a0+sa)) for sa in l_split ]+[(x2, y2)]
+    l_pieces = []
+    for i in range(len(l_angle)-1):
+      side = 1 if(math.cos(a0+(l_angle[i]+l_angle[i+1])/2)>0) else -1
+      l_pieces.append((l_point[i][0], l_point[i][1], l_point[i+1][0], l_point[i+1][1], side))
+  for (ax, ay, bx, by, side) in l_pieces:
+    if((ay>ai_py)!=(by>ai_py)):
+      if(side==0):
+        cross_x = ax+(ai_py-ay)*(bx-ax)/(by-ay)
+      else:
+        cross_x = cx+side*math.sqrt(max(0, radius*radius-(ai_py-cy)**2))
+      if(cross_x>ai_px):
+        r_crossing += 1
+  return(r_crossing)
+
+################################################################
+# Segment_Index class
+################################################################
+
+class Segment_Index:
+  """
+  Store the segments of several format-B outlines in a uniform grid of cells.
+  Each segment is registered in the cells crossed by its bounding boxes enlarged by the half of the cell size,
+  so two segments closer than the cell size share at least one cell.
+  """
+
+  def __init__(self, cell_size):
+    """ create an empty index. cell_size must be larger than the clearance distances that will be queried
+    """
+    if(not (cell_size>0)):
+      raise cnc25d_error.GeometryError("ERR153: Error, the Segment_Index cell_size {:s} must be positive".format(str(cell_size)))
+    self.cell_size = float(cell_size)
+    self.segments = [] # (segment, outline_index, segment_index_in_the_outline)
+    self.outline_segment_nb = [] # number of segments of each outline
+    self.outline_closed = [] # True if the last point of the outline is the first one
+    self.outline_ids = []
+    self.grid = {} # (ix, iy) -> list of segment indices
+    self.ix_max = None
+
+  def add_outline(self, ai_outline, ai_outline_id=""):
+    """ add a format-B outline or a circle to the index. It returns the index of the outline
+    """
+    outline_index = len(self.outline_segment_nb)
+    l_segment = []
+    outline_closed = True
+    if(not isinstance(ai_outline[0], (tuple, list))): # circle
+      if(len(ai_outline)!=3):
+        raise cnc25d_error.GeometryError("ERR155: Error in {:s}, the circle must have 3 elements. Currently: {:d}".format(ai_outline_id, len(ai_outline)))
+      (cx, cy, radius) = ai_outline
+      l_segment.append((segment_arc, cx+radius, cy, cx+radius, cy, cx, cy, radius, 0.0, 2*math.pi))
+    else:
+      if(len(ai_outline)<2):
+        raise cnc25d_error.GeometryError("ERR158: Error in {:s}, the outline must have at least 2 elements. Currently: {:d}".format(ai_outline_id, len(ai_outline)))
+      (px, py) = (ai_outline[0][0], ai_outline[0][1])
+      for i in range(1, len(ai_outline)):
+        segment = ai_outline[i]
+        if(len(segment)==2):
+          l_segment.append((segment_line, px, py, segment[0], segment[1]))
+        elif(len(segment)==4):
+          (cx, cy, radius, uw, u, w) = small_geometry.arc_center_radius_angles((px, py), (segment[0], segment[1]), (segment[2], segment[3]), "{:s}.{:d}".format(ai_outline_id, i))
+          if(uw>0):
+            l_segment.append((segment_arc, px, py, segment[2], segment[3], cx, cy, radius, u, uw))
+          else:
+            l_segment.append((segment_arc, px, py, segment[2], segment[3], cx, cy, radius, u+uw, -uw))
+        else:
+          raise cnc25d_error.GeometryError("ERR164: Error in {:s}, the segment {:d} must have 2 or 4 elements. Currently: {:d}".format(ai_outline_id, i, len(segment)))
+        (px, py) = (segment[-2], segment[-1])
+      outline_closed = ((px==ai_outline[0][0])and(py==ai_outline[0][1]))
+    for i in range(len(l_segment)):
+      self.add_segment_in_grid(len(self.segments), l_segment[i])
+      self.segments.append((l_segment[i], outline_index, i))
+    self.outline_segment_nb.append(len(l_segment))
+    self.outline_closed.append(outline_closed)
+    self.outline_ids.append(ai_outline_id)
+    return(outline_index)
+
+  def add_segment_in_grid(self, ai_segment_index, ai_segment):
+    """ register the segment in the cells crossed by the pieces of the segment
+        long lines and large arcs are cut into pieces not longer than the cell size, so the number of cells stays proportional to the segment length
+    """
+    margin = self.cell_size/2
+    if(ai_segment[0]==segment_line):
+      (kind, x1, y1, x2, y2) = ai_segment
+      piece_nb = 1+int(math.hypot(x2-x1, y2-y1)/self.cell_size)
+      l_point = [ (x1+(x2-x1)*i/float(piece_nb), y1+(y2-y1)*i/float(piece_nb)) for i in range(piece_nb+1) ]
+      l_box = [ (min(l_point[i][0], l_point[i+1][0]), min(l_point[i][1], l_point[i+1][1]), max(l_point[i][0], l_point[i+1][0]), max(l_point[i][1], l_point[i+1][1])) for i in range(piece_nb) ]
+    else:
+      (kind, x1, y1, x2, y2, cx, cy, radius, a0, sweep) = ai_segment
+      piece_nb = 1+int(max(radius*sweep/self.cell_size, 4*sweep/math.pi))
+      l_box = []
+      for i in range(piece_nb):
+        # the chord and the arc of a piece smaller than pi/4 are contained in the box of the ends enlarged by the sagitta
+        pa = a0+sweep*i/piece_nb
+        pb = a0+sweep*(i+1)/piece_nb
+        (pax, pay, pbx, pby) = (cx+radius*math.cos(pa), cy+radius*math.sin(pa), cx+radius*math.cos(pb), cy+radius*math.sin(pb))
+        sagitta = radius*(1-math.cos((pb-pa)/2))
+        l_box.append((min(pax, pbx)-sagitta, min(pay, pby)-sagitta, max(pax, pbx)+sagitta, max(pay, pby)+sagitta))
+    l_cell = set()
+    for (xmin, ymin, xmax, ymax) in l_box:
+      for ix in range(int(math.floor((xmin-margin)/self.cell_size)), int(math.floor((xmax+margin)/self.cell_size))+1):
+        for iy in range(int(math.floor((ymin-margin)/self.cell_size)), int(math.floor((ymax+margin)/self.cell_size))+1):
+          l_cell.add((ix, iy))
+    for cell in l_cell:
+      self.grid.setdefault(cell, []).append(ai_segment_index)
+      if((self.ix_max is None)or(cell[0]>self.ix_max)):
+        self.ix_max = cell[0]
+
+  def adjacent_segments(self, ai_segment_index1, ai_segment_index2):
+    """ check if two segments follow each other in the same outline
+        the last and the first segments follow each other only if the outline is closed
+    """
+    (s1, o1, i1) = self.segments[ai_segment_index1]
+    (s2, o2, i2) = self.segments[ai_segment_index2]
+    r_adjacent = False
+    if(o1==o2):
+      segment_nb = self.outline_segment_nb[o1]
+      r_adjacent = ((abs(i1-i2)==1)or(self.outline_closed[o1] and (abs(i1-i2)==segment_nb-1)))
+    return(r_adjacent)
+
+  def close_pairs(self, ai_distance):
+    """ return the list of (distance, segment_index1, segment_index2) of the segments closer than ai_distance
+        the adjacent segments of an outline are not compared. ai_distance must not be larger than the cell size
+    """
+    if(ai_distance>self.cell_size):
+      raise cnc25d_error.GeometryError("ERR165: Error, the distance {:0.3f} is larger than the Segment_Index cell_size {:0.3f}".format(ai_distance, self.cell_size))
+    r_pairs = []
+    l_compared = set()
+    for cell in self.grid:
+      l_segment = self.grid[cell]
+      for i in range(len(l_segment)):
+        for j in range(i+1, len(l_segment)):
+          pair = (min(l_segment[i], l_segment[j]), max(l_segment[i], l_segment[j]))
+          if((pair[0]==pair[1])or(pair in l_compared)):
+            continue
+          l_compared.add(pair)
+          if(self.adjacent_segments(pair[0], pair[1])):
+            continue
+          distance = segment_distance(self.segments[pair[0]][0], self.segments[pair[1]][0])
+          if(distance<ai_distance):
+            r_pairs.append((distance, pair[0], pair[1]))
+    r_pairs.sort()
+    return(r_pairs)
+
+  def point_distance(self, ai_px, ai_py, ai_outline_index):
+    """ return the distance between the point P and the outline ai_outline_index
+    """
+    r_distance = None
+    for (segment, outline_index, i) in self.segments:
+      if(outline_index==ai_outline_index):
+        distance = point_segment_distance(ai_px, ai_py, segment)
+        if((r_distance is None)or(distance<r_distance)):
+          r_distance = distance
+    return(r_distance)
+
+  def point_in_outline(self, ai_px, ai_py, ai_outline_index):
+    """ check if the point P is inside the closed outline ai_outline_index
+        only the segments of the grid cells at the right of P are tested
+    """
+    iy = int(math.floor(ai_py/self.cell_size))
+    ix_min = int(math.floor(ai_px/self.cell_size))
+    l_candidate = set()
+    if(self.ix_max is not None):
+      for ix in range(ix_min, self.ix_max+1):
+        for segment_index in self.grid.get((ix, iy), ()):
+          if(self.segments[segment_index][1]==ai_outline_index):
+            l_candidate.add(segment_index)
+    crossing_nb = 0
+    for segment_index in l_candidate:
+      crossing_nb += segment_ray_crossing(ai_px, ai_py, self.segments[segment_index][0])
+    r_inside = ((crossing_nb%2)==1)
+    return(r_inside)
+
+################################################################
+# self test
+################################################################
+
+def segment_index_self_test():
+  """ check the distances and the point containment on simple shapes
+  """
+  print("Non-regression tests of the segment_index module")
+  square = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0), (0.0, 0.0)]
+  rounded = [(12.0, 0.0), (14.0, 0.0), (16.0, 5.0, 14.0, 10.0), (12.0, 10.0), (12.0, 0.0)]
+  si = Segment_Index(5.0)
+  o_square = si.add_outline(square, "square")
+  o_rounded = si.add_outline(rounded, "rounded")
+  o_circle = si.add_outline((5.0, 5.0, 2.0), "circle")
+  o_crossing = si.add_outline([(9.0, 4.0), (11.0, 4.0), (11.0, 6.0), (9.0, 6.0), (9.0, 4.0)], "crossing")
+  o_rounded_cw = si.add_outline([(22.0, 0.0), (22.0, 10.0), (24.0, 10.0), (26.0, 5.0, 24.0, 0.0), (22.0, 0.0)], "rounded_cw")
+  o_arc_cw = si.add_outline([(50.0, 0.0), (55.0, 5.0, 55.0+5*math.cos(math.pi/6), -2.5), (50.0, 0.0)], "arc_cw")
+  o_open = si.add_outline([(30.0, 0.0), (40.0, 0.0), (40.0, 10.0), (30.0, 10.0), (30.0, 0.5)], "open")
+  l_check = []
+  l_check.append(("square-rounded distance", min([ d for (d, i, j) in si.close_pairs(5.0) if(set((si.segments[i][1], si.segments[j][1]))==set((o_square, o_rounded))) ]), 2.0))
+  l_check.append(("square-crossing intersection", min([ d for (d, i, j) in si.close_pairs(5.0) if(set((si.segments[i][1], si.segments[j][1]))==set((o_square, o_crossing))) ]), 0.0))
+  l_check.append(("circle-square distance", min([ d for (d, i, j) in si.close_pairs(5.0) if(set((si.segments[i][1], si.segments[j][1]))==set((o_square, o_circle))) ]), 3.0))
+  l_check.append(("point in square", si.point_in_outline(5.0, 5.0, o_square), True))
+  l_check.append(("point in circle", si.point_in_outline(5.5, 5.0, o_circle), True))
+  l_check.append(("point out of circle", si.point_in_outline(1.0, 5.0, o_circle), False))
+  l_check.append(("point in the arc of rounded", si.point_in_outline(15.5, 5.0, o_rounded), True))
+  l_check.append(("point out of rounded", si.point_in_outline(16.5, 5.0, o_rounded), False))
+  l_check.append(("point-rounded distance", si.point_distance(18.0, 5.0, o_rounded), 2.0))
+  l_check.append(("point in the clock wise arc", si.point_in_outline(25.0, 2.0, o_rounded_cw), True))
+  l_check.append(("point in the split clock wise arc", si.point_in_outline(57.0, -1.0, o_arc_cw), True))
+  l_check.append(("point in rounded_cw", si.point_in_outline(23.0, 8.0, o_rounded_cw), True))
+  l_check.append(("point out of rounded_cw", si.point_in_outline(26.5, 5.0, o_rounded_cw), False))
+  l_check.append(("ends of the open outline", min([ d for (d, i, j) in si.close_pairs(5.0) if(si.segments[i][1]==si.segments[j][1]==o_open) ]), 0.5))
+  for (check_name, check_value, expected_value) in l_check:
+    check_ok = (abs(check_value-expected_value)<1e-9)
+    print("{:s}: {:s} (expected {:s}) {:s}".format(check_name, str(check_value), str(expected_value), "ok" if(check_ok) else "ERR170: Error"))
+
+################################################################
+# main
+################################################################
+
+if __name__ == "__main__":
+  segment_index_self_test()
+
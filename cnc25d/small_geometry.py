@@ -39,6 +39,13 @@ from __future__ import division # to get float division
 #
 import math
 import sys, argparse
+#
+import cnc25d_error
+# numpy is optional
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 ################################################################
 # functions to be used by cnc_cut_outline.py
@@ -72,8 +79,7 @@ def arc_center_radius(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_error_msg_id):
   BC = math.sqrt((CX-BX)**2+(CY-BY)**2)
   AC = math.sqrt((CX-AX)**2+(CY-AY)**2)
   if((AB<radian_epsilon)or(BC<radian_epsilon)or(AC<radian_epsilon)):
-    print("ERR682: Error in {:s}, the three arc points ABC are too closed: AB={:0.2f} BC={:0.2f} AC={:0.2f}".format(ai_error_msg_id, AB, BC, AC))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR682: Error in {:s}, the three arc points ABC are too closed: AB={:0.2f} BC={:0.2f} AC={:0.2f}".format(ai_error_msg_id, AB, BC, AC))
   # calculation of M and N
   MX = (AX+BX)/2
   MY = (AY+BY)/2
@@ -96,8 +102,7 @@ def arc_center_radius(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_error_msg_id):
   ixk = sin_f*(cos_e*MX+sin_e*MY)-sin_e*(cos_f*NX+sin_f*NY)
   iyk = cos_f*(cos_e*MX+sin_e*MY)-cos_e*(cos_f*NX+sin_f*NY)
   if((abs(ixl)<radian_epsilon)or(abs(iyl)<radian_epsilon)):
-    print("ERR947: Error in {:s}, ixl (= {:0.2f}) or iyl (= {:0.2f}) are too closed to zero!".format(ai_error_msg_id, ixl, iyl))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR947: Error in {:s}, ixl (= {:0.2f}) or iyl (= {:0.2f}) are too closed to zero!".format(ai_error_msg_id, ixl, iyl))
   IX=ixk/ixl
   IY=iyk/iyl
   # check than I is equidistant of A, B and C
@@ -105,12 +110,11 @@ def arc_center_radius(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_error_msg_id):
   IB = math.sqrt((BX-IX)**2+(BY-IY)**2)
   IC = math.sqrt((CX-IX)**2+(CY-IY)**2)
   if((abs(IB-IA)>radian_epsilon)or(abs(IC-IA)>radian_epsilon)):
-    print("ERR748: Error in {:s}, the calculation of the center of the arc A,B,C is wrong! IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, IA, IB, IC))
     print("dbg253: A= {:0.2f} {:0.2f}  B= {:0.2f} {:0.2f}  C= {:0.2f} {:0.2f}  I= {:0.2f} {:0.2f}".format(AX,AY,BX,BY,CX,CY,IX,IY))
     print("dbg764: cos_e={:0.2f}  sin_e={:0.2f}  cos_f={:0.2f}  sin_f={:0.2f}".format(cos_e, sin_e, cos_f, sin_f))
     print("dbg765: ixl={:0.2f} ixk={:0.2f} iyl={:0.2f} iyk={:0.2f}".format(ixl, ixk, iyl, iyk))
     print("dbg766: MX={:0.2f} MY={:0.2f} NX={:0.2f} NY={:0.2f}".format(MX,MY,NX,NY))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR748: Error in {:s}, the calculation of the center of the arc A,B,C is wrong! IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, IA, IB, IC))
   # return
   r_arc_center_radius=(IX, IY, IA)
   return(r_arc_center_radius)
@@ -134,8 +138,7 @@ def arc_center_radius_angles(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_error_msg_id
   IB = math.sqrt((BX-IX)**2+(BY-IY)**2)
   IC = math.sqrt((CX-IX)**2+(CY-IY)**2)
   if((abs(IA-arc_radius)>radian_epsilon)or(abs(IB-arc_radius)>radian_epsilon)or(abs(IC-arc_radius)>radian_epsilon)):
-    print("ERR841: Error, in {:s}, I is not equidistant from A,B,C. arc_radius={:0.2f} IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, arc_radius, IA, IB, IC))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR841: Error, in {:s}, I is not equidistant from A,B,C. arc_radius={:0.2f} IA={:0.2f} IB={:0.2f} IC={:0.2f}".format(ai_error_msg_id, arc_radius, IA, IB, IC))
   # calculation of the angle u=(Ix, IA) , v=(Ix, IB), w=(Ix, IC), d=(Ix, ID) and e=(Ix, IE)
   u = math.atan2(AY-IY, AX-IX)
   v = math.atan2(BY-IY, BX-IX)
@@ -157,6 +160,124 @@ def arc_center_radius_angles(ai_arc_pt1, ai_arc_pt2, ai_arc_pt3, ai_error_msg_id
   r_arc_center_radius_angles=(IX, IY, IA, uw, u, w)
   return(r_arc_center_radius_angles)
 
+def arc_3_points_to_radius_center_angles(ai_start, ai_middle, ai_end):
+  """ From three points (A,B,C: equivalent to 6 floats) computes the radius, the center (I) and the angles ((Ix,IA), (Ix,IB), (Ix,IC)) of the arc passing through A, B and C
+      It returns the resolved-arc record (lia, ptix, ptiy, u, v, w, uv, vw, uw) used by the outline backends:
+      radius, center, start/middle/end angles and the signed sweeps (IA,IB), (IB,IC) and (IA,IC). uw>0 for a CCW arc.
+      lia is 0 when A, B and C are colinear
+  """
+  # interpretation of the three points
+  ptax = ai_start[0]
+  ptay = ai_start[1]
+  ptbx = ai_middle[0]
+  ptby = ai_middle[1]
+  ptcx = ai_end[0]
+  ptcy = ai_end[1]
+  #print("dbg501: pta: {:6.01f}  {:6.01f}".format(ptax, ptay))
+  #print("dbg502: ptb: {:6.01f}  {:6.01f}".format(ptbx, ptby))
+  #print("dbg503: ptc: {:6.01f}  {:6.01f}".format(ptcx, ptcy))
+  # epsilon definiton to be tolerant to calculation imprecision
+  #epsilon = math.pi/1000 # can be used to compare radian and sine
+  length_epsilon = math.pi/1000
+  angle_epsilon = math.pi/10000
+  #print("dbg747: length_epsilon:", length_epsilon)
+  # check
+  if((ptax==ptbx)and(ptay==ptby)):
+    raise cnc25d_error.BackendError("ERR807: Error, point_A and point_B are identical!")
+  if((ptbx==ptcx)and(ptby==ptcy)):
+    raise cnc25d_error.BackendError("ERR808: Error, point_B and point_C are identical!")
+  if((ptax==ptcx)and(ptay==ptcy)):
+    raise cnc25d_error.BackendError("ERR809: Error, point_A and point_C are identical!")
+  ## check the documentation for the explanation of the following calculation
+  # length of [AB] and [BC]
+  lab = math.sqrt((ptbx-ptax)**2+(ptby-ptay)**2)
+  lbc = math.sqrt((ptcx-ptbx)**2+(ptcy-ptby)**2)
+  if(lab<length_epsilon):
+    print("dbg559: pta={:0.2f} {:0.2f}  ptb={:0.2f} {:0.2f}  ptc={:0.2f} {:0.2f}".format(ptax, ptay, ptbx, ptby, ptcx, ptcy))
+    raise cnc25d_error.BackendError("ERR811: Error, A and B are almost identical")
+  if(lbc<length_epsilon):
+    raise cnc25d_error.BackendError("ERR812: Error, B and C are almost identical")
+  # calculation of cos(e), cos(f), sin(e) and sin(f)
+  cos_e = (ptbx-ptax)/lab
+  cos_f = (ptcx-ptbx)/lbc
+  sin_e = (ptby-ptay)/lab
+  sin_f = (ptcy-ptby)/lbc
+  #print("dbg304: cos_e: ", cos_e)
+  #print("dbg305: sin_e: ", sin_e)
+  #print("dbg306: cos_f: ", cos_f)
+  #print("dbg307: sin_f: ", sin_f)
+  is_colinear = (math.copysign(1, sin_e)*cos_e)-(math.copysign(1,sin_f)*cos_f)
+  #print("dbg556: is_colinear:", is_colinear)
+  if(abs(is_colinear)<angle_epsilon):
+    #print("ERR810: Error, A, B, C are colinear. Arc can not be created!")
+    #sys.exit(2)
+    if(lab>100*length_epsilon):
+      pass # to let comment the following warning
+      #print("WARN810: Arc ABC is replaced by the line AC, because A,B,C are colinear!")
+      #print("dbg559: A= {:0.2f} {:0.2f}  B= {:0.2f} {:0.2f}  C= {:0.2f} {:0.2f}".format(ptax, ptay, ptbx, ptby, ptcx, ptcy))
+      #print("dbg558: is_colinear:", is_colinear)
+      #print("dbg557: lab:", lab)
+    r_a3ptrca = (0, 0, 0, 0, 0, 0, 0, 0, 0)
+    return(r_a3ptrca)
+  # Calculation of M and N
+  ptmx = (ptax+ptbx)/2
+  ptmy = (ptay+ptby)/2
+  ptnx = (ptbx+ptcx)/2
+  ptny = (ptby+ptcy)/2
+  #print("dbg134: ptmx:", ptmx)
+  #print("dbg135: ptmy:", ptmy)
+  #print("dbg136: ptnx:", ptnx)
+  #print("dbg137: ptny:", ptny)
+  # calculation of I
+  lix = cos_e*sin_f-cos_f*sin_e
+  kix = sin_f*(cos_e*ptmx+sin_e*ptmy)-sin_e*(cos_f*ptnx+sin_f*ptny)
+  liy = sin_e*cos_f-sin_f*cos_e
+  kiy = cos_f*(cos_e*ptmx+sin_e*ptmy)-cos_e*(cos_f*ptnx+sin_f*ptny)
+  if(abs(lix)<angle_epsilon):
+    raise cnc25d_error.BackendError("ERR813: Error, A, B and C are almost colinear. Arc can not be created!")
+  if(abs(liy)<angle_epsilon):
+    raise cnc25d_error.BackendError("ERR814: Error, A, B and C are almost colinear. Arc can not be created!")
+  #print("dbg124: lix:", lix)
+  #print("dbg125: kix:", kix)
+  #print("dbg126: liy:", liy)
+  #print("dbg127: kiy:", kiy)
+  ptix = kix / lix
+  ptiy = kiy / liy
+  #print("dbg505: pti: {:6.02f}  {:6.02f}".format(ptix, ptiy))
+  # length of [IA], [IB] and [IC]
+  lia = math.sqrt((ptax-ptix)**2+(ptay-ptiy)**2)
+  lib = math.sqrt((ptbx-ptix)**2+(ptby-ptiy)**2)
+  lic = math.sqrt((ptcx-ptix)**2+(ptcy-ptiy)**2)
+  if(abs(lib-lia)>length_epsilon):
+    #print("dbg404: lia:", lia)
+    #print("dbg405: lib:", lib)
+    raise cnc25d_error.BackendError("ERR815: I is not equidistant from A and B!")
+  if(abs(lic-lib)>length_epsilon):
+    #print("dbg402: lib:", lib)
+    #print("dbg403: lic:", lic)
+    raise cnc25d_error.BackendError("ERR816: I is not equidistant from B and C!")
+  # calculation of the angle u=(Ix, IA) , v=(Ix, IB) and w=(Ix, IC)
+  u = math.atan2(ptay-ptiy, ptax-ptix)
+  v = math.atan2(ptby-ptiy, ptbx-ptix)
+  w = math.atan2(ptcy-ptiy, ptcx-ptix)
+  # calculation of the angle uv=(IA, IB), uw=(IA, IC) vw=(IB, IC)
+  uv = math.fmod(v-u+4*math.pi, 2*math.pi)
+  uw = math.fmod(w-u+4*math.pi, 2*math.pi)
+  vw = math.fmod(w-v+4*math.pi, 2*math.pi)
+  # check arc direction
+  ccw_ncw = 1
+  if(uw>uv):
+    #print("dbg874: arc of circle direction: counter clock wise (CCW)")
+    ccw_ncw = 1
+  else:
+    #print("dbg875: arc of circle direction: clock wise (CW)")
+    ccw_ncw = 0
+    uv = uv - 2*math.pi
+    vw = vw - 2*math.pi
+    uw = uw - 2*math.pi
+  r_a3ptrca = (lia, ptix, ptiy, u, v, w, uv, vw, uw)
+  return(r_a3ptrca)
+
 # aka circle_circle_intersection
 def triangulation(ai_A, ai_AC, ai_B, ai_BC, ai_D, ai_D_direction, ai_error_msg_id):
   """ knowing the coordiantes of A and B and the lengths AC and BC, returns the coordinates of C
@@ -183,8 +304,7 @@ def triangulation(ai_A, ai_AC, ai_B, ai_BC, ai_D, ai_D_direction, ai_error_msg_i
   # calculation of the length c=AB
   c = math.sqrt((BX-AX)**2+(BY-AY)**2)
   if(c<radian_epsilon):
-    print("ERR662: Error in {:s}, the length c (=AB={:0.2f}) is too small!".format(ai_error_msg_id, c))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR662: Error in {:s}, the length c (=AB={:0.2f}) is too small!".format(ai_error_msg_id, c))
   # calculation of the angle A with the law of cosines
   #BAC = math.acos((b**2+c**2-a**2)/(2*b*c))
   cos_BAC = (b**2+c**2-a**2)/(2*b*c)
@@ -227,7 +347,6 @@ def triangulation(ai_A, ai_AC, ai_B, ai_BC, ai_D, ai_D_direction, ai_error_msg_i
   CX2 = BX+a*math.cos(xBC)
   CY2 = BY+a*math.sin(xBC)
   if((abs(CX2-CX)>radian_epsilon)or(abs(CY2-CY)>radian_epsilon)):
-    print("ERR686: Error in {:s}, the coordinate of C seems wrong! CX={:0.2f} CX2={:0.2f} CY={:0.2f} CY2={:0.2f}".format(ai_error_msg_id, CX, CX2, CY, CY2))
     print("dbg545: D {:0.2f} {:0.2f}  ai_D_direction {:0.2f}".format(DX,DY, ai_D_direction))
     print("dbg512: BAC", BAC)
     print("dbg513: xAB", xAB)
@@ -241,7 +360,7 @@ def triangulation(ai_A, ai_AC, ai_B, ai_BC, ai_D, ai_D_direction, ai_error_msg_i
     print("dbg525: ABD", ABD)
     print("dbg526: xBC", xBC)
     print("dbg527: BX {:0.2f}  BY {:0.2f}  a {:0.2f}".format(BX,BY, a))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR686: Error in {:s}, the coordinate of C seems wrong! CX={:0.2f} CX2={:0.2f} CY={:0.2f} CY2={:0.2f}".format(ai_error_msg_id, CX, CX2, CY, CY2))
   r_C = (CX,CY,r_status)
   return(r_C)
 
@@ -258,8 +377,7 @@ def line_equation(ai_A, ai_B, ai_error_msg_id):
   # calculation of the length AB
   lAB = math.sqrt((BX-AX)**2+(BY-AY)**2)
   if(lAB<radian_epsilon):
-    print("ERR261: Error, lAB {:0.3f} is too small".format(lAB))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR261: Error, lAB {:0.3f} is too small".format(lAB))
   # calculation of the inclination of AB
   xAB = math.atan2(BY-AY, BX-AX)
   cos_xAB = (BX-AX)/lAB
@@ -489,7 +607,6 @@ def sub_smooth_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle, a
       (SX,SY, line_circle_intersection_status) = line_circle_intersection((AClx, ACly, ACkQ), (JX,JY),JS, (tmpCX,tmpCY), D_direction, ai_error_msg_id)
     # end of the retry. Continue the normal calculation recipe
     if(line_circle_intersection_status==2):
-      print("WARN684: Warning in {:s}, corner is not smoothed because of a line_circle_intersection error!".format(ai_error_msg_id))
       print("dbg681: ai_pre_point", ai_pre_point)
       print("dbg683: ai_current_point", ai_current_point)
       print("dbg684: ai_post_middle", ai_post_middle)
@@ -504,7 +621,7 @@ def sub_smooth_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle, a
       print("dbg693: in {:s}, xAC={:0.2f} R2={:0.2f} ai_router_bit_request={:0.2f}".format(ai_error_msg_id, xAC, R2, ai_router_bit_request))
       #r_outline = [(ai_current_point[0], ai_current_point[1])]
       smooth_status = 2
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR684: Error in {:s}, corner is not smoothed because of a line_circle_intersection error!".format(ai_error_msg_id))
     else:
       # calculation of U, the projection of S on AC
       (UX, UY) = line_point_projection((AClx, ACly, ACkA), (SX,SY), ai_error_msg_id)
@@ -632,14 +749,12 @@ def sub_enlarge_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle,
   MKX=0; MKY=0; GX=0; GY=0; HX=0; HY=0; NLX=0; NLY=0; enlarge_type_request_1=0; enlarge_type_request_2=0
   (SX, SY, UX, UY, xSU, xSJ, router_bit_arc_uw, smooth_status) = sub_smooth_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle, ai_post_point, ai_router_bit_request, ai_error_msg_id)
   if(smooth_status!=1):
-    print("ERR977: Error in {:s}, the sub smooth corner get an error!".format(ai_error_msg_id))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR977: Error in {:s}, the sub smooth corner get an error!".format(ai_error_msg_id))
     enlarge_status = 2
   else:
     #print("dbg553: router_bit_arc_uw:", router_bit_arc_uw)
     if(abs(router_bit_arc_uw)>math.pi):
-      print("ERR877: Error in {:s}, the sub smooth corner is englobed!".format(ai_error_msg_id))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR877: Error in {:s}, the sub smooth corner is englobed!".format(ai_error_msg_id))
       enlarge_status = 2
     elif(abs(router_bit_arc_uw)<radian_epsilon):
       print("WARN878: Warning in {:s}, the corner is too flat to be enlarged with this router_bit radius!")
@@ -652,8 +767,7 @@ def sub_enlarge_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle,
       (SClx, SCly, SCkS, lSC, xSC) = line_equation((SX,SY), (CX,CY), ai_error_msg_id)
       (FX,FY, line_circle_intersection_status) = line_circle_intersection((SClx, SCly, SCkS), (CX,CY),ai_router_bit_request, (SX,SY), xSC+math.pi, ai_error_msg_id)
       if(line_circle_intersection_status==2):
-        print("ERR739: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR739: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
       (GX,GY, SCkG) = line_distance_point((FX,FY), (CX,CY), -1*corner_orientation*ai_router_bit_request, ai_error_msg_id)
       (HX,HY, SCkH) = line_distance_point((FX,FY), (CX,CY),  1*corner_orientation*ai_router_bit_request, ai_error_msg_id)
       #(IX,IY, R1, uw1, u1, w1) = arc_center_radius_angles(ai_pre_point, ai_pre_middle, ai_current_point, ai_error_msg_id)
@@ -665,15 +779,13 @@ def sub_enlarge_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle,
 
       #print("dbg321: MX={:0.2f}  MY={:0.2f}  line_circle_intersection={:0.2f}".format(MX, MY, line_circle_intersection_status))
       if(line_line_intersection_status==2):
-        print("ERR736: Error in {:s} with the line_line_intersection_status!".format(ai_error_msg_id))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR736: Error in {:s} with the line_line_intersection_status!".format(ai_error_msg_id))
         enlarge_status = 2
       (NX,NY, line_circle_intersection_status) = line_circle_intersection((SClx, SCly, SCkH), (JX,JY),R2, ((HX+SX)/2,(HY+SY)/2), xSC+math.pi, ai_error_msg_id)
       #print("dbg322: NX={:0.2f}  NY={:0.2f}  line_circle_intersection={:0.2f}".format(NX, NY, line_circle_intersection_status))
       if(line_circle_intersection_status==2):
-        print("ERR733: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
         #print("dbg513: G={:0.2f} {:0.2f}  H={:0.2f} {:0.2f}".format(GX, GY, HX, HY))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR733: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
         enlarge_status = 2
       # check if arc-arc intersection must be calculated
       tmp_MG_deep_x = (MX-GX)*(CX-FX)
@@ -704,16 +816,14 @@ def sub_enlarge_corner_line_arc(ai_pre_point, ai_current_point, ai_post_middle,
         (KX,KY, line_circle_intersection_status) = line_circle_intersection((AClx, ACly, ACkC), (FX,FY),ai_router_bit_request, (GX, GY), xSC+math.pi, ai_error_msg_id)
 
         if(line_circle_intersection==2):
-          print("ERR536: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
-          sys.exit(2)
+          raise cnc25d_error.GeometryError("ERR536: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
         MKX = KX
         MKY = KY
         enlarge_type_request_1 = 2
       if(NH_deep>0):
         (LX,LY, triangulation_status) = triangulation((JX,JY),R2, (FX,FY),ai_router_bit_request, (HX,HY), xSC+math.pi, ai_error_msg_id)
         if(triangulation_status==2):
-          print("ERR533: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
-          sys.exit(2)
+          raise cnc25d_error.GeometryError("ERR533: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
         NLX = LX
         NLY = LY
         enlarge_type_request_2 = 2
@@ -748,13 +858,11 @@ def sub_enlarge_corner_arc_arc(ai_pre_point, ai_pre_middle, ai_current_point, ai
   (SX, SY, xSI, xSJ, router_bit_arc_uw, smooth_status) = sub_smooth_corner_arc_arc(ai_pre_point, ai_pre_middle, ai_current_point, ai_post_middle, ai_post_point, ai_router_bit_request, ai_error_msg_id)
   enlarge_status = 0
   if(smooth_status==2):
-    print("ERR927: Error in {:s}, the sub smooth corner gets an error!".format(ai_error_msg_id))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR927: Error in {:s}, the sub smooth corner gets an error!".format(ai_error_msg_id))
   else:
     #print("dbg553: router_bit_arc_uw:", router_bit_arc_uw)
     if(abs(router_bit_arc_uw)>math.pi):
-      print("ERR887: Error in {:s}, the sub smooth corner is englobed!".format(ai_error_msg_id))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR887: Error in {:s}, the sub smooth corner is englobed!".format(ai_error_msg_id))
       enlarge_status = 2
     elif(abs(router_bit_arc_uw)<radian_epsilon):
       print("WARN877: Error in {:s}, the corner is too flat to be enlarged with this router_bit radius!".format(ai_error_msg_id))
@@ -767,8 +875,7 @@ def sub_enlarge_corner_arc_arc(ai_pre_point, ai_pre_middle, ai_current_point, ai
       (SClx, SCly, SCkS, lSC, xSC) = line_equation((SX,SY), (CX,CY), ai_error_msg_id)
       (FX,FY, line_circle_intersection_status) = line_circle_intersection((SClx, SCly, SCkS), (CX,CY),ai_router_bit_request, (SX,SY), xSC+math.pi, ai_error_msg_id)
       if(line_circle_intersection_status==2):
-        print("ERR639: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR639: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
       (GX,GY, SCkG) = line_distance_point((FX,FY), (CX,CY), -1*corner_orientation*ai_router_bit_request, ai_error_msg_id)
       (HX,HY, SCkH) = line_distance_point((FX,FY), (CX,CY),  1*corner_orientation*ai_router_bit_request, ai_error_msg_id)
       (IX,IY, R1, uw1, u1, w1) = arc_center_radius_angles(ai_pre_point, ai_pre_middle, ai_current_point, ai_error_msg_id)
@@ -776,8 +883,7 @@ def sub_enlarge_corner_arc_arc(ai_pre_point, ai_pre_middle, ai_current_point, ai
       (MX,MY, line_circle_intersection_status) = line_circle_intersection((SClx, SCly, SCkG), (IX,IY),R1, ((GX+SX)/2,(GY+SY)/2), xSC+math.pi, ai_error_msg_id)
       #print("dbg321: MX={:0.2f}  MY={:0.2f}  line_circle_intersection={:0.2f}".format(MX, MY, line_circle_intersection_status))
       if(line_circle_intersection_status==2):
-        print("ERR636: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
-        sys.exit(2)
+        raise cnc25d_error.GeometryError("ERR636: Error in {:s} with the line_circle_intersection_status!".format(ai_error_msg_id))
       (NX,NY, line_circle_intersection_status) = line_circle_intersection((SClx, SCly, SCkH), (JX,JY),R2, ((HX+SX)/2,(HY+SY)/2), xSC+math.pi, ai_error_msg_id)
       #print("dbg322: NX={:0.2f}  NY={:0.2f}  line_circle_intersection={:0.2f}".format(NX, NY, line_circle_intersection_status))
       if(line_circle_intersection_status==2):
@@ -812,16 +918,14 @@ def sub_enlarge_corner_arc_arc(ai_pre_point, ai_pre_middle, ai_current_point, ai
       if(MG_deep>0):
         (KX,KY, triangulation_status) = triangulation((IX,IY),R1,(FX,FY),ai_router_bit_request,(GX,GY), xSC+math.pi, ai_error_msg_id)
         if(triangulation_status==2):
-          print("ERR536: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
-          sys.exit(2)
+          raise cnc25d_error.GeometryError("ERR536: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
         MKX = KX
         MKY = KY
         enlarge_type_request_1 = 2
       if(NH_deep>0):
         (LX,LY, triangulation_status) = triangulation((JX,JY),R2,(FX,FY),ai_router_bit_request,(HX,HY), xSC+math.pi, ai_error_msg_id)
         if(triangulation_status==2):
-          print("ERR533: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
-          sys.exit(2)
+          raise cnc25d_error.GeometryError("ERR533: Error in {:s} with the triangulation_status!".format(ai_error_msg_id))
         NLX = LX
         NLY = LY
         enlarge_type_request_2 = 2
@@ -858,8 +962,7 @@ def curve_arc(ai_AX, ai_AY, ai_CX, ai_CY, ai_At, ai_router_bit_request, ai_error
   # O intersection of (OI) and (OA). It's the center of the arc
   (OX, OY, line_line_intersection_status) = line_line_intersection((OIlx, OIly, OIk),(OAlx, OAly, OAk), ai_error_msg_id)
   if(line_line_intersection_status==2):
-    print("ERR374: Error in {:s}, the tangent and AC are collinear!".format(ai_error_msg_id))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR374: Error in {:s}, the tangent and AC are collinear!".format(ai_error_msg_id))
   # verification of the distance OA and OC
   lOA = math.sqrt((ai_AX-OX)**2+(ai_AY-OY)**2)
   lOC = math.sqrt((ai_CX-OX)**2+(ai_CY-OY)**2)
@@ -868,8 +971,7 @@ def curve_arc(ai_AX, ai_AY, ai_CX, ai_CY, ai_At, ai_router_bit_request, ai_error
   #print("dbg356: IX={:0.2f}  IY={:0.2f}".format(IX, IY))
   #print("dbg357: OX={:0.2f}  OY={:0.2f}".format(OX, OY))
   if(abs(lOC-lOA)>radian_epsilon):
-    print("ERR375: Error in {:s}, O is not equidistant from A and C! lOA={:0.2f} l_OC={:0.2f}".format(ai_error_msg_id, lOA, lOC))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR375: Error in {:s}, O is not equidistant from A and C! lOA={:0.2f} l_OC={:0.2f}".format(ai_error_msg_id, lOA, lOC))
   if(lOA<ai_router_bit_request):
     print("WARN446: Warning in {:s}, the radius_of_curvature is smaller than the router_bit_request! lOA={:0.2f} rbr={:0.2f}".format(ai_error_msg_id, lOA, ai_router_bit_request))
   # calculation of the angle (Ox, OA)
@@ -919,13 +1021,11 @@ def unstable_smooth_outline_b_curve(ai_polyline, ai_initial_tangent, ai_precisio
   point_nb = len(ai_polyline)
   # check the outline point number
   if(point_nb<2):
-    print("ERR209: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR209: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
   # check if the first point is valid
   first_point_len = len(ai_polyline[0])
   if(first_point_len!=2):
-    print("ERR219: Error in {:s}, the first-point of ai_polyline must have exactly 2 elements. Currently: {:d}".format(ai_error_msg_id, first_point_len))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR219: Error in {:s}, the first-point of ai_polyline must have exactly 2 elements. Currently: {:d}".format(ai_error_msg_id, first_point_len))
   # processing initialization
   ti = ai_initial_tangent
   r_outline = []
@@ -937,8 +1037,7 @@ def unstable_smooth_outline_b_curve(ai_polyline, ai_initial_tangent, ai_precisio
     # check the validity of the new segment
     segment_len = len(ai_polyline[i+1])
     if(segment_len!=2):
-      print("ERR229: Error in {:s}, the ai_polyline segment length must be exactly 2. Currently: {:d}".format(i_error_msg_id, segment_len))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR229: Error in {:s}, the ai_polyline segment length must be exactly 2. Currently: {:d}".format(i_error_msg_id, segment_len))
     # geometrical data
     AX = ai_polyline[i][0]
     AY = ai_polyline[i][1]
@@ -949,8 +1048,7 @@ def unstable_smooth_outline_b_curve(ai_polyline, ai_initial_tangent, ai_precisio
     iAC = math.atan2((CY-AY)/lAC, (CX-AX)/lAC)
     rti = math.fmod(ti-iAC+5*math.pi, 2*math.pi)-math.pi # angle (AC, tangent) between [-pi,pi]
     if(abs(rti)>math.pi-radian_epsilon):
-      print("ERR239: Error in {:s}, AC and the tangent Ti are collinear and in opposite direction. iAC={:0.2f}  ti={:0.2f}".format(i_error_msg_id, iAC, ti))
-      sys.exit(2)
+      raise cnc25d_error.GeometryError("ERR239: Error in {:s}, AC and the tangent Ti are collinear and in opposite direction. iAC={:0.2f}  ti={:0.2f}".format(i_error_msg_id, iAC, ti))
     if(abs(rti)>math.pi/3):
       print("WARN249: Warning in {:s}, AC and the tangent Ti are doing a large angle. Add itermediate points to remove this warning. iAC={:0.2f}  ti={:0.2f}".format(i_error_msg_id, iAC, ti))
     if(abs(rti)<radian_epsilon):
@@ -965,6 +1063,74 @@ def unstable_smooth_outline_b_curve(ai_polyline, ai_initial_tangent, ai_precisio
   # return
   return(r_outline)
 
+def smooth_c_curve_segment(ai_polyline, i, ai_precision, ai_router_bit_request, ai_error_msg_id):
+  """ sub-function of sub_smooth_outline_c_curve(): compute the segment i of the format-C polyline ai_polyline
+      It returns a line-segment or two arc-segments
+  """
+  # define the angle precision to know when to use a line instead of an arc
+  radian_epsilon = ai_precision
+  # error message
+  i_error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, i)
+  r_segments = []
+  # check the validity of the new segment
+  segment_len = len(ai_polyline[i+1])
+  if(segment_len!=3):
+    raise cnc25d_error.GeometryError("ERR629: Error in {:s}, the ai_polyline segment length must be exactly 3. Currently: {:d}".format(i_error_msg_id, segment_len))
+  # geometrical data
+  AX = ai_polyline[i][0]
+  AY = ai_polyline[i][1]
+  xAt = ai_polyline[i][2]
+  EX = ai_polyline[i+1][0]
+  EY = ai_polyline[i+1][1]
+  xEt = ai_polyline[i+1][2]
+  # calculation of the inclination of AE
+  lAE = math.sqrt((EX-AX)**2+(EY-AY)**2)
+  xAE = math.atan2((EY-AY)/lAE, (EX-AX)/lAE)
+  # calculation of the inclination of AC
+  AtAE = math.fmod(xAt-xAE+5*math.pi, 2*math.pi)-math.pi # angle (AE, tangent) between [-pi,pi]
+  xAC = math.fmod(xAE + AtAE/2 + 5*math.pi, 2*math.pi) - math.pi
+  AClx = math.sin(xAC)
+  ACly = -1*math.cos(xAC)
+  ACk = -1*(AClx*AX+ACly*AY)
+  # calculation of the inclination of EC
+  EtEA = math.fmod(xEt-xAE+5*math.pi, 2*math.pi)-math.pi # angle (AE, tangent) between [-pi,pi]
+  xEC = math.fmod(xAE+math.pi + EtEA/2 + 5*math.pi, 2*math.pi) - math.pi
+  EClx = math.sin(xEC)
+  ECly = -1*math.cos(xEC)
+  ECk = -1*(EClx*EX+ECly*EY)
+  # check if the segment must be an arc or a line
+  if(abs(AtAE)>math.pi/2):
+    raise cnc25d_error.GeometryError("ERR639: Error in {:s}, the angle between AC and the tangent xAt is larger than pi/2. It doesn't look like a feasible curbe. xAC={:0.2f}  xAt={:0.2f}".format(i_error_msg_id, xAC, xAt))
+  if(abs(EtEA)>math.pi/2):
+    raise cnc25d_error.GeometryError("ERR638: Error in {:s}, the angle between EC and the tangent et is larger than pi/2. It doesn't look like a feasible curbe. xEC={:0.2f}  xEt={:0.2f}".format(i_error_msg_id, xEC, xEt))
+  if(abs(AtAE)>math.pi/3):
+    print("WARN649: Warning in {:s}, AC and the tangent xAt are doing a large angle. Add itermediate points to remove this warning. xAC={:0.2f}  xAt={:0.2f}".format(i_error_msg_id, xAC, xAt))
+  if(abs(EtEA)>math.pi/3):
+    print("WARN648: Warning in {:s}, EC and the tangent xEt are doing a large angle. Add itermediate points to remove this warning. xEC={:0.2f}  xEt={:0.2f}".format(i_error_msg_id, xEC, xEt))
+  if((abs(AtAE)<radian_epsilon)or(abs(EtEA)<radian_epsilon)):
+    print("WARN659: Warning in {:s}, (xAC, xAt) or (xEC, xEt) are almost identical. A line is generated for this segment. xAC={:0.2f}  xAt={:0.2f} xEC={:0.2f}  xEt={:0.2f} ".format(i_error_msg_id, xAC, xAt, xEC, xEt))
+    r_segments.append((EX, EY)) # create a line-segment
+  elif((AtAE*EtEA)>0):
+    print("WARN669: Warning in {:s}, xAt and xEt are not one the side of (AE). It look like an inflexion. A line is generated for this segment. xAC={:0.2f}  xAt={:0.2f} xEC={:0.2f} xEt={:0.2f} ".format(i_error_msg_id, xAC, xAt, xEC, xEt))
+    r_segments.append((EX, EY)) # create a line-segment
+  else:
+    # C intersection of (AC) and (EC). it is the junction point between the two arcs
+    (CX, CY, line_line_intersection_status) = line_line_intersection((AClx, ACly, ACk),(EClx, ECly, ECk), ai_error_msg_id)
+    if(line_line_intersection_status==2):
+      raise cnc25d_error.GeometryError("ERR324: Error in {:s}, AC and EC are collinear!".format(ai_error_msg_id))
+    (BX, BY, xCt) = curve_arc(AX, AY, CX, CY, xAt, ai_router_bit_request, i_error_msg_id)
+    if(abs(math.fmod(xCt-xAE+5*math.pi, 2*math.pi)-math.pi)>radian_epsilon):
+      raise cnc25d_error.GeometryError("ERR325: Error in {:s}, the first arc tangent in C is not parallel to AE! xCt={:0.2f} xAE={:0.2f}".format(ai_error_msg_id, xCt, xAE))
+    (DX, DY, xEt2) = curve_arc(CX, CY, EX, EY, xAE, ai_router_bit_request, i_error_msg_id)
+    if(abs(math.fmod(xEt2-xEt+5*math.pi, 2*math.pi)-math.pi)>radian_epsilon):
+      raise cnc25d_error.GeometryError("ERR326: Error in {:s}, the second arc tangent in E is different from xEt! xEt={:0.2f} xEt2={:0.2f}".format(ai_error_msg_id, xEt, xEt2))
+    r_segments.append((BX, BY, CX, CY)) # create the first arc-segment
+    r_segments.append((DX, DY, EX, EY)) # create the second arc-segment
+    #print("dbg048: BX {:0.3f}  BY {:0.3f}  CX {:0.3f}  CY {:0.3f}  DX {:0.3f}  DY {:0.3f}  EX {:0.3f}  EY {:0.3f}".format(BX, BY, CX, CY, DX, DY, EX, EY))
+    #print("fbg049: r_outline:", r_outline)
+  # return
+  return(r_segments)
+
 def sub_smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id):
   """
   This function computes a serie of 2N arcs that pass through the (N+1) points defined by the N line-segments of ai_polyline.
@@ -987,83 +1153,485 @@ def sub_smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request,
   point_nb = len(ai_polyline)
   # check the outline point number
   if(point_nb<2):
-    print("ERR609: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR609: Error in {:s}, the number of points must be bigger than 2. Currently: {:d}".format(ai_error_msg_id, point_nb))
   # check if the first point is valid
   first_point_len = len(ai_polyline[0])
   if(first_point_len!=3):
-    print("ERR619: Error in {:s}, the first-point of ai_polyline must have exactly 3 elements. Currently: {:d}".format(ai_error_msg_id, first_point_len))
-    sys.exit(2)
+    raise cnc25d_error.GeometryError("ERR619: Error in {:s}, the first-point of ai_polyline must have exactly 3 elements. Currently: {:d}".format(ai_error_msg_id, first_point_len))
   # processing initialization
   r_outline = []
   r_outline.append((ai_polyline[0][0], ai_polyline[0][1])) # first-point
   # processing incrementation
   for i in range(point_nb-1):
-    # error message
-    i_error_msg_id = "{:s}.{:d}".format(ai_error_msg_id, i)
-    # check the validity of the new segment
-    segment_len = len(ai_polyline[i+1])
-    if(segment_len!=3):
-      print("ERR629: Error in {:s}, the ai_polyline segment length must be exactly 3. Currently: {:d}".format(i_error_msg_id, segment_len))
-      sys.exit(2)
-    # geometrical data
-    AX = ai_polyline[i][0]
-    AY = ai_polyline[i][1]
-    xAt = ai_polyline[i][2]
-    EX = ai_polyline[i+1][0]
-    EY = ai_polyline[i+1][1]
-    xEt = ai_polyline[i+1][2]
-    # calculation of the inclination of AE
-    lAE = math.sqrt((EX-AX)**2+(EY-AY)**2)
-    xAE = math.atan2((EY-AY)/lAE, (EX-AX)/lAE)
-    # calculation of the inclination of AC
-    AtAE = math.fmod(xAt-xAE+5*math.pi, 2*math.pi)-math.pi # angle (AE, tangent) between [-pi,pi]
-    xAC = math.fmod(xAE + AtAE/2 + 5*math.pi, 2*math.pi) - math.pi
-    AClx = math.sin(xAC)
-    ACly = -1*math.cos(xAC)
+    r_outline.extend(smooth_c_curve_segment(ai_polyline, i, ai_precision, ai_router_bit_request, ai_error_msg_id))
+  # return
+  return(r_outline)
+
+
+################################################################
+# numpy version of the curve smoothing
+################################################################
+
+# below this number of segments, the scalar functions are faster than the numpy functions
+curve_vectorized_min = 20
+
+def curve_arc_vectorized(ai_AX, ai_AY, ai_CX, ai_CY, ai_At):
+  """ curve_arc() computed with numpy on arrays of start-points, end-points and tangents
+      It returns the arrays (BX, BY, Ct, lOA, AOC, valid). valid is False where curve_arc() raises an error.
+      The warnings are not printed: lOA and AOC let the caller detect them
+  """
+  # use to check if the calculation is possible
+  radian_epsilon = math.pi/1000
+  # line equation of (AC) as line_equation()
+  lAC = numpy.sqrt(numpy.power(ai_CX-ai_AX, 2)+numpy.power(ai_CY-ai_AY, 2))
+  xAC = numpy.arctan2(ai_CY-ai_AY, ai_CX-ai_AX)
+  AClx = (ai_CY-ai_AY)/lAC
+  ACly = -((ai_CX-ai_AX)/lAC)
+  # calcultion of I the middle of [AC]
+  IX = (ai_AX+ai_CX)/2
+  IY = (ai_AY+ai_CY)/2
+  # line equation of the bisection (OI) of [AC]
+  OIlx = ACly
+  OIly = -1*AClx
+  OIk = -1*(OIlx*IX+OIly*IY)
+  # line equation of (OA)
+  OAlx = numpy.cos(ai_At)
+  OAly = numpy.sin(ai_At)
+  OAk = -1*(OAlx*ai_AX+OAly*ai_AY)
+  # O intersection of (OI) and (OA) as line_line_intersection()
+  determinant = OIlx*OAly-OAlx*OIly
+  OX = (OAk*OIly-OIk*OAly)/determinant
+  OY = (OIk*OAlx-OAk*OIlx)/determinant
+  # verification of the distance OA and OC
+  lOA = numpy.sqrt(numpy.power(ai_AX-OX, 2)+numpy.power(ai_AY-OY, 2))
+  lOC = numpy.sqrt(numpy.power(ai_CX-OX, 2)+numpy.power(ai_CY-OY, 2))
+  # calculation of the angles (Ox, OA), (Ox, OC), (At,AC) and AOC
+  xOA = numpy.arctan2((ai_AY-OY)/lOA, (ai_AX-OX)/lOA)
+  xOC = numpy.arctan2((ai_CY-OY)/lOC, (ai_CX-OX)/lOC)
+  AtAC = numpy.fmod(xAC-ai_At+5*math.pi, 2*math.pi) - math.pi
+  AOC = numpy.where(AtAC>0, numpy.fmod(xOC-xOA+4*math.pi, 2*math.pi), -1*numpy.fmod(xOA-xOC+4*math.pi, 2*math.pi))
+  # calculation of B and of the tangent inclination Ct in C
+  xOB = xOA + AOC/2
+  BX = OX+lOA*numpy.cos(xOB)
+  BY = OY+lOA*numpy.sin(xOB)
+  Ct = xOC + numpy.copysign(math.pi/2, AtAC)
+  valid = (lAC>=radian_epsilon)&(numpy.abs(determinant)>=radian_epsilon)&(numpy.abs(lOC-lOA)<=radian_epsilon)
+  r_curve_arc = (BX, BY, Ct, lOA, AOC, valid)
+  return(r_curve_arc)
+
+def sub_smooth_outline_c_curve_vectorized(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id):
+  """ same as sub_smooth_outline_c_curve() but the arcs of all the segments are computed at once with numpy.
+      The segments that print a warning or raise an error are computed again by smooth_c_curve_segment()
+      so the messages and the errors are the ones of sub_smooth_outline_c_curve()
+  """
+  point_nb = len(ai_polyline)
+  if((numpy is None)or(point_nb-1<curve_vectorized_min)or(not all([ len(p)==3 for p in ai_polyline ]))):
+    r_outline = sub_smooth_outline_c_curve(ai_polyline, ai_precision, ai_router_bit_request, ai_error_msg_id)
+    return(r_outline)
+  radian_epsilon = ai_precision
+  arc_epsilon = math.pi/1000 # radian_epsilon of curve_arc()
+  with numpy.errstate(all='ignore'):
+    points = numpy.array(ai_polyline, dtype=float)
+    AX = points[:-1,0]
+    AY = points[:-1,1]
+    xAt = points[:-1,2]
+    EX = points[1:,0]
+    EY = points[1:,1]
+    xEt = points[1:,2]
+    # inclination of AE, AC and EC
+    lAE = numpy.sqrt(numpy.power(EX-AX, 2)+numpy.power(EY-AY, 2))
+    xAE = numpy.arctan2((EY-AY)/lAE, (EX-AX)/lAE)
+    AtAE = numpy.fmod(xAt-xAE+5*math.pi, 2*math.pi)-math.pi
+    xAC = numpy.fmod(xAE + AtAE/2 + 5*math.pi, 2*math.pi) - math.pi
+    AClx = numpy.sin(xAC)
+    ACly = -1*numpy.cos(xAC)
     ACk = -1*(AClx*AX+ACly*AY)
-    # calculation of the inclination of EC
-    EtEA = math.fmod(xEt-xAE+5*math.pi, 2*math.pi)-math.pi # angle (AE, tangent) between [-pi,pi]
-    xEC = math.fmod(xAE+math.pi + EtEA/2 + 5*math.pi, 2*math.pi) - math.pi
-    EClx = math.sin(xEC)
-    ECly = -1*math.cos(xEC)
+    EtEA = numpy.fmod(xEt-xAE+5*math.pi, 2*math.pi)-math.pi
+    xEC = numpy.fmod(xAE+math.pi + EtEA/2 + 5*math.pi, 2*math.pi) - math.pi
+    EClx = numpy.sin(xEC)
+    ECly = -1*numpy.cos(xEC)
     ECk = -1*(EClx*EX+ECly*EY)
-    # check if the segment must be an arc or a line
-    if(abs(AtAE)>math.pi/2):
-      print("ERR639: Error in {:s}, the angle between AC and the tangent xAt is larger than pi/2. It doesn't look like a feasible curbe. xAC={:0.2f}  xAt={:0.2f}".format(i_error_msg_id, xAC, xAt))
-      sys.exit(2)
-    if(abs(EtEA)>math.pi/2):
-      print("ERR638: Error in {:s}, the angle between EC and the tangent et is larger than pi/2. It doesn't look like a feasible curbe. xEC={:0.2f}  xEt={:0.2f}".format(i_error_msg_id, xEC, xEt))
-      sys.exit(2)
-    if(abs(AtAE)>math.pi/3):
-      print("WARN649: Warning in {:s}, AC and the tangent xAt are doing a large angle. Add itermediate points to remove this warning. xAC={:0.2f}  xAt={:0.2f}".format(i_error_msg_id, xAC, xAt))
-    if(abs(EtEA)>math.pi/3):
-      print("WARN648: Warning in {:s}, EC and the tangent xEt are doing a large angle. Add itermediate points to remove this warning. xEC={:0.2f}  xEt={:0.2f}".format(i_error_msg_id, xEC, xEt))
-    if((abs(AtAE)<radian_epsilon)or(abs(EtEA)<radian_epsilon)):
-      print("WARN659: Warning in {:s}, (xAC, xAt) or (xEC, xEt) are almost identical. A line is generated for this segment. xAC={:0.2f}  xAt={:0.2f} xEC={:0.2f}  xEt={:0.2f} ".format(i_error_msg_id, xAC, xAt, xEC, xEt))
-      r_outline.append((EX, EY)) # create a line-segment
-    elif((AtAE*EtEA)>0):
-      print("WARN669: Warning in {:s}, xAt and xEt are not one the side of (AE). It look like an inflexion. A line is generated for this segment. xAC={:0.2f}  xAt={:0.2f} xEC={:0.2f} xEt={:0.2f} ".format(i_error_msg_id, xAC, xAt, xEC, xEt))
-      r_outline.append((EX, EY)) # create a line-segment
+    # C intersection of (AC) and (EC) as line_line_intersection()
+    determinant = AClx*ECly-EClx*ACly
+    CX = (ECk*ACly-ACk*ECly)/determinant
+    CY = (ACk*EClx-ECk*AClx)/determinant
+    # the two arcs
+    (BX, BY, xCt, lOA1, AOC1, valid1) = curve_arc_vectorized(AX, AY, CX, CY, xAt)
+    (DX, DY, xEt2, lOA2, AOC2, valid2) = curve_arc_vectorized(CX, CY, EX, EY, xAE)
+    # the segments computed without warning or error
+    clean = (numpy.abs(AtAE)<=math.pi/3)&(numpy.abs(EtEA)<=math.pi/3)
+    clean &= (numpy.abs(AtAE)>=radian_epsilon)&(numpy.abs(EtEA)>=radian_epsilon)&((AtAE*EtEA)<=0) # no line-segment
+    clean &= (numpy.abs(determinant)>=arc_epsilon)&valid1&valid2
+    clean &= (numpy.abs(numpy.fmod(xCt-xAE+5*math.pi, 2*math.pi)-math.pi)<=radian_epsilon)
+    clean &= (numpy.abs(numpy.fmod(xEt2-xEt+5*math.pi, 2*math.pi)-math.pi)<=radian_epsilon)
+    clean &= (lOA1>=ai_router_bit_request)&(lOA2>=ai_router_bit_request)&(numpy.abs(AOC1)>=arc_epsilon)&(numpy.abs(AOC2)>=arc_epsilon)
+    clean &= numpy.isfinite(BX)&numpy.isfinite(BY)&numpy.isfinite(CX)&numpy.isfinite(CY)&numpy.isfinite(DX)&numpy.isfinite(DY)
+  clean = clean.tolist()
+  BX = BX.tolist()
+  BY = BY.tolist()
+  CX = CX.tolist()
+  CY = CY.tolist()
+  DX = DX.tolist()
+  DY = DY.tolist()
+  r_outline = []
+  r_outline.append((ai_polyline[0][0], ai_polyline[0][1])) # first-point
+  for i in range(point_nb-1):
+    if(clean[i]):
+      r_outline.append((BX[i], BY[i], CX[i], CY[i])) # create the first arc-segment
+      r_outline.append((DX[i], DY[i], ai_polyline[i+1][0], ai_polyline[i+1][1])) # create the second arc-segment
     else:
-      # C intersection of (AC) and (EC). it is the junction point between the two arcs
-      (CX, CY, line_line_intersection_status) = line_line_intersection((AClx, ACly, ACk),(EClx, ECly, ECk), ai_error_msg_id)
-      if(line_line_intersection_status==2):
-        print("ERR324: Error in {:s}, AC and EC are collinear!".format(ai_error_msg_id))
-        sys.exit(2)
-      (BX, BY, xCt) = curve_arc(AX, AY, CX, CY, xAt, ai_router_bit_request, i_error_msg_id)
-      if(abs(math.fmod(xCt-xAE+5*math.pi, 2*math.pi)-math.pi)>radian_epsilon):
-        print("ERR325: Error in {:s}, the first arc tangent in C is not parallel to AE! xCt={:0.2f} xAE={:0.2f}".format(ai_error_msg_id, xCt, xAE))
-        sys.exit(2)
-      (DX, DY, xEt2) = curve_arc(CX, CY, EX, EY, xAE, ai_router_bit_request, i_error_msg_id)
-      if(abs(math.fmod(xEt2-xEt+5*math.pi, 2*math.pi)-math.pi)>radian_epsilon):
-        print("ERR326: Error in {:s}, the second arc tangent in E is different from xEt! xEt={:0.2f} xEt2={:0.2f}".format(ai_error_msg_id, xEt, xEt2))
-        sys.exit(2)
-      r_outline.append((BX, BY, CX, CY)) # create the first arc-segment
-      r_outline.append((DX, DY, EX, EY)) # create the second arc-segment
-      #print("dbg048: BX {:0.3f}  BY {:0.3f}  CX {:0.3f}  CY {:0.3f}  DX {:0.3f}  DY {:0.3f}  EX {:0.3f}  EY {:0.3f}".format(BX, BY, CX, CY, DX, DY, EX, EY))
-      #print("fbg049: r_outline:", r_outline)
-  # return
+      r_outline.extend(smooth_c_curve_segment(ai_polyline, i, ai_precision, ai_router_bit_request, ai_error_msg_id))
   return(r_outline)
 
 
+################################################################
+# batch versions of the geometry primitives
+################################################################
+
+# The *_batch functions compute a primitive for arrays of inputs at once, with numpy if it is installed, otherwise with a Python loop.
+# Each argument is a float or an array of floats (a point is a tuple of two arrays, a line equation a tuple of three arrays).
+# The floats are repeated to the length of the arrays. The results are numpy arrays (or lists without numpy).
+# Nothing is printed and no exception is raised: a status array reports the elements that failed
+# and batch_status_message() formats their messages only when the caller needs them.
+
+batch_status_ok = 0
+batch_status_warning = 1 # the result is computed but the scalar function would print a warning
+batch_status_no_solution = 2 # same as the status 2 of the scalar functions
+batch_status_degenerate = 3 # the scalar function would raise an error
+
+def batch_columns(ai_columns, ai_use_numpy):
+  """ convert the floats and arrays of ai_columns into arrays of the same length
+      It returns a list of float64 numpy arrays if ai_use_numpy is True, otherwise a list of lists
+  """
+  if(ai_use_numpy):
+    r_columns = numpy.broadcast_arrays(*[ numpy.asarray(c, dtype=numpy.float64) for c in ai_columns ])
+    r_columns = [ numpy.atleast_1d(c) for c in r_columns ]
+  else:
+    column_len = 1
+    for c in ai_columns:
+      if(not isinstance(c, (int, float))):
+        column_len = max(column_len, len(c))
+    r_columns = []
+    for c in ai_columns:
+      if(isinstance(c, (int, float))):
+        r_columns.append([float(c)]*column_len)
+      else:
+        r_columns.append([ float(v) for v in c ])
+  return(r_columns)
+
+def batch_use_numpy(ai_use_numpy):
+  """ numpy is used if it is installed and if the caller doesn't request the Python loop
+  """
+  r_use_numpy = (ai_use_numpy and (numpy is not None))
+  return(r_use_numpy)
+
+def batch_status_message(ai_function_name, ai_status, ai_error_msg_id):
+  """ return the list of the messages of the elements of ai_status that are not batch_status_ok
+  """
+  r_msg = []
+  for i in range(len(ai_status)):
+    if(ai_status[i]==batch_status_warning):
+      r_msg.append("WARN101: Warning in {:s}.{:d}, {:s} uses the direction argument to choose the side of the solution".format(ai_error_msg_id, i, ai_function_name))
+    elif(ai_status[i]==batch_status_no_solution):
+      r_msg.append("ERR171: Error in {:s}.{:d}, {:s} has no solution".format(ai_error_msg_id, i, ai_function_name))
+    elif(ai_status[i]==batch_status_degenerate):
+      r_msg.append("ERR172: Error in {:s}.{:d}, {:s} has degenerated inputs (too short length or parallel lines)".format(ai_error_msg_id, i, ai_function_name))
+  return(r_msg)
+
+def rotate_point_batch(ai_point, ai_ox, ai_oy, ai_rotation_angle, ai_use_numpy=True):
+  """ rotate_point() for the points ai_point=(X, Y)
+      It returns the arrays (X, Y)
+  """
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (PX, PY, ox, oy, angle) = batch_columns((ai_point[0], ai_point[1], ai_ox, ai_oy, ai_rotation_angle), use_numpy)
+  if(use_numpy):
+    ix = PX-ox
+    iy = PY-oy
+    r_X = ox+ix*numpy.cos(angle)-iy*numpy.sin(angle)
+    r_Y = oy+ix*numpy.sin(angle)+iy*numpy.cos(angle)
+  else:
+    r_X = []
+    r_Y = []
+    for i in range(len(PX)):
+      (pt_x, pt_y) = rotate_point((PX[i], PY[i]), ox[i], oy[i], angle[i])
+      r_X.append(pt_x)
+      r_Y.append(pt_y)
+  return((r_X, r_Y))
+
+def line_equation_batch(ai_A, ai_B, ai_use_numpy=True):
+  """ line_equation() for the points ai_A=(AX, AY) and ai_B=(BX, BY)
+      It returns the arrays (ABlx, ABly, ABk, lAB, xAB, status). status is batch_status_degenerate where AB is too short
+  """
+  radian_epsilon = math.pi/1000
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (AX, AY, BX, BY) = batch_columns((ai_A[0], ai_A[1], ai_B[0], ai_B[1]), use_numpy)
+  if(use_numpy):
+    lAB = numpy.sqrt(numpy.power(BX-AX, 2)+numpy.power(BY-AY, 2))
+    degenerate = (lAB<radian_epsilon)
+    safe_lAB = numpy.where(degenerate, 1.0, lAB)
+    xAB = numpy.arctan2(BY-AY, BX-AX)
+    ABlx = (BY-AY)/safe_lAB
+    ABly = -((BX-AX)/safe_lAB)
+    ABk = -(ABlx*AX+ABly*AY)
+    status = numpy.where(degenerate, batch_status_degenerate, batch_status_ok)
+  else:
+    (ABlx, ABly, ABk, lAB, xAB, status) = ([], [], [], [], [], [])
+    for i in range(len(AX)):
+      l = math.sqrt((BX[i]-AX[i])**2+(BY[i]-AY[i])**2)
+      safe_l = l
+      status.append(batch_status_ok)
+      if(l<radian_epsilon):
+        safe_l = 1.0
+        status[-1] = batch_status_degenerate
+      lx = (BY[i]-AY[i])/safe_l
+      ly = -((BX[i]-AX[i])/safe_l)
+      ABlx.append(lx)
+      ABly.append(ly)
+      ABk.append(-(lx*AX[i]+ly*AY[i]))
+      lAB.append(l)
+      xAB.append(math.atan2(BY[i]-AY[i], BX[i]-AX[i]))
+  return((ABlx, ABly, ABk, lAB, xAB, status))
+
+def line_distance_point_batch(ai_A, ai_B, ai_q, ai_use_numpy=True):
+  """ line_distance_point() for the points ai_A=(AX, AY), ai_B=(BX, BY) and the distances ai_q
+      It returns the arrays (QX, QY, ABkQ, status). status is batch_status_degenerate where A and B are identical
+  """
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (AX, AY, BX, BY, q) = batch_columns((ai_A[0], ai_A[1], ai_B[0], ai_B[1], ai_q), use_numpy)
+  if(use_numpy):
+    lAB = numpy.sqrt(numpy.power(BX-AX, 2)+numpy.power(BY-AY, 2))
+    degenerate = (lAB==0)
+    safe_lAB = numpy.where(degenerate, 1.0, lAB)
+    cos_xAB = (BX-AX)/safe_lAB
+    sin_xAB = (BY-AY)/safe_lAB
+    QX = AX-q*sin_xAB
+    QY = AY+q*cos_xAB
+    ABkQ = -(sin_xAB*QX+(-cos_xAB)*QY)
+    status = numpy.where(degenerate, batch_status_degenerate, batch_status_ok)
+  else:
+    (QX, QY, ABkQ, status) = ([], [], [], [])
+    for i in range(len(AX)):
+      if((AX[i]==BX[i])and(AY[i]==BY[i])):
+        (qx, qy, k) = (AX[i], AY[i], 0.0)
+        status.append(batch_status_degenerate)
+      else:
+        (qx, qy, k) = line_distance_point((AX[i], AY[i]), (BX[i], BY[i]), q[i], "")
+        status.append(batch_status_ok)
+      QX.append(qx)
+      QY.append(qy)
+      ABkQ.append(k)
+  return((QX, QY, ABkQ, status))
+
+def line_point_projection_batch(ai_AB, ai_M, ai_use_numpy=True):
+  """ line_point_projection() for the line equations ai_AB=(ABlx, ABly, ABk) and the points ai_M=(MX, MY)
+      It returns the arrays (PX, PY)
+  """
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (a, b, c, MX, MY) = batch_columns((ai_AB[0], ai_AB[1], ai_AB[2], ai_M[0], ai_M[1]), use_numpy)
+  if(use_numpy):
+    d = -(b*MX-a*MY)
+    r_PX = -(c*a+d*b)
+    r_PY = d*a-c*b
+  else:
+    r_PX = []
+    r_PY = []
+    for i in range(len(a)):
+      (px, py) = line_point_projection((a[i], b[i], c[i]), (MX[i], MY[i]), "")
+      r_PX.append(px)
+      r_PY.append(py)
+  return((r_PX, r_PY))
+
+def line_circle_intersection_batch(ai_AB, ai_I, ai_R, ai_C, ai_D_direction, ai_use_numpy=True):
+  """ line_circle_intersection() for the line equations ai_AB=(ABlx, ABly, ABk), the circles of center ai_I=(IX, IY) and radius ai_R,
+      the side points ai_C=(CX, CY) and the directions ai_D_direction
+      It returns the arrays (MX, MY, status). status is batch_status_no_solution where the line doesn't cross the circle,
+      batch_status_degenerate where the line equation is null and batch_status_warning where C is too close to the line and ai_D_direction is used
+  """
+  radian_epsilon = math.pi/1000
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (a, b, c, IX, IY, R, CX, CY, D_direction) = batch_columns((ai_AB[0], ai_AB[1], ai_AB[2], ai_I[0], ai_I[1], ai_R, ai_C[0], ai_C[1], ai_D_direction), use_numpy)
+  if(use_numpy):
+    # P, projection of I on AB and C2, projection of C on AB
+    (PX, PY) = line_point_projection_batch((a, b, c), (IX, IY))
+    (C2X, C2Y) = line_point_projection_batch((a, b, c), (CX, CY))
+    IP2 = numpy.power(PX-IX, 2)+numpy.power(PY-IY, 2)
+    IP = numpy.sqrt(IP2)
+    degenerate = (a==0)&(b==0)
+    no_solution = (IP>R)
+    PM = numpy.sqrt(numpy.where(no_solution, 0.0, numpy.power(R, 2)-IP2))
+    C2P = numpy.sqrt(numpy.power(PX-C2X, 2)+numpy.power(PY-C2Y, 2))
+    close_side = (C2P<radian_epsilon)
+    safe_C2P = numpy.where(C2P==0, 1.0, C2P)
+    cos_i = (C2X-PX)/safe_C2P
+    sin_i = (C2Y-PY)/safe_C2P
+    # side given by D_direction
+    xAB = numpy.arctan2(a, -b)
+    direction_correlation = numpy.fmod(D_direction-xAB+5*math.pi, 2*math.pi)-math.pi
+    direction_AB = numpy.copysign(1, direction_correlation)
+    norm_ab = numpy.sqrt(numpy.power(a, 2)+numpy.power(b, 2))
+    safe_norm_ab = numpy.where(degenerate, 1.0, norm_ab)
+    cos_i = numpy.where(close_side, direction_AB * -b / safe_norm_ab, cos_i)
+    sin_i = numpy.where(close_side, direction_AB * a / safe_norm_ab, sin_i)
+    failed = degenerate|no_solution
+    MX = numpy.where(failed, 0.0, PX+cos_i*PM)
+    MY = numpy.where(failed, 0.0, PY+sin_i*PM)
+    status = numpy.where(degenerate, batch_status_degenerate, numpy.where(no_solution, batch_status_no_solution, numpy.where(close_side, batch_status_warning, batch_status_ok)))
+  else:
+    (MX, MY, status) = ([], [], [])
+    for i in range(len(a)):
+      (PX, PY) = line_point_projection((a[i], b[i], c[i]), (IX[i], IY[i]), "")
+      (C2X, C2Y) = line_point_projection((a[i], b[i], c[i]), (CX[i], CY[i]), "")
+      IP2 = (PX-IX[i])**2+(PY-IY[i])**2
+      IP = math.sqrt(IP2)
+      if((a[i]==0)and(b[i]==0)):
+        MX.append(0.0)
+        MY.append(0.0)
+        status.append(batch_status_degenerate)
+        continue
+      if(IP>R[i]):
+        MX.append(0.0)
+        MY.append(0.0)
+        status.append(batch_status_no_solution)
+        continue
+      PM = math.sqrt(R[i]**2-IP2)
+      C2P = math.sqrt((PX-C2X)**2+(PY-C2Y)**2)
+      status.append(batch_status_ok)
+      if(C2P<radian_epsilon):
+        xAB = math.atan2(a[i], -b[i])
+        direction_correlation = math.fmod(D_direction[i]-xAB+5*math.pi, 2*math.pi)-math.pi
+        direction_AB = math.copysign(1, direction_correlation)
+        norm_ab = math.sqrt(a[i]**2+b[i]**2)
+        cos_i = direction_AB * -b[i] / norm_ab
+        sin_i = direction_AB * a[i] / norm_ab
+        status[-1] = batch_status_warning
+      else:
+        cos_i = (C2X-PX)/C2P
+        sin_i = (C2Y-PY)/C2P
+      MX.append(PX+cos_i*PM)
+      MY.append(PY+sin_i*PM)
+  return((MX, MY, status))
+
+def line_line_intersection_batch(ai_AB, ai_CD, ai_use_numpy=True):
+  """ line_line_intersection() for the line equations ai_AB=(ABlx, ABly, ABk) and ai_CD=(CDlx, CDly, CDk)
+      It returns the arrays (MX, MY, status). status is batch_status_no_solution where the lines are parallel
+  """
+  radian_epsilon = math.pi/1000
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (a1, b1, c1, a2, b2, c2) = batch_columns((ai_AB[0], ai_AB[1], ai_AB[2], ai_CD[0], ai_CD[1], ai_CD[2]), use_numpy)
+  if(use_numpy):
+    determinant = a1*b2-a2*b1
+    parallel = (numpy.abs(determinant)<radian_epsilon)
+    safe_determinant = numpy.where(parallel, 1.0, determinant)
+    MX = numpy.where(parallel, 0.0, (c2*b1-c1*b2)/safe_determinant)
+    MY = numpy.where(parallel, 0.0, (c1*a2-c2*a1)/safe_determinant)
+    status = numpy.where(parallel, batch_status_no_solution, batch_status_ok)
+  else:
+    (MX, MY, status) = ([], [], [])
+    for i in range(len(a1)):
+      determinant = a1[i]*b2[i]-a2[i]*b1[i]
+      if(abs(determinant)<radian_epsilon):
+        MX.append(0.0)
+        MY.append(0.0)
+        status.append(batch_status_no_solution)
+      else:
+        MX.append((c2[i]*b1[i]-c1[i]*b2[i])/determinant)
+        MY.append((c1[i]*a2[i]-c2[i]*a1[i])/determinant)
+        status.append(batch_status_ok)
+  return((MX, MY, status))
+
+def triangulation_side_angle(ai_AX, ai_AY, ai_DX, ai_DY, ai_xAB, ai_D_direction):
+  """ sub-function of triangulation_batch(): return the angle (AB, AD) and True if D_direction was needed to get it
+  """
+  radian_epsilon = math.pi/1000
+  xAD = math.atan2(ai_DY-ai_AY, ai_DX-ai_AX)
+  BAD = math.fmod(xAD - ai_xAB + 5*math.pi, 2*math.pi) - math.pi
+  r_warning = False
+  if(abs(BAD)<radian_epsilon):
+    DX1 = ai_DX+5*radian_epsilon*math.cos(ai_D_direction)
+    DY1 = ai_DY+5*radian_epsilon*math.sin(ai_D_direction)
+    xAD = math.atan2(DY1-ai_AY, DX1-ai_AX)
+    BAD = math.fmod(xAD - ai_xAB + 5*math.pi, 2*math.pi) - math.pi
+    r_warning = True
+  return((BAD, r_warning))
+
+def triangulation_batch(ai_A, ai_AC, ai_B, ai_BC, ai_D, ai_D_direction, ai_use_numpy=True):
+  """ triangulation() for the points ai_A=(AX, AY), ai_B=(BX, BY), ai_D=(DX, DY), the lengths ai_AC and ai_BC and the directions ai_D_direction
+      It returns the arrays (CX, CY, status). status is batch_status_no_solution where the triangle doesn't exist,
+      batch_status_degenerate where a length is too small or where the verification via B fails
+      and batch_status_warning where ai_D_direction is used to choose the side of C
+  """
+  radian_epsilon = math.pi/1000
+  use_numpy = batch_use_numpy(ai_use_numpy)
+  (AX, AY, b, BX, BY, a, DX, DY, D_direction) = batch_columns((ai_A[0], ai_A[1], ai_AC, ai_B[0], ai_B[1], ai_BC, ai_D[0], ai_D[1], ai_D_direction), use_numpy)
+  if(use_numpy):
+    with numpy.errstate(all='ignore'):
+      c = numpy.sqrt(numpy.power(BX-AX, 2)+numpy.power(BY-AY, 2))
+      degenerate = (b<radian_epsilon)|(a<radian_epsilon)|(c<radian_epsilon)
+      cos_BAC = (numpy.power(b, 2)+numpy.power(c, 2)-numpy.power(a, 2))/(2*b*c)
+      no_solution = (~degenerate)&(numpy.abs(cos_BAC)>1)
+      BAC = numpy.arccos(cos_BAC)
+      # side of C with the angle BAD
+      xAB = numpy.arctan2(BY-AY, BX-AX)
+      xAD = numpy.arctan2(DY-AY, DX-AX)
+      BAD = numpy.fmod(xAD - xAB + 5*math.pi, 2*math.pi) - math.pi
+      DX1 = DX+5*radian_epsilon*numpy.cos(D_direction)
+      DY1 = DY+5*radian_epsilon*numpy.sin(D_direction)
+      warning_A = (numpy.abs(BAD)<radian_epsilon)
+      BAD = numpy.where(warning_A, numpy.fmod(numpy.arctan2(DY1-AY, DX1-AX) - xAB + 5*math.pi, 2*math.pi) - math.pi, BAD)
+      xAC = xAB + numpy.copysign(BAC, BAD)
+      CX = AX+b*numpy.cos(xAC)
+      CY = AY+b*numpy.sin(xAC)
+      # verification via B
+      ABC = numpy.arccos((numpy.power(a, 2)+numpy.power(c, 2)-numpy.power(b, 2))/(2*a*c))
+      xBA = numpy.arctan2(AY-BY, AX-BX)
+      xBD = numpy.arctan2(DY-BY, DX-BX)
+      ABD = numpy.fmod(xBD - xBA + 5*math.pi, 2*math.pi) - math.pi
+      warning_B = (numpy.abs(ABD)<radian_epsilon)
+      ABD = numpy.where(warning_B, numpy.fmod(numpy.arctan2(DY1-BY, DX1-BX) - xBA + 5*math.pi, 2*math.pi) - math.pi, ABD)
+      xBC = xBA + numpy.copysign(ABC, ABD)
+      CX2 = BX+a*numpy.cos(xBC)
+      CY2 = BY+a*numpy.sin(xBC)
+      inconsistent = ~((numpy.abs(CX2-CX)<=radian_epsilon)&(numpy.abs(CY2-CY)<=radian_epsilon))
+    failed = degenerate|no_solution
+    CX = numpy.where(failed, 0.0, CX)
+    CY = numpy.where(failed, 0.0, CY)
+    status = numpy.where(degenerate, batch_status_degenerate,
+               numpy.where(no_solution, batch_status_no_solution,
+                 numpy.where(inconsistent, batch_status_degenerate,
+                   numpy.where(warning_A|warning_B, batch_status_warning, batch_status_ok))))
+  else:
+    (CX, CY, status) = ([], [], [])
+    for i in range(len(AX)):
+      c = math.sqrt((BX[i]-AX[i])**2+(BY[i]-AY[i])**2)
+      if((b[i]<radian_epsilon)or(a[i]<radian_epsilon)or(c<radian_epsilon)):
+        (cx, cy, st) = (0.0, 0.0, batch_status_degenerate)
+      else:
+        cos_BAC = (b[i]**2+c**2-a[i]**2)/(2*b[i]*c)
+        if(abs(cos_BAC)>1):
+          (cx, cy, st) = (0.0, 0.0, batch_status_no_solution)
+        else:
+          BAC = math.acos(cos_BAC)
+          xAB = math.atan2(BY[i]-AY[i], BX[i]-AX[i])
+          (BAD, warning_A) = triangulation_side_angle(AX[i], AY[i], DX[i], DY[i], xAB, D_direction[i])
+          xAC = xAB + math.copysign(BAC, BAD)
+          cx = AX[i]+b[i]*math.cos(xAC)
+          cy = AY[i]+b[i]*math.sin(xAC)
+          st = batch_status_warning if(warning_A) else batch_status_ok
+          # verification via B
+          cos_ABC = (a[i]**2+c**2-b[i]**2)/(2*a[i]*c)
+          if(abs(cos_ABC)>1):
+            st = batch_status_degenerate
+          else:
+            ABC = math.acos(cos_ABC)
+            xBA = math.atan2(AY[i]-BY[i], AX[i]-BX[i])
+            (ABD, warning_B) = triangulation_side_angle(BX[i], BY[i], DX[i], DY[i], xBA, D_direction[i])
+            xBC = xBA + math.copysign(ABC, ABD)
+            if((abs(BX[i]+a[i]*math.cos(xBC)-cx)>radian_epsilon)or(abs(BY[i]+a[i]*math.sin(xBC)-cy)>radian_epsilon)):
+              st = batch_status_degenerate
+            elif(warning_B):
+              st = batch_status_warning
+      CX.append(cx)
+      CY.append(cy)
+      status.append(st)
+  return((CX, CY, status))
+
@@ -21,14 +21,18 @@
 
 from setuptools import setup, find_packages
 
+# the version is defined only in cnc25d/cnc25d_version.py
+version_globals = {}
+execfile('cnc25d/cnc25d_version.py', version_globals)
+
 setup(
   name='Cnc25D',
-  version='0.1.11',
+  version=version_globals['cnc25d_version'],
   author='charlyoleg',
   author_email='charlyoleg@fabfolk.com',
   #packages=['cnc25d', 'cnc25d.tests'],
   packages=find_packages(),
-  scripts=['bin/cnc25d_example_generator.py'],
+  scripts=['bin/cnc25d_example_generator.py', 'bin/cnc25d_server.py'],
   url='http://pypi.python.org/pypi/Cnc25D/',
   license='LICENSE.txt',
   description='CAD library for 2.5D parts (including gears) using svgwrite, dxfwrite or FreeCAD as backend',